@@ -9,10 +9,14 @@ from typing import Any, Literal
 
 from fastapi import FastAPI, Query, status
 from models_library.api_schemas_storage import (
+    FileDownloadLinksBatch,
+    FileDownloadLinksBatchBody,
     FileMetaDataGet,
     FileUploadCompleteFutureResponse,
     FileUploadCompleteResponse,
     FileUploadCompletionBody,
+    FileUploadLinksBatch,
+    FileUploadLinksBatchBody,
     FileUploadSchema,
     FoldersBody,
     HealthCheck,
@@ -136,7 +140,10 @@ async def get_storage_locations(user_id: UserID):
     summary="Manually triggers the synchronisation of the file meta data table in the database",
 )
 async def synchronise_meta_data_table(
-    location_id: LocationID, dry_run: bool = False, fire_and_forget: bool = False
+    location_id: LocationID,
+    dry_run: bool = False,
+    fire_and_forget: bool = False,
+    full_scan: bool = False,
 ):
     """Returns an object containing added, changed and removed paths"""
 
@@ -249,6 +256,36 @@ async def is_completed_upload_file(
     """Returns state of upload completion"""
 
 
+@app.post(
+    f"/{api_vtag}/simcore-s3/files/links:batch-upload",
+    response_model=Envelope[FileUploadLinksBatch],
+    tags=TAGS_FILES,
+    summary="Returns the upload links of several files",
+    operation_id="upload_files_batch",
+)
+async def upload_files_batch(
+    body_item: FileUploadLinksBatchBody,
+    user_id: UserID,
+    link_type: LinkType = LinkType.PRESIGNED,
+):
+    """creates the upload file links of several files if user has the rights to, expects the client to complete/abort each upload"""
+
+
+@app.post(
+    f"/{api_vtag}/simcore-s3/files/links:batch-download",
+    response_model=Envelope[FileDownloadLinksBatch],
+    tags=TAGS_FILES,
+    summary="Returns the download links of several files",
+    operation_id="download_files_batch",
+)
+async def download_files_batch(
+    body_item: FileDownloadLinksBatchBody,
+    user_id: UserID,
+    link_type: LinkType = LinkType.PRESIGNED,
+):
+    """creates the download file links of several files if user has the rights to"""
+
+
 # handlers_health.py
 
 
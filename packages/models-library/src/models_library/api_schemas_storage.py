@@ -330,3 +330,38 @@ class FoldersBody(BaseModel):
 
 class SoftCopyBody(BaseModel):
     link_id: SimcoreS3FileID
+
+
+# /simcore-s3/files/links:batch-upload
+class FileUploadLinksBatchItem(BaseModel):
+    file_id: SimcoreS3FileID
+    file_size: ByteSize
+    sha256_checksum: SHA256Str | None = None
+
+
+class FileUploadLinksBatchBody(BaseModel):
+    files: list[FileUploadLinksBatchItem] = Field(..., min_items=1)
+
+    @validator("files")
+    @classmethod
+    def ensure_unique_file_ids(
+        cls, value: list[FileUploadLinksBatchItem]
+    ) -> list[FileUploadLinksBatchItem]:
+        file_ids = [f.file_id for f in value]
+        if len(set(file_ids)) != len(file_ids):
+            msg = "file_id must be unique in a batch"
+            raise ValueError(msg)
+        return value
+
+
+class FileUploadLinksBatch(BaseModel):
+    uploads: dict[SimcoreS3FileID, FileUploadSchema]
+
+
+# /simcore-s3/files/links:batch-download
+class FileDownloadLinksBatchBody(BaseModel):
+    file_ids: list[SimcoreS3FileID] = Field(..., min_items=1, unique_items=True)
+
+
+class FileDownloadLinksBatch(BaseModel):
+    links: dict[SimcoreS3FileID, AnyUrl]
@@ -8,7 +8,13 @@ file_meta_data = sa.Table(
     sa.Column("location_id", sa.String()),
     sa.Column("location", sa.String()),
     sa.Column("bucket_name", sa.String()),
-    sa.Column("object_name", sa.String()),
+    sa.Column(
+        "object_name",
+        sa.String(),
+        index=True,
+        doc="S3 object holding the data. Several entries might share the same object "
+        "(e.g. soft links, deduplicated copies): the number of entries sharing it is its reference count",
+    ),
     sa.Column("project_id", sa.String()),
     sa.Column("node_id", sa.String()),
     sa.Column("user_id", sa.String()),
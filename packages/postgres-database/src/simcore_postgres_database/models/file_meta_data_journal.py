@@ -0,0 +1,54 @@
+""" file_meta_data_journal table
+
+    - journal of the operations performed by storage on file_meta_data and the S3 backend
+    - the metadata synchronisation replays the events since the last checkpoint
+    (i.e. processed events are removed) instead of scanning the whole S3 bucket
+"""
+import enum
+
+import sqlalchemy as sa
+
+from ._common import column_created_datetime
+from .base import metadata
+
+
+@enum.unique
+class FileMetaDataJournalEvent(str, enum.Enum):
+    UPLOAD_STARTED = "UPLOAD_STARTED"
+    UPLOAD_COMPLETED = "UPLOAD_COMPLETED"
+    UPLOAD_ABORTED = "UPLOAD_ABORTED"
+    DELETED = "DELETED"
+
+
+file_meta_data_journal = sa.Table(
+    "file_meta_data_journal",
+    metadata,
+    sa.Column(
+        "event_id",
+        sa.BigInteger,
+        nullable=False,
+        autoincrement=True,
+        primary_key=True,
+        doc="Monotonic identifier of the event (defines the replay order)",
+    ),
+    sa.Column(
+        "file_id",
+        sa.String,
+        nullable=False,
+        doc="file_meta_data.file_id affected by the event",
+    ),
+    sa.Column(
+        "event",
+        sa.Enum(FileMetaDataJournalEvent),
+        nullable=False,
+        doc="Operation performed by storage",
+    ),
+    sa.Column(
+        "upload_id",
+        sa.String,
+        nullable=True,
+        doc="S3 multipart upload ID involved in the event if any",
+    ),
+    # TIME STAMPS ----
+    column_created_datetime(timezone=True),
+)
@@ -5,6 +5,10 @@
 """
 from .models.base import metadata
 from .models.file_meta_data import file_meta_data
+from .models.file_meta_data_journal import (
+    FileMetaDataJournalEvent,
+    file_meta_data_journal,
+)
 from .models.groups import groups, user_to_groups
 from .models.projects import projects
 from .models.tokens import tokens
@@ -13,6 +17,8 @@ from .models.users import users
 __all__ = [
     "tokens",
     "file_meta_data",
+    "file_meta_data_journal",
+    "FileMetaDataJournalEvent",
     "metadata",
     "projects",
     "users",
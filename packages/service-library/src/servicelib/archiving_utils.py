@@ -1,13 +1,23 @@
 import asyncio
 import fnmatch
 import functools
+import io
 import logging
+import os
+import queue
+import tempfile
+import threading
 import types
 import zipfile
-from contextlib import AsyncExitStack, contextmanager
+import zlib
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import AsyncExitStack, contextmanager, suppress
+from dataclasses import dataclass
 from functools import partial
 from pathlib import Path
-from typing import Awaitable, Callable, Final, Iterator
+from typing import Awaitable, BinaryIO, Callable, Final, Iterator
+from uuid import uuid4
 
 import tqdm
 from tqdm.contrib.logging import logging_redirect_tqdm, tqdm_logging_redirect
@@ -19,7 +29,20 @@ from .progress_bar import ProgressBarData
 
 _MIN: Final[int] = 60  # secs
 _MAX_UNARCHIVING_WORKER_COUNT: Final[int] = 2
-_CHUNK_SIZE: Final[int] = 1024 * 8
+_UNARCHIVING_BATCH_SIZE: Final[int] = 8 * 1024 * 1024
+_UNARCHIVING_BATCH_MAX_FILES: Final[int] = 512
+_UNARCHIVING_BATCHES_PER_WORKER: Final[int] = 2
+_UNARCHIVING_BUFFER_SIZE: Final[int] = 1024 * 1024
+_STREAM_CHUNK_SIZE: Final[int] = 1024 * 1024
+_STREAM_MAX_BUFFERED_CHUNKS: Final[int] = 16
+_STREAM_PUT_TIMEOUT_S: Final[float] = 0.1
+# NOTE: the process pools are shared by all the callers of the application
+_MAX_ARCHIVING_WORKER_COUNT: Final[int] = 2
+_PARALLEL_ARCHIVING_MIN_SIZE: Final[int] = 1024 * 1024
+_ARCHIVING_PIECE_SIZE: Final[int] = 64 * 1024 * 1024
+_ARCHIVING_BATCH_SIZE: Final[int] = 8 * 1024 * 1024
+_ARCHIVING_BATCH_MAX_FILES: Final[int] = 512
+_ARCHIVING_MAX_INLINE_SIZE: Final[int] = 1024 * 1024
 
 log = logging.getLogger(__name__)
 
@@ -102,55 +125,78 @@ _TQDM_MULTI_FILES_OPTIONS = _TQDM_FILE_OPTIONS | dict(
 )
 
 
-def _zipfile_single_file_extract_worker(
+def _zipfile_batch_extract_worker(
     zip_file_path: Path,
-    file_in_archive: zipfile.ZipInfo,
+    files_in_archive: list[zipfile.ZipInfo],
     destination_folder: Path,
-    is_dir: bool,
-) -> Path:
-    """Extracts file_in_archive from the archive zip_file_path -> destination_folder/file_in_archive
+    buffer_size: int,
+) -> list[Path]:
+    """Extracts files_in_archive from the archive zip_file_path -> destination_folder/file_in_archive
 
-    Extracts in chunks to avoid memory pressure on zip/unzip
-    returns: a path to extracted file or directory
+    Extracts in chunks (in a single buffer of buffer_size reused for all the files) to avoid memory pressure on zip/unzip
+    returns: the paths to extracted files or directories
     """
+    extracted_paths = []
+    buffer = bytearray(buffer_size)
+    buffer_view = memoryview(buffer)
     with _FastZipFileReader(zip_file_path) as zf:
-        # assemble destination and ensure it exits
-        destination_path = destination_folder / file_in_archive.filename
-
-        if is_dir:
-            destination_path.mkdir(parents=True, exist_ok=True)
-            return destination_path
-        desc = f"decompressing {zip_file_path}:{file_in_archive.filename} -> {destination_path}\n"
-        with zf.open(name=file_in_archive) as zip_fp, destination_path.open(
-            "wb"
-        ) as dest_fp, tqdm_logging_redirect(
-            total=file_in_archive.file_size,
-            desc=desc,
-            **(
-                _TQDM_FILE_OPTIONS
-                | dict(miniters=_compute_tqdm_miniters(file_in_archive.file_size))
-            ),
-        ) as pbar:
-            while chunk := zip_fp.read(_CHUNK_SIZE):
-                dest_fp.write(chunk)
-                pbar.update(len(chunk))
-            return destination_path
+        for file_in_archive in files_in_archive:
+            # assemble destination and ensure it exits
+            destination_path = destination_folder / file_in_archive.filename
+
+            if file_in_archive.is_dir():
+                destination_path.mkdir(parents=True, exist_ok=True)
+            else:
+                with zf.open(name=file_in_archive) as zip_fp, destination_path.open(
+                    "wb"
+                ) as dest_fp:
+                    while read_size := zip_fp.readinto(buffer):
+                        dest_fp.write(buffer_view[:read_size])
+            extracted_paths.append(destination_path)
+    return extracted_paths
+
+
+def _iter_extraction_batches(
+    zip_entries: list[zipfile.ZipInfo],
+) -> Iterator[list[zipfile.ZipInfo]]:
+    batch: list[zipfile.ZipInfo] = []
+    batch_size = 0
+    for zip_entry in zip_entries:
+        batch.append(zip_entry)
+        batch_size += zip_entry.file_size
+        if (
+            batch_size >= _UNARCHIVING_BATCH_SIZE
+            or len(batch) >= _UNARCHIVING_BATCH_MAX_FILES
+        ):
+            yield batch
+            batch = []
+            batch_size = 0
+    if batch:
+        yield batch
 
 
 def _ensure_destination_subdirectories_exist(
     zip_file_handler: zipfile.ZipFile, destination_folder: Path
 ) -> None:
-    # assemble full destination paths
-    full_destination_paths = {
-        destination_folder / entry.filename for entry in zip_file_handler.infolist()
-    }
     # extract all possible subdirectories
-    subdirectories = {x.parent for x in full_destination_paths}
+    subdirectories = {
+        (destination_folder / entry.filename).parent
+        for entry in zip_file_handler.infolist()
+    }
     # create all subdirectories before extracting
     for subdirectory in subdirectories:
         Path(subdirectory).mkdir(parents=True, exist_ok=True)
 
 
+def cpu_based_max_workers() -> int:
+    """number of (un)archiving workers using all the CPUs available to the process
+
+    NOTE: meant for the callers for which (un)archiving is the main work (e.g. restoring
+    the state of a service), the defaults keep the shared process pools small
+    """
+    return max(1, len(os.sched_getaffinity(0)))
+
+
 async def unarchive_dir(
     archive_to_extract: Path,
     destination_folder: Path,
@@ -165,6 +211,8 @@ async def unarchive_dir(
     Returns a set with all the paths extracted from archive. It includes
     all tree leafs, which might include files or empty folders
 
+    The members are extracted by batches (grouping the small ones), and only
+    a few batches per worker are in flight at any time.
 
     NOTE: ``destination_folder`` is fully deleted after error
 
@@ -193,53 +241,62 @@ async def unarchive_dir(
             destination_folder=destination_folder,
         )
 
-        futures: list[asyncio.Future] = [
-            asyncio.get_event_loop().run_in_executor(
-                process_pool,
-                # ---------
-                _zipfile_single_file_extract_worker,
-                archive_to_extract,
-                zip_entry,
-                destination_folder,
-                zip_entry.is_dir(),
-            )
-            for zip_entry in zip_file_handler.infolist()
-        ]
+        zip_entries = zip_file_handler.infolist()
+        batches = _iter_extraction_batches(zip_entries)
+        futures: dict[asyncio.Future, int] = {}
+
+        def _submit_next_batch() -> None:
+            if batch := next(batches, None):
+                future = asyncio.get_event_loop().run_in_executor(
+                    process_pool,
+                    # ---------
+                    _zipfile_batch_extract_worker,
+                    archive_to_extract,
+                    batch,
+                    destination_folder,
+                    _UNARCHIVING_BUFFER_SIZE,
+                )
+                futures[future] = sum(zip_entry.file_size for zip_entry in batch)
 
         try:
             extracted_paths: list[Path] = []
-            total_file_size = sum(
-                zip_entry.file_size for zip_entry in zip_file_handler.infolist()
-            )
+            total_file_size = sum(zip_entry.file_size for zip_entry in zip_entries)
             async with AsyncExitStack() as progress_stack:
                 sub_prog = await progress_stack.enter_async_context(
                     progress_bar.sub_progress(steps=total_file_size)
                 )
                 tqdm_progress = progress_stack.enter_context(
                     tqdm.tqdm(
-                        desc=f"decompressing {archive_to_extract} -> {destination_folder} [{len(futures)} file{'s' if len(futures) > 1 else ''}"
+                        desc=f"decompressing {archive_to_extract} -> {destination_folder} [{len(zip_entries)} file{'s' if len(zip_entries) > 1 else ''}"
                         f"/{_human_readable_size(archive_to_extract.stat().st_size)}]\n",
                         total=total_file_size,
                         **_TQDM_MULTI_FILES_OPTIONS,
                     )
                 )
-                for future in asyncio.as_completed(futures):
-                    extracted_path = await future
-                    extracted_file_size = extracted_path.stat().st_size
-                    if tqdm_progress.update(extracted_file_size) and log_cb:
-                        with log_catch(log, reraise=False):
-                            await log_cb(f"{tqdm_progress}")
-                    await sub_prog.update(extracted_file_size)
-                    extracted_paths.append(extracted_path)
+                for _ in range(_UNARCHIVING_BATCHES_PER_WORKER * max_workers):
+                    _submit_next_batch()
+                while futures:
+                    done, _ = await asyncio.wait(
+                        futures, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for future in done:
+                        extracted_paths.extend(await future)
+                        extracted_size = futures.pop(future)
+                        _submit_next_batch()
+                        if tqdm_progress.update(extracted_size) and log_cb:
+                            with log_catch(log, reraise=False):
+                                await log_cb(f"{tqdm_progress}")
+                        await sub_prog.update(extracted_size)
 
         except Exception as err:
             for f in futures:
                 f.cancel()
 
             # wait until all tasks are cancelled
-            await asyncio.wait(
-                futures, timeout=2 * _MIN, return_when=asyncio.ALL_COMPLETED
-            )
+            if futures:
+                await asyncio.wait(
+                    futures, timeout=2 * _MIN, return_when=asyncio.ALL_COMPLETED
+                )
 
             # now we can cleanup
             if destination_folder.exists() and destination_folder.is_dir():
@@ -328,6 +385,298 @@ def _add_to_archive(
             )
 
 
+# NOTE: parallel archiving
+# The members are compressed (or only check-summed when stored) by a process pool,
+# then written in order together with their headers. The files bigger than
+# _ARCHIVING_PIECE_SIZE are split in pieces that are compressed independently:
+# all but the last piece are ended with a full flush, so that concatenated
+# they form a single valid deflate stream.
+
+
+@dataclass(frozen=True)
+class _ArchivePiece:
+    path: Path
+    arcname: str
+    offset: int
+    length: int
+    is_last: bool
+
+
+@dataclass(frozen=True)
+class _ProcessedPiece:
+    crc: int
+    read_size: int
+    # compressed data, inline or in a temporary file (None when stored)
+    data: bytes | None
+    data_path: Path | None
+    data_size: int
+
+
+def _crc32_combine(crc1: int, crc2: int, len2: int) -> int:
+    """crc32 of the concatenation of 2 blocks (as zlib's crc32_combine)"""
+
+    def _gf2_matrix_times(mat: list[int], vec: int) -> int:
+        result = 0
+        i = 0
+        while vec:
+            if vec & 1:
+                result ^= mat[i]
+            vec >>= 1
+            i += 1
+        return result
+
+    def _gf2_matrix_square(mat: list[int]) -> list[int]:
+        return [_gf2_matrix_times(mat, mat[n]) for n in range(32)]
+
+    if len2 <= 0:
+        return crc1
+    # operator for one zero bit
+    odd = [0xEDB88320] + [1 << n for n in range(31)]
+    even = _gf2_matrix_square(odd)  # 2 zero bits
+    odd = _gf2_matrix_square(even)  # 4 zero bits
+    while True:
+        even = _gf2_matrix_square(odd)
+        if len2 & 1:
+            crc1 = _gf2_matrix_times(even, crc1)
+        len2 >>= 1
+        if not len2:
+            break
+        odd = _gf2_matrix_square(even)
+        if len2 & 1:
+            crc1 = _gf2_matrix_times(odd, crc1)
+        len2 >>= 1
+        if not len2:
+            break
+    return crc1 ^ crc2
+
+
+def _process_pieces(
+    pieces: list[_ArchivePiece], *, compress: bool, tmp_dir: Path, max_inline_size: int
+) -> list[_ProcessedPiece]:
+    """runs in the process pool
+
+    compressed pieces bigger than max_inline_size are written to tmp_dir
+    """
+    processed_pieces = []
+    for piece in pieces:
+        crc = 0
+        read_size = 0
+        compressor = (
+            zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+            if compress
+            else None
+        )
+        data_path = (
+            tmp_dir / f"{uuid4()}"
+            if compress and piece.length > max_inline_size
+            else None
+        )
+        with piece.path.open("rb") as src, (
+            data_path.open("wb") if data_path else io.BytesIO()
+        ) as dst:
+            src.seek(piece.offset)
+            while read_size < piece.length and (
+                chunk := src.read(min(_STREAM_CHUNK_SIZE, piece.length - read_size))
+            ):
+                crc = zlib.crc32(chunk, crc)
+                read_size += len(chunk)
+                if compressor:
+                    dst.write(compressor.compress(chunk))
+            if compressor:
+                dst.write(
+                    compressor.flush(
+                        zlib.Z_FINISH if piece.is_last else zlib.Z_FULL_FLUSH
+                    )
+                )
+            data_size = dst.tell()
+            data = dst.getvalue() if isinstance(dst, io.BytesIO) else None
+        processed_pieces.append(
+            _ProcessedPiece(
+                crc=crc,
+                read_size=read_size,
+                data=data if compress else None,
+                data_path=data_path,
+                data_size=data_size if compress else read_size,
+            )
+        )
+    return processed_pieces
+
+
+def _copy_file_range(src_path: Path, dst: BinaryIO, offset: int, count: int) -> None:
+    """appends count bytes of src_path from offset to dst, zero-copy if possible"""
+    dst.flush()
+    dst_offset = dst.tell()
+    with src_path.open("rb") as src:
+        copied = 0
+        with suppress(OSError, AttributeError):
+            while copied < count:
+                if not (
+                    n := os.copy_file_range(
+                        src.fileno(),
+                        dst.fileno(),
+                        count - copied,
+                        offset + copied,
+                        dst_offset + copied,
+                    )
+                ):
+                    break
+                copied += n
+        if copied < count:
+            # e.g. not supported by the filesystem
+            src.seek(offset + copied)
+            dst.seek(dst_offset + copied)
+            while copied < count and (
+                chunk := src.read(min(_STREAM_CHUNK_SIZE, count - copied))
+            ):
+                dst.write(chunk)
+                copied += len(chunk)
+    dst.seek(dst_offset + copied)
+
+
+def _write_processed_member(
+    zip_file_handler: zipfile.ZipFile,
+    *,
+    compress: bool,
+    pieces: list[tuple[_ArchivePiece, _ProcessedPiece]],
+) -> None:
+    first_piece = pieces[0][0]
+    zinfo = zipfile.ZipInfo.from_file(first_piece.path, first_piece.arcname)
+    zinfo.compress_type = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+    zinfo.CRC = pieces[0][1].crc
+    zinfo.file_size = pieces[0][1].read_size
+    zinfo.compress_size = pieces[0][1].data_size
+    for _, processed in pieces[1:]:
+        zinfo.CRC = _crc32_combine(zinfo.CRC, processed.crc, processed.read_size)
+        zinfo.file_size += processed.read_size
+        zinfo.compress_size += processed.data_size
+
+    assert zip_file_handler.fp  # nosec
+    dst = zip_file_handler.fp
+    zinfo.header_offset = dst.tell()
+    dst.write(
+        zinfo.FileHeader(
+            zinfo.file_size > zipfile.ZIP64_LIMIT
+            or zinfo.compress_size > zipfile.ZIP64_LIMIT
+        )
+    )
+    for piece, processed in pieces:
+        if processed.data is not None:
+            dst.write(processed.data)
+        elif processed.data_path:
+            _copy_file_range(processed.data_path, dst, 0, processed.data_size)
+            processed.data_path.unlink()
+        else:
+            _copy_file_range(piece.path, dst, piece.offset, processed.read_size)
+
+    # NOTE: same bookkeeping as when zipfile writes a member (see ZipFile._open_to_write)
+    zip_file_handler._didModify = True  # pylint: disable=protected-access
+    zip_file_handler.start_dir = dst.tell()
+    zip_file_handler.filelist.append(zinfo)
+    zip_file_handler.NameToInfo[zinfo.filename] = zinfo
+
+
+def _iter_pieces_batches(
+    files_to_compress: list[tuple[Path, str]]
+) -> Iterator[list[_ArchivePiece]]:
+    batch: list[_ArchivePiece] = []
+    batch_size = 0
+    for path, arcname in files_to_compress:
+        file_size = path.stat().st_size
+        offsets = range(0, file_size, _ARCHIVING_PIECE_SIZE) if file_size else [0]
+        for offset in offsets:
+            length = min(_ARCHIVING_PIECE_SIZE, file_size - offset)
+            batch.append(
+                _ArchivePiece(
+                    path=path,
+                    arcname=arcname,
+                    offset=offset,
+                    length=length,
+                    is_last=offset + length >= file_size,
+                )
+            )
+            batch_size += length
+            if (
+                batch_size >= _ARCHIVING_BATCH_SIZE
+                or len(batch) >= _ARCHIVING_BATCH_MAX_FILES
+            ):
+                yield batch
+                batch = []
+                batch_size = 0
+    if batch:
+        yield batch
+
+
+def _add_to_archive_in_parallel(
+    dir_to_compress: Path,
+    destination: Path,
+    compress: bool,
+    store_relative_path: bool,
+    update_progress,
+    loop,
+    exclude_patterns: set[str] | None,
+    process_pool: ProcessPoolExecutor,
+    max_workers: int,
+) -> None:
+    files_to_compress = [
+        (
+            file_to_add,
+            # because surrogates are not allowed in zip files,
+            # replacing them will ensure errors will not happen.
+            f"{_strip_undecodable_in_path(_strip_directory_from_path(file_to_add, dir_to_compress) if store_relative_path else file_to_add)}",
+        )
+        for file_to_add in _iter_files_to_compress(dir_to_compress, exclude_patterns)
+    ]
+    batches = _iter_pieces_batches(files_to_compress)
+    # NOTE: bounds the memory/temporary disk used by the pieces not yet written
+    in_flight: deque[tuple[list[_ArchivePiece], Future]] = deque()
+
+    with tempfile.TemporaryDirectory(
+        dir=destination.parent, prefix=".archiving_"
+    ) as tmp_dir, zipfile.ZipFile(
+        destination,
+        "w",
+        compression=zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED,
+    ) as zip_file_handler:
+
+        def _submit_next_batch() -> None:
+            if batch := next(batches, None):
+                in_flight.append(
+                    (
+                        batch,
+                        process_pool.submit(
+                            _process_pieces,
+                            batch,
+                            compress=compress,
+                            tmp_dir=Path(tmp_dir),
+                            max_inline_size=_ARCHIVING_MAX_INLINE_SIZE,
+                        ),
+                    )
+                )
+
+        try:
+            for _ in range(2 * max_workers):
+                _submit_next_batch()
+
+            member_pieces: list[tuple[_ArchivePiece, _ProcessedPiece]] = []
+            while in_flight:
+                batch, future = in_flight.popleft()
+                processed_pieces = future.result()
+                _submit_next_batch()
+                for piece, processed in zip(batch, processed_pieces, strict=True):
+                    member_pieces.append((piece, processed))
+                    if piece.is_last:
+                        _write_processed_member(
+                            zip_file_handler, compress=compress, pieces=member_pieces
+                        )
+                        member_pieces = []
+                asyncio.run_coroutine_threadsafe(
+                    update_progress(sum(p.read_size for p in processed_pieces)), loop
+                )
+        finally:
+            for _, future in in_flight:
+                future.cancel()
+
+
 async def _update_progress(prog: ProgressBarData, delta: float) -> None:
     await prog.update(delta)
 
@@ -340,6 +689,7 @@ async def archive_dir(
     store_relative_path: bool,
     exclude_patterns: set[str] | None = None,
     progress_bar: ProgressBarData | None = None,
+    max_workers: int = _MAX_ARCHIVING_WORKER_COUNT,
 ) -> None:
     """
     When archiving, undecodable bytes in filenames will be escaped,
@@ -350,6 +700,9 @@ async def archive_dir(
     The **exclude_patterns** is a set of patterns created using
     Unix shell-style wildcards to exclude files and directories.
 
+    Folders of at least 1MiB are archived by **max_workers** processes,
+    when there are more than one.
+
     destination: Path deleted if errors
 
     ::raise ArchiveError
@@ -368,11 +721,20 @@ async def archive_dir(
         thread_pool = stack.enter_context(
             non_blocking_thread_pool_executor(max_workers=1)
         )
+        add_to_archive: Callable[..., None] = _add_to_archive
+        if max_workers > 1 and folder_size_bytes >= _PARALLEL_ARCHIVING_MIN_SIZE:
+            add_to_archive = functools.partial(
+                _add_to_archive_in_parallel,
+                process_pool=stack.enter_context(
+                    non_blocking_process_pool_executor(max_workers=max_workers)
+                ),
+                max_workers=max_workers,
+            )
         try:
             await asyncio.get_event_loop().run_in_executor(
                 thread_pool,
                 # ---------
-                _add_to_archive,
+                add_to_archive,
                 dir_to_compress,
                 destination,
                 compress,
@@ -396,6 +758,253 @@ async def archive_dir(
             raise
 
 
+class _ArchiveStreamClosedError(Exception):
+    ...
+
+
+class _WriteOnlyStream(io.RawIOBase):
+    # NOTE: not providing `tell` and `seek` makes zipfile write in streaming mode
+    # (using data descriptors), the archive is created in a single pass
+
+    def __init__(self, put_fct: Callable[[bytes | None], None]) -> None:
+        super().__init__()
+        self._put_fct = put_fct
+        self.written_bytes: int = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:  # type: ignore[override]
+        if data:
+            self._put_fct(bytes(data))
+            self.written_bytes += len(data)
+        return len(data)
+
+
+def _compute_stored_archive_size(files_to_compress: list[zipfile.ZipInfo]) -> int:
+    # NOTE: this mirrors what zipfile writes to a non seekable stream:
+    # every entry has a local header (with a forced zip64 extra), the data and
+    # a zip64 data descriptor; central directory entries and the end record
+    # only use zip64 when required
+    zip64_local_extra_size = 4 + 8 * 2
+    zip64_data_descriptor_size = 4 + 4 + 8 + 8
+    offset = 0
+    central_directory_size = 0
+    for zinfo in files_to_compress:
+        file_name_size = len(
+            zinfo.filename.encode("ascii" if zinfo.filename.isascii() else "utf-8")
+        )
+        zip64_fields = (2 if zinfo.file_size > zipfile.ZIP64_LIMIT else 0) + (
+            1 if offset > zipfile.ZIP64_LIMIT else 0
+        )
+        central_directory_size += (
+            zipfile.sizeCentralDir
+            + file_name_size
+            + (4 + 8 * zip64_fields if zip64_fields else 0)
+        )
+        offset += (
+            zipfile.sizeFileHeader
+            + file_name_size
+            + zip64_local_extra_size
+            + zinfo.file_size
+            + zip64_data_descriptor_size
+        )
+
+    end_record_size = zipfile.sizeEndCentDir
+    if (
+        len(files_to_compress) > zipfile.ZIP_FILECOUNT_LIMIT
+        or offset > zipfile.ZIP64_LIMIT
+        or central_directory_size > zipfile.ZIP64_LIMIT
+    ):
+        end_record_size += zipfile.sizeEndCentDir64 + zipfile.sizeEndCentDir64Locator
+    return offset + central_directory_size + end_record_size
+
+
+class ArchiveStream(io.RawIOBase):
+    """
+    Read-only file object returning an uncompressed zip archive of a directory
+    while it is being created. The archive is never written to disk and only
+    a few chunks are kept in memory.
+
+    The size of the archive is known before creating it (see `archive_size`),
+    as required to upload it via presigned links.
+    Only sequential reads are supported (i.e. not `seekable`), uploaders
+    buffer the parts they need to read again.
+
+    with ArchiveStream(dir_to_compress, store_relative_path=True) as stream:
+        upload(stream, size=stream.archive_size)
+
+    ::raise ArchiveError
+    """
+
+    def __init__(
+        self,
+        dir_to_compress: Path,
+        *,
+        store_relative_path: bool,
+        exclude_patterns: set[str] | None = None,
+    ) -> None:
+        super().__init__()
+        self.dir_to_compress = dir_to_compress
+        try:
+            self._files_to_compress: list[tuple[Path, zipfile.ZipInfo]] = [
+                (
+                    file_to_add,
+                    zipfile.ZipInfo.from_file(
+                        file_to_add,
+                        # because surrogates are not allowed in zip files,
+                        # replacing them will ensure errors will not happen.
+                        _strip_undecodable_in_path(
+                            _strip_directory_from_path(file_to_add, dir_to_compress)
+                            if store_relative_path
+                            else file_to_add
+                        ),
+                    ),
+                )
+                for file_to_add in _iter_files_to_compress(
+                    dir_to_compress, exclude_patterns
+                )
+            ]
+        except (OSError, ValueError) as err:
+            raise ArchiveError(
+                f"Failed listing {dir_to_compress} due to {type(err)}."
+                f"Details: {err}"
+            ) from err
+        self.archive_size: int = _compute_stored_archive_size(
+            [zinfo for _, zinfo in self._files_to_compress]
+        )
+
+        self._chunks: queue.Queue[bytes | None] = queue.Queue(
+            maxsize=_STREAM_MAX_BUFFERED_CHUNKS
+        )
+        self._current_chunk: bytes = b""
+        self._position: int = 0
+        self._eof: bool = False
+        self._error: ArchiveError | None = None
+        self._closing = threading.Event()
+        self._worker = threading.Thread(
+            target=self._write_archive,
+            name=f"archive_stream_{dir_to_compress.name}",
+            daemon=True,
+        )
+
+    def __enter__(self) -> "ArchiveStream":
+        self._worker.start()
+        return self
+
+    def _put(self, chunk: bytes | None) -> None:
+        # NOTE: runs in the worker thread, blocks while the reader is behind
+        while not self._closing.is_set():
+            with suppress(queue.Full):
+                self._chunks.put(chunk, timeout=_STREAM_PUT_TIMEOUT_S)
+                return
+        raise _ArchiveStreamClosedError
+
+    def _write_archive(self) -> None:
+        stream = _WriteOnlyStream(self._put)
+        try:
+            with zipfile.ZipFile(
+                stream, "w", compression=zipfile.ZIP_STORED
+            ) as zip_file_handler:
+                for file_to_add, zinfo in self._files_to_compress:
+                    expected_file_size = zinfo.file_size
+                    copied_bytes = 0
+                    with file_to_add.open("rb") as src, zip_file_handler.open(
+                        zinfo, "w", force_zip64=True
+                    ) as dest:
+                        while chunk := src.read(_STREAM_CHUNK_SIZE):
+                            dest.write(chunk)
+                            copied_bytes += len(chunk)
+                    if copied_bytes != expected_file_size:
+                        msg = f"{file_to_add} changed while being archived"
+                        raise ArchiveError(msg)
+            if stream.written_bytes != self.archive_size:
+                msg = f"created {stream.written_bytes} bytes instead of the expected {self.archive_size}"
+                raise ArchiveError(msg)
+        except _ArchiveStreamClosedError:
+            return
+        except Exception as err:  # pylint: disable=broad-except
+            self._error = ArchiveError(
+                f"Failed archiving {self.dir_to_compress} due to {type(err)}."
+                f"Details: {err}"
+            )
+            self._error.__cause__ = err
+
+        with suppress(_ArchiveStreamClosedError):
+            self._put(None)
+
+    def _next_chunk(self) -> bytes | None:
+        if self._eof:
+            return None
+        chunk = self._chunks.get()
+        if chunk is None:
+            self._eof = True
+            if self._error:
+                raise self._error
+        return chunk
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        # NOTE: only the current position is supported, which
+        # allows reading the stream in consecutive parts
+        if whence != io.SEEK_SET or offset != self._position:
+            msg = f"cannot seek to {offset=} from {self._position=}"
+            raise io.UnsupportedOperation(msg)
+        return self._position
+
+    def read(self, size: int | None = -1) -> bytes:
+        """blocks until `size` bytes are created or the archive is complete"""
+        if self._worker.ident is None:
+            msg = f"{ArchiveStream.__name__} must be used as a context manager"
+            raise ArchiveError(msg)
+
+        data = bytearray()
+        while size is None or size < 0 or len(data) < size:
+            if not self._current_chunk:
+                chunk = self._next_chunk()
+                if chunk is None:
+                    break
+                self._current_chunk = chunk
+            missing = (
+                len(self._current_chunk)
+                if size is None or size < 0
+                else size - len(data)
+            )
+            data += self._current_chunk[:missing]
+            self._current_chunk = self._current_chunk[missing:]
+        self._position += len(data)
+
+        if self._position == self.archive_size and not self._current_chunk:
+            # NOTE: ensures errors are raised while the last bytes are read,
+            # readers stopping at `archive_size` would otherwise never see them
+            if self._next_chunk() is not None:
+                msg = (
+                    f"{self.dir_to_compress} archive exceeds {self.archive_size} bytes"
+                )
+                raise ArchiveError(msg)
+        return bytes(data)
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def close(self) -> None:
+        if not self.closed:
+            self._closing.set()
+            if self._worker.ident is not None:
+                self._worker.join()
+        super().close()
+
+
 def is_leaf_path(p: Path) -> bool:
     """Tests whether a path corresponds to a file or empty folder, i.e.
     some leaf item in a file-system tree structure
@@ -461,6 +1070,7 @@ class PrunableFolder:
 __all__ = (
     "archive_dir",
     "ArchiveError",
+    "ArchiveStream",
     "is_leaf_path",
     "PrunableFolder",
     "unarchive_dir",
@@ -8,6 +8,7 @@ from ._errors import (
     RPCNotInitializedError,
     RPCServerError,
 )
+from ._outbox import RabbitMQOutbox
 from ._rpc_router import RPCRouter
 from ._utils import is_rabbitmq_responsive, wait_till_rabbitmq_responsive
 
@@ -15,6 +16,7 @@ __all__: tuple[str, ...] = (
     "BIND_TO_ALL_TOPICS",
     "is_rabbitmq_responsive",
     "RabbitMQClient",
+    "RabbitMQOutbox",
     "RabbitMQRPCClient",
     "RemoteMethodNotRegisteredError",
     "RPCNamespace",
@@ -1,21 +1,30 @@
 import asyncio
+import contextlib
+import datetime
 import logging
+import weakref
+from collections.abc import AsyncIterator, Callable, Hashable, Sequence
 from dataclasses import dataclass, field
-from functools import partial
-from typing import Any, Final
+from typing import TYPE_CHECKING, Any, Final
 
 import aio_pika
-from pydantic import NonNegativeInt
+from pydantic import NonNegativeInt, PositiveInt
 
 from ..logging_utils import log_context
 from ._client_base import RabbitMQClientBase
 from ._models import MessageHandler, RabbitMessage
+from ._outbox import RabbitMQOutbox
 from ._utils import (
     RABBIT_QUEUE_MESSAGE_DEFAULT_TTL_MS,
     declare_queue,
     get_rabbitmq_client_unique_name,
 )
 
+if TYPE_CHECKING:
+    from prometheus_client import CollectorRegistry
+
+    from ._metrics import RabbitMQMetrics
+
 _logger = logging.getLogger(__name__)
 
 
@@ -28,6 +37,12 @@ _DEFAULT_UNEXPECTED_ERROR_MAX_ATTEMPTS: Final[NonNegativeInt] = 15
 
 _DELAYED_EXCHANGE_NAME: Final[str] = "delayed_{exchange_name}"
 
+_DEFAULT_OUTBOX_MAX_SIZE: Final[int] = 1000
+_DEFAULT_OUTBOX_FLUSH_SIZE: Final[int] = 100
+_DEFAULT_OUTBOX_FLUSH_INTERVAL: Final[datetime.timedelta] = datetime.timedelta(
+    milliseconds=100
+)
+
 
 def _get_x_death_count(message: aio_pika.abc.AbstractIncomingMessage) -> int:
     count: int = 0
@@ -85,10 +100,108 @@ async def _on_message(
             await _safe_nack(message_handler, max_retries_upon_error, message)
 
 
+@dataclass
+class _OrderingLock:
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    num_messages: int = 0
+
+
+@dataclass
+class _MessageConsumer:
+    exchange_name: str
+    message_handler: MessageHandler
+    max_retries_upon_error: int
+    max_concurrency: PositiveInt | None
+    ordering_key: Callable[[bytes], Hashable] | None
+    metrics: "RabbitMQMetrics | None"
+    _concurrency_limit: asyncio.Semaphore | None = field(init=False, default=None)
+    _ordering_locks: dict[Hashable, _OrderingLock] = field(
+        init=False, default_factory=dict
+    )
+
+    def __post_init__(self) -> None:
+        if self.max_concurrency:
+            self._concurrency_limit = asyncio.Semaphore(self.max_concurrency)
+
+    def _get_ordering_key(
+        self, message: aio_pika.abc.AbstractIncomingMessage
+    ) -> Hashable | None:
+        if self.ordering_key is None:
+            return None
+        try:
+            return self.ordering_key(message.body)
+        except Exception:  # pylint: disable=broad-exception-caught
+            _logger.exception(
+                "Could not get the ordering key of message '%s', it is handled unordered",
+                message.message_id,
+            )
+            return None
+
+    @contextlib.asynccontextmanager
+    async def _keep_order(
+        self, message: aio_pika.abc.AbstractIncomingMessage
+    ) -> AsyncIterator[None]:
+        # NOTE: the messages are delivered in order and each one runs in its own task,
+        # they therefore wait in order for the lock of their key (asyncio.Lock is fair)
+        key = self._get_ordering_key(message)
+        if key is None:
+            yield
+            return
+        ordering_lock = self._ordering_locks.setdefault(key, _OrderingLock())
+        ordering_lock.num_messages += 1
+        try:
+            async with ordering_lock.lock:
+                yield
+        finally:
+            ordering_lock.num_messages -= 1
+            if ordering_lock.num_messages == 0:
+                del self._ordering_locks[key]
+
+    @contextlib.asynccontextmanager
+    async def _limit_concurrency(self) -> AsyncIterator[None]:
+        if self._concurrency_limit is None:
+            yield
+            return
+        async with self._concurrency_limit:
+            yield
+
+    async def __call__(self, message: aio_pika.abc.AbstractIncomingMessage) -> None:
+        async with self._keep_order(message), self._limit_concurrency():
+            if self.metrics is None:
+                await _on_message(
+                    self.message_handler, self.max_retries_upon_error, message
+                )
+                return
+            self.metrics.observe_message_lag(
+                self.exchange_name, published_at=message.timestamp
+            )
+            with self.metrics.observe_handler(self.exchange_name):
+                await _on_message(
+                    self.message_handler, self.max_retries_upon_error, message
+                )
+
+
+def _get_exchange_type(message: RabbitMessage) -> aio_pika.ExchangeType:
+    return (
+        aio_pika.ExchangeType.FANOUT
+        if message.routing_key() is None
+        else aio_pika.ExchangeType.TOPIC
+    )
+
+
 @dataclass
 class RabbitMQClient(RabbitMQClientBase):
+    # NOTE: metrics are only collected if a registry is given (requires prometheus_client)
+    metrics_registry: "CollectorRegistry | None" = None
+
     _connection_pool: aio_pika.pool.Pool | None = field(init=False, default=None)
     _channel_pool: aio_pika.pool.Pool | None = field(init=False, default=None)
+    # NOTE: exchanges declared by channel, robust channels re-declare them upon reconnection
+    _declared_exchanges: weakref.WeakKeyDictionary[
+        aio_pika.abc.AbstractChannel,
+        dict[tuple[str, aio_pika.ExchangeType], aio_pika.abc.AbstractExchange],
+    ] = field(init=False, default_factory=weakref.WeakKeyDictionary)
+    _metrics: "RabbitMQMetrics | None" = field(init=False, default=None)
 
     def __post_init__(self) -> None:
         # recommendations are 1 connection per process
@@ -97,6 +210,10 @@ class RabbitMQClient(RabbitMQClientBase):
         )
         # channels are not thread safe, what about python?
         self._channel_pool = aio_pika.pool.Pool(self._get_channel, max_size=10)
+        if self.metrics_registry:
+            from ._metrics import RabbitMQMetrics
+
+            self._metrics = RabbitMQMetrics.create(self.metrics_registry)
 
     async def _get_connection(
         self, rabbit_broker: str, connection_name: str
@@ -144,12 +261,23 @@ class RabbitMQClient(RabbitMQClientBase):
         message_ttl: NonNegativeInt = RABBIT_QUEUE_MESSAGE_DEFAULT_TTL_MS,
         unexpected_error_retry_delay_s: float = _DEFAULT_UNEXPECTED_ERROR_RETRY_DELAY_S,
         unexpected_error_max_attempts: int = _DEFAULT_UNEXPECTED_ERROR_MAX_ATTEMPTS,
+        prefetch_count: PositiveInt | None = None,
+        max_concurrency: PositiveInt | None = None,
+        ordering_key: Callable[[bytes], Hashable] | None = None,
     ) -> str:
         """subscribe to exchange_name calling ``message_handler`` for every incoming message
         - exclusive_queue: True means that every instance of this application will
             receive the incoming messages
         - exclusive_queue: False means that only one instance of this application will
             reveice the incoming message
+        - prefetch_count: maximum number of unacknowledged messages delivered to this
+            subscriber (defaults to max_concurrency if set, else to 1 for non exclusive
+            queues and 10 otherwise)
+        - max_concurrency: maximum number of messages handled concurrently
+            (defaults to the prefetch_count)
+        - ordering_key: returns the key of a message body, messages with the same key
+            are handled one after the other in their delivery order (e.g. per project_id).
+            NOTE: a message retried upon error is delivered again after the others
 
         NOTE: ``message_ttl` is also a soft timeout: if the handler does not finish processing
         the message before this is reached the message will be redelivered!
@@ -180,7 +308,11 @@ class RabbitMQClient(RabbitMQClientBase):
 
         assert self._channel_pool  # nosec
         async with self._channel_pool.acquire() as channel:
-            qos_value = 1 if exclusive_queue is False else _DEFAULT_PREFETCH_VALUE
+            qos_value = (
+                prefetch_count
+                or max_concurrency
+                or (1 if exclusive_queue is False else _DEFAULT_PREFETCH_VALUE)
+            )
             await channel.set_qos(qos_value)
 
             exchange = await channel.declare_exchange(
@@ -231,7 +363,14 @@ class RabbitMQClient(RabbitMQClientBase):
 
             _consumer_tag = await self._get_consumer_tag(exchange_name)
             await queue.consume(
-                partial(_on_message, message_handler, unexpected_error_max_attempts),
+                _MessageConsumer(
+                    exchange_name,
+                    message_handler,
+                    unexpected_error_max_attempts,
+                    max_concurrency=max_concurrency,
+                    ordering_key=ordering_key,
+                    metrics=self._metrics,
+                ),
                 exclusive=exclusive_queue,
                 consumer_tag=_consumer_tag,
             )
@@ -299,6 +438,44 @@ class RabbitMQClient(RabbitMQClientBase):
             # NOTE: we force delete here
             await queue.delete(if_unused=False, if_empty=False)
 
+    async def _get_exchange(
+        self,
+        channel: aio_pika.abc.AbstractChannel,
+        exchange_name: str,
+        exchange_type: aio_pika.ExchangeType,
+    ) -> aio_pika.abc.AbstractExchange:
+        channel_exchanges = self._declared_exchanges.setdefault(channel, {})
+        exchange = channel_exchanges.get((exchange_name, exchange_type))
+        if exchange is None:
+            exchange = await channel.declare_exchange(
+                exchange_name,
+                exchange_type,
+                durable=True,
+                timeout=_DEFAULT_RABBITMQ_EXECUTION_TIMEOUT_S,
+            )
+            channel_exchanges[(exchange_name, exchange_type)] = exchange
+        return exchange
+
+    async def _publish_message(
+        self,
+        exchange: aio_pika.abc.AbstractExchange,
+        message: RabbitMessage,
+        *,
+        mode: str,
+    ) -> None:
+        # NOTE: the channels use publisher confirms, this returns once the broker confirmed the message
+        publish = exchange.publish(
+            aio_pika.Message(
+                message.body(), timestamp=datetime.datetime.now(datetime.timezone.utc)
+            ),
+            routing_key=message.routing_key() or "",
+        )
+        if self._metrics:
+            with self._metrics.observe_publish(exchange.name, mode=mode):
+                await publish
+        else:
+            await publish
+
     async def publish(self, exchange_name: str, message: RabbitMessage) -> None:
         """publish message in the exchange exchange_name.
         specifying a topic will use a TOPIC type of RabbitMQ Exchange instead of FANOUT
@@ -306,22 +483,62 @@ class RabbitMQClient(RabbitMQClientBase):
         NOTE: changing the type of Exchange will create issues if the name is not changed!
         """
         assert self._channel_pool  # nosec
-        topic = message.routing_key()
 
         async with self._channel_pool.acquire() as channel:
-            exchange = await channel.declare_exchange(
-                exchange_name,
-                aio_pika.ExchangeType.FANOUT
-                if topic is None
-                else aio_pika.ExchangeType.TOPIC,
-                durable=True,
-                timeout=_DEFAULT_RABBITMQ_EXECUTION_TIMEOUT_S,
+            exchange = await self._get_exchange(
+                channel, exchange_name, _get_exchange_type(message)
             )
-            await exchange.publish(
-                aio_pika.Message(message.body()),
-                routing_key=message.routing_key() or "",
+            await self._publish_message(exchange, message, mode="single")
+
+    async def publish_batch(
+        self, exchange_name: str, messages: Sequence[RabbitMessage]
+    ) -> None:
+        """publish messages in the exchange exchange_name (see ``publish``).
+        The messages are pipelined on a single channel: they are all sent
+        before waiting for their confirmations by the broker.
+
+        Raises:
+            the first error raised while publishing a message, the other messages are still published
+        """
+        if not messages:
+            return
+        assert self._channel_pool  # nosec
+
+        async with self._channel_pool.acquire() as channel:
+            exchanges = {
+                exchange_type: await self._get_exchange(
+                    channel, exchange_name, exchange_type
+                )
+                for exchange_type in {_get_exchange_type(m) for m in messages}
+            }
+            await asyncio.gather(
+                *(
+                    self._publish_message(
+                        exchanges[_get_exchange_type(message)], message, mode="batch"
+                    )
+                    for message in messages
+                )
             )
 
+    def create_outbox(
+        self,
+        *,
+        max_size: PositiveInt = _DEFAULT_OUTBOX_MAX_SIZE,
+        flush_size: PositiveInt = _DEFAULT_OUTBOX_FLUSH_SIZE,
+        flush_interval: datetime.timedelta = _DEFAULT_OUTBOX_FLUSH_INTERVAL,
+    ) -> RabbitMQOutbox:
+        """creates an outbox publishing its messages in batches with this client,
+        it must be started and stopped (which publishes the messages still waiting)
+        before closing this client
+        """
+        return RabbitMQOutbox(
+            self,
+            max_size=max_size,
+            flush_size=flush_size,
+            flush_interval=flush_interval,
+            metrics=self._metrics,
+        )
+
     async def unsubscribe_consumer(self, exchange_name: str):
         assert self._channel_pool  # nosec
         async with self._channel_pool.acquire() as channel:
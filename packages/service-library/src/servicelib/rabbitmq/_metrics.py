@@ -0,0 +1,118 @@
+import contextlib
+import datetime
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Final
+
+from prometheus_client import CollectorRegistry, Histogram
+
+_LATENCY_BUCKETS: Final[tuple[float, ...]] = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    float("inf"),
+)
+
+# NOTE: AMQP timestamps have a resolution of 1 second
+_LAG_BUCKETS: Final[tuple[float, ...]] = (
+    1,
+    2,
+    5,
+    10,
+    30,
+    60,
+    120,
+    300,
+    900,
+    float("inf"),
+)
+
+
+@dataclass(frozen=True)
+class RabbitMQMetrics:
+    publish_duration: Histogram
+    outbox_delay: Histogram
+    message_lag: Histogram
+    handler_duration: Histogram
+
+    @classmethod
+    def create(cls, registry: CollectorRegistry) -> "RabbitMQMetrics":
+        return cls(
+            publish_duration=Histogram(
+                name="rabbitmq_publish_duration_seconds",
+                documentation="Time needed to publish a message until it is confirmed by the broker",
+                labelnames=("exchange", "mode"),
+                buckets=_LATENCY_BUCKETS,
+                registry=registry,
+            ),
+            outbox_delay=Histogram(
+                name="rabbitmq_outbox_delay_seconds",
+                documentation="Time from putting a message in the outbox until it is confirmed by the broker",
+                labelnames=("exchange",),
+                buckets=_LATENCY_BUCKETS,
+                registry=registry,
+            ),
+            message_lag=Histogram(
+                name="rabbitmq_message_lag_seconds",
+                documentation="Time from publishing a message until its handler starts (1s resolution)",
+                labelnames=("exchange",),
+                buckets=_LAG_BUCKETS,
+                registry=registry,
+            ),
+            handler_duration=Histogram(
+                name="rabbitmq_message_handler_duration_seconds",
+                documentation="Time needed by the subscribed handler to process a message",
+                labelnames=("exchange",),
+                buckets=_LATENCY_BUCKETS,
+                registry=registry,
+            ),
+        )
+
+    @contextlib.contextmanager
+    def observe_publish(self, exchange_name: str, *, mode: str) -> Iterator[None]:
+        start = time.monotonic()
+        yield
+        self.publish_duration.labels(exchange=exchange_name, mode=mode).observe(
+            time.monotonic() - start
+        )
+
+    def observe_outbox_delay(self, exchange_name: str, *, put_at: float) -> None:
+        self.outbox_delay.labels(exchange=exchange_name).observe(
+            time.monotonic() - put_at
+        )
+
+    def observe_message_lag(
+        self, exchange_name: str, *, published_at: datetime.datetime | None
+    ) -> None:
+        if published_at is None:
+            return
+        if published_at.tzinfo is None:
+            published_at = published_at.replace(tzinfo=datetime.timezone.utc)
+        self.message_lag.labels(exchange=exchange_name).observe(
+            max(
+                0,
+                (
+                    datetime.datetime.now(datetime.timezone.utc) - published_at
+                ).total_seconds(),
+            )
+        )
+
+    @contextlib.contextmanager
+    def observe_handler(self, exchange_name: str) -> Iterator[None]:
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.handler_duration.labels(exchange=exchange_name).observe(
+                time.monotonic() - start
+            )
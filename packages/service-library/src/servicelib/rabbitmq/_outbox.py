@@ -0,0 +1,141 @@
+import asyncio
+import collections
+import contextlib
+import datetime
+import logging
+import time
+from typing import TYPE_CHECKING, Final, NamedTuple
+
+from pydantic import PositiveInt
+
+from ..logging_utils import log_catch
+from ._models import RabbitMessage
+
+if TYPE_CHECKING:
+    from ._client import RabbitMQClient
+    from ._metrics import RabbitMQMetrics
+
+_logger = logging.getLogger(__name__)
+
+_PUBLISH_RETRY_DELAY_S: Final[float] = 1
+_MAX_PUBLISH_ATTEMPTS: Final[int] = 3
+
+
+class _OutboxMessage(NamedTuple):
+    exchange_name: str
+    message: RabbitMessage
+    put_at: float
+
+
+class RabbitMQOutbox:
+    """Bounded in-process outbox publishing the messages in batches
+
+    - ``put`` waits while the outbox is full (back-pressure on the producers)
+    - the waiting messages are published once ``flush_size`` of them are waiting
+        or ``flush_interval`` after the first one was put
+    - ``stop`` publishes the messages still waiting
+
+    NOTE: a batch that failed to be published is retried, some of its messages
+    might then be published twice. It is dropped after 3 failed attempts.
+    """
+
+    def __init__(
+        self,
+        client: "RabbitMQClient",
+        *,
+        max_size: PositiveInt,
+        flush_size: PositiveInt,
+        flush_interval: datetime.timedelta,
+        metrics: "RabbitMQMetrics | None",
+    ) -> None:
+        self._client = client
+        self._queue: asyncio.Queue[_OutboxMessage] = asyncio.Queue(maxsize=max_size)
+        self._flush_size = flush_size
+        self._flush_interval_s = flush_interval.total_seconds()
+        self._metrics = metrics
+        self._batch: list[_OutboxMessage] = []
+        self._failed_attempts = 0
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(
+            self._publish_batches(), name=f"{self._client.client_name} outbox"
+        )
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        while not self._queue.empty():
+            self._batch.append(self._queue.get_nowait())
+        if self._batch:
+            with log_catch(_logger, reraise=False):
+                await self._publish(self._batch)
+            self._batch = []
+
+    async def put(self, exchange_name: str, message: RabbitMessage) -> None:
+        await self._queue.put(_OutboxMessage(exchange_name, message, time.monotonic()))
+
+    async def _fill_batch(self) -> None:
+        self._batch.append(await self._queue.get())
+        loop = asyncio.get_running_loop()
+        flush_time = loop.time() + self._flush_interval_s
+        while len(self._batch) < self._flush_size:
+            if not self._queue.empty():
+                self._batch.append(self._queue.get_nowait())
+                continue
+            if (timeout := flush_time - loop.time()) <= 0:
+                break
+            try:
+                self._batch.append(
+                    await asyncio.wait_for(self._queue.get(), timeout=timeout)
+                )
+            except asyncio.TimeoutError:
+                break
+
+    async def _publish(self, batch: list[_OutboxMessage]) -> None:
+        messages_per_exchange: dict[str, list[RabbitMessage]] = collections.defaultdict(
+            list
+        )
+        for outbox_message in batch:
+            messages_per_exchange[outbox_message.exchange_name].append(
+                outbox_message.message
+            )
+        await asyncio.gather(
+            *(
+                self._client.publish_batch(exchange_name, messages)
+                for exchange_name, messages in messages_per_exchange.items()
+            )
+        )
+        if self._metrics:
+            for outbox_message in batch:
+                self._metrics.observe_outbox_delay(
+                    outbox_message.exchange_name, put_at=outbox_message.put_at
+                )
+
+    async def _publish_batches(self) -> None:
+        while True:
+            if not self._batch:
+                await self._fill_batch()
+            try:
+                await self._publish(self._batch)
+            except Exception:  # pylint: disable=broad-exception-caught
+                self._failed_attempts += 1
+                if self._failed_attempts < _MAX_PUBLISH_ATTEMPTS:
+                    _logger.warning(
+                        "Publishing %s messages from the outbox failed [%s/%s], retrying in %ss",
+                        len(self._batch),
+                        self._failed_attempts,
+                        _MAX_PUBLISH_ATTEMPTS,
+                        _PUBLISH_RETRY_DELAY_S,
+                    )
+                    await asyncio.sleep(_PUBLISH_RETRY_DELAY_S)
+                    continue
+                _logger.exception(
+                    "Dropping %s messages from the outbox that could not be published",
+                    len(self._batch),
+                )
+            self._failed_attempts = 0
+            self._batch = []
@@ -6,6 +6,7 @@
 
 
 import asyncio
+import datetime
 from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 from typing import Any, Final
@@ -712,3 +713,153 @@ async def test_unsubscribe_consumer(
     await client.unsubscribe(exchange_name)
     with pytest.raises(aio_pika.exceptions.ChannelNotFoundEntity):
         await client.unsubscribe(exchange_name)
+
+
+async def test_rabbit_client_publish_declares_exchange_once(
+    create_rabbitmq_client: Callable[[str], RabbitMQClient],
+    random_exchange_name: Callable[[], str],
+    mocked_message_parser: mock.AsyncMock,
+    random_rabbit_message: Callable[..., PytestRabbitMessage],
+    mocker: MockerFixture,
+):
+    consumer = create_rabbitmq_client("consumer")
+    publisher = create_rabbitmq_client("publisher")
+    exchange_name = random_exchange_name()
+    await consumer.subscribe(exchange_name, mocked_message_parser)
+
+    declare_exchange_spy = mocker.spy(
+        aio_pika.robust_channel.RobustChannel, "declare_exchange"
+    )
+    messages = [random_rabbit_message() for _ in range(3)]
+    for message in messages:
+        await publisher.publish(exchange_name, message)
+    await _assert_message_received(mocked_message_parser, 3, messages[-1])
+    declare_exchange_spy.assert_called_once()
+    assert declare_exchange_spy.call_args.args[1] == exchange_name
+
+
+@pytest.mark.parametrize("topics", _TOPICS)
+async def test_rabbit_client_publish_batch(
+    create_rabbitmq_client: Callable[[str], RabbitMQClient],
+    random_exchange_name: Callable[[], str],
+    mocked_message_parser: mock.AsyncMock,
+    random_rabbit_message: Callable[..., PytestRabbitMessage],
+    topics: list[str] | None,
+):
+    consumer = create_rabbitmq_client("consumer")
+    publisher = create_rabbitmq_client("publisher")
+    exchange_name = random_exchange_name()
+    await consumer.subscribe(
+        exchange_name, mocked_message_parser, topics=topics and [BIND_TO_ALL_TOPICS]
+    )
+
+    await publisher.publish_batch(exchange_name, [])
+    messages = [
+        random_rabbit_message(topic=topic)
+        for topic in (topics or [None])
+        for _ in range(10)
+    ]
+    await publisher.publish_batch(exchange_name, messages)
+    await _assert_message_received(mocked_message_parser, len(messages), messages[-1])
+    assert {call.args[0] for call in mocked_message_parser.call_args_list} == {
+        message.message.encode() for message in messages
+    }
+
+
+async def test_rabbit_client_outbox(
+    create_rabbitmq_client: Callable[[str], RabbitMQClient],
+    random_exchange_name: Callable[[], str],
+    mocked_message_parser: mock.AsyncMock,
+    random_rabbit_message: Callable[..., PytestRabbitMessage],
+):
+    consumer = create_rabbitmq_client("consumer")
+    publisher = create_rabbitmq_client("publisher")
+    exchange_name = random_exchange_name()
+    await consumer.subscribe(exchange_name, mocked_message_parser)
+
+    outbox = publisher.create_outbox(
+        max_size=5, flush_size=3, flush_interval=datetime.timedelta(seconds=0.1)
+    )
+    await outbox.start()
+    # the outbox is flushed on size and on time
+    messages = [random_rabbit_message() for _ in range(10)]
+    for message in messages:
+        await outbox.put(exchange_name, message)
+    await _assert_message_received(mocked_message_parser, len(messages), messages[-1])
+
+    # the waiting messages are published when stopping
+    await outbox.put(exchange_name, last_message := random_rabbit_message())
+    await outbox.stop()
+    await _assert_message_received(
+        mocked_message_parser, len(messages) + 1, last_message
+    )
+
+
+@pytest.mark.parametrize("max_concurrency", [1, 4])
+async def test_subscribe_with_max_concurrency(
+    create_rabbitmq_client: Callable[[str], RabbitMQClient],
+    random_exchange_name: Callable[[], str],
+    random_rabbit_message: Callable[..., PytestRabbitMessage],
+    max_concurrency: int,
+):
+    consumer = create_rabbitmq_client("consumer")
+    publisher = create_rabbitmq_client("publisher")
+    exchange_name = random_exchange_name()
+
+    running_handlers = 0
+    max_running_handlers = 0
+
+    async def _slow_message_handler(data: bytes) -> bool:
+        nonlocal running_handlers, max_running_handlers
+        running_handlers += 1
+        max_running_handlers = max(max_running_handlers, running_handlers)
+        await asyncio.sleep(0.2)
+        running_handlers -= 1
+        return True
+
+    mocked_message_parser = mock.AsyncMock(side_effect=_slow_message_handler)
+    await consumer.subscribe(
+        exchange_name, mocked_message_parser, max_concurrency=max_concurrency
+    )
+    messages = [random_rabbit_message() for _ in range(8)]
+    await publisher.publish_batch(exchange_name, messages)
+    await _assert_message_received(mocked_message_parser, len(messages))
+    assert max_running_handlers == max_concurrency
+
+
+async def test_subscribe_with_ordering_key(
+    create_rabbitmq_client: Callable[[str], RabbitMQClient],
+    random_exchange_name: Callable[[], str],
+    random_rabbit_message: Callable[..., PytestRabbitMessage],
+    faker: Faker,
+):
+    consumer = create_rabbitmq_client("consumer")
+    publisher = create_rabbitmq_client("publisher")
+    exchange_name = random_exchange_name()
+
+    received: dict[str, list[int]] = {}
+
+    async def _message_handler(data: bytes) -> bool:
+        key, index = data.decode().split(":")
+        # random handling times would reorder the messages of a key if not ordered
+        await asyncio.sleep(faker.pyfloat(min_value=0, max_value=0.1))
+        received.setdefault(key, []).append(int(index))
+        return True
+
+    mocked_message_parser = mock.AsyncMock(side_effect=_message_handler)
+    await consumer.subscribe(
+        exchange_name,
+        mocked_message_parser,
+        max_concurrency=10,
+        ordering_key=lambda data: data.split(b":")[0],
+    )
+    keys = ["project_a", "project_b", "project_c"]
+    messages = [
+        random_rabbit_message(message=f"{key}:{index}")
+        for index in range(10)
+        for key in keys
+    ]
+    for message in messages:
+        await publisher.publish(exchange_name, message)
+    await _assert_message_received(mocked_message_parser, len(messages))
+    assert received == {key: list(range(10)) for key in keys}
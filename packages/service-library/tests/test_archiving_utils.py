@@ -11,6 +11,7 @@ import random
 import secrets
 import string
 import tempfile
+import zipfile
 from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
@@ -21,7 +22,13 @@ from faker import Faker
 from pydantic import ByteSize, parse_obj_as
 from pytest_benchmark.plugin import BenchmarkFixture
 from servicelib import archiving_utils
-from servicelib.archiving_utils import ArchiveError, archive_dir, unarchive_dir
+from servicelib.archiving_utils import (
+    ArchiveError,
+    ArchiveStream,
+    archive_dir,
+    cpu_based_max_workers,
+    unarchive_dir,
+)
 
 from .test_utils import print_tree
 
@@ -105,16 +112,16 @@ def __raise_error(*arts, **kwargs) -> None:
 
 
 @pytest.fixture
-def zipfile_single_file_extract_worker_raises_error() -> Iterator[None]:
+def zipfile_batch_extract_worker_raises_error() -> Iterator[None]:
     # NOTE: cannot MagicMock cannot be serialized via pickle used by
     # multiprocessing, also `__raise_error` cannot be defined in the
     # context fo this function or it cannot be pickled
 
     # pylint: disable=protected-access
-    old_func = archiving_utils._zipfile_single_file_extract_worker
-    archiving_utils._zipfile_single_file_extract_worker = __raise_error
+    old_func = archiving_utils._zipfile_batch_extract_worker
+    archiving_utils._zipfile_batch_extract_worker = __raise_error
     yield
-    archiving_utils._zipfile_single_file_extract_worker = old_func
+    archiving_utils._zipfile_batch_extract_worker = old_func
 
 
 # UTILS
@@ -323,6 +330,71 @@ async def test_archive_unarchive_same_structure_dir(
     )
 
 
+@pytest.mark.parametrize("compress", [True, False])
+async def test_archive_dir_in_parallel(
+    dir_with_random_content: Path,
+    tmp_path: Path,
+    compress: bool,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(archiving_utils, "_PARALLEL_ARCHIVING_MIN_SIZE", 0)
+    # files are split in several pieces and batched
+    monkeypatch.setattr(archiving_utils, "_ARCHIVING_PIECE_SIZE", 1000)
+    monkeypatch.setattr(archiving_utils, "_ARCHIVING_BATCH_SIZE", 5000)
+    monkeypatch.setattr(archiving_utils, "_ARCHIVING_MAX_INLINE_SIZE", 500)
+    (dir_with_random_content / "big_file.bin").write_bytes(os.urandom(10500))
+    (dir_with_random_content / "empty_file.bin").touch()
+
+    archive_file = tmp_path / "archive.zip"
+    await archive_dir(
+        dir_to_compress=dir_with_random_content,
+        destination=archive_file,
+        store_relative_path=True,
+        compress=compress,
+        max_workers=2,
+    )
+    with zipfile.ZipFile(archive_file) as zip_file:
+        assert zip_file.testzip() is None
+    # the temporary files are removed
+    assert list(tmp_path.iterdir()) == [archive_file]
+
+    destination = tmp_path / "unarchived"
+    destination.mkdir()
+    await unarchive_dir(archive_to_extract=archive_file, destination_folder=destination)
+    await assert_same_directory_content(dir_with_random_content, destination, None)
+
+
+async def test_unarchive_dir_in_batches(
+    dir_with_random_content: Path,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    # members are grouped in several batches and read in several chunks
+    monkeypatch.setattr(archiving_utils, "_UNARCHIVING_BATCH_MAX_FILES", 3)
+    monkeypatch.setattr(archiving_utils, "_UNARCHIVING_BATCH_SIZE", 1000)
+    monkeypatch.setattr(archiving_utils, "_UNARCHIVING_BUFFER_SIZE", 7)
+
+    archive_file = tmp_path / "archive.zip"
+    await archive_dir(
+        dir_to_compress=dir_with_random_content,
+        destination=archive_file,
+        store_relative_path=True,
+        compress=True,
+    )
+    destination = tmp_path / "unarchived"
+    destination.mkdir()
+    unarchived_paths = await unarchive_dir(
+        archive_to_extract=archive_file, destination_folder=destination, max_workers=2
+    )
+    assert_unarchived_paths(
+        unarchived_paths,
+        src_dir=dir_with_random_content,
+        dst_dir=destination,
+        is_saved_as_relpath=True,
+    )
+    await assert_same_directory_content(dir_with_random_content, destination, None)
+
+
 @pytest.mark.parametrize(
     "compress,store_relative_path",
     itertools.product([True, False], repeat=2),
@@ -519,7 +591,7 @@ async def test_archive_unarchive_check_exclude(
 
 
 async def test_unarchive_dir_raises_error(
-    zipfile_single_file_extract_worker_raises_error: None,
+    zipfile_batch_extract_worker_raises_error: None,
     dir_with_random_content: Path,
     tmp_path: Path,
 ):
@@ -542,11 +614,63 @@ async def test_unarchive_dir_raises_error(
         await archiving_utils.unarchive_dir(archive_file, temp_dir_two)
 
 
+@pytest.mark.parametrize("store_relative_path", [True, False])
+@pytest.mark.parametrize("part_size", [1, 7, 1024 * 1024])
+async def test_archive_stream_unarchive_same_structure_dir(
+    dir_with_random_content: Path,
+    tmp_path: Path,
+    store_relative_path: bool,
+    part_size: int,
+):
+    archive_file = tmp_path / "archive.zip"
+    with ArchiveStream(
+        dir_with_random_content, store_relative_path=store_relative_path
+    ) as archive_stream, archive_file.open("wb") as f:
+        # read in consecutive parts like a multipart upload does
+        for offset in range(0, archive_stream.archive_size, part_size):
+            archive_stream.seek(offset)
+            f.write(archive_stream.read(part_size))
+        assert archive_stream.read(part_size) == b""
+    assert archive_file.stat().st_size == archive_stream.archive_size
+
+    destination = tmp_path / "unarchived"
+    destination.mkdir()
+    unarchived_paths: set[Path] = await unarchive_dir(
+        archive_to_extract=archive_file, destination_folder=destination
+    )
+    assert_unarchived_paths(
+        unarchived_paths,
+        src_dir=dir_with_random_content,
+        dst_dir=destination,
+        is_saved_as_relpath=store_relative_path,
+    )
+    await assert_same_directory_content(
+        dir_with_random_content,
+        destination,
+        None if store_relative_path else dir_with_random_content,
+    )
+
+
+async def test_archive_stream_raises_if_files_change(
+    dir_with_random_content: Path,
+):
+    with ArchiveStream(
+        dir_with_random_content, store_relative_path=True
+    ) as archive_stream:
+        # NOTE: the stream only buffers a few chunks ahead of the reader,
+        # the last file is not yet archived
+        a_file = [p for p in dir_with_random_content.rglob("*") if p.is_file()][-1]
+        a_file.write_bytes(a_file.read_bytes() + b"changed")
+
+        with pytest.raises(ArchiveError, match="changed while being archived"):
+            archive_stream.read(archive_stream.archive_size)
+
+
 file_suffix = 0
 
 
 async def _archive_dir_performance(
-    input_path: Path, destination_path: Path, compress: bool
+    input_path: Path, destination_path: Path, compress: bool, max_workers: int
 ):
     global file_suffix  # pylint: disable=global-statement
 
@@ -555,13 +679,20 @@ async def _archive_dir_performance(
         destination_path / f"archive_{file_suffix}.zip",
         compress=compress,
         store_relative_path=True,
+        max_workers=max_workers,
     )
     file_suffix += 1
 
 
 @pytest.mark.skip(reason="manual testing")
+@pytest.mark.parametrize("max_workers", [1, os.cpu_count()])
+@pytest.mark.parametrize("compress", [True, False])
 @pytest.mark.parametrize(
-    "compress, file_size, num_files", [(False, parse_obj_as(ByteSize, "1Mib"), 10000)]
+    "file_size, num_files",
+    [
+        pytest.param(parse_obj_as(ByteSize, "1Mib"), 10000, id="many-small-files"),
+        pytest.param(parse_obj_as(ByteSize, "1Gib"), 4, id="few-large-files"),
+    ],
 )
 def test_archive_dir_performance(
     benchmark: BenchmarkFixture,
@@ -570,6 +701,7 @@ def test_archive_dir_performance(
     compress: bool,
     file_size: ByteSize,
     num_files: int,
+    max_workers: int,
 ):
     # create a bunch of different files
     files_to_compress = [
@@ -587,7 +719,13 @@ def test_archive_dir_performance(
 
     def run_async_test(*args, **kwargs):
         asyncio.get_event_loop().run_until_complete(
-            _archive_dir_performance(parent_path, destination_path, compress)
+            _archive_dir_performance(
+                parent_path, destination_path, compress, max_workers
+            )
         )
 
     benchmark(run_async_test)
+
+
+def test_cpu_based_max_workers():
+    assert 1 <= cpu_based_max_workers() <= (os.cpu_count() or 1)
@@ -1,9 +1,19 @@
+import asyncio
 import warnings
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Final
 
 from aiohttp import ClientSession, ClientTimeout, TCPConnector
 
 from ..config.http_clients import client_request_settings
 
+# NOTE: connections to S3 are kept alive for less than its idle timeout (~20s on AWS)
+_UPLOAD_CONNECTIONS_KEEPALIVE_TIMEOUT_S: Final[float] = 5
+_UPLOAD_CONNECTIONS_LIMIT: Final[int] = 64
+_UPLOAD_DNS_CACHE_TTL_S: Final[int] = 5 * 60
+
 
 class ClientSessionContextManager:
     #
@@ -38,3 +48,48 @@ class ClientSessionContextManager:
                 category=DeprecationWarning,
             )
             await self.active_session.close()
+
+
+@dataclass
+class _SharedUploadSession:
+    session: ClientSession
+    users: int = 0
+
+
+_shared_upload_sessions: dict[asyncio.AbstractEventLoop, _SharedUploadSession] = {}
+
+
+@asynccontextmanager
+async def shared_upload_session() -> AsyncIterator[ClientSession]:
+    """session to upload to presigned links, shared by all the concurrent uploads of the event loop
+
+    The connections are kept alive and reused by the parts of the uploads,
+    the session is closed once the last upload using it is done.
+    """
+    loop = asyncio.get_running_loop()
+    shared = _shared_upload_sessions.get(loop)
+    if shared is None:
+        shared = _SharedUploadSession(
+            session=ClientSession(
+                connector=TCPConnector(
+                    limit=_UPLOAD_CONNECTIONS_LIMIT,
+                    keepalive_timeout=_UPLOAD_CONNECTIONS_KEEPALIVE_TIMEOUT_S,
+                    ttl_dns_cache=_UPLOAD_DNS_CACHE_TTL_S,
+                    enable_cleanup_closed=True,
+                ),
+                timeout=ClientTimeout(
+                    total=None,
+                    connect=client_request_settings.HTTP_CLIENT_REQUEST_AIOHTTP_CONNECT_TIMEOUT,
+                    sock_connect=client_request_settings.HTTP_CLIENT_REQUEST_AIOHTTP_SOCK_CONNECT_TIMEOUT,
+                ),
+            )
+        )
+        _shared_upload_sessions[loop] = shared
+    shared.users += 1
+    try:
+        yield shared.session
+    finally:
+        shared.users -= 1
+        if shared.users == 0:
+            del _shared_upload_sessions[loop]
+            await shared.session.close()
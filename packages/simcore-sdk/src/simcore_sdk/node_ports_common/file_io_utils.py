@@ -1,8 +1,12 @@
 import asyncio
+import dataclasses
 import json
 import logging
-from collections.abc import AsyncGenerator, Coroutine
-from contextlib import AsyncExitStack
+import os
+import tempfile
+import time
+from collections.abc import AsyncGenerator, Coroutine, Iterator
+from contextlib import AsyncExitStack, ExitStack
 from dataclasses import dataclass
 from pathlib import Path
 from typing import IO, Any, Final, Protocol, runtime_checkable
@@ -20,11 +24,10 @@ from aiohttp import (
 from aiohttp.typedefs import LooseHeaders
 from models_library.api_schemas_storage import ETag, FileUploadSchema, UploadedPart
 from models_library.basic_types import SHA256Str
-from pydantic import AnyUrl, NonNegativeInt
+from pydantic import AnyUrl, ByteSize, NonNegativeInt
 from servicelib.aiohttp import status
 from servicelib.logging_utils import log_catch
 from servicelib.progress_bar import ProgressBarData
-from servicelib.utils import logged_gather, partition_gen
 from tenacity._asyncio import AsyncRetrying
 from tenacity.after import after_log
 from tenacity.before_sleep import before_sleep_log
@@ -40,7 +43,9 @@ from .constants import CHUNK_SIZE
 
 _logger = logging.getLogger(__name__)
 
-_CONCURRENT_MULTIPART_UPLOADS_COUNT: Final[NonNegativeInt] = 10
+_MAX_CONCURRENT_UPLOAD_PARTS: Final[NonNegativeInt] = 8
+# NOTE: larger parts of forward-only file objects are spooled to disk
+_MAX_IN_MEMORY_SPOOLED_PART_SIZE: Final[NonNegativeInt] = 16 * 1024 * 1024
 _VALID_HTTP_STATUS_CODES: Final[NonNegativeInt] = 299
 
 
@@ -119,16 +124,21 @@ async def _file_object_chunk_reader(
 
 
 async def _file_chunk_reader(
-    file: Path, *, offset: int, total_bytes_to_read: int
+    file_descriptor: int, *, offset: int, total_bytes_to_read: int
 ) -> AsyncGenerator[bytes, None]:
-    async with aiofiles.open(file, "rb") as f:
-        await f.seek(offset)
-        num_read_bytes = 0
-        while chunk := await f.read(
-            min(CHUNK_SIZE, total_bytes_to_read - num_read_bytes)
-        ):
-            num_read_bytes += len(chunk)
-            yield chunk
+    # NOTE: positional reads, the parts share the file descriptor
+    num_read_bytes = 0
+    while num_read_bytes < total_bytes_to_read and (
+        chunk := await asyncio.get_event_loop().run_in_executor(
+            None,
+            os.pread,
+            file_descriptor,
+            min(CHUNK_SIZE, total_bytes_to_read - num_read_bytes),
+            offset + num_read_bytes,
+        )
+    ):
+        num_read_bytes += len(chunk)
+        yield chunk
 
 
 @dataclass(frozen=True)
@@ -271,9 +281,93 @@ async def _session_put(
         return etag
 
 
+@dataclass
+class _UploadStats:
+    num_parts: int = 0
+    num_bytes: int = 0
+    num_retries: int = 0
+    parts_duration_s: float = 0
+    slowest_part_throughput: float | None = None
+
+    def add_part(self, part_size: int, duration_s: float, num_retries: int) -> None:
+        self.num_parts += 1
+        self.num_bytes += part_size
+        self.num_retries += num_retries
+        self.parts_duration_s += duration_s
+        throughput = part_size / duration_s if duration_s > 0 else None
+        if throughput is not None and (
+            self.slowest_part_throughput is None
+            or throughput < self.slowest_part_throughput
+        ):
+            self.slowest_part_throughput = throughput
+
+    def __str__(self) -> str:
+        def _throughput(value: float | None) -> str:
+            return f"{ByteSize(int(value)).human_readable()}/s" if value else "n/a"
+
+        return (
+            f"{self.num_parts} part(s) of {ByteSize(self.num_bytes).human_readable()}, "
+            f"average part throughput {_throughput(self.num_bytes / self.parts_duration_s if self.parts_duration_s else None)}, "
+            f"slowest part throughput {_throughput(self.slowest_part_throughput)}, "
+            f"{self.num_retries} retries"
+        )
+
+
+def _get_file_part_reader(
+    file_to_upload: int | UploadableFileObject, *, offset: int, part_size: int
+) -> AsyncGenerator[bytes, None]:
+    if isinstance(file_to_upload, UploadableFileObject):
+        return _file_object_chunk_reader(
+            file_to_upload.file_object, offset=offset, total_bytes_to_read=part_size
+        )
+    return _file_chunk_reader(
+        file_to_upload, offset=offset, total_bytes_to_read=part_size
+    )
+
+
+def _is_rereadable(file_to_upload: int | UploadableFileObject) -> bool:
+    return (
+        not isinstance(file_to_upload, UploadableFileObject)
+        or file_to_upload.file_object.seekable()
+    )
+
+
+async def _spool_file_part(
+    file_to_upload: UploadableFileObject, *, offset: int, part_size: int
+) -> UploadableFileObject:
+    """copies the next part of a forward-only file object (e.g. a stream), so that
+    it can be read again when its upload is retried"""
+
+    def _copy() -> IO:
+        file_object = file_to_upload.file_object
+        if file_object.tell() != offset:
+            msg = f"{file_to_upload.file_name} cannot be read from {offset=}"
+            raise exceptions.S3TransferError(msg)
+        spooled_part = tempfile.SpooledTemporaryFile(  # noqa: SIM115
+            max_size=_MAX_IN_MEMORY_SPOOLED_PART_SIZE
+        )
+        try:
+            copied_bytes = 0
+            while copied_bytes < part_size and (
+                chunk := file_object.read(min(CHUNK_SIZE, part_size - copied_bytes))
+            ):
+                spooled_part.write(chunk)
+                copied_bytes += len(chunk)
+            spooled_part.seek(0)
+        except BaseException:
+            spooled_part.close()
+            raise
+        return spooled_part
+
+    spooled_part = await asyncio.get_event_loop().run_in_executor(None, _copy)
+    return dataclasses.replace(
+        file_to_upload, file_object=spooled_part, file_size=part_size
+    )
+
+
 async def _upload_file_part(
     session: ClientSession,
-    file_to_upload: Path | UploadableFileObject,
+    file_to_upload: int | UploadableFileObject,
     part_index: int,
     file_offset: int,
     file_part_size: int,
@@ -283,40 +377,49 @@ async def _upload_file_part(
     *,
     io_log_redirect_cb: LogRedirectCB | None,
     progress_bar: ProgressBarData,
+    upload_stats: _UploadStats,
 ) -> tuple[int, ETag]:
-    file_uploader = _file_chunk_reader(
-        file_to_upload,  # type: ignore
-        offset=file_offset,
-        total_bytes_to_read=file_part_size,
-    )
-    if isinstance(file_to_upload, UploadableFileObject):
-        file_uploader = _file_object_chunk_reader(
-            file_to_upload.file_object,
-            offset=file_offset,
-            total_bytes_to_read=file_part_size,
-        )
-
-    async for attempt in AsyncRetrying(
-        reraise=True,
-        wait=wait_exponential(min=1, max=10),
-        stop=stop_after_attempt(num_retries),
-        retry=retry_if_exception_type(ClientConnectionError)
-        | retry_if_exception(_check_for_aws_http_errors),
-        before_sleep=before_sleep_log(_logger, logging.WARNING, exc_info=True),
-        after=after_log(_logger, log_level=logging.ERROR),
-    ):
-        with attempt:
-            received_e_tag = await _session_put(
-                session=session,
-                file_part_size=file_part_size,
-                upload_url=upload_url,
-                pbar=pbar,
-                io_log_redirect_cb=io_log_redirect_cb,
-                progress_bar=progress_bar,
-                file_uploader=file_uploader,
+    """
+    file_to_upload: the descriptor of the file or the file object
+    """
+    start = time.monotonic()
+    with ExitStack() as stack:
+        if not _is_rereadable(file_to_upload):
+            assert isinstance(file_to_upload, UploadableFileObject)  # nosec
+            file_to_upload = await _spool_file_part(
+                file_to_upload, offset=file_offset, part_size=file_part_size
             )
-            return (part_index, received_e_tag)
-    msg = f"Unexpected error while transferring {file_to_upload} to {upload_url}"
+            stack.callback(file_to_upload.file_object.close)
+            file_offset = 0
+        async for attempt in AsyncRetrying(
+            reraise=True,
+            wait=wait_exponential(min=1, max=10),
+            stop=stop_after_attempt(num_retries),
+            retry=retry_if_exception_type(ClientConnectionError)
+            | retry_if_exception(_check_for_aws_http_errors),
+            before_sleep=before_sleep_log(_logger, logging.WARNING, exc_info=True),
+            after=after_log(_logger, log_level=logging.ERROR),
+        ):
+            with attempt:
+                # NOTE: every attempt reads the part from its beginning
+                received_e_tag = await _session_put(
+                    session=session,
+                    file_part_size=file_part_size,
+                    upload_url=upload_url,
+                    pbar=pbar,
+                    io_log_redirect_cb=io_log_redirect_cb,
+                    progress_bar=progress_bar,
+                    file_uploader=_get_file_part_reader(
+                        file_to_upload, offset=file_offset, part_size=file_part_size
+                    ),
+                )
+                upload_stats.add_part(
+                    file_part_size,
+                    time.monotonic() - start,
+                    attempt.retry_state.attempt_number - 1,
+                )
+                return (part_index, received_e_tag)
+    msg = f"Unexpected error while transferring part {part_index + 1} to {upload_url}"
     raise exceptions.S3TransferError(msg)
 
 
@@ -333,34 +436,57 @@ def _get_file_size_and_name(
     return file_size, file_name
 
 
-async def _process_batch(
+async def _upload_parts(
     *,
-    upload_tasks: list[Coroutine],
+    upload_tasks: Iterator[Coroutine],
     max_concurrency: int,
     file_name: str,
     file_size: int,
     file_chunk_size: int,
     last_chunk_size: int,
 ) -> list[UploadedPart]:
+    """uploads the parts keeping max_concurrency of them in flight,
+    stops at the first part that fails (after its retries)
+    """
     results: list[UploadedPart] = []
-    try:
-        upload_results = await logged_gather(
-            *upload_tasks, log=_logger, max_concurrency=max_concurrency
-        )
+    in_flight: set[asyncio.Task] = set()
 
-        for i, e_tag in upload_results:
-            results.append(UploadedPart(number=i + 1, e_tag=e_tag))
+    def _start_next_upload() -> None:
+        if (upload_task := next(upload_tasks, None)) is not None:
+            in_flight.add(asyncio.create_task(upload_task))
+
+    try:
+        for _ in range(max_concurrency):
+            _start_next_upload()
+        while in_flight:
+            done, in_flight = await asyncio.wait(
+                in_flight, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                i, e_tag = task.result()
+                results.append(UploadedPart(number=i + 1, e_tag=e_tag))
+                _start_next_upload()
     except _ExtendedClientResponseError as e:
         if e.status == status.HTTP_400_BAD_REQUEST and "RequestTimeout" in e.body:
             raise exceptions.AwsS3BadRequestRequestTimeoutError(e.body) from e
+        msg = (
+            f"Could not upload file {file_name} ({file_size=}, "
+            f"{file_chunk_size=}, {last_chunk_size=}):{e}"
+        )
+        raise exceptions.S3TransferError(msg) from e
     except ClientError as exc:
         msg = (
             f"Could not upload file {file_name} ({file_size=}, "
             f"{file_chunk_size=}, {last_chunk_size=}):{exc}"
         )
         raise exceptions.S3TransferError(msg) from exc
+    finally:
+        for task in in_flight:
+            task.cancel()
+        if in_flight:
+            await asyncio.wait(in_flight)
 
-    return results
+    return sorted(results, key=lambda part: part.number)
 
 
 async def upload_file_to_presigned_links(
@@ -376,13 +502,15 @@ async def upload_file_to_presigned_links(
 
     # NOTE: when the file object is already created it cannot be duplicated so
     # no concurrency is allowed in that case
-    max_concurrency: int = 4 if isinstance(file_to_upload, Path) else 1
+    max_concurrency: int = (
+        _MAX_CONCURRENT_UPLOAD_PARTS if isinstance(file_to_upload, Path) else 1
+    )
 
     file_chunk_size = int(file_upload_links.chunk_size)
     num_urls: int = len(file_upload_links.urls)
     last_chunk_size: int = file_size - file_chunk_size * (num_urls - 1)
+    upload_stats = _UploadStats()
 
-    results: list[UploadedPart] = []
     async with AsyncExitStack() as stack:
         tqdm_progress = stack.enter_context(
             tqdm_logging_redirect(
@@ -396,39 +524,36 @@ async def upload_file_to_presigned_links(
         sub_progress = await stack.enter_async_context(
             progress_bar.sub_progress(steps=file_size)
         )
+        file_to_read: int | UploadableFileObject = file_to_upload  # type: ignore[assignment]
+        if isinstance(file_to_upload, Path):
+            file_to_read = os.open(file_to_upload, os.O_RDONLY)
+            stack.callback(os.close, file_to_read)
 
-        indexed_urls: list[tuple[int, AnyUrl]] = list(enumerate(file_upload_links.urls))
-        for partition_of_indexed_urls in partition_gen(
-            indexed_urls, slice_size=_CONCURRENT_MULTIPART_UPLOADS_COUNT
-        ):
-            upload_tasks: list[Coroutine] = []
-            for index, upload_url in partition_of_indexed_urls:
-                this_file_chunk_size = (
+        upload_tasks = (
+            _upload_file_part(
+                session=session,
+                file_to_upload=file_to_read,
+                part_index=index,
+                file_offset=index * file_chunk_size,
+                file_part_size=(
                     file_chunk_size if (index + 1) < num_urls else last_chunk_size
-                )
-                upload_tasks.append(
-                    _upload_file_part(
-                        session=session,
-                        file_to_upload=file_to_upload,
-                        part_index=index,
-                        file_offset=index * file_chunk_size,
-                        file_part_size=this_file_chunk_size,
-                        upload_url=upload_url,
-                        pbar=tqdm_progress,
-                        num_retries=num_retries,
-                        io_log_redirect_cb=io_log_redirect_cb,
-                        progress_bar=sub_progress,
-                    )
-                )
-            results.extend(
-                await _process_batch(
-                    upload_tasks=upload_tasks,
-                    max_concurrency=max_concurrency,
-                    file_name=file_name,
-                    file_size=file_chunk_size,
-                    file_chunk_size=file_chunk_size,
-                    last_chunk_size=last_chunk_size,
-                )
+                ),
+                upload_url=upload_url,
+                pbar=tqdm_progress,
+                num_retries=num_retries,
+                io_log_redirect_cb=io_log_redirect_cb,
+                progress_bar=sub_progress,
+                upload_stats=upload_stats,
             )
-
+            for index, upload_url in enumerate(file_upload_links.urls)
+        )
+        results = await _upload_parts(
+            upload_tasks=upload_tasks,
+            max_concurrency=max_concurrency,
+            file_name=file_name,
+            file_size=file_size,
+            file_chunk_size=file_chunk_size,
+            last_chunk_size=last_chunk_size,
+        )
+    _logger.info("Uploaded %s: %s", file_name, upload_stats)
     return results
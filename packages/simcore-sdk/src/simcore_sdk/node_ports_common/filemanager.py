@@ -8,6 +8,7 @@ from aiohttp import ClientSession
 from models_library.api_schemas_storage import (
     ETag,
     FileMetaDataGet,
+    FileUploadLinksBatchItem,
     FileUploadSchema,
     LinkType,
     LocationID,
@@ -15,7 +16,7 @@ from models_library.api_schemas_storage import (
     UploadedPart,
 )
 from models_library.basic_types import SHA256Str
-from models_library.projects_nodes_io import StorageFileID
+from models_library.projects_nodes_io import SimcoreS3FileID, StorageFileID
 from models_library.users import UserID
 from pydantic import AnyUrl, ByteSize, parse_obj_as
 from servicelib.file_utils import create_sha256_checksum
@@ -30,9 +31,13 @@ from tenacity.stop import stop_after_attempt
 from tenacity.wait import wait_random_exponential
 from yarl import URL
 
-from ..node_ports_common.client_session_manager import ClientSessionContextManager
+from ..node_ports_common.client_session_manager import (
+    ClientSessionContextManager,
+    shared_upload_session,
+)
 from . import exceptions, r_clone, storage_client
 from ._filemanager import _abort_upload, _complete_upload, _resolve_location_id
+from .constants import SIMCORE_LOCATION
 from .file_io_utils import (
     LogRedirectCB,
     UploadableFileObject,
@@ -114,6 +119,76 @@ async def get_upload_links_from_s3(
         return (store_id, file_links)
 
 
+async def get_download_links_from_s3_batch(
+    *,
+    user_id: UserID,
+    s3_objects: list[SimcoreS3FileID],
+    link_type: LinkType,
+    client_session: ClientSession | None = None,
+) -> dict[SimcoreS3FileID, URL]:
+    """same as get_download_link_from_s3 for several files of the simcore location,
+    the links are created in a single call to storage
+
+    :raises exceptions.NodeportsException
+    :raises exceptions.S3InvalidPathError
+    :raises exceptions.StorageInvalidCall
+    :raises exceptions.StorageServerIssue
+    """
+    # NOTE: storage requires unique file IDs
+    s3_objects = list(dict.fromkeys(s3_objects))
+    if len(s3_objects) == 1:
+        return {
+            s3_objects[0]: await get_download_link_from_s3(
+                user_id=user_id,
+                store_name=None,
+                store_id=SIMCORE_LOCATION,
+                s3_object=s3_objects[0],
+                link_type=link_type,
+                client_session=client_session,
+            )
+        }
+    async with ClientSessionContextManager(client_session) as session:
+        file_links = await storage_client.get_download_file_links_batch(
+            session=session,
+            file_ids=s3_objects,
+            user_id=user_id,
+            link_type=link_type,
+        )
+        return {file_id: URL(f"{link}") for file_id, link in file_links.items()}
+
+
+async def get_upload_links_from_s3_batch(
+    *,
+    user_id: UserID,
+    files: list[FileUploadLinksBatchItem],
+    link_type: LinkType,
+    client_session: ClientSession | None = None,
+) -> dict[SimcoreS3FileID, FileUploadSchema]:
+    """same as get_upload_links_from_s3 for several files of the simcore location,
+    the links are created in a single call to storage
+    """
+    if len(files) == 1:
+        _, file_links = await get_upload_links_from_s3(
+            user_id=user_id,
+            store_name=None,
+            store_id=SIMCORE_LOCATION,
+            s3_object=files[0].file_id,
+            link_type=link_type,
+            client_session=client_session,
+            file_size=files[0].file_size,
+            is_directory=False,
+            sha256_checksum=files[0].sha256_checksum,
+        )
+        return {files[0].file_id: file_links}
+    async with ClientSessionContextManager(client_session) as session:
+        return await storage_client.get_upload_file_links_batch(
+            session=session,
+            files=files,
+            user_id=user_id,
+            link_type=link_type,
+        )
+
+
 async def download_path_from_s3(
     *,
     user_id: UserID,
@@ -290,11 +365,19 @@ async def upload_path(
     :raises exceptions.NodeportsException
     :return: stored id, S3 entity_tag
     """
+    # NOTE: a forward-only file object (e.g. a stream) cannot be uploaded again,
+    # its parts are nevertheless retried (SEE file_io_utils)
+    is_rereadable = (
+        not isinstance(path_to_upload, UploadableFileObject)
+        or path_to_upload.file_object.seekable()
+    )
     async for attempt in AsyncRetrying(
         reraise=True,
         wait=wait_random_exponential(),
         stop=stop_after_attempt(
             NodePortsSettings.create_from_envs().NODE_PORTS_400_REQUEST_TIMEOUT_ATTEMPTS
+            if is_rereadable
+            else 1
         ),
         retry=retry_if_exception_type(exceptions.AwsS3BadRequestRequestTimeoutError),
         before_sleep=before_sleep_log(_logger, logging.WARNING, exc_info=True),
@@ -421,14 +504,15 @@ async def _upload_to_s3(
             exclude_patterns=exclude_patterns,
         )
     else:
-        uploaded_parts = await upload_file_to_presigned_links(
-            session,
-            upload_links,
-            path_to_upload,
-            num_retries=NodePortsSettings.create_from_envs().NODE_PORTS_IO_NUM_RETRY_ATTEMPTS,
-            io_log_redirect_cb=io_log_redirect_cb,
-            progress_bar=progress_bar,
-        )
+        async with shared_upload_session() as upload_session:
+            uploaded_parts = await upload_file_to_presigned_links(
+                upload_session,
+                upload_links,
+                path_to_upload,
+                num_retries=NodePortsSettings.create_from_envs().NODE_PORTS_IO_NUM_RETRY_ATTEMPTS,
+                io_log_redirect_cb=io_log_redirect_cb,
+                progress_bar=progress_bar,
+            )
     # complete the upload
     e_tag = await _complete_upload(
         session,
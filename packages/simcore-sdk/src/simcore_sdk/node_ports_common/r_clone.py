@@ -2,12 +2,14 @@ import asyncio
 import logging
 import re
 import shlex
+import urllib.parse
 from asyncio.streams import StreamReader
 from collections.abc import AsyncIterator
-from contextlib import asynccontextmanager
+from contextlib import AsyncExitStack, asynccontextmanager
 from pathlib import Path
 from typing import Final
 
+import aiofiles
 from aiocache import cached
 from aiofiles import tempfile
 from pydantic import AnyUrl
@@ -17,6 +19,14 @@ from servicelib.utils import logged_gather
 from settings_library.r_clone import RCloneSettings
 from settings_library.utils_r_clone import get_r_clone_config
 
+from .r_clone_sync_manifest import (
+    SYNC_MANIFEST_FILE_NAME,
+    SyncManifest,
+    create_sync_manifest,
+    get_files_to_sync,
+    get_local_files,
+    parse_sync_manifest,
+)
 from .r_clone_utils import (
     BaseRCloneLogParser,
     CommandResultCaptureParser,
@@ -134,6 +144,69 @@ def _get_exclude_filters(exclude_patterns: set[str] | None) -> list[str]:
     return exclude_options
 
 
+async def _load_sync_manifest(
+    config_file_name: str, s3_config_key: str, s3_path: str
+) -> SyncManifest | None:
+    async with tempfile.TemporaryDirectory() as tmp_dir:
+        manifest_path = Path(tmp_dir) / SYNC_MANIFEST_FILE_NAME
+        try:
+            await _async_r_clone_command(
+                "rclone",
+                "--config",
+                config_file_name,
+                "--quiet",
+                "copyto",
+                shlex.quote(f"{s3_config_key}:{s3_path}/{SYNC_MANIFEST_FILE_NAME}"),
+                shlex.quote(f"{manifest_path}"),
+            )
+        except RCloneFailedError:
+            _logger.debug("No rclone sync manifest found in %s", s3_path)
+            return None
+        async with aiofiles.open(manifest_path) as f:
+            return parse_sync_manifest(await f.read())
+
+
+async def _delete_sync_manifest(
+    config_file_name: str, s3_config_key: str, s3_path: str
+) -> None:
+    await _async_r_clone_command(
+        "rclone",
+        "--config",
+        config_file_name,
+        "--quiet",
+        "deletefile",
+        shlex.quote(f"{s3_config_key}:{s3_path}/{SYNC_MANIFEST_FILE_NAME}"),
+    )
+
+
+async def _save_sync_manifest(
+    config_file_name: str, s3_config_key: str, manifest: SyncManifest
+) -> None:
+    async with tempfile.NamedTemporaryFile("w") as f:
+        await f.write(manifest.json())
+        await f.flush()
+        await _async_r_clone_command(
+            "rclone",
+            "--config",
+            config_file_name,
+            "--quiet",
+            "copyto",
+            shlex.quote(f"{f.name}"),
+            shlex.quote(
+                f"{s3_config_key}:{manifest.s3_path}/{SYNC_MANIFEST_FILE_NAME}"
+            ),
+        )
+
+
+@asynccontextmanager
+async def _files_from_file(files_to_sync: set[str]) -> AsyncIterator[str]:
+    async with tempfile.NamedTemporaryFile("w") as f:
+        await f.write("".join(f"{path}\n" for path in sorted(files_to_sync)))
+        await f.flush()
+        assert isinstance(f.name, str)  # nosec
+        yield f.name
+
+
 async def _sync_sources(
     r_clone_settings: RCloneSettings,
     progress_bar: ProgressBarData,
@@ -142,13 +215,59 @@ async def _sync_sources(
     destination: str,
     local_dir: Path,
     s3_config_key: str,
+    s3_path: str,
+    is_upload: bool,
     exclude_patterns: set[str] | None,
     debug_logs: bool,
 ) -> None:
     r_clone_config_file_content = get_r_clone_config(
         r_clone_settings, s3_config_key=s3_config_key
     )
-    async with _config_file(r_clone_config_file_content) as config_file_name:
+    async with _config_file(
+        r_clone_config_file_content
+    ) as config_file_name, progress_bar.sub_progress(
+        steps=100
+    ) as sub_progress, AsyncExitStack() as stack:
+        # NOTE: with the manifest of the last sync, only the changed files are passed to rclone
+        # otherwise rclone lists the whole remote and local directories to find them
+        manifest = await _load_sync_manifest(config_file_name, s3_config_key, s3_path)
+        local_files = await asyncio.get_event_loop().run_in_executor(
+            None, get_local_files, local_dir, exclude_patterns
+        )
+        # NOTE: a manifest copied with the data of another directory is not used
+        valid_manifest = (
+            manifest
+            if manifest
+            and urllib.parse.unquote(manifest.s3_path) == urllib.parse.unquote(s3_path)
+            else None
+        )
+        filter_options: list[str]
+        if valid_manifest and local_files is not None:
+            files_to_sync = get_files_to_sync(
+                valid_manifest, local_files, exclude_patterns
+            )
+            _logger.debug(
+                "%s file(s) changed since the last sync of %s",
+                len(files_to_sync),
+                s3_path,
+            )
+            if not files_to_sync:
+                return
+            filter_options = [
+                "--files-from-raw",
+                await stack.enter_async_context(_files_from_file(files_to_sync)),
+            ]
+        else:
+            filter_options = [
+                *_get_exclude_filters(exclude_patterns),
+                "--exclude",
+                f"/{SYNC_MANIFEST_FILE_NAME}",
+            ]
+
+        if is_upload and manifest:
+            # NOTE: an interrupted upload leaves no manifest, the next sync will be a full one
+            await _delete_sync_manifest(config_file_name, s3_config_key, s3_path)
+
         r_clone_command = (
             "rclone",
             "--config",
@@ -172,22 +291,35 @@ async def _sync_sources(
             shlex.quote(source),
             shlex.quote(destination),
             # filter options
-            *_get_exclude_filters(exclude_patterns),
+            *filter_options,
             "--progress",
             "--links",
             "--verbose",
         )
 
-        async with progress_bar.sub_progress(steps=100) as sub_progress:
-            r_clone_log_parsers: list[BaseRCloneLogParser] = (
-                [DebugLogParser()] if debug_logs else []
-            )
-            r_clone_log_parsers.append(SyncProgressLogParser(sub_progress))
+        r_clone_log_parsers: list[BaseRCloneLogParser] = (
+            [DebugLogParser()] if debug_logs else []
+        )
+        r_clone_log_parsers.append(SyncProgressLogParser(sub_progress))
 
-            await _async_r_clone_command(
-                *r_clone_command,
-                r_clone_log_parsers=r_clone_log_parsers,
-                cwd=f"{local_dir}",
+        await _async_r_clone_command(
+            *r_clone_command,
+            r_clone_log_parsers=r_clone_log_parsers,
+            cwd=f"{local_dir}",
+        )
+
+        if is_upload and local_files is not None:
+            # NOTE: the state of the local files before the upload is stored,
+            # files modified while uploading will be synced the next time
+            await _save_sync_manifest(
+                config_file_name,
+                s3_config_key,
+                create_sync_manifest(
+                    s3_path,
+                    local_files,
+                    previous_manifest=valid_manifest,
+                    exclude_patterns=exclude_patterns,
+                ),
             )
 
 
@@ -221,6 +353,8 @@ async def sync_local_to_s3(
         destination=f"{_S3_CONFIG_KEY_DESTINATION}:{upload_s3_path}",
         local_dir=local_directory_path,
         s3_config_key=_S3_CONFIG_KEY_DESTINATION,
+        s3_path=upload_s3_path,
+        is_upload=True,
         exclude_patterns=exclude_patterns,
         debug_logs=debug_logs,
     )
@@ -251,6 +385,8 @@ async def sync_s3_to_local(
         destination=f"{local_directory_path}",
         local_dir=local_directory_path,
         s3_config_key=_S3_CONFIG_KEY_SOURCE,
+        s3_path=download_s3_path,
+        is_upload=False,
         exclude_patterns=exclude_patterns,
         debug_logs=debug_logs,
     )
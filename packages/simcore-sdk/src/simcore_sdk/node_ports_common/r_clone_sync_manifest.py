@@ -0,0 +1,122 @@
+""" Manifest of the content of a directory as it was last synced with rclone
+
+The manifest is stored with the synced data (in the synced S3 prefix, excluded from the syncs).
+It allows to compute locally which files changed since the last sync and to pass only those
+to rclone (`--files-from`), instead of letting rclone list the whole remote prefix.
+
+As rclone, files are considered unchanged if their size and modification time are the same.
+"""
+
+import fnmatch
+import logging
+import os
+from pathlib import Path
+from typing import Final
+
+from pydantic import BaseModel, NonNegativeInt, ValidationError
+
+_logger = logging.getLogger(__name__)
+
+SYNC_MANIFEST_FILE_NAME: Final[str] = ".r_clone_sync_manifest.json"
+
+
+class SyncedFile(BaseModel):
+    size: NonNegativeInt
+    mtime_ns: NonNegativeInt
+
+
+class SyncManifest(BaseModel):
+    # path in S3 of the synced directory
+    s3_path: str
+    files: dict[str, SyncedFile]
+
+
+def parse_sync_manifest(content: str) -> SyncManifest | None:
+    try:
+        return SyncManifest.parse_raw(content)
+    except ValidationError as err:
+        _logger.warning("Ignoring invalid rclone sync manifest: %s", err)
+        return None
+
+
+def is_excluded(relative_path: str, exclude_patterns: set[str] | None) -> bool:
+    """same matching as the `--exclude` filters passed to rclone"""
+    for pattern in exclude_patterns or set():
+        if pattern.startswith("/"):
+            # anchored to the root of the synced directory
+            if fnmatch.fnmatchcase(relative_path, pattern[1:]):
+                return True
+        elif fnmatch.fnmatchcase(relative_path, pattern) or fnmatch.fnmatchcase(
+            relative_path, f"*/{pattern}"
+        ):
+            return True
+    return False
+
+
+def get_local_files(
+    local_directory_path: Path, exclude_patterns: set[str] | None
+) -> dict[str, SyncedFile] | None:
+    """
+    Returns the files in the directory, or None if it contains links
+    (rclone syncs them as `.rclonelink` files, which is not tracked by the manifest)
+
+    NOTE: blocking, walks the directory
+    """
+    local_files: dict[str, SyncedFile] = {}
+    directories = [local_directory_path] if local_directory_path.is_dir() else []
+    while directories:
+        with os.scandir(directories.pop()) as entries:
+            for entry in entries:
+                if entry.is_symlink():
+                    return None
+                if entry.is_dir():
+                    directories.append(Path(entry.path))
+                    continue
+                relative_path = os.path.relpath(entry.path, local_directory_path)
+                if relative_path == SYNC_MANIFEST_FILE_NAME or is_excluded(
+                    relative_path, exclude_patterns
+                ):
+                    continue
+                stat = entry.stat()
+                local_files[relative_path] = SyncedFile(
+                    size=stat.st_size, mtime_ns=stat.st_mtime_ns
+                )
+    return local_files
+
+
+def get_files_to_sync(
+    manifest: SyncManifest,
+    local_files: dict[str, SyncedFile],
+    exclude_patterns: set[str] | None,
+) -> set[str]:
+    """files that were added, modified or removed since the manifest was created"""
+    synced_files = {
+        relative_path: synced_file
+        for relative_path, synced_file in manifest.files.items()
+        if not is_excluded(relative_path, exclude_patterns)
+    }
+    return {
+        relative_path
+        for relative_path in synced_files.keys() | local_files.keys()
+        if synced_files.get(relative_path) != local_files.get(relative_path)
+    }
+
+
+def create_sync_manifest(
+    s3_path: str,
+    local_files: dict[str, SyncedFile],
+    *,
+    previous_manifest: SyncManifest | None,
+    exclude_patterns: set[str] | None,
+) -> SyncManifest:
+    """manifest of the remote after `local_files` were uploaded"""
+    # NOTE: excluded files are neither uploaded nor removed from the remote
+    files = {
+        relative_path: synced_file
+        for relative_path, synced_file in (
+            previous_manifest.files.items() if previous_manifest else []
+        )
+        if is_excluded(relative_path, exclude_patterns)
+    }
+    files.update(local_files)
+    return SyncManifest(s3_path=s3_path, files=files)
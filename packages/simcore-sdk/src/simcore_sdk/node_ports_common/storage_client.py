@@ -11,17 +11,24 @@ from aiohttp import ClientResponse, ClientSession
 from aiohttp import client as aiohttp_client_module
 from aiohttp.client_exceptions import ClientConnectionError, ClientResponseError
 from models_library.api_schemas_storage import (
+    FileDownloadLinksBatch,
+    FileDownloadLinksBatchBody,
     FileLocationArray,
     FileMetaDataGet,
+    FileUploadLinksBatch,
+    FileUploadLinksBatchBody,
+    FileUploadLinksBatchItem,
     FileUploadSchema,
     LinkType,
     LocationID,
     PresignedLink,
+    SimcoreS3FileID,
     StorageFileID,
 )
 from models_library.basic_types import SHA256Str
 from models_library.generics import Envelope
 from models_library.users import UserID
+from models_library.utils.fastapi_encoders import jsonable_encoder
 from pydantic import ByteSize
 from pydantic.networks import AnyUrl
 from servicelib.aiohttp import status
@@ -220,6 +227,66 @@ async def get_upload_file_links(
     return file_upload_links_enveloped.data
 
 
+@handle_client_exception
+async def get_download_file_links_batch(
+    *,
+    session: ClientSession,
+    file_ids: list[SimcoreS3FileID],
+    user_id: UserID,
+    link_type: LinkType,
+) -> dict[SimcoreS3FileID, AnyUrl]:
+    """same as get_download_file_link for several files of the simcore location
+
+    :raises exceptions.StorageInvalidCall
+    :raises exceptions.StorageServerIssue
+    """
+    async with retry_request(
+        session,
+        "POST",
+        f"{get_base_url()}/simcore-s3/files/links:batch-download",
+        expected_status=status.HTTP_200_OK,
+        params={"user_id": f"{user_id}", "link_type": link_type.value},
+        json=jsonable_encoder(FileDownloadLinksBatchBody(file_ids=file_ids)),
+    ) as response:
+        links_enveloped = Envelope[FileDownloadLinksBatch].parse_obj(
+            await response.json()
+        )
+    if links_enveloped.data is None:
+        msg = "Storage server is not responding"
+        raise exceptions.StorageServerIssue(msg)
+    return links_enveloped.data.links
+
+
+@handle_client_exception
+async def get_upload_file_links_batch(
+    *,
+    session: ClientSession,
+    files: list[FileUploadLinksBatchItem],
+    user_id: UserID,
+    link_type: LinkType,
+) -> dict[SimcoreS3FileID, FileUploadSchema]:
+    """same as get_upload_file_links for several files of the simcore location
+
+    :raises exceptions.StorageServerIssue
+    :raises ClientResponseError
+    """
+    async with retry_request(
+        session,
+        "POST",
+        f"{get_base_url()}/simcore-s3/files/links:batch-upload",
+        expected_status=status.HTTP_200_OK,
+        params={"user_id": f"{user_id}", "link_type": link_type.value},
+        json=jsonable_encoder(FileUploadLinksBatchBody(files=files)),
+    ) as response:
+        file_upload_links_enveloped = Envelope[FileUploadLinksBatch].parse_obj(
+            await response.json()
+        )
+    if file_upload_links_enveloped.data is None:
+        msg = "Storage server is not responding"
+        raise exceptions.StorageServerIssue(msg)
+    return file_upload_links_enveloped.data.uploads
+
+
 @handle_client_exception
 async def get_file_metadata(
     *,
@@ -14,7 +14,7 @@ from settings_library.r_clone import RCloneSettings
 
 from ..node_ports_common.dbmanager import DBManager
 from ..node_ports_common.exceptions import PortNotFound, UnboundPortError
-from ..node_ports_common.file_io_utils import LogRedirectCB
+from ..node_ports_common.file_io_utils import LogRedirectCB, UploadableFileObject
 from ..node_ports_v2.port import SetKWargs
 from .links import ItemConcreteValue, ItemValue
 from .port_utils import is_file_type
@@ -136,7 +136,10 @@ class Nodeports(BaseModel):
 
     async def set_multiple(
         self,
-        port_values: dict[PortKey, tuple[ItemConcreteValue | None, SetKWargs | None]],
+        port_values: dict[
+            PortKey,
+            tuple[ItemConcreteValue | UploadableFileObject | None, SetKWargs | None],
+        ],
         *,
         progress_bar: ProgressBarData,
     ) -> None:
@@ -16,6 +16,7 @@ from ..node_ports_common.exceptions import (
     InvalidItemTypeError,
     SymlinkToSymlinkIsNotUploadableException,
 )
+from ..node_ports_common.file_io_utils import UploadableFileObject
 from . import port_utils
 from .links import (
     DataItemValue,
@@ -292,7 +293,7 @@ class Port(BaseServiceIOModel):
 
     async def _set(
         self,
-        new_concrete_value: ItemConcreteValue | None,
+        new_concrete_value: ItemConcreteValue | UploadableFileObject | None,
         *,
         set_kwargs: SetKWargs | None = None,
         progress_bar: ProgressBarData,
@@ -309,18 +310,23 @@ class Port(BaseServiceIOModel):
         )
         new_value: DataItemValue | None = None
         if new_concrete_value is not None:
-            converted_value = self._py_value_converter(new_concrete_value)
-            if isinstance(converted_value, Path):
-                if (
-                    not port_utils.is_file_type(self.property_type)
-                    or not converted_value.exists()
-                    or converted_value.is_dir()
+            # NOTE: file objects (e.g. streamed archives) are uploaded as they are
+            converted_value = (
+                new_concrete_value
+                if isinstance(new_concrete_value, UploadableFileObject)
+                else self._py_value_converter(new_concrete_value)
+            )
+            if isinstance(converted_value, Path | UploadableFileObject):
+                if not port_utils.is_file_type(self.property_type) or (
+                    isinstance(converted_value, Path)
+                    and (not converted_value.exists() or converted_value.is_dir())
                 ):
                     raise InvalidItemTypeError(
                         self.property_type, f"{new_concrete_value}"
                     )
 
-                _check_if_symlink_is_valid(converted_value)
+                if isinstance(converted_value, Path):
+                    _check_if_symlink_is_valid(converted_value)
 
                 # NOTE: the file will be saved in S3 as PROJECT_ID/NODE_ID/(set_kwargs.file_base_path)/PORT_KEY/file.ext
                 base_path = Path(self.key)
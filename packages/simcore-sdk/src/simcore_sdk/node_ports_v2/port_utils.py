@@ -4,8 +4,13 @@ from collections.abc import Callable, Coroutine
 from pathlib import Path
 from typing import Any
 
-from models_library.api_schemas_storage import FileUploadSchema, LinkType
+from models_library.api_schemas_storage import (
+    FileUploadLinksBatchItem,
+    FileUploadSchema,
+    LinkType,
+)
 from models_library.basic_types import SHA256Str
+from models_library.projects_nodes_io import SimcoreS3FileID
 from models_library.users import UserID
 from pydantic import AnyUrl, ByteSize
 from pydantic.tools import parse_obj_as
@@ -16,7 +21,7 @@ from yarl import URL
 from ..node_ports_common import data_items_utils, filemanager
 from ..node_ports_common.constants import SIMCORE_LOCATION
 from ..node_ports_common.exceptions import NodeportsException
-from ..node_ports_common.file_io_utils import LogRedirectCB
+from ..node_ports_common.file_io_utils import LogRedirectCB, UploadableFileObject
 from ..node_ports_common.filemanager import UploadedFile, UploadedFolder
 from .links import DownloadLink, FileLink, ItemConcreteValue, ItemValue, PortLink
 
@@ -103,6 +108,30 @@ async def get_download_link_from_storage(
     return url
 
 
+async def get_download_links_from_storage_batch(
+    user_id: UserID, values: list[FileLink], link_type: LinkType
+) -> dict[SimcoreS3FileID, AnyUrl]:
+    """same as get_download_link_from_storage for several files of the simcore location,
+    returns the links by file path
+
+    :raises exceptions.NodeportsException
+    :raises exceptions.StorageInvalidCall
+    :raises exceptions.StorageServerIssue
+    """
+    assert all(value.store == SIMCORE_LOCATION for value in values)  # nosec
+    if not values:
+        return {}
+    log.debug("getting links to files from storage %s", values)
+    links = await filemanager.get_download_links_from_s3_batch(
+        user_id=user_id,
+        s3_objects=[parse_obj_as(SimcoreS3FileID, value.path) for value in values],
+        link_type=link_type,
+    )
+    return {
+        s3_object: parse_obj_as(AnyUrl, f"{link}") for s3_object, link in links.items()
+    }
+
+
 async def get_download_link_from_storage_overload(
     user_id: UserID, project_id: str, node_id: str, file_name: str, link_type: LinkType
 ) -> AnyUrl:
@@ -151,6 +180,35 @@ async def get_upload_links_from_storage(
     return links
 
 
+async def get_upload_links_from_storage_batch(
+    user_id: UserID,
+    project_id: str,
+    node_id: str,
+    file_names: list[str],
+    link_type: LinkType,
+    file_size: ByteSize,
+) -> dict[str, FileUploadSchema]:
+    """same as get_upload_links_from_storage for several files of the same node,
+    returns the links by file name
+    """
+    log.debug("getting links to files from storage for %s", file_names)
+    s3_objects = {
+        data_items_utils.create_simcore_file_id(
+            Path(file_name), project_id, node_id
+        ): file_name
+        for file_name in file_names
+    }
+    links = await filemanager.get_upload_links_from_s3_batch(
+        user_id=user_id,
+        files=[
+            FileUploadLinksBatchItem(file_id=s3_object, file_size=file_size)
+            for s3_object in s3_objects
+        ],
+        link_type=link_type,
+    )
+    return {s3_objects[s3_object]: links[s3_object] for s3_object in s3_objects}
+
+
 async def target_link_exists(
     user_id: UserID, project_id: str, node_id: str, file_name: str
 ) -> bool:
@@ -216,7 +274,7 @@ async def pull_file_from_store(
 
 async def push_file_to_store(
     *,
-    file: Path,
+    file: Path | UploadableFileObject,
     user_id: UserID,
     project_id: str,
     node_id: str,
@@ -231,9 +289,12 @@ async def push_file_to_store(
 
     log.debug("file path %s will be uploaded to s3", file)
     s3_object = data_items_utils.create_simcore_file_id(
-        file, project_id, node_id, file_base_path=file_base_path
+        Path(file.file_name) if isinstance(file, UploadableFileObject) else file,
+        project_id,
+        node_id,
+        file_base_path=file_base_path,
     )
-    if not file.is_file():
+    if isinstance(file, Path) and not file.is_file():
         msg = f"Expected path={file} should be a file"
         raise NodeportsException(msg)
 
@@ -9,7 +9,7 @@ import urllib.parse
 from collections.abc import AsyncIterator, Callable
 from pathlib import Path
 from typing import Final
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 from uuid import uuid4
 
 import aioboto3
@@ -17,6 +17,7 @@ import aiofiles
 import pytest
 from faker import Faker
 from pydantic import AnyUrl, ByteSize, parse_obj_as
+from pytest_mock import MockerFixture
 from servicelib.file_utils import remove_directory
 from servicelib.progress_bar import ProgressBarData
 from servicelib.utils import logged_gather
@@ -397,6 +398,51 @@ async def test_overwrite_an_existing_file_and_sync_again(
     )
 
 
+def _get_r_clone_sync_calls(spy: MagicMock) -> list[tuple[str, ...]]:
+    return [call.args for call in spy.call_args_list if "sync" in call.args]
+
+
+async def test_sync_again_only_transfers_changed_files(
+    r_clone_settings: RCloneSettings,
+    create_valid_file_uuid: Callable[[str, Path], str],
+    dir_locally_created_files: Path,
+    dir_downloaded_files_1: Path,
+    cleanup_bucket_after_test: None,
+    mocker: MockerFixture,
+) -> None:
+    generated_file_names: set[str] = await _create_files_in_dir(
+        dir_locally_created_files, 10, parse_obj_as(ByteSize, "1kib")
+    )
+    directory_uuid = create_valid_file_uuid(f"{dir_locally_created_files}", Path(""))
+    s3_directory_link = _fake_s3_link(r_clone_settings, directory_uuid)
+    await _upload_local_dir_to_s3(
+        r_clone_settings, s3_directory_link, dir_locally_created_files
+    )
+
+    spy_r_clone_command = mocker.spy(r_clone, "_async_r_clone_command")
+    # nothing changed, rclone sync is not called
+    await _upload_local_dir_to_s3(
+        r_clone_settings, s3_directory_link, dir_locally_created_files
+    )
+    assert _get_r_clone_sync_calls(spy_r_clone_command) == []
+
+    # only the changed files are passed to rclone sync
+    _add_a_new_file(dir_locally_created_files, generated_file_names)
+    _remove_one_file(dir_locally_created_files, generated_file_names)
+    await _upload_local_dir_to_s3(
+        r_clone_settings, s3_directory_link, dir_locally_created_files
+    )
+    (sync_call,) = _get_r_clone_sync_calls(spy_r_clone_command)
+    assert "--files-from-raw" in sync_call
+
+    await _download_from_s3_to_local_dir(
+        r_clone_settings, s3_directory_link, dir_downloaded_files_1
+    )
+    assert _directories_have_the_same_content(
+        dir_locally_created_files, dir_downloaded_files_1
+    )
+
+
 async def test_raises_error_if_local_directory_path_is_a_file(
     tmp_path: Path, faker: Faker, cleanup_bucket_after_test: None
 ):
@@ -3,6 +3,8 @@
 # pylint: disable=protected-access
 
 import asyncio
+import io
+import os
 from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable
 from dataclasses import dataclass
 from pathlib import Path
@@ -10,7 +12,13 @@ from unittest.mock import AsyncMock
 
 import pytest
 from aiobotocore.session import AioBaseClient, get_session
-from aiohttp import ClientResponse, ClientSession, TCPConnector
+from aiohttp import (
+    ClientConnectionError,
+    ClientError,
+    ClientResponse,
+    ClientSession,
+    TCPConnector,
+)
 from aioresponses import aioresponses
 from faker import Faker
 from models_library.api_schemas_storage import (
@@ -23,12 +31,18 @@ from pydantic import AnyUrl, ByteSize, parse_obj_as
 from pytest_mock import MockerFixture
 from servicelib.aiohttp import status
 from servicelib.progress_bar import ProgressBarData
-from simcore_sdk.node_ports_common.exceptions import AwsS3BadRequestRequestTimeoutError
+from simcore_sdk.node_ports_common.client_session_manager import shared_upload_session
+from simcore_sdk.node_ports_common.exceptions import (
+    AwsS3BadRequestRequestTimeoutError,
+    S3TransferError,
+)
 from simcore_sdk.node_ports_common.file_io_utils import (
+    UploadableFileObject,
     _check_for_aws_http_errors,
     _ExtendedClientResponseError,
-    _process_batch,
+    _file_chunk_reader,
     _raise_for_status,
+    _upload_parts,
     upload_file_to_presigned_links,
 )
 
@@ -91,7 +105,7 @@ async def test_check_for_aws_http_errors(
             )
 
 
-async def test_process_batch_captures_400_request_timeout_and_wraps_in_error(
+async def test_upload_parts_captures_400_request_timeout_and_wraps_in_error(
     aioresponses_mocker: aioresponses, client_session: ClientSession
 ):
     async def _mock_upload_task() -> None:
@@ -111,8 +125,8 @@ async def test_process_batch_captures_400_request_timeout_and_wraps_in_error(
             await _raise_for_status(resp)
 
     with pytest.raises(AwsS3BadRequestRequestTimeoutError):
-        await _process_batch(
-            upload_tasks=[_mock_upload_task()],
+        await _upload_parts(
+            upload_tasks=iter([_mock_upload_task()]),
             max_concurrency=1,
             file_name="mock_file",
             file_size=1,
@@ -121,6 +135,100 @@ async def test_process_batch_captures_400_request_timeout_and_wraps_in_error(
         )
 
 
+async def test_upload_parts_keeps_a_window_of_parts_in_flight():
+    max_concurrency = 3
+    in_flight = 0
+    max_in_flight = 0
+
+    async def _mock_upload_task(index: int) -> tuple[int, str]:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        # a slow part does not prevent the next ones from starting
+        await asyncio.sleep(0.5 if index == 0 else 0.01)
+        in_flight -= 1
+        return index, f"etag_{index}"
+
+    uploaded_parts = await _upload_parts(
+        upload_tasks=(_mock_upload_task(i) for i in range(20)),
+        max_concurrency=max_concurrency,
+        file_name="mock_file",
+        file_size=20,
+        file_chunk_size=1,
+        last_chunk_size=1,
+    )
+    assert max_in_flight == max_concurrency
+    assert uploaded_parts == [
+        UploadedPart(number=i + 1, e_tag=f"etag_{i}") for i in range(20)
+    ]
+
+
+async def test_upload_parts_stops_at_first_failed_part():
+    started_parts: list[int] = []
+    cancelled_parts: list[int] = []
+
+    async def _mock_upload_task(index: int) -> tuple[int, str]:
+        started_parts.append(index)
+        if index == 1:
+            raise ClientError
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled_parts.append(index)
+            raise
+        return index, f"etag_{index}"
+
+    with pytest.raises(S3TransferError):
+        await _upload_parts(
+            upload_tasks=(_mock_upload_task(i) for i in range(20)),
+            max_concurrency=4,
+            file_name="mock_file",
+            file_size=20,
+            file_chunk_size=1,
+            last_chunk_size=1,
+        )
+    assert started_parts == [0, 1, 2, 3]
+    assert sorted(cancelled_parts) == [0, 2, 3]
+
+
+async def test_file_chunk_reader(
+    create_file_of_size: Callable[[ByteSize], Path],
+    mocker: MockerFixture,
+):
+    mocker.patch("simcore_sdk.node_ports_common.file_io_utils.CHUNK_SIZE", 100)
+    file_path = create_file_of_size(parse_obj_as(ByteSize, "1KiB"))
+    file_descriptor = os.open(file_path, os.O_RDONLY)
+    try:
+        # parts are read concurrently from the same file descriptor
+        parts = await asyncio.gather(
+            *(
+                _read_all(
+                    _file_chunk_reader(
+                        file_descriptor, offset=offset, total_bytes_to_read=250
+                    )
+                )
+                for offset in range(0, 1024, 250)
+            )
+        )
+    finally:
+        os.close(file_descriptor)
+    assert b"".join(parts) == file_path.read_bytes()
+
+
+async def _read_all(reader: AsyncIterable[bytes]) -> bytes:
+    return b"".join([chunk async for chunk in reader])
+
+
+async def test_shared_upload_session():
+    async with shared_upload_session() as session:
+        async with shared_upload_session() as same_session:
+            assert same_session is session
+        assert not session.closed
+    assert session.closed
+    async with shared_upload_session() as new_session:
+        assert new_session is not session
+
+
 async def test_upload_file_to_presigned_links_raises_aws_s3_400_request_time_out_error(
     mocker: MockerFixture,
     create_upload_links: Callable[[int, ByteSize], Awaitable[FileUploadSchema]],
@@ -146,6 +254,70 @@ async def test_upload_file_to_presigned_links_raises_aws_s3_400_request_time_out
             )
 
 
+class _ForwardOnlyStream(io.RawIOBase):
+    def __init__(self, data: bytes) -> None:
+        super().__init__()
+        self._data = io.BytesIO(data)
+
+    def readable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._data.tell()
+
+    def read(self, size: int | None = -1) -> bytes:
+        return self._data.read(size)
+
+
+async def test_upload_file_to_presigned_links_retries_parts_of_forward_only_file_objects(
+    mocker: MockerFixture, faker: Faker
+):
+    chunk_size = parse_obj_as(ByteSize, "1KiB")
+    data = faker.binary(length=3 * chunk_size)
+    upload_links = FileUploadSchema(
+        chunk_size=chunk_size,
+        urls=parse_obj_as(list[AnyUrl], [faker.url() for _ in range(3)]),
+        links=FileUploadLinks(
+            abort_upload=parse_obj_as(AnyUrl, faker.uri()),
+            complete_upload=parse_obj_as(AnyUrl, faker.uri()),
+        ),
+    )
+    uploaded_parts: dict[AnyUrl, bytes] = {}
+    failing_url = upload_links.urls[1]
+
+    async def _session_put_failing_once(
+        *, upload_url: AnyUrl, file_uploader: AsyncIterator[bytes], **kwargs
+    ) -> str:
+        part = b"".join([chunk async for chunk in file_uploader])
+        if upload_url == failing_url and failing_url not in uploaded_parts:
+            uploaded_parts[upload_url] = b""
+            msg = "the connection was lost"
+            raise ClientConnectionError(msg)
+        uploaded_parts[upload_url] = part
+        return faker.md5()
+
+    mocker.patch(
+        "simcore_sdk.node_ports_common.file_io_utils._session_put",
+        side_effect=_session_put_failing_once,
+    )
+    async with ProgressBarData(num_steps=1) as progress_bar:
+        results = await upload_file_to_presigned_links(
+            session=AsyncMock(),
+            file_upload_links=upload_links,
+            file_to_upload=UploadableFileObject(
+                file_object=_ForwardOnlyStream(data),
+                file_name=faker.file_name(),
+                file_size=len(data),
+            ),
+            num_retries=2,
+            io_log_redirect_cb=None,
+            progress_bar=progress_bar,
+        )
+    assert [part.number for part in results] == [1, 2, 3]
+    # the failed part was read again from its beginning
+    assert b"".join(uploaded_parts[url] for url in upload_links.urls) == data
+
+
 @pytest.fixture
 async def aiobotocore_s3_client(
     mocked_aws_server: ThreadedMotoServer,
@@ -0,0 +1,92 @@
+# pylint: disable=redefined-outer-name
+
+import os
+from pathlib import Path
+
+import pytest
+from simcore_sdk.node_ports_common.r_clone_sync_manifest import (
+    SYNC_MANIFEST_FILE_NAME,
+    create_sync_manifest,
+    get_files_to_sync,
+    get_local_files,
+    parse_sync_manifest,
+)
+
+
+@pytest.fixture
+def local_dir(tmp_path: Path) -> Path:
+    local_dir = tmp_path / "state"
+    (local_dir / "subdir").mkdir(parents=True)
+    for i in range(3):
+        (local_dir / f"file_{i}.txt").write_text(f"content {i}")
+        (local_dir / "subdir" / f"file_{i}.txt").write_text(f"content {i}")
+    (local_dir / "cache.tmp").write_text("excluded")
+    return local_dir
+
+
+def test_get_files_to_sync(local_dir: Path):
+    exclude_patterns = {"*.tmp"}
+    local_files = get_local_files(local_dir, exclude_patterns)
+    assert local_files is not None
+    assert len(local_files) == 6
+    manifest = create_sync_manifest(
+        "bucket/path", local_files, previous_manifest=None, exclude_patterns=None
+    )
+    assert get_files_to_sync(manifest, local_files, exclude_patterns) == set()
+
+    # modified, added and removed files are synced
+    (local_dir / "file_0.txt").write_text("changed")
+    stat = (local_dir / "file_1.txt").stat()
+    os.utime(local_dir / "file_1.txt", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    (local_dir / "subdir" / "new_file.txt").write_text("new")
+    (local_dir / "subdir" / "file_2.txt").unlink()
+    (local_dir / "other.tmp").write_text("excluded")
+    # files with the manifest name are never synced
+    (local_dir / SYNC_MANIFEST_FILE_NAME).write_text("local")
+
+    local_files = get_local_files(local_dir, exclude_patterns)
+    assert local_files is not None
+    assert get_files_to_sync(manifest, local_files, exclude_patterns) == {
+        "file_0.txt",
+        "file_1.txt",
+        "subdir/new_file.txt",
+        "subdir/file_2.txt",
+    }
+
+
+def test_create_sync_manifest_keeps_excluded_files(local_dir: Path):
+    local_files = get_local_files(local_dir, None)
+    assert local_files is not None
+    manifest = create_sync_manifest(
+        "bucket/path", local_files, previous_manifest=None, exclude_patterns=None
+    )
+    assert "cache.tmp" in manifest.files
+
+    # excluded files are neither uploaded nor removed from the remote
+    (local_dir / "cache.tmp").unlink()
+    local_files = get_local_files(local_dir, {"*.tmp"})
+    assert local_files is not None
+    assert get_files_to_sync(manifest, local_files, {"*.tmp"}) == set()
+    new_manifest = create_sync_manifest(
+        "bucket/path",
+        local_files,
+        previous_manifest=manifest,
+        exclude_patterns={"*.tmp"},
+    )
+    assert new_manifest == manifest
+
+
+def test_get_local_files_with_links(local_dir: Path, tmp_path: Path):
+    assert get_local_files(tmp_path / "missing", None) == {}
+    (local_dir / "subdir" / "a_link").symlink_to(local_dir / "file_0.txt")
+    assert get_local_files(local_dir, None) is None
+
+
+def test_parse_sync_manifest(local_dir: Path):
+    local_files = get_local_files(local_dir, None)
+    assert local_files is not None
+    manifest = create_sync_manifest(
+        "bucket/path", local_files, previous_manifest=None, exclude_patterns=None
+    )
+    assert parse_sync_manifest(manifest.json()) == manifest
+    assert parse_sync_manifest("not a manifest") is None
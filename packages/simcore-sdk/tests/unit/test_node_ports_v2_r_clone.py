@@ -12,6 +12,7 @@ from pytest_mock.plugin import MockerFixture
 from settings_library.r_clone import S3Provider
 from simcore_sdk.node_ports_common import r_clone
 from simcore_sdk.node_ports_common.r_clone import RCloneSettings
+from simcore_sdk.node_ports_common.r_clone_sync_manifest import get_local_files
 
 
 @pytest.fixture(params=list(S3Provider))
@@ -147,47 +148,47 @@ ALL_ITEMS_SET: set[Path] = {
 #    - f2.txt
 #    - f1
 #   - f1
-@pytest.mark.parametrize(
-    "exclude_patterns, expected_result",
-    [
-        pytest.param({"/d1*"}, EMPTY_SET),
-        pytest.param(
-            {"/d1/sd1*"},
-            {
-                Path("d1/f2.txt"),
-                Path("d1/f1"),
-            },
-        ),
-        pytest.param(
-            {"d1*"},
-            EMPTY_SET,
-        ),
-        pytest.param(
-            {"*d1*"},
-            EMPTY_SET,
-        ),
-        pytest.param(
-            {"*.txt"},
-            {Path("d1/f1"), Path("d1/sd1/f1")},
-        ),
-        pytest.param(
-            {"/absolute/path/does/not/exist*"},
-            ALL_ITEMS_SET,
-        ),
-        pytest.param(
-            {"/../../this/is/ignored*"},
-            ALL_ITEMS_SET,
-        ),
-        pytest.param(
-            {"*relative/path/does/not/exist"},
-            ALL_ITEMS_SET,
-        ),
-        pytest.param(
-            None,
-            ALL_ITEMS_SET,
-        ),
-    ],
-)
+_EXCLUDE_PATTERNS_CASES: list = [
+    pytest.param({"/d1*"}, EMPTY_SET),
+    pytest.param(
+        {"/d1/sd1*"},
+        {
+            Path("d1/f2.txt"),
+            Path("d1/f1"),
+        },
+    ),
+    pytest.param(
+        {"d1*"},
+        EMPTY_SET,
+    ),
+    pytest.param(
+        {"*d1*"},
+        EMPTY_SET,
+    ),
+    pytest.param(
+        {"*.txt"},
+        {Path("d1/f1"), Path("d1/sd1/f1")},
+    ),
+    pytest.param(
+        {"/absolute/path/does/not/exist*"},
+        ALL_ITEMS_SET,
+    ),
+    pytest.param(
+        {"/../../this/is/ignored*"},
+        ALL_ITEMS_SET,
+    ),
+    pytest.param(
+        {"*relative/path/does/not/exist"},
+        ALL_ITEMS_SET,
+    ),
+    pytest.param(
+        None,
+        ALL_ITEMS_SET,
+    ),
+]
+
+
+@pytest.mark.parametrize("exclude_patterns, expected_result", _EXCLUDE_PATTERNS_CASES)
 async def test__get_exclude_filter(
     skip_if_r_clone_is_missing: None,
     exclude_patterns_validation_dir: Path,
@@ -211,3 +212,14 @@ async def test__get_exclude_filter(
         Path(x.lstrip("/")) for x in ls_result.split("\n") if x
     }
     assert relative_files_paths == expected_result
+
+
+@pytest.mark.parametrize("exclude_patterns, expected_result", _EXCLUDE_PATTERNS_CASES)
+def test_sync_manifest_excludes_as_r_clone(
+    exclude_patterns_validation_dir: Path,
+    exclude_patterns: set[str] | None,
+    expected_result: set[Path],
+):
+    local_files = get_local_files(exclude_patterns_validation_dir, exclude_patterns)
+    assert local_files is not None
+    assert {Path(relative_path) for relative_path in local_files} == expected_result
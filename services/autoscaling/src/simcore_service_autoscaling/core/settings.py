@@ -69,6 +69,17 @@ class EC2InstancesSettings(BaseCustomSettings):
         description="Constant reserve of drained ready machines for fast(er) usage,"
         "disabled when set to 0. Uses 1st machine defined in EC2_INSTANCES_ALLOWED_TYPES",
     )
+    EC2_INSTANCES_MAX_PREWARMED_MACHINES: NonNegativeInt = Field(
+        default=0,
+        description="Maximum number of drained ready machines kept warm for the demand forecasted from the previous resource checks, "
+        "in addition to EC2_INSTANCES_MACHINES_BUFFER (caps the cost of pre-warming), disabled when set to 0",
+    )
+    EC2_INSTANCES_PREWARMING_SMOOTHING_FACTOR: float = Field(
+        default=0.1,
+        gt=0,
+        le=1,
+        description="Exponential smoothing factor of the forecasted demand (the larger, the faster the forecast follows the demand)",
+    )
     EC2_INSTANCES_MAX_INSTANCES: int = Field(
         default=10,
         description="Defines the maximum number of instances the autoscaling app may create",
@@ -220,6 +231,12 @@ class ApplicationSettings(BaseCustomSettings, MixinLoggingSettings):
         "(default to seconds, or see https://pydantic-docs.helpmanual.io/usage/types/#datetime-types for string formating)",
     )
 
+    AUTOSCALING_CLUSTER_SNAPSHOT_RESYNC_TICKS: PositiveInt = Field(
+        default=30,
+        description="between resource checks, the docker nodes are kept up to date with the docker events. "
+        "They are fully listed again every this number of checks",
+    )
+
     AUTOSCALING_RABBITMQ: RabbitSettings | None = Field(auto_default_from_env=True)
 
     AUTOSCALING_REDIS: RedisSettings = Field(auto_default_from_env=True)
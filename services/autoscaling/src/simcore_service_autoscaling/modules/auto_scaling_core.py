@@ -2,6 +2,7 @@ import asyncio
 import collections
 import dataclasses
 import datetime
+import functools
 import itertools
 import json
 import logging
@@ -13,85 +14,147 @@ from aws_library.ec2.models import (
     EC2InstanceData,
     EC2InstanceType,
     EC2Tags,
-    Resources,
 )
 from fastapi import FastAPI
 from fastapi.encoders import jsonable_encoder
 from models_library.generated_models.docker_rest_api import Node, NodeState
 from servicelib.logging_utils import log_catch, log_context
+from servicelib.utils import logged_gather
 from servicelib.utils_formatting import timedelta_as_minute_second
 from types_aiobotocore_ec2.literals import InstanceTypeType
 
-from ..core.errors import (
-    Ec2InstanceInvalidError,
-    Ec2InstanceNotFoundError,
-    Ec2InvalidDnsNameError,
-    Ec2TooManyInstancesError,
-)
+from ..core.errors import Ec2InvalidDnsNameError, Ec2TooManyInstancesError
 from ..core.settings import ApplicationSettings, get_application_settings
-from ..models import (
-    AssignedTasksToInstanceType,
-    AssociatedInstance,
-    Cluster,
-    NonAssociatedInstance,
-)
-from ..utils import utils_docker, utils_ec2
+from ..models import AssociatedInstance, Cluster, NonAssociatedInstance
+from ..utils import utils_docker
 from ..utils.auto_scaling_core import (
     associate_ec2_instances_with_nodes,
     ec2_startup_script,
-    find_selected_instance_type_for_task,
     node_host_name_from_ec2_private_dns,
 )
+from ..utils.bin_packing import (
+    PlacementTask,
+    assign_tasks_to_instances,
+    find_needed_instances,
+)
 from ..utils.rabbitmq import post_autoscaling_status_message
 from .auto_scaling_mode_base import BaseAutoscaling
+from .auto_scaling_monitoring import AutoscalingMetrics
+from .cluster_snapshot import ClusterSnapshot
 from .docker import get_docker_client
 from .ec2 import get_ec2_client
+from .instances_prewarming import InstancesPrewarming
 
 _logger = logging.getLogger(__name__)
 
+_MAX_CONCURRENT_TASK_DEFINED_INSTANCE_REQUESTS: Final[int] = 20
+_MAX_CONCURRENT_NODE_REQUESTS: Final[int] = 20
+
 
 def _node_not_ready(node: Node) -> bool:
     assert node.Status  # nosec
     return bool(node.Status.State != NodeState.ready)
 
 
+def _split_reserve_drained_nodes(
+    drained_nodes: list[AssociatedInstance], wanted_reserve: collections.Counter[str]
+) -> tuple[list[AssociatedInstance], list[AssociatedInstance]]:
+    """returns the drained nodes and the ones kept in reserve, i.e. the first ones
+    of each instance type up to the wanted number of that type"""
+    remaining_drained_nodes: list[AssociatedInstance] = []
+    reserve_drained_nodes: list[AssociatedInstance] = []
+    reserve: collections.Counter[str] = collections.Counter()
+    for node in drained_nodes:
+        if reserve[node.ec2_instance.type] < wanted_reserve[node.ec2_instance.type]:
+            reserve[node.ec2_instance.type] += 1
+            reserve_drained_nodes.append(node)
+        else:
+            remaining_drained_nodes.append(node)
+    return remaining_drained_nodes, reserve_drained_nodes
+
+
+def _get_wanted_reserve(
+    app: FastAPI, warm_buffer: collections.Counter[str]
+) -> collections.Counter[str]:
+    """returns the number of drained machines per instance type to keep in reserve:
+    the constant buffer uses the 1st allowed type, the warm buffer its forecasted types"""
+    app_settings = get_application_settings(app)
+    assert app_settings.AUTOSCALING_EC2_INSTANCES  # nosec
+    default_instance_type = next(
+        iter(app_settings.AUTOSCALING_EC2_INSTANCES.EC2_INSTANCES_ALLOWED_TYPES)
+    )
+    return warm_buffer + collections.Counter(
+        {
+            default_instance_type: app_settings.AUTOSCALING_EC2_INSTANCES.EC2_INSTANCES_MACHINES_BUFFER
+        }
+    )
+
+
 async def _analyze_current_cluster(
-    app: FastAPI, auto_scaling_mode: BaseAutoscaling
+    app: FastAPI,
+    auto_scaling_mode: BaseAutoscaling,
+    cluster_snapshot: ClusterSnapshot | None,
+    wanted_reserve: collections.Counter[str],
 ) -> Cluster:
     app_settings = get_application_settings(app)
     assert app_settings.AUTOSCALING_EC2_INSTANCES  # nosec
 
     # get current docker nodes (these are associated (active or drained) or disconnected)
-    docker_nodes: list[Node] = await auto_scaling_mode.get_monitored_nodes(app)
-
-    # get the EC2 instances we have
-    existing_ec2_instances = await get_ec2_client(app).get_instances(
-        key_names=[app_settings.AUTOSCALING_EC2_INSTANCES.EC2_INSTANCES_KEY_NAME],
-        tags=auto_scaling_mode.get_ec2_tags(app),
+    docker_nodes: list[Node] = await (
+        cluster_snapshot.get_monitored_nodes(
+            functools.partial(auto_scaling_mode.get_monitored_nodes, app),
+            functools.partial(auto_scaling_mode.is_monitored_node, app),
+        )
+        if cluster_snapshot
+        else auto_scaling_mode.get_monitored_nodes(app)
     )
 
-    terminated_ec2_instances = await get_ec2_client(app).get_instances(
+    # get the EC2 instances we have (existing and terminated in one call)
+    all_ec2_instances = await get_ec2_client(app).get_instances(
         key_names=[app_settings.AUTOSCALING_EC2_INSTANCES.EC2_INSTANCES_KEY_NAME],
         tags=auto_scaling_mode.get_ec2_tags(app),
-        state_names=["terminated"],
+        state_names=["pending", "running", "terminated"],
     )
+    existing_ec2_instances = [i for i in all_ec2_instances if i.state != "terminated"]
+    terminated_ec2_instances = [i for i in all_ec2_instances if i.state == "terminated"]
 
     attached_ec2s, pending_ec2s = await associate_ec2_instances_with_nodes(
         docker_nodes, existing_ec2_instances
     )
 
     # analyse attached ec2s
+    instances_active = await logged_gather(
+        *(auto_scaling_mode.is_instance_active(app, i) for i in attached_ec2s),
+        log=_logger,
+        max_concurrency=_MAX_CONCURRENT_NODE_REQUESTS,
+    )
+    active_instances = [
+        i
+        for i, is_active in zip(attached_ec2s, instances_active, strict=True)
+        if is_active
+    ]
+    nodes_used_resources = dict(
+        zip(
+            (i.ec2_instance.id for i in active_instances),
+            await logged_gather(
+                *(
+                    auto_scaling_mode.compute_node_used_resources(app, i)
+                    for i in active_instances
+                ),
+                log=_logger,
+                max_concurrency=_MAX_CONCURRENT_NODE_REQUESTS,
+            ),
+            strict=True,
+        )
+    )
     active_nodes, pending_nodes, all_drained_nodes = [], [], []
-    for instance in attached_ec2s:
-        if await auto_scaling_mode.is_instance_active(app, instance):
-            node_used_resources = await auto_scaling_mode.compute_node_used_resources(
-                app, instance
-            )
+    for instance, is_active in zip(attached_ec2s, instances_active, strict=True):
+        if is_active:
             active_nodes.append(
                 dataclasses.replace(
                     instance,
                     available_resources=instance.ec2_instance.resources
-                    - node_used_resources,
+                    - nodes_used_resources[instance.ec2_instance.id],
                 )
             )
         elif auto_scaling_mode.is_instance_drained(instance):
@@ -99,15 +162,14 @@ async def _analyze_current_cluster(
         else:
             pending_nodes.append(instance)
 
+    drained_nodes, reserve_drained_nodes = _split_reserve_drained_nodes(
+        all_drained_nodes, wanted_reserve
+    )
     cluster = Cluster(
         active_nodes=active_nodes,
         pending_nodes=pending_nodes,
-        drained_nodes=all_drained_nodes[
-            app_settings.AUTOSCALING_EC2_INSTANCES.EC2_INSTANCES_MACHINES_BUFFER :
-        ],
-        reserve_drained_nodes=all_drained_nodes[
-            : app_settings.AUTOSCALING_EC2_INSTANCES.EC2_INSTANCES_MACHINES_BUFFER
-        ],
+        drained_nodes=drained_nodes,
+        reserve_drained_nodes=reserve_drained_nodes,
         pending_ec2s=[NonAssociatedInstance(ec2_instance=i) for i in pending_ec2s],
         terminated_instances=terminated_ec2_instances,
         disconnected_nodes=[n for n in docker_nodes if _node_not_ready(n)],
@@ -149,7 +211,10 @@ async def _cleanup_disconnected_nodes(app: FastAPI, cluster: Cluster) -> Cluster
 
 
 async def _try_attach_pending_ec2s(
-    app: FastAPI, cluster: Cluster, auto_scaling_mode: BaseAutoscaling
+    app: FastAPI,
+    cluster: Cluster,
+    auto_scaling_mode: BaseAutoscaling,
+    wanted_reserve: collections.Counter[str],
 ) -> Cluster:
     """label the drained instances that connected to the swarm which are missing the monitoring labels"""
     new_found_instances: list[AssociatedInstance] = []
@@ -186,17 +251,14 @@ async def _try_attach_pending_ec2s(
         except Ec2InvalidDnsNameError:  # noqa: PERF203
             _logger.exception("Unexpected EC2 private dns")
     # NOTE: first provision the reserve drained nodes if possible
-    all_drained_nodes = (
-        cluster.drained_nodes + cluster.reserve_drained_nodes + new_found_instances
+    drained_nodes, reserve_drained_nodes = _split_reserve_drained_nodes(
+        cluster.drained_nodes + cluster.reserve_drained_nodes + new_found_instances,
+        wanted_reserve,
     )
     return dataclasses.replace(
         cluster,
-        drained_nodes=all_drained_nodes[
-            app_settings.AUTOSCALING_EC2_INSTANCES.EC2_INSTANCES_MACHINES_BUFFER :
-        ],
-        reserve_drained_nodes=all_drained_nodes[
-            : app_settings.AUTOSCALING_EC2_INSTANCES.EC2_INSTANCES_MACHINES_BUFFER
-        ],
+        drained_nodes=drained_nodes,
+        reserve_drained_nodes=reserve_drained_nodes,
         pending_ec2s=still_pending_ec2s,
     )
 
@@ -290,52 +352,24 @@ async def _activate_drained_nodes(
     )
 
 
-def _try_assign_task_to_ec2_instance(
-    task,
-    *,
-    instances: list[AssociatedInstance] | list[NonAssociatedInstance],
-    task_required_ec2_instance: InstanceTypeType | None,
-    task_required_resources: Resources,
-) -> bool:
-    for instance in instances:
-        if task_required_ec2_instance and (
-            task_required_ec2_instance != instance.ec2_instance.type
-        ):
-            continue
-        if instance.has_resources_for_task(task_required_resources):
-            instance.assign_task(task, task_required_resources)
-            _logger.debug(
-                "%s",
-                f"assigned task with {task_required_resources=}, {task_required_ec2_instance=} to "
-                f"{instance.ec2_instance.id=}:{instance.ec2_instance.type}, "
-                f"remaining resources:{instance.available_resources}/{instance.ec2_instance.resources}",
-            )
-            return True
-    return False
-
-
-def _try_assign_task_to_ec2_instance_type(
-    task,
-    *,
-    instances: list[AssignedTasksToInstanceType],
-    task_required_ec2_instance: InstanceTypeType | None,
-    task_required_resources: Resources,
-) -> bool:
-    for instance in instances:
-        if task_required_ec2_instance and (
-            task_required_ec2_instance != instance.instance_type.name
-        ):
-            continue
-        if instance.has_resources_for_task(task_required_resources):
-            instance.assign_task(task, task_required_resources)
-            _logger.debug(
-                "%s",
-                f"assigned task with {task_required_resources=}, {task_required_ec2_instance=} to "
-                f"{instance.instance_type}, "
-                f"remaining resources:{instance.available_resources}/{instance.instance_type.resources}",
-            )
-            return True
-    return False
+async def _get_placement_tasks(
+    app: FastAPI, tasks: list, auto_scaling_mode: BaseAutoscaling
+) -> list[PlacementTask]:
+    tasks_required_ec2_instance = await logged_gather(
+        *(auto_scaling_mode.get_task_defined_instance(app, task) for task in tasks),
+        log=_logger,
+        max_concurrency=_MAX_CONCURRENT_TASK_DEFINED_INSTANCE_REQUESTS,
+    )
+    return [
+        PlacementTask(
+            task=task,
+            required_resources=auto_scaling_mode.get_task_required_resources(task),
+            required_instance_type=task_required_ec2_instance,
+        )
+        for task, task_required_ec2_instance in zip(
+            tasks, tasks_required_ec2_instance, strict=True
+        )
+    ]
 
 
 async def _assign_tasks_to_current_cluster(
@@ -344,47 +378,18 @@ async def _assign_tasks_to_current_cluster(
     cluster: Cluster,
     auto_scaling_mode: BaseAutoscaling,
 ) -> tuple[list, Cluster]:
-    unassigned_tasks = []
-    for task in tasks:
-        task_required_resources = auto_scaling_mode.get_task_required_resources(task)
-        task_required_ec2_instance = await auto_scaling_mode.get_task_defined_instance(
-            app, task
-        )
-
-        assignment_functions = [
-            lambda task, required_ec2, required_resources: _try_assign_task_to_ec2_instance(
-                task,
-                instances=cluster.active_nodes,
-                task_required_ec2_instance=required_ec2,
-                task_required_resources=required_resources,
-            ),
-            lambda task, required_ec2, required_resources: _try_assign_task_to_ec2_instance(
-                task,
-                instances=cluster.drained_nodes + cluster.reserve_drained_nodes,
-                task_required_ec2_instance=required_ec2,
-                task_required_resources=required_resources,
-            ),
-            lambda task, required_ec2, required_resources: _try_assign_task_to_ec2_instance(
-                task,
-                instances=cluster.pending_nodes,
-                task_required_ec2_instance=required_ec2,
-                task_required_resources=required_resources,
-            ),
-            lambda task, required_ec2, required_resources: _try_assign_task_to_ec2_instance(
-                task,
-                instances=cluster.pending_ec2s,
-                task_required_ec2_instance=required_ec2,
-                task_required_resources=required_resources,
-            ),
-        ]
-
-        if any(
-            assignment(task, task_required_ec2_instance, task_required_resources)
-            for assignment in assignment_functions
-        ):
-            _logger.debug("assigned task to cluster")
-        else:
-            unassigned_tasks.append(task)
+    unassigned_tasks = [
+        placement_task.task
+        for placement_task in assign_tasks_to_instances(
+            await _get_placement_tasks(app, tasks, auto_scaling_mode),
+            [
+                cluster.active_nodes,
+                cluster.drained_nodes + cluster.reserve_drained_nodes,
+                cluster.pending_nodes,
+                cluster.pending_ec2s,
+            ],
+        )
+    ]
 
     if unassigned_tasks:
         _logger.info(
@@ -401,68 +406,15 @@ async def _find_needed_instances(
     available_ec2_types: list[EC2InstanceType],
     cluster: Cluster,
     auto_scaling_mode: BaseAutoscaling,
-) -> dict[EC2InstanceType, int]:
+    wanted_reserve: collections.Counter[str],
+) -> tuple[dict[EC2InstanceType, int], collections.Counter[str]]:
+    """returns the number of instances to start per type and the number of these needed by the tasks"""
     # 1. check first the pending task needs
-    needed_new_instance_types_for_tasks: list[AssignedTasksToInstanceType] = []
     with log_context(_logger, logging.DEBUG, msg="finding needed instances"):
-        for task in unassigned_tasks:
-            task_required_resources = auto_scaling_mode.get_task_required_resources(
-                task
-            )
-            task_required_ec2_instance = (
-                await auto_scaling_mode.get_task_defined_instance(app, task)
-            )
-
-            # first check if we can assign the task to one of the newly tobe created instances
-            if _try_assign_task_to_ec2_instance_type(
-                task,
-                instances=needed_new_instance_types_for_tasks,
-                task_required_ec2_instance=task_required_ec2_instance,
-                task_required_resources=task_required_resources,
-            ):
-                continue
-
-            # so we need to find what we can create now
-            try:
-                # check if exact instance type is needed first
-                if task_required_ec2_instance:
-                    defined_ec2 = find_selected_instance_type_for_task(
-                        task_required_ec2_instance,
-                        available_ec2_types,
-                        auto_scaling_mode,
-                        task,
-                    )
-                    needed_new_instance_types_for_tasks.append(
-                        AssignedTasksToInstanceType(
-                            instance_type=defined_ec2,
-                            assigned_tasks=[task],
-                            available_resources=defined_ec2.resources
-                            - task_required_resources,
-                        )
-                    )
-                else:
-                    # we go for best fitting type
-                    best_ec2_instance = utils_ec2.find_best_fitting_ec2_instance(
-                        available_ec2_types,
-                        auto_scaling_mode.get_task_required_resources(task),
-                        score_type=utils_ec2.closest_instance_policy,
-                    )
-                    needed_new_instance_types_for_tasks.append(
-                        AssignedTasksToInstanceType(
-                            instance_type=best_ec2_instance,
-                            assigned_tasks=[task],
-                            available_resources=best_ec2_instance.resources
-                            - task_required_resources,
-                        )
-                    )
-            except Ec2InstanceNotFoundError:
-                _logger.exception(
-                    "Task %s needs more resources than any EC2 instance "
-                    "can provide with the current configuration. Please check!",
-                    f"{task}",
-                )
-            except Ec2InstanceInvalidError:
-                _logger.exception("Unexpected error:")
+        needed_new_instance_types_for_tasks = find_needed_instances(
+            await _get_placement_tasks(app, unassigned_tasks, auto_scaling_mode),
+            available_ec2_types,
+        )
 
     _logger.info(
         "found following needed instances: %s",
@@ -478,28 +430,26 @@ async def _find_needed_instances(
             t.instance_type for t in needed_new_instance_types_for_tasks
         ),
     )
+    tasks_demand = collections.Counter(
+        t.instance_type.name for t in needed_new_instance_types_for_tasks
+    )
 
-    # 2. check the buffer needs
-    app_settings = get_application_settings(app)
-    assert app_settings.AUTOSCALING_EC2_INSTANCES  # nosec
-    if (
-        num_missing_nodes := (
-            app_settings.AUTOSCALING_EC2_INSTANCES.EC2_INSTANCES_MACHINES_BUFFER
-            - len(cluster.reserve_drained_nodes)
-        )
-    ) > 0:
-        # check if some are already pending
-        remaining_pending_instances = [
-            i.ec2_instance for i in cluster.pending_ec2s if not i.assigned_tasks
-        ] + [i.ec2_instance for i in cluster.pending_nodes if not i.assigned_tasks]
-        if len(remaining_pending_instances) < (
-            app_settings.AUTOSCALING_EC2_INSTANCES.EC2_INSTANCES_MACHINES_BUFFER
-            - len(cluster.reserve_drained_nodes)
-        ):
-            default_instance_type = available_ec2_types[0]
-            num_instances_per_type[default_instance_type] += num_missing_nodes
+    # 2. check the reserve needs per instance type (some might already be pending)
+    current_reserve = collections.Counter(
+        i.ec2_instance.type
+        for i in itertools.chain(
+            cluster.reserve_drained_nodes, cluster.pending_ec2s, cluster.pending_nodes
+        )
+        if not i.assigned_tasks
+    )
+    instance_types_by_name = {i.name: i for i in available_ec2_types}
+    for instance_type_name, num_missing_nodes in (
+        wanted_reserve - current_reserve
+    ).items():
+        if instance_type := instance_types_by_name.get(instance_type_name):
+            num_instances_per_type[instance_type] += num_missing_nodes
 
-    return num_instances_per_type
+    return num_instances_per_type, tasks_demand
 
 
 async def _cap_needed_instances(
@@ -666,17 +616,25 @@ async def _scale_up_cluster(
     cluster: Cluster,
     unassigned_tasks: list,
     auto_scaling_mode: BaseAutoscaling,
-) -> Cluster:
+    wanted_reserve: collections.Counter[str],
+) -> tuple[Cluster, collections.Counter[str]]:
+    """returns the scaled up cluster and the number of new instances per type needed by the tasks"""
     app_settings: ApplicationSettings = app.state.settings
     assert app_settings.AUTOSCALING_EC2_ACCESS  # nosec
     assert app_settings.AUTOSCALING_EC2_INSTANCES  # nosec
 
     allowed_instance_types = await sorted_allowed_instance_types(app)
 
+    needed_ec2_instances, tasks_demand = await _find_needed_instances(
+        app,
+        unassigned_tasks,
+        allowed_instance_types,
+        cluster,
+        auto_scaling_mode,
+        wanted_reserve,
+    )
     # let's start these
-    if needed_ec2_instances := await _find_needed_instances(
-        app, unassigned_tasks, allowed_instance_types, cluster, auto_scaling_mode
-    ):
+    if needed_ec2_instances:
         await auto_scaling_mode.log_message_from_tasks(
             app,
             unassigned_tasks,
@@ -692,7 +650,7 @@ async def _scale_up_cluster(
         # NOTE: to check the logs of UserData in EC2 instance
         # run: tail -f -n 1000 /var/log/cloud-init-output.log in the instance
 
-    return cluster
+    return cluster, tasks_demand
 
 
 async def _deactivate_empty_nodes(app: FastAPI, cluster: Cluster) -> Cluster:
@@ -864,8 +822,13 @@ async def _notify_machine_creation_progress(
 
 
 async def _autoscale_cluster(
-    app: FastAPI, cluster: Cluster, auto_scaling_mode: BaseAutoscaling
-) -> Cluster:
+    app: FastAPI,
+    cluster: Cluster,
+    auto_scaling_mode: BaseAutoscaling,
+    wanted_reserve: collections.Counter[str],
+) -> tuple[Cluster, collections.Counter[str]]:
+    """returns the scaled cluster and the demand, i.e. the number of machines per instance type
+    taken into service (activated or started) for the tasks"""
     # 1. check if we have pending tasks and resolve them by activating some drained nodes
     unrunnable_tasks = await auto_scaling_mode.list_unrunnable_tasks(app)
     _logger.info("found %s unrunnable tasks", len(unrunnable_tasks))
@@ -873,6 +836,11 @@ async def _autoscale_cluster(
     queued_or_missing_instance_tasks, cluster = await _assign_tasks_to_current_cluster(
         app, unrunnable_tasks, cluster, auto_scaling_mode
     )
+    demand = collections.Counter(
+        i.ec2_instance.type
+        for i in itertools.chain(cluster.drained_nodes, cluster.reserve_drained_nodes)
+        if i.assigned_tasks
+    )
     # 2. try to activate drained nodes to cover some of the tasks
     cluster = await _activate_drained_nodes(app, cluster, auto_scaling_mode)
 
@@ -880,8 +848,10 @@ async def _autoscale_cluster(
     app_settings = get_application_settings(app)
     assert app_settings.AUTOSCALING_EC2_INSTANCES  # nosec
     if queued_or_missing_instance_tasks or (
-        len(cluster.reserve_drained_nodes)
-        < app_settings.AUTOSCALING_EC2_INSTANCES.EC2_INSTANCES_MACHINES_BUFFER
+        wanted_reserve
+        - collections.Counter(
+            i.ec2_instance.type for i in cluster.reserve_drained_nodes
+        )
     ):
         if (
             cluster.total_number_of_machines()
@@ -891,9 +861,14 @@ async def _autoscale_cluster(
                 "%s unrunnable tasks could not be assigned, slowly trying to scale up...",
                 len(queued_or_missing_instance_tasks),
             )
-            cluster = await _scale_up_cluster(
-                app, cluster, queued_or_missing_instance_tasks, auto_scaling_mode
+            cluster, tasks_demand = await _scale_up_cluster(
+                app,
+                cluster,
+                queued_or_missing_instance_tasks,
+                auto_scaling_mode,
+                wanted_reserve,
             )
+            demand.update(tasks_demand)
 
     elif (
         len(queued_or_missing_instance_tasks) == len(unrunnable_tasks) == 0
@@ -908,7 +883,7 @@ async def _autoscale_cluster(
         cluster = await _deactivate_empty_nodes(app, cluster)
         cluster = await _try_scale_down_cluster(app, cluster)
 
-    return cluster
+    return cluster, demand
 
 
 async def _notify_autoscaling_status(
@@ -938,17 +913,48 @@ async def _notify_autoscaling_status(
 
 
 async def auto_scale_cluster(
-    *, app: FastAPI, auto_scaling_mode: BaseAutoscaling
+    *,
+    app: FastAPI,
+    auto_scaling_mode: BaseAutoscaling,
+    cluster_snapshot: ClusterSnapshot | None = None,
+    metrics: AutoscalingMetrics | None = None,
+    instances_prewarming: InstancesPrewarming | None = None,
 ) -> None:
     """Check that there are no pending tasks requiring additional resources in the cluster (docker swarm)
     If there are such tasks, this method will allocate new machines in AWS to cope with
     the additional load.
-    """
 
-    cluster = await _analyze_current_cluster(app, auto_scaling_mode)
-    cluster = await _cleanup_disconnected_nodes(app, cluster)
-    cluster = await _try_attach_pending_ec2s(app, cluster, auto_scaling_mode)
-
-    cluster = await _autoscale_cluster(app, cluster, auto_scaling_mode)
-    await _notify_machine_creation_progress(app, cluster, auto_scaling_mode)
-    await _notify_autoscaling_status(app, cluster, auto_scaling_mode)
+    NOTE: without cluster_snapshot, the docker nodes are fully listed
+    NOTE: without instances_prewarming, only the constant reserve of machines is kept warm
+    """
+    if metrics is None:
+        metrics = AutoscalingMetrics.disabled()
+
+    with metrics.observe_tick():
+        with metrics.observe_phase("forecast"):
+            warm_buffer = (
+                await instances_prewarming.get_warm_buffer()
+                if instances_prewarming
+                else collections.Counter()
+            )
+        wanted_reserve = _get_wanted_reserve(app, warm_buffer)
+        with metrics.observe_phase("analyze"):
+            cluster = await _analyze_current_cluster(
+                app, auto_scaling_mode, cluster_snapshot, wanted_reserve
+            )
+        with metrics.observe_phase("cleanup"):
+            cluster = await _cleanup_disconnected_nodes(app, cluster)
+        with metrics.observe_phase("attach"):
+            cluster = await _try_attach_pending_ec2s(
+                app, cluster, auto_scaling_mode, wanted_reserve
+            )
+        with metrics.observe_phase("scale"):
+            cluster, demand = await _autoscale_cluster(
+                app, cluster, auto_scaling_mode, wanted_reserve
+            )
+        if instances_prewarming:
+            with metrics.observe_phase("record"):
+                await instances_prewarming.record_demand(demand)
+        with metrics.observe_phase("notify"):
+            await _notify_machine_creation_progress(app, cluster, auto_scaling_mode)
+            await _notify_autoscaling_status(app, cluster, auto_scaling_mode)
@@ -19,6 +19,11 @@ class BaseAutoscaling(ABC):  # pragma: no cover
     async def get_monitored_nodes(app: FastAPI) -> list[DockerNode]:
         ...
 
+    @staticmethod
+    @abstractmethod
+    def is_monitored_node(app: FastAPI, node: DockerNode) -> bool:
+        ...
+
     @staticmethod
     @abstractmethod
     def get_ec2_tags(app: FastAPI) -> EC2Tags:
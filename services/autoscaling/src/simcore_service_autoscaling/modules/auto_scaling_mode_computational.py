@@ -48,6 +48,11 @@ class ComputationalAutoscaling(BaseAutoscaling):
     async def get_monitored_nodes(app: FastAPI) -> list[Node]:
         return await utils_docker.get_worker_nodes(get_docker_client(app))
 
+    @staticmethod
+    def is_monitored_node(app: FastAPI, node: Node) -> bool:
+        assert app  # nosec
+        return utils_docker.is_worker_node(node)
+
     @staticmethod
     def get_ec2_tags(app: FastAPI) -> EC2Tags:
         app_settings = get_application_settings(app)
@@ -23,6 +23,15 @@ class DynamicAutoscaling(BaseAutoscaling):
             node_labels=app_settings.AUTOSCALING_NODES_MONITORING.NODES_MONITORING_NODE_LABELS,
         )
 
+    @staticmethod
+    def is_monitored_node(app: FastAPI, node: Node) -> bool:
+        app_settings = get_application_settings(app)
+        assert app_settings.AUTOSCALING_NODES_MONITORING  # nosec
+        return utils_docker.is_monitored_node(
+            node,
+            node_labels=app_settings.AUTOSCALING_NODES_MONITORING.NODES_MONITORING_NODE_LABELS,
+        )
+
     @staticmethod
     def get_ec2_tags(app: FastAPI) -> EC2Tags:
         app_settings = get_application_settings(app)
@@ -0,0 +1,110 @@
+import contextlib
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+from fastapi import FastAPI
+from prometheus_client import REGISTRY, Gauge, Histogram
+
+from ..core.settings import get_application_settings
+
+_DURATION_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, float("inf"))
+
+
+@dataclass(frozen=True)
+class AutoscalingMetrics:
+    tick_duration: Histogram | None
+    phase_duration: Histogram | None
+    demand_forecast: Gauge | None
+    demand_forecast_error: Gauge | None
+    warm_buffer_machines: Gauge | None
+
+    @classmethod
+    def create(cls, app: FastAPI) -> "AutoscalingMetrics":
+        app_settings = get_application_settings(app)
+        if not app_settings.AUTOSCALING_PROMETHEUS_INSTRUMENTATION_ENABLED:
+            return cls.disabled()
+        # NOTE: the collectors of the default registry are unregistered
+        # on shutdown by the prometheus instrumentation
+        return cls(
+            tick_duration=Histogram(
+                name="autoscaling_tick_duration_seconds",
+                documentation="Time needed to check and scale the cluster",
+                buckets=_DURATION_BUCKETS,
+                registry=REGISTRY,
+            ),
+            phase_duration=Histogram(
+                name="autoscaling_tick_phase_duration_seconds",
+                documentation="Time needed by each phase of checking and scaling the cluster",
+                labelnames=("phase",),
+                buckets=_DURATION_BUCKETS,
+                registry=REGISTRY,
+            ),
+            demand_forecast=Gauge(
+                name="autoscaling_demand_forecast_machines",
+                documentation="Forecasted number of machines needed until a new machine is ready",
+                labelnames=("instance_type",),
+                registry=REGISTRY,
+            ),
+            demand_forecast_error=Gauge(
+                name="autoscaling_demand_forecast_error_machines",
+                documentation="Smoothed absolute error of the forecasted number of machines needed per resource check",
+                labelnames=("instance_type",),
+                registry=REGISTRY,
+            ),
+            warm_buffer_machines=Gauge(
+                name="autoscaling_warm_buffer_machines",
+                documentation="Number of drained machines kept warm for the forecasted demand",
+                labelnames=("instance_type",),
+                registry=REGISTRY,
+            ),
+        )
+
+    @classmethod
+    def disabled(cls) -> "AutoscalingMetrics":
+        return cls(
+            tick_duration=None,
+            phase_duration=None,
+            demand_forecast=None,
+            demand_forecast_error=None,
+            warm_buffer_machines=None,
+        )
+
+    @contextlib.contextmanager
+    def observe_tick(self) -> Iterator[None]:
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            if self.tick_duration:
+                self.tick_duration.observe(time.monotonic() - start)
+
+    @contextlib.contextmanager
+    def observe_phase(self, phase: str) -> Iterator[None]:
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            if self.phase_duration:
+                self.phase_duration.labels(phase=phase).observe(
+                    time.monotonic() - start
+                )
+
+    def observe_demand_forecast(
+        self,
+        instance_type: str,
+        *,
+        forecast: float,
+        forecast_error: float,
+        warm_machines: int,
+    ) -> None:
+        if self.demand_forecast:
+            self.demand_forecast.labels(instance_type=instance_type).set(forecast)
+        if self.demand_forecast_error:
+            self.demand_forecast_error.labels(instance_type=instance_type).set(
+                forecast_error
+            )
+        if self.warm_buffer_machines:
+            self.warm_buffer_machines.labels(instance_type=instance_type).set(
+                warm_machines
+            )
@@ -10,6 +10,10 @@ from ..core.settings import ApplicationSettings
 from .auto_scaling_core import auto_scale_cluster
 from .auto_scaling_mode_computational import ComputationalAutoscaling
 from .auto_scaling_mode_dynamic import DynamicAutoscaling
+from .auto_scaling_monitoring import AutoscalingMetrics
+from .cluster_snapshot import ClusterSnapshot
+from .docker import get_docker_client
+from .instances_prewarming import DEMAND_HISTORY_FORMAT_VERSION, InstancesPrewarming
 from .redis import get_redis_client
 
 _TASK_NAME = "Autoscaling EC2 instances"
@@ -20,10 +24,10 @@ logger = logging.getLogger(__name__)
 def on_app_startup(app: FastAPI) -> Callable[[], Awaitable[None]]:
     async def _startup() -> None:
         app_settings: ApplicationSettings = app.state.settings
-        lock_key_parts = [app.title, app.version]
+        mode_key_parts: list = []
         lock_value = ""
         if app_settings.AUTOSCALING_NODES_MONITORING:
-            lock_key_parts += [
+            mode_key_parts += [
                 "dynamic",
                 app_settings.AUTOSCALING_NODES_MONITORING.NODES_MONITORING_NODE_LABELS,
             ]
@@ -33,16 +37,32 @@ def on_app_startup(app: FastAPI) -> Callable[[], Awaitable[None]]:
                 }
             )
         elif app_settings.AUTOSCALING_DASK:
-            lock_key_parts += [
+            mode_key_parts += [
                 "computational",
                 app_settings.AUTOSCALING_DASK.DASK_MONITORING_URL,
             ]
             lock_value = json.dumps(
                 {"scheduler_url": app_settings.AUTOSCALING_DASK.DASK_MONITORING_URL}
             )
-        lock_key = ":".join(f"{k}" for k in lock_key_parts)
+        lock_key = ":".join(f"{k}" for k in [app.title, app.version, *mode_key_parts])
         assert lock_key  # nosec
         assert lock_value  # nosec
+        # NOTE: the demand history is kept across versions of the service, not of its format
+        demand_history_key = ":".join(
+            f"{k}"
+            for k in [
+                app.title,
+                *mode_key_parts,
+                "demand_history",
+                DEMAND_HISTORY_FORMAT_VERSION,
+            ]
+        )
+        metrics = AutoscalingMetrics.create(app)
+        app.state.cluster_snapshot = cluster_snapshot = ClusterSnapshot(
+            get_docker_client(app),
+            resync_ticks=app_settings.AUTOSCALING_CLUSTER_SNAPSHOT_RESYNC_TICKS,
+        )
+        await cluster_snapshot.start()
         app.state.autoscaler_task = start_periodic_task(
             exclusive(get_redis_client(app), lock_key=lock_key, lock_value=lock_value)(
                 auto_scale_cluster
@@ -53,6 +73,11 @@ def on_app_startup(app: FastAPI) -> Callable[[], Awaitable[None]]:
             auto_scaling_mode=DynamicAutoscaling()
             if app_settings.AUTOSCALING_NODES_MONITORING is not None
             else ComputationalAutoscaling(),
+            cluster_snapshot=cluster_snapshot,
+            metrics=metrics,
+            instances_prewarming=InstancesPrewarming.create(
+                app, key=demand_history_key, metrics=metrics
+            ),
         )
 
     return _startup
@@ -61,6 +86,7 @@ def on_app_startup(app: FastAPI) -> Callable[[], Awaitable[None]]:
 def on_app_shutdown(app: FastAPI) -> Callable[[], Awaitable[None]]:
     async def _stop() -> None:
         await stop_periodic_task(app.state.autoscaler_task)
+        await app.state.cluster_snapshot.stop()
 
     return _stop
 
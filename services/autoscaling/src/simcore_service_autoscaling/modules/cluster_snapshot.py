@@ -0,0 +1,147 @@
+""" In-memory snapshot of the docker nodes monitored by the autoscaling
+
+Listing (and parsing) all the nodes of a big swarm at every autoscaling tick is expensive.
+Instead, the snapshot follows the docker node events and only the nodes that changed since
+the previous tick are inspected. The monitored nodes are fully listed again:
+- every AUTOSCALING_CLUSTER_SNAPSHOT_RESYNC_TICKS ticks,
+- when a node unknown to the snapshot changed (e.g. a new node joined the swarm),
+- when the docker events stream was interrupted (events might have been missed).
+
+NOTE: the docker events are only received by the manager nodes of the swarm
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any, Final
+
+import aiodocker
+from models_library.generated_models.docker_rest_api import Node
+from pydantic import PositiveInt, parse_obj_as
+from servicelib.logging_utils import log_catch
+from servicelib.utils import logged_gather
+
+from .docker import AutoscalingDocker
+
+_logger = logging.getLogger(__name__)
+
+_NODE_EVENTS_FILTERS: Final[str] = json.dumps({"type": ["node"]})
+_EVENTS_RECONNECT_DELAY_S: Final[float] = 5
+_MAX_CONCURRENT_NODE_INSPECTIONS: Final[int] = 20
+
+
+class ClusterSnapshot:
+    def __init__(
+        self, docker_client: AutoscalingDocker, *, resync_ticks: PositiveInt
+    ) -> None:
+        self._docker_client = docker_client
+        self._resync_ticks = resync_ticks
+        self._nodes: dict[str, Node] = {}
+        self._changed_node_ids: set[str] = set()
+        self._resync_needed = True
+        self._ticks_since_resync = 0
+        self._events_task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        self._events_task = asyncio.create_task(
+            self._consume_node_events(), name="autoscaling docker node events"
+        )
+
+    async def stop(self) -> None:
+        if self._events_task:
+            self._events_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._events_task
+            self._events_task = None
+
+    def _on_node_event(self, event: dict[str, Any]) -> None:
+        node_id = event.get("Actor", {}).get("ID")
+        if not node_id:
+            return
+        if node_id in self._nodes:
+            self._changed_node_ids.add(node_id)
+        elif event.get("Action") != "remove":
+            # e.g. a new node, or a node that just got the monitored labels
+            self._resync_needed = True
+
+    async def _consume_node_events(self) -> None:
+        while True:
+            subscriber = self._docker_client.events.subscribe(create_task=False)
+            events_stream = asyncio.create_task(
+                self._docker_client.events.run(filters=_NODE_EVENTS_FILTERS)
+            )
+            # NOTE: events might have been missed until the stream is up
+            self._resync_needed = True
+            try:
+                # NOTE: None is published when the stream ends (error or closed)
+                while (event := await subscriber.get()) is not None:
+                    self._on_node_event(event)
+            finally:
+                events_stream.cancel()
+                with log_catch(_logger, reraise=False), contextlib.suppress(
+                    asyncio.CancelledError
+                ):
+                    await events_stream
+                del subscriber
+            _logger.warning(
+                "docker node events stream interrupted, reconnecting in %ss",
+                _EVENTS_RECONNECT_DELAY_S,
+            )
+            self._resync_needed = True
+            await asyncio.sleep(_EVENTS_RECONNECT_DELAY_S)
+
+    async def _inspect_node(self, node_id: str) -> Node | None:
+        try:
+            return parse_obj_as(
+                Node, await self._docker_client.nodes.inspect(node_id=node_id)
+            )
+        except aiodocker.DockerError as err:
+            if err.status == 404:  # noqa: PLR2004
+                return None
+            raise
+
+    async def _update_changed_nodes(
+        self, is_monitored_node: Callable[[Node], bool]
+    ) -> None:
+        changed_node_ids = list(self._changed_node_ids)
+        self._changed_node_ids.clear()
+        inspected_nodes = await logged_gather(
+            *(self._inspect_node(node_id) for node_id in changed_node_ids),
+            log=_logger,
+            max_concurrency=_MAX_CONCURRENT_NODE_INSPECTIONS,
+        )
+        for node_id, node in zip(changed_node_ids, inspected_nodes, strict=True):
+            if node is None or not is_monitored_node(node):
+                # NOTE: removed, or no longer matching the monitored labels/role
+                self._nodes.pop(node_id, None)
+            else:
+                self._nodes[node_id] = node
+
+    async def get_monitored_nodes(
+        self,
+        list_monitored_nodes: Callable[[], Awaitable[list[Node]]],
+        is_monitored_node: Callable[[Node], bool],
+    ) -> list[Node]:
+        """returns the monitored nodes, listed with `list_monitored_nodes` when a full resync is needed
+
+        `is_monitored_node` applies the same selection as `list_monitored_nodes` to the changed nodes
+        """
+        try:
+            if self._resync_needed or self._ticks_since_resync >= self._resync_ticks:
+                # NOTE: events received while listing are applied at the next tick
+                self._resync_needed = False
+                self._changed_node_ids.clear()
+                self._nodes = {
+                    node.ID: node for node in await list_monitored_nodes() if node.ID
+                }
+                self._ticks_since_resync = 0
+                _logger.debug("listed %s monitored nodes", len(self._nodes))
+            else:
+                await self._update_changed_nodes(is_monitored_node)
+                self._ticks_since_resync += 1
+        except Exception:
+            self._resync_needed = True
+            raise
+        return list(self._nodes.values())
@@ -0,0 +1,181 @@
+""" Pre-warming of machines for the forecasted demand
+
+The demand of machines per instance type is recorded in redis at every resource check,
+so that the history survives restarts of the autoscaling. Additional drained machines are
+then kept warm in the reserve for the demand forecasted until a new machine would be ready
+(i.e. EC2_INSTANCES_MAX_START_TIME), so that bursts of tasks do not wait for new machines.
+
+NOTE: only the autoscaling instance holding the exclusive lock records the demand
+"""
+
+import collections
+import dataclasses
+import datetime
+import json
+import logging
+import math
+from typing import Final
+
+import arrow
+import redis.asyncio as aioredis
+from fastapi import FastAPI
+from pydantic import NonNegativeInt
+from servicelib.logging_utils import log_catch
+
+from ..core.settings import get_application_settings
+from ..utils.demand_forecast import (
+    DemandHistory,
+    compute_warm_buffer,
+    forecast_demand_rate,
+    update_demand_history,
+)
+from .auto_scaling_monitoring import AutoscalingMetrics
+from .redis import get_redis_client
+
+_logger = logging.getLogger(__name__)
+
+# NOTE: keeps at least one week of history for the seasonal baselines
+_DEMAND_HISTORY_TTL: Final[datetime.timedelta] = datetime.timedelta(days=14)
+# NOTE: to bump whenever the stored demand history is not compatible anymore
+DEMAND_HISTORY_FORMAT_VERSION: Final[str] = "v1"
+
+
+def _dump_history(history: DemandHistory) -> str:
+    return json.dumps(dataclasses.asdict(history))
+
+
+def _load_history(value: str) -> DemandHistory | None:
+    try:
+        data = json.loads(value)
+        return DemandHistory(
+            level=float(data["level"]),
+            error=float(data["error"]),
+            seasonal_levels={
+                int(hour): float(level)
+                for hour, level in data["seasonal_levels"].items()
+            },
+        )
+    except (ValueError, TypeError, KeyError, AttributeError):
+        _logger.warning("Ignoring invalid demand history %s", value, exc_info=True)
+        return None
+
+
+class InstancesPrewarming:
+    def __init__(
+        self,
+        redis_client: aioredis.Redis,
+        *,
+        key: str,
+        instance_types: list[str],
+        smoothing: float,
+        horizon: datetime.timedelta,
+        check_interval: datetime.timedelta,
+        max_prewarmed_machines: NonNegativeInt,
+        metrics: AutoscalingMetrics,
+    ) -> None:
+        self._redis_client = redis_client
+        self._key = key
+        self._instance_types = instance_types
+        self._smoothing = smoothing
+        self._horizon = horizon
+        # number of resource checks until a new machine is ready
+        self._horizon_checks = max(1, math.ceil(horizon / check_interval))
+        self._max_prewarmed_machines = max_prewarmed_machines
+        self._metrics = metrics
+        self._histories: dict[str, DemandHistory] = {}
+        # NOTE: the stored history is only overwritten once it was read
+        self._is_history_loaded = False
+        self._warm_buffer: collections.Counter[str] = collections.Counter()
+
+    @classmethod
+    def create(
+        cls, app: FastAPI, *, key: str, metrics: AutoscalingMetrics
+    ) -> "InstancesPrewarming | None":
+        """returns None if pre-warming is disabled by settings"""
+        app_settings = get_application_settings(app)
+        assert app_settings.AUTOSCALING_EC2_INSTANCES  # nosec
+        ec2_instances_settings = app_settings.AUTOSCALING_EC2_INSTANCES
+        if ec2_instances_settings.EC2_INSTANCES_MAX_PREWARMED_MACHINES == 0:
+            return None
+        return cls(
+            get_redis_client(app).redis,
+            key=key,
+            instance_types=list(ec2_instances_settings.EC2_INSTANCES_ALLOWED_TYPES),
+            smoothing=ec2_instances_settings.EC2_INSTANCES_PREWARMING_SMOOTHING_FACTOR,
+            horizon=ec2_instances_settings.EC2_INSTANCES_MAX_START_TIME,
+            check_interval=app_settings.AUTOSCALING_POLL_INTERVAL,
+            max_prewarmed_machines=ec2_instances_settings.EC2_INSTANCES_MAX_PREWARMED_MACHINES,
+            metrics=metrics,
+        )
+
+    async def get_warm_buffer(self) -> collections.Counter[str]:
+        """returns the number of machines per instance type to keep warm for the forecasted demand
+
+        NOTE: if the history cannot be read, the previous warm buffer is kept
+        and the demand is not recorded
+        """
+        self._is_history_loaded = False
+        with log_catch(_logger, reraise=False):
+            stored_histories: dict[str, str] = await self._redis_client.hgetall(
+                self._key
+            )
+            self._histories = {
+                instance_type: history
+                for instance_type, value in stored_histories.items()
+                if instance_type in self._instance_types
+                and (history := _load_history(value)) is not None
+            }
+            self._is_history_loaded = True
+            forecast_time = arrow.utcnow().datetime + self._horizon
+            forecasts = {
+                instance_type: forecast_demand_rate(history, at=forecast_time)
+                * self._horizon_checks
+                for instance_type, history in self._histories.items()
+            }
+            self._warm_buffer = compute_warm_buffer(
+                forecasts, max_machines=self._max_prewarmed_machines
+            )
+            for instance_type in self._instance_types:
+                self._metrics.observe_demand_forecast(
+                    instance_type,
+                    forecast=forecasts.get(instance_type, 0),
+                    forecast_error=self._histories.get(
+                        instance_type, DemandHistory()
+                    ).error,
+                    warm_machines=self._warm_buffer[instance_type],
+                )
+            if self._warm_buffer:
+                _logger.info(
+                    "keeping %s warm for the forecasted demand",
+                    f"{dict(self._warm_buffer)}",
+                )
+        return self._warm_buffer
+
+    async def record_demand(self, demand: collections.Counter[str]) -> None:
+        """records the number of machines per instance type taken into service for the tasks"""
+        if not self._is_history_loaded:
+            _logger.warning(
+                "demand history could not be read, skipping recording the demand"
+            )
+            return
+        now = arrow.utcnow().datetime
+        self._histories = {
+            instance_type: update_demand_history(
+                self._histories.get(instance_type, DemandHistory()),
+                demand[instance_type],
+                now=now,
+                smoothing=self._smoothing,
+            )
+            for instance_type in self._instance_types
+        }
+        with log_catch(_logger, reraise=False):
+            async with self._redis_client.pipeline(transaction=True) as pipe:
+                pipe.hset(
+                    self._key,
+                    mapping={
+                        instance_type: _dump_history(history)
+                        for instance_type, history in self._histories.items()
+                    },
+                )
+                pipe.expire(self._key, _DEMAND_HISTORY_TTL)
+                await pipe.execute()
@@ -1,20 +1,13 @@
-import functools
 import logging
 import re
 from typing import Final
 
-from aws_library.ec2.models import (
-    EC2InstanceBootSpecific,
-    EC2InstanceData,
-    EC2InstanceType,
-)
+from aws_library.ec2.models import EC2InstanceBootSpecific, EC2InstanceData
 from models_library.generated_models.docker_rest_api import Node
-from types_aiobotocore_ec2.literals import InstanceTypeType
 
-from ..core.errors import Ec2InstanceInvalidError, Ec2InvalidDnsNameError
+from ..core.errors import Ec2InvalidDnsNameError
 from ..core.settings import ApplicationSettings
 from ..models import AssociatedInstance
-from ..modules.auto_scaling_mode_base import BaseAutoscaling
 from . import utils_docker
 
 _EC2_INTERNAL_DNS_RE: Final[re.Pattern] = re.compile(r"^(?P<host_name>ip-[^.]+).*$")
@@ -55,9 +48,12 @@ async def associate_ec2_instances_with_nodes(
     associated_instances: list[AssociatedInstance] = []
     non_associated_instances: list[EC2InstanceData] = []
 
-    def _find_node_with_name(node: Node) -> bool:
+    nodes_by_host_name: dict[str, Node] = {}
+    for node in nodes:
         assert node.Description  # nosec
-        return bool(node.Description.Hostname == docker_node_name)
+        if node.Description.Hostname:
+            # NOTE: the first node with a given host name is used
+            nodes_by_host_name.setdefault(node.Description.Hostname, node)
 
     for instance_data in ec2_instances:
         try:
@@ -67,7 +63,7 @@ async def associate_ec2_instances_with_nodes(
             non_associated_instances.append(instance_data)
             continue
 
-        if node := next(iter(filter(_find_node_with_name, nodes)), None):
+        if node := nodes_by_host_name.get(docker_node_name):
             associated_instances.append(
                 AssociatedInstance(node=node, ec2_instance=instance_data)
             )
@@ -102,49 +98,3 @@ async def ec2_startup_script(
             )
 
     return " && ".join(startup_commands)
-
-
-def _instance_type_by_type_name(
-    ec2_type: EC2InstanceType, *, type_name: InstanceTypeType | None
-) -> bool:
-    if type_name is None:
-        return True
-    return bool(ec2_type.name == type_name)
-
-
-def find_selected_instance_type_for_task(
-    instance_type_name: InstanceTypeType,
-    available_ec2_types: list[EC2InstanceType],
-    auto_scaling_mode: BaseAutoscaling,
-    task,
-) -> EC2InstanceType:
-    filtered_instances = list(
-        filter(
-            functools.partial(
-                _instance_type_by_type_name, type_name=instance_type_name
-            ),
-            available_ec2_types,
-        )
-    )
-    if not filtered_instances:
-        msg = (
-            f"Task {task} requires an unauthorized EC2 instance type."
-            f"Asked for {instance_type_name}, authorized are {available_ec2_types}. Please check!"
-        )
-        raise Ec2InstanceInvalidError(msg=msg)
-
-    assert len(filtered_instances) == 1  # nosec
-    selected_instance = filtered_instances[0]
-
-    # check that the assigned resources and the machine resource fit
-    if (
-        auto_scaling_mode.get_task_required_resources(task)
-        > selected_instance.resources
-    ):
-        msg = (
-            f"Task {task} requires more resources than the selected instance provides."
-            f" Asked for {selected_instance}, but task needs {auto_scaling_mode.get_task_required_resources(task)}. Please check!"
-        )
-        raise Ec2InstanceInvalidError(msg=msg)
-
-    return selected_instance
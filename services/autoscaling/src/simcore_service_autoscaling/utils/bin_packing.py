@@ -0,0 +1,266 @@
+""" Placement of the pending tasks on the instances of the cluster (bin-packing)
+
+- tasks are placed by decreasing required resources (best-fit decreasing),
+- a task goes to the instance it fills best (i.e. the one left with the least unused resources),
+- the free resources of the instances are kept as columns indexed by instance type, so that
+  a task restricted to a type only looks at the instances of that type and full instances are skipped,
+- the needed new instances are planned the same way: first on the already planned instances,
+  otherwise on a new instance of the best fitting type (first-fit decreasing).
+
+NOTE: these are pure functions (no I/O), they can be benchmarked offline against recorded clusters
+"""
+
+import logging
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from typing import Any, TypeAlias
+
+from aws_library.ec2.models import EC2InstanceType, Resources
+from types_aiobotocore_ec2.literals import InstanceTypeType
+
+from ..core.errors import Ec2InstanceInvalidError, Ec2InstanceNotFoundError
+from ..models import (
+    AssignedTasksToInstanceType,
+    AssociatedInstance,
+    NonAssociatedInstance,
+)
+from . import utils_ec2
+
+_logger = logging.getLogger(__name__)
+
+_Instance: TypeAlias = (
+    AssociatedInstance | NonAssociatedInstance | AssignedTasksToInstanceType
+)
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class PlacementTask:
+    task: Any
+    required_resources: Resources
+    required_instance_type: InstanceTypeType | None
+
+
+def _get_instance_type(instance: _Instance) -> tuple[InstanceTypeType, Resources]:
+    if isinstance(instance, AssignedTasksToInstanceType):
+        return instance.instance_type.name, instance.instance_type.resources
+    return instance.ec2_instance.type, instance.ec2_instance.resources
+
+
+def _ratio(value: float, total: float) -> float:
+    return value / total if total > 0 else 0
+
+
+@dataclass(slots=True)
+class _CapacityIndex:
+    """free resources of instances of the same type, as columns"""
+
+    total_resources: Resources
+    instances: list[_Instance] = field(default_factory=list)
+    free_cpus: list[float] = field(default_factory=list)
+    free_ram: list[int] = field(default_factory=list)
+    max_free_cpus: float = 0
+    max_free_ram: int = 0
+
+    def add(self, instance: _Instance) -> None:
+        self.instances.append(instance)
+        self.free_cpus.append(instance.available_resources.cpus)
+        self.free_ram.append(instance.available_resources.ram)
+        self.max_free_cpus = max(self.max_free_cpus, self.free_cpus[-1])
+        self.max_free_ram = max(self.max_free_ram, self.free_ram[-1])
+
+    def best_fit(self, resources: Resources) -> tuple[float, int] | None:
+        """returns (score, column) of the instance the task fills best, lower score is better"""
+        if resources.cpus > self.max_free_cpus or resources.ram > self.max_free_ram:
+            return None
+        best: tuple[float, int] | None = None
+        for column, (free_cpus, free_ram) in enumerate(
+            zip(self.free_cpus, self.free_ram, strict=True)
+        ):
+            if free_cpus < resources.cpus or free_ram < resources.ram:
+                continue
+            score = _ratio(
+                free_cpus - resources.cpus, self.total_resources.cpus
+            ) + _ratio(free_ram - resources.ram, self.total_resources.ram)
+            if best is None or score < best[0]:
+                best = (score, column)
+                if score == 0:
+                    # cannot fit better
+                    break
+        return best
+
+    def assign(self, column: int, task: PlacementTask) -> None:
+        instance = self.instances[column]
+        instance.assign_task(task.task, task.required_resources)
+        previous_free_cpus = self.free_cpus[column]
+        previous_free_ram = self.free_ram[column]
+        self.free_cpus[column] -= task.required_resources.cpus
+        self.free_ram[column] -= task.required_resources.ram
+        if previous_free_cpus == self.max_free_cpus:
+            self.max_free_cpus = max(self.free_cpus)
+        if previous_free_ram == self.max_free_ram:
+            self.max_free_ram = max(self.free_ram)
+        _logger.debug(
+            "assigned task with %s, %s to %s, remaining resources:%s/%s",
+            f"{task.required_resources=}",
+            f"{task.required_instance_type=}",
+            instance,
+            instance.available_resources,
+            self.total_resources,
+        )
+
+
+def _create_capacity_indexes(
+    instances: Iterable[_Instance],
+) -> dict[InstanceTypeType, _CapacityIndex]:
+    capacity_indexes: dict[InstanceTypeType, _CapacityIndex] = {}
+    for instance in instances:
+        type_name, total_resources = _get_instance_type(instance)
+        capacity_indexes.setdefault(type_name, _CapacityIndex(total_resources)).add(
+            instance
+        )
+    return capacity_indexes
+
+
+def _try_assign_task(
+    task: PlacementTask, capacity_indexes: dict[InstanceTypeType, _CapacityIndex]
+) -> bool:
+    if task.required_instance_type:
+        candidate_indexes = (
+            [capacity_indexes[task.required_instance_type]]
+            if task.required_instance_type in capacity_indexes
+            else []
+        )
+    else:
+        candidate_indexes = list(capacity_indexes.values())
+
+    best: tuple[float, int, _CapacityIndex] | None = None
+    for capacity_index in candidate_indexes:
+        if (fit := capacity_index.best_fit(task.required_resources)) and (
+            best is None or fit[0] < best[0]
+        ):
+            best = (*fit, capacity_index)
+    if best is None:
+        return False
+    _, column, capacity_index = best
+    capacity_index.assign(column, task)
+    return True
+
+
+def _sorted_by_decreasing_resources(tasks: list[PlacementTask]) -> list[int]:
+    # NOTE: cpus and ram are weighted relative to the biggest needs
+    max_cpus = max((t.required_resources.cpus for t in tasks), default=0)
+    max_ram = max((t.required_resources.ram for t in tasks), default=0)
+    # NOTE: the sort is stable, tasks with the same needs keep their order (i.e. FIFO)
+    return sorted(
+        range(len(tasks)),
+        key=lambda i: _ratio(tasks[i].required_resources.cpus, max_cpus)
+        + _ratio(tasks[i].required_resources.ram, max_ram),
+        reverse=True,
+    )
+
+
+def assign_tasks_to_instances(
+    tasks: list[PlacementTask], instances_by_priority: Sequence[Iterable[_Instance]]
+) -> list[PlacementTask]:
+    """assigns the tasks to the instances (modified in place). A task goes to the
+    first group of instances (e.g. active nodes before pending ones) that can run it.
+
+    Returns the tasks that could not be assigned, in their original order
+    """
+    capacity_indexes_by_priority = [
+        _create_capacity_indexes(instances) for instances in instances_by_priority
+    ]
+    unassigned_task_indices = [
+        i
+        for i in _sorted_by_decreasing_resources(tasks)
+        if not any(
+            _try_assign_task(tasks[i], capacity_indexes)
+            for capacity_indexes in capacity_indexes_by_priority
+        )
+    ]
+    return [tasks[i] for i in sorted(unassigned_task_indices)]
+
+
+def _find_new_instance_type(
+    task: PlacementTask,
+    available_ec2_types: list[EC2InstanceType],
+    best_fitting_types_cache: dict[tuple[float, int], EC2InstanceType],
+) -> EC2InstanceType:
+    """
+    Raises:
+        Ec2InstanceInvalidError: if the task requires a type that is not available or too small
+        Ec2InstanceNotFoundError: if no available type can run the task
+    """
+    if task.required_instance_type:
+        selected_instance = next(
+            (i for i in available_ec2_types if i.name == task.required_instance_type),
+            None,
+        )
+        if selected_instance is None:
+            msg = (
+                f"Task {task.task} requires an unauthorized EC2 instance type."
+                f"Asked for {task.required_instance_type}, authorized are {available_ec2_types}. Please check!"
+            )
+            raise Ec2InstanceInvalidError(msg=msg)
+        if task.required_resources > selected_instance.resources:
+            msg = (
+                f"Task {task.task} requires more resources than the selected instance provides."
+                f" Asked for {selected_instance}, but task needs {task.required_resources}. Please check!"
+            )
+            raise Ec2InstanceInvalidError(msg=msg)
+        return selected_instance
+
+    # NOTE: pending tasks usually come by many with the same needs
+    cache_key = (task.required_resources.cpus, task.required_resources.ram)
+    if cache_key not in best_fitting_types_cache:
+        best_fitting_types_cache[cache_key] = utils_ec2.find_best_fitting_ec2_instance(
+            available_ec2_types,
+            task.required_resources,
+            score_type=utils_ec2.closest_instance_policy,
+        )
+    return best_fitting_types_cache[cache_key]
+
+
+def find_needed_instances(
+    tasks: list[PlacementTask], available_ec2_types: list[EC2InstanceType]
+) -> list[AssignedTasksToInstanceType]:
+    """returns the new instances needed to run the tasks, with their assigned tasks.
+    Tasks that no available instance type can run are logged and skipped.
+    """
+    needed_new_instances: list[AssignedTasksToInstanceType] = []
+    capacity_indexes: dict[InstanceTypeType, _CapacityIndex] = {}
+    best_fitting_types_cache: dict[tuple[float, int], EC2InstanceType] = {}
+    for i in _sorted_by_decreasing_resources(tasks):
+        task = tasks[i]
+        # first check if we can assign the task to one of the newly tobe created instances
+        if _try_assign_task(task, capacity_indexes):
+            continue
+
+        # so we need to find what we can create now
+        try:
+            instance_type = _find_new_instance_type(
+                task, available_ec2_types, best_fitting_types_cache
+            )
+        except Ec2InstanceNotFoundError:
+            _logger.exception(
+                "Task %s needs more resources than any EC2 instance "
+                "can provide with the current configuration. Please check!",
+                f"{task.task}",
+            )
+            continue
+        except Ec2InstanceInvalidError:
+            _logger.exception("Unexpected error:")
+            continue
+
+        new_instance = AssignedTasksToInstanceType(
+            instance_type=instance_type,
+            available_resources=instance_type.resources,
+        )
+        needed_new_instances.append(new_instance)
+        capacity_index = capacity_indexes.setdefault(
+            instance_type.name, _CapacityIndex(instance_type.resources)
+        )
+        capacity_index.add(new_instance)
+        capacity_index.assign(len(capacity_index.instances) - 1, task)
+
+    return needed_new_instances
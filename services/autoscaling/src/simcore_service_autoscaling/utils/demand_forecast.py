@@ -0,0 +1,87 @@
+""" Short-horizon forecast of the demand of machines per EC2 instance type
+
+The demand of an instance type is the number of its machines taken into service
+(drained machines activated or new machines started) for the tasks at each resource check.
+The demand rate is forecasted by:
+- an exponentially smoothed level of the demand (follows the recent trend),
+- seasonal baselines, a slowly smoothed level per hour of the week (anticipates the
+  recurring bursts, e.g. the start of a course every monday morning).
+
+The forecast is the largest of both, so that the warm buffer is ready before a recurring burst.
+"""
+
+import collections
+import datetime
+import math
+from dataclasses import dataclass, field, replace
+from typing import Final
+
+_HOURS_PER_WEEK: Final[int] = 7 * 24
+# NOTE: the seasonal baselines are updated at every check of their hour of the week
+# (e.g. 360 times with a 10s polling interval), they therefore need a much smaller factor
+_SEASONAL_SMOOTHING_FACTOR: Final[float] = 0.01
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class DemandHistory:
+    level: float = 0
+    error: float = 0
+    seasonal_levels: dict[int, float] = field(default_factory=dict)
+
+
+def hour_of_week(when: datetime.datetime) -> int:
+    return when.weekday() * 24 + when.hour
+
+
+def forecast_demand_rate(history: DemandHistory, *, at: datetime.datetime) -> float:
+    """returns the forecasted number of machines needed per resource check at the given time"""
+    return max(history.level, history.seasonal_levels.get(hour_of_week(at), 0))
+
+
+def update_demand_history(
+    history: DemandHistory,
+    demand: int,
+    *,
+    now: datetime.datetime,
+    smoothing: float,
+) -> DemandHistory:
+    """updates the history with the demand of the current resource check
+
+    the error is the smoothed absolute error of the forecast made for the current check
+    """
+    forecast_error = abs(demand - forecast_demand_rate(history, at=now))
+    current_hour = hour_of_week(now)
+    seasonal_level = history.seasonal_levels.get(current_hour, 0)
+    return replace(
+        history,
+        level=history.level + smoothing * (demand - history.level),
+        error=history.error + smoothing * (forecast_error - history.error),
+        seasonal_levels=history.seasonal_levels
+        | {
+            current_hour: seasonal_level
+            + _SEASONAL_SMOOTHING_FACTOR * (demand - seasonal_level)
+        },
+    )
+
+
+def compute_warm_buffer(
+    forecasts: dict[str, float], *, max_machines: int
+) -> collections.Counter[str]:
+    """returns the number of machines per instance type to keep warm for the forecasted
+    demand, the most demanded types are kept first when the forecast exceeds max_machines
+
+    :param forecasts: forecasted number of machines needed per instance type
+    """
+    warm_buffer: collections.Counter[str] = collections.Counter()
+    for instance_type, forecast in sorted(
+        forecasts.items(), key=lambda item: item[1], reverse=True
+    ):
+        # NOTE: a fractional machine is only kept warm when it is more likely needed than not
+        num_machines = min(
+            math.floor(forecast + 0.5), max_machines - warm_buffer.total()
+        )
+        if num_machines <= 0:
+            break
+        warm_buffer[instance_type] = num_machines
+    assert warm_buffer.total() <= max_machines  # nosec
+    return warm_buffer
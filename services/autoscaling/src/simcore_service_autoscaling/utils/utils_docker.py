@@ -25,6 +25,7 @@ from models_library.generated_models.docker_rest_api import (
     Availability,
     Node,
     NodeState,
+    Role,
     Service,
     Task,
     TaskState,
@@ -72,6 +73,12 @@ async def get_monitored_nodes(
     )
 
 
+def is_monitored_node(node: Node, node_labels: list[DockerLabelKey]) -> bool:
+    """True if get_monitored_nodes lists the node"""
+    labels = (node.Spec.Labels if node.Spec else None) or {}
+    return all(labels.get(label) == "true" for label in node_labels)
+
+
 async def get_worker_nodes(docker_client: AutoscalingDocker) -> list[Node]:
     return parse_obj_as(
         list[Node],
@@ -79,6 +86,11 @@ async def get_worker_nodes(docker_client: AutoscalingDocker) -> list[Node]:
     )
 
 
+def is_worker_node(node: Node) -> bool:
+    """True if get_worker_nodes lists the node"""
+    return bool(node.Spec and node.Spec.Role == Role.worker)
+
+
 async def remove_nodes(
     docker_client: AutoscalingDocker, *, nodes: list[Node], force: bool = False
 ) -> list[Node]:
@@ -7,6 +7,7 @@
 
 import asyncio
 import base64
+import collections
 import datetime
 from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
 from copy import deepcopy
@@ -43,6 +44,7 @@ from simcore_service_autoscaling.modules.auto_scaling_core import (
     _activate_drained_nodes,
     _deactivate_empty_nodes,
     _find_terminateable_instances,
+    _split_reserve_drained_nodes,
     _try_scale_down_cluster,
     auto_scale_cluster,
 )
@@ -1233,3 +1235,20 @@ async def test__activate_drained_nodes_with_drained_node(
         },
         available=True,
     )
+
+
+def test__split_reserve_drained_nodes_per_instance_type(
+    fake_node: Node, fake_ec2_instance_data: Callable[..., EC2InstanceData]
+):
+    drained_nodes = [
+        AssociatedInstance(
+            node=fake_node, ec2_instance=fake_ec2_instance_data(type=instance_type)
+        )
+        for instance_type in ["t2.xlarge", "r5n.4xlarge", "t2.xlarge", "t2.xlarge"]
+    ]
+    remaining_drained_nodes, reserve_drained_nodes = _split_reserve_drained_nodes(
+        drained_nodes, collections.Counter({"t2.xlarge": 2, "r5n.8xlarge": 1})
+    )
+    # a machine of another type does not count in the reserve of a type
+    assert reserve_drained_nodes == [drained_nodes[0], drained_nodes[2]]
+    assert remaining_drained_nodes == [drained_nodes[1], drained_nodes[3]]
@@ -0,0 +1,155 @@
+# pylint: disable=protected-access
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-argument
+# pylint: disable=unused-variable
+
+from collections.abc import Callable
+from unittest import mock
+
+import aiodocker
+import pytest
+from models_library.generated_models.docker_rest_api import Node as DockerNode
+from simcore_service_autoscaling.modules.cluster_snapshot import ClusterSnapshot
+
+_RESYNC_TICKS = 3
+
+
+@pytest.fixture
+def mock_docker_client() -> mock.MagicMock:
+    docker_client = mock.MagicMock()
+    docker_client.nodes.inspect = mock.AsyncMock()
+    return docker_client
+
+
+@pytest.fixture
+def cluster_snapshot(mock_docker_client: mock.MagicMock) -> ClusterSnapshot:
+    return ClusterSnapshot(mock_docker_client, resync_ticks=_RESYNC_TICKS)
+
+
+def _node_event(node: DockerNode, action: str) -> dict:
+    return {"Type": "node", "Action": action, "Actor": {"ID": node.ID}}
+
+
+def _is_any_node(node: DockerNode) -> bool:
+    return True
+
+
+def _is_monitored_node(node: DockerNode) -> bool:
+    return bool(node.Spec and node.Spec.Labels and node.Spec.Labels.get("monitored"))
+
+
+async def test_cluster_snapshot_follows_node_events(
+    cluster_snapshot: ClusterSnapshot,
+    mock_docker_client: mock.MagicMock,
+    create_fake_node: Callable[..., DockerNode],
+):
+    nodes = [create_fake_node() for _ in range(3)]
+    list_monitored_nodes = mock.AsyncMock(return_value=nodes)
+
+    assert (
+        await cluster_snapshot.get_monitored_nodes(list_monitored_nodes, _is_any_node)
+        == nodes
+    )
+    list_monitored_nodes.assert_called_once()
+    list_monitored_nodes.reset_mock()
+
+    # only the changed nodes are inspected
+    assert (
+        await cluster_snapshot.get_monitored_nodes(list_monitored_nodes, _is_any_node)
+        == nodes
+    )
+    mock_docker_client.nodes.inspect.assert_not_called()
+
+    updated_node = nodes[1].copy(update={"UpdatedAt": "now"})
+    mock_docker_client.nodes.inspect.return_value = updated_node.dict(by_alias=True)
+    cluster_snapshot._on_node_event(_node_event(nodes[1], "update"))
+    assert await cluster_snapshot.get_monitored_nodes(
+        list_monitored_nodes, _is_any_node
+    ) == [
+        nodes[0],
+        updated_node,
+        nodes[2],
+    ]
+    mock_docker_client.nodes.inspect.assert_called_once_with(node_id=nodes[1].ID)
+    mock_docker_client.nodes.inspect.reset_mock()
+
+    # removed nodes are gone
+    mock_docker_client.nodes.inspect.side_effect = aiodocker.DockerError(
+        404, {"message": "node not found"}
+    )
+    cluster_snapshot._on_node_event(_node_event(nodes[2], "remove"))
+    assert await cluster_snapshot.get_monitored_nodes(
+        list_monitored_nodes, _is_any_node
+    ) == [
+        nodes[0],
+        updated_node,
+    ]
+    list_monitored_nodes.assert_not_called()
+
+    # the nodes are listed again after some ticks
+    assert (
+        await cluster_snapshot.get_monitored_nodes(list_monitored_nodes, _is_any_node)
+        == nodes
+    )
+    list_monitored_nodes.assert_called_once()
+
+
+async def test_cluster_snapshot_resyncs_on_unknown_node(
+    cluster_snapshot: ClusterSnapshot,
+    mock_docker_client: mock.MagicMock,
+    create_fake_node: Callable[..., DockerNode],
+):
+    nodes = [create_fake_node()]
+    list_monitored_nodes = mock.AsyncMock(return_value=nodes)
+    await cluster_snapshot.get_monitored_nodes(list_monitored_nodes, _is_any_node)
+
+    new_node = create_fake_node()
+    cluster_snapshot._on_node_event(_node_event(new_node, "create"))
+    list_monitored_nodes.return_value = [*nodes, new_node]
+    assert await cluster_snapshot.get_monitored_nodes(
+        list_monitored_nodes, _is_any_node
+    ) == [
+        *nodes,
+        new_node,
+    ]
+    assert list_monitored_nodes.call_count == 2
+    mock_docker_client.nodes.inspect.assert_not_called()
+
+    # a failed listing is retried at the next tick
+    list_monitored_nodes.side_effect = RuntimeError("docker is down")
+    cluster_snapshot._on_node_event(_node_event(create_fake_node(), "update"))
+    with pytest.raises(RuntimeError):
+        await cluster_snapshot.get_monitored_nodes(list_monitored_nodes, _is_any_node)
+    list_monitored_nodes.side_effect = None
+    await cluster_snapshot.get_monitored_nodes(list_monitored_nodes, _is_any_node)
+    assert list_monitored_nodes.call_count == 4
+
+
+async def test_cluster_snapshot_drops_nodes_no_longer_monitored(
+    cluster_snapshot: ClusterSnapshot,
+    mock_docker_client: mock.MagicMock,
+    create_fake_node: Callable[..., DockerNode],
+):
+    nodes = [create_fake_node() for _ in range(2)]
+    for node in nodes:
+        assert node.Spec
+        node.Spec.Labels = {"monitored": "true"}
+    list_monitored_nodes = mock.AsyncMock(return_value=nodes)
+    assert (
+        await cluster_snapshot.get_monitored_nodes(
+            list_monitored_nodes, _is_monitored_node
+        )
+        == nodes
+    )
+
+    # the monitored labels were removed from a node
+    assert nodes[1].Spec
+    unlabelled_node = nodes[1].copy(
+        update={"Spec": nodes[1].Spec.copy(update={"Labels": {}})}
+    )
+    mock_docker_client.nodes.inspect.return_value = unlabelled_node.dict(by_alias=True)
+    cluster_snapshot._on_node_event(_node_event(nodes[1], "update"))
+    assert await cluster_snapshot.get_monitored_nodes(
+        list_monitored_nodes, _is_monitored_node
+    ) == [nodes[0]]
+    list_monitored_nodes.assert_called_once()
@@ -0,0 +1,150 @@
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-argument
+# pylint: disable=unused-variable
+
+import collections
+import datetime
+from collections.abc import Callable
+from unittest import mock
+
+import pytest
+import redis.exceptions
+from fakeredis.aioredis import FakeRedis
+from pytest_mock import MockerFixture
+from simcore_service_autoscaling.modules.auto_scaling_monitoring import (
+    AutoscalingMetrics,
+)
+from simcore_service_autoscaling.modules.instances_prewarming import InstancesPrewarming
+
+
+@pytest.fixture
+def fake_redis() -> FakeRedis:
+    return FakeRedis(decode_responses=True)
+
+
+@pytest.fixture
+def create_instances_prewarming(
+    fake_redis: FakeRedis,
+) -> Callable[[], InstancesPrewarming]:
+    def _creator() -> InstancesPrewarming:
+        return InstancesPrewarming(
+            fake_redis,
+            key="autoscaling:demand_history",
+            instance_types=["t2.xlarge", "r5n.4xlarge"],
+            smoothing=0.5,
+            horizon=datetime.timedelta(minutes=3),
+            check_interval=datetime.timedelta(minutes=1),
+            max_prewarmed_machines=4,
+            metrics=AutoscalingMetrics.disabled(),
+        )
+
+    return _creator
+
+
+async def test_instances_prewarming_keeps_machines_warm_for_the_forecasted_demand(
+    create_instances_prewarming: Callable[[], InstancesPrewarming],
+    fake_redis: FakeRedis,
+):
+    instances_prewarming = create_instances_prewarming()
+    assert await instances_prewarming.get_warm_buffer() == collections.Counter()
+
+    for _ in range(10):
+        await instances_prewarming.get_warm_buffer()
+        await instances_prewarming.record_demand(
+            collections.Counter({"t2.xlarge": 1, "g4dn.xlarge": 3})
+        )
+    # 1 machine per check during the 3 checks needed to start a machine
+    assert await instances_prewarming.get_warm_buffer() == collections.Counter(
+        {"t2.xlarge": 3}
+    )
+    assert set(await fake_redis.hkeys("autoscaling:demand_history")) == {
+        "t2.xlarge",
+        "r5n.4xlarge",
+    }
+    assert await fake_redis.ttl("autoscaling:demand_history") > 0
+
+    # the history survives a restart, the warm buffer is capped
+    instances_prewarming = create_instances_prewarming()
+    for _ in range(10):
+        await instances_prewarming.get_warm_buffer()
+        await instances_prewarming.record_demand(
+            collections.Counter({"t2.xlarge": 1, "r5n.4xlarge": 1})
+        )
+    assert await instances_prewarming.get_warm_buffer() == collections.Counter(
+        {"t2.xlarge": 3, "r5n.4xlarge": 1}
+    )
+
+
+async def test_instances_prewarming_keeps_warm_buffer_when_redis_fails(
+    create_instances_prewarming: Callable[[], InstancesPrewarming],
+    fake_redis: FakeRedis,
+    mocker: MockerFixture,
+):
+    instances_prewarming = create_instances_prewarming()
+    for _ in range(10):
+        await instances_prewarming.get_warm_buffer()
+        await instances_prewarming.record_demand(
+            collections.Counter({"r5n.4xlarge": 1})
+        )
+    warm_buffer = await instances_prewarming.get_warm_buffer()
+    assert warm_buffer == collections.Counter({"r5n.4xlarge": 3})
+
+    mocker.patch.object(
+        fake_redis, "hgetall", side_effect=redis.exceptions.ConnectionError
+    )
+    assert await instances_prewarming.get_warm_buffer() == warm_buffer
+
+
+async def test_instances_prewarming_keeps_history_when_redis_fails_after_restart(
+    create_instances_prewarming: Callable[[], InstancesPrewarming],
+    fake_redis: FakeRedis,
+):
+    instances_prewarming = create_instances_prewarming()
+    for _ in range(10):
+        await instances_prewarming.get_warm_buffer()
+        await instances_prewarming.record_demand(
+            collections.Counter({"r5n.4xlarge": 1})
+        )
+    stored_histories = await fake_redis.hgetall("autoscaling:demand_history")
+
+    # the history cannot be read by the restarted autoscaling
+    restarted_instances_prewarming = create_instances_prewarming()
+    with mock.patch.object(
+        fake_redis, "hgetall", side_effect=redis.exceptions.ConnectionError
+    ):
+        assert (
+            await restarted_instances_prewarming.get_warm_buffer()
+            == collections.Counter()
+        )
+        await restarted_instances_prewarming.record_demand(collections.Counter())
+    assert await fake_redis.hgetall("autoscaling:demand_history") == stored_histories
+    assert await restarted_instances_prewarming.get_warm_buffer() == (
+        collections.Counter({"r5n.4xlarge": 3})
+    )
+
+
+async def test_instances_prewarming_ignores_invalid_history(
+    create_instances_prewarming: Callable[[], InstancesPrewarming],
+    fake_redis: FakeRedis,
+):
+    instances_prewarming = create_instances_prewarming()
+    for _ in range(10):
+        await instances_prewarming.get_warm_buffer()
+        await instances_prewarming.record_demand(
+            collections.Counter({"r5n.4xlarge": 1})
+        )
+    await fake_redis.hset("autoscaling:demand_history", "t2.xlarge", "not a history")
+
+    # the valid histories are still used, the invalid one starts again
+    restarted_instances_prewarming = create_instances_prewarming()
+    assert (
+        await restarted_instances_prewarming.get_warm_buffer()
+        == collections.Counter({"r5n.4xlarge": 3})
+    )
+    await restarted_instances_prewarming.record_demand(
+        collections.Counter({"r5n.4xlarge": 1})
+    )
+    assert (
+        await fake_redis.hget("autoscaling:demand_history", "t2.xlarge")
+        != "not a history"
+    )
@@ -0,0 +1,139 @@
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-argument
+# pylint: disable=unused-variable
+
+from collections.abc import Callable
+
+import pytest
+from aws_library.ec2.models import EC2InstanceData, EC2InstanceType, Resources
+from pydantic import ByteSize
+from simcore_service_autoscaling.models import NonAssociatedInstance
+from simcore_service_autoscaling.utils.bin_packing import (
+    PlacementTask,
+    assign_tasks_to_instances,
+    find_needed_instances,
+)
+
+_GiB = 1024 * 1024 * 1024
+
+
+@pytest.fixture
+def available_ec2_types() -> list[EC2InstanceType]:
+    return [
+        EC2InstanceType(
+            name="t2.xlarge", resources=Resources(cpus=4, ram=ByteSize(16 * _GiB))
+        ),
+        EC2InstanceType(
+            name="t2.2xlarge", resources=Resources(cpus=8, ram=ByteSize(32 * _GiB))
+        ),
+        EC2InstanceType(
+            name="r5n.8xlarge", resources=Resources(cpus=32, ram=ByteSize(256 * _GiB))
+        ),
+    ]
+
+
+@pytest.fixture
+def create_instance(
+    fake_ec2_instance_data: Callable[..., EC2InstanceData],
+    available_ec2_types: list[EC2InstanceType],
+) -> Callable[[str], NonAssociatedInstance]:
+    def _creator(type_name: str) -> NonAssociatedInstance:
+        instance_type = next(i for i in available_ec2_types if i.name == type_name)
+        return NonAssociatedInstance(
+            ec2_instance=fake_ec2_instance_data(
+                type=type_name, resources=instance_type.resources
+            )
+        )
+
+    return _creator
+
+
+def _create_task(
+    name: str, cpus: float, ram_gib: int, instance_type: str | None = None
+) -> PlacementTask:
+    return PlacementTask(
+        task=name,
+        required_resources=Resources(cpus=cpus, ram=ByteSize(ram_gib * _GiB)),
+        required_instance_type=instance_type,
+    )
+
+
+def test_assign_tasks_to_instances_fills_instances_best(
+    create_instance: Callable[[str], NonAssociatedInstance],
+):
+    small_instance = create_instance("t2.xlarge")
+    big_instance = create_instance("t2.2xlarge")
+    tasks = [
+        _create_task("small", 1, 1),
+        _create_task("too_big", 16, 1),
+        _create_task("large", 6, 16),
+        _create_task("medium", 3, 8),
+    ]
+    unassigned_tasks = assign_tasks_to_instances(
+        tasks, [[big_instance, small_instance]]
+    )
+    assert unassigned_tasks == [tasks[1]]
+    # biggest tasks are placed first, on the instance they fill best
+    assert big_instance.assigned_tasks == ["large"]
+    assert small_instance.assigned_tasks == ["medium", "small"]
+    assert small_instance.available_resources == Resources(
+        cpus=0, ram=ByteSize(7 * _GiB)
+    )
+
+
+def test_assign_tasks_to_instances_by_priority(
+    create_instance: Callable[[str], NonAssociatedInstance],
+):
+    active_instance = create_instance("t2.2xlarge")
+    pending_instance = create_instance("t2.xlarge")
+    tasks = [_create_task(f"task_{i}", 2, 2) for i in range(5)]
+    unassigned_tasks = assign_tasks_to_instances(
+        tasks, [[active_instance], [pending_instance]]
+    )
+    assert unassigned_tasks == []
+    assert active_instance.assigned_tasks == [f"task_{i}" for i in range(4)]
+    assert pending_instance.assigned_tasks == ["task_4"]
+
+    # tasks restricted to an instance type only go there
+    tasks = [_create_task("restricted", 1, 1, "t2.xlarge")]
+    assert (
+        assign_tasks_to_instances(tasks, [[active_instance], [pending_instance]]) == []
+    )
+    assert pending_instance.assigned_tasks == ["task_4", "restricted"]
+
+
+def test_find_needed_instances_packs_decreasing(
+    available_ec2_types: list[EC2InstanceType],
+):
+    # placed in their order, these tasks would need 3 instances
+    tasks = [
+        _create_task("small_0", 2, 1),
+        _create_task("large_0", 6, 1),
+        _create_task("small_1", 2, 1),
+        _create_task("large_1", 6, 1),
+    ]
+    needed_instances = find_needed_instances(tasks, available_ec2_types)
+    assert [i.instance_type.name for i in needed_instances] == [
+        "t2.2xlarge",
+        "t2.2xlarge",
+    ]
+    assert [i.assigned_tasks for i in needed_instances] == [
+        ["large_0", "small_0"],
+        ["large_1", "small_1"],
+    ]
+
+
+def test_find_needed_instances_skips_impossible_tasks(
+    available_ec2_types: list[EC2InstanceType],
+):
+    tasks = [
+        _create_task("too_big", 64, 1),
+        _create_task("unauthorized", 1, 1, "g4dn.xlarge"),
+        _create_task("too_big_for_type", 6, 1, "t2.xlarge"),
+        _create_task("restricted", 1, 1, "r5n.8xlarge"),
+        _create_task("any", 1, 1),
+    ]
+    needed_instances = find_needed_instances(tasks, available_ec2_types)
+    assert [(i.instance_type.name, i.assigned_tasks) for i in needed_instances] == [
+        ("r5n.8xlarge", ["restricted", "any"]),
+    ]
@@ -0,0 +1,64 @@
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-argument
+# pylint: disable=unused-variable
+
+import collections
+import datetime
+
+import pytest
+from simcore_service_autoscaling.utils.demand_forecast import (
+    DemandHistory,
+    compute_warm_buffer,
+    forecast_demand_rate,
+    hour_of_week,
+    update_demand_history,
+)
+
+_MONDAY_9AM = datetime.datetime(2024, 1, 8, 9, tzinfo=datetime.timezone.utc)
+
+
+def test_hour_of_week():
+    assert hour_of_week(_MONDAY_9AM) == 9
+    assert hour_of_week(_MONDAY_9AM + datetime.timedelta(days=6, hours=14)) == 167
+
+
+def test_update_demand_history_follows_the_demand():
+    history = DemandHistory()
+    for _ in range(50):
+        history = update_demand_history(history, 2, now=_MONDAY_9AM, smoothing=0.2)
+    assert history.level == pytest.approx(2, abs=1e-3)
+    # the forecast became accurate
+    assert history.error < 0.01
+    assert forecast_demand_rate(history, at=_MONDAY_9AM) == pytest.approx(2, abs=1e-3)
+
+    # without demand, the level decays but the seasonal baseline remains
+    later = _MONDAY_9AM + datetime.timedelta(hours=2)
+    for _ in range(50):
+        history = update_demand_history(history, 0, now=later, smoothing=0.2)
+    assert history.level == pytest.approx(0, abs=1e-3)
+    assert forecast_demand_rate(history, at=later) == history.level
+    next_week = _MONDAY_9AM + datetime.timedelta(weeks=1)
+    assert forecast_demand_rate(history, at=next_week) == pytest.approx(
+        history.seasonal_levels[9]
+    )
+    assert history.seasonal_levels[9] > 0
+
+
+@pytest.mark.parametrize(
+    "forecasts, max_machines, expected_warm_buffer",
+    [
+        ({}, 5, {}),
+        ({"t2.xlarge": 0.4}, 5, {}),
+        ({"t2.xlarge": 0.6, "r5n.4xlarge": 2.2}, 5, {"t2.xlarge": 1, "r5n.4xlarge": 2}),
+        ({"t2.xlarge": 3.7, "r5n.4xlarge": 2.2}, 5, {"t2.xlarge": 4, "r5n.4xlarge": 1}),
+        ({"t2.xlarge": 3.7}, 0, {}),
+    ],
+)
+def test_compute_warm_buffer(
+    forecasts: dict[str, float],
+    max_machines: int,
+    expected_warm_buffer: dict[str, int],
+):
+    assert compute_warm_buffer(
+        forecasts, max_machines=max_machines
+    ) == collections.Counter(expected_warm_buffer)
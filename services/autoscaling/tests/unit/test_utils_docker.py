@@ -53,8 +53,10 @@ from simcore_service_autoscaling.utils.utils_docker import (
     get_new_node_docker_tags,
     get_node_total_resources,
     get_worker_nodes,
+    is_monitored_node,
     is_node_osparc_ready,
     is_node_ready_and_available,
+    is_worker_node,
     pending_service_tasks_with_insufficient_resources,
     remove_nodes,
     set_node_availability,
@@ -113,6 +115,7 @@ async def test_get_monitored_nodes(
     monitored_nodes = await get_monitored_nodes(autoscaling_docker, node_labels=[])
     assert len(monitored_nodes) == 1
     assert monitored_nodes[0] == host_node
+    assert is_monitored_node(host_node, node_labels=[])
 
 
 async def test_get_monitored_nodes_with_invalid_label(
@@ -120,10 +123,12 @@ async def test_get_monitored_nodes_with_invalid_label(
     host_node: Node,
     faker: Faker,
 ):
+    node_labels = faker.pylist(allowed_types=(str,))
     monitored_nodes = await get_monitored_nodes(
-        autoscaling_docker, node_labels=faker.pylist(allowed_types=(str,))
+        autoscaling_docker, node_labels=node_labels
     )
     assert len(monitored_nodes) == 0
+    assert not is_monitored_node(host_node, node_labels=node_labels)
 
 
 async def test_get_monitored_nodes_with_valid_label(
@@ -136,6 +141,7 @@ async def test_get_monitored_nodes_with_valid_label(
     await create_node_labels(labels)
     monitored_nodes = await get_monitored_nodes(autoscaling_docker, node_labels=labels)
     assert len(monitored_nodes) == 1
+    assert is_monitored_node(monitored_nodes[0], node_labels=labels)
 
     # this is the host node with some keys slightly changed
     EXCLUDED_KEYS = {
@@ -155,6 +161,7 @@ async def test_worker_nodes(
 ):
     worker_nodes = await get_worker_nodes(autoscaling_docker)
     assert not worker_nodes
+    assert not is_worker_node(host_node)
 
 
 async def test_remove_monitored_down_nodes_with_empty_list_does_nothing(
@@ -26,6 +26,7 @@ from yarl import URL
 
 from ..dask_utils import TaskPublisher
 from ..file_utils import pull_file_from_remote, push_file_to_remote
+from ..inputs_cache import InputsCacheStats
 from ..settings import Settings
 from .docker_utils import (
     create_container_config,
@@ -57,6 +58,7 @@ class ComputationalSidecar:
         self,
         task_volumes: TaskSharedVolumes,
         integration_version: version.Version,
+        settings: Settings,
     ) -> None:
         input_data_file = (
             task_volumes.inputs_folder
@@ -64,6 +66,7 @@ class ComputationalSidecar:
         )
         local_input_data_file = {}
         download_tasks = []
+        inputs_cache_stats = InputsCacheStats()
 
         for input_key, input_params in self.task_parameters.input_data.items():
             if isinstance(input_params, FileUrl):
@@ -87,12 +90,17 @@ class ComputationalSidecar:
                         destination_path,
                         self._publish_sidecar_log,
                         self.s3_settings,
+                        part_size=settings.SIDECAR_DOWNLOAD_PART_SIZE,
+                        max_concurrent_parts=settings.SIDECAR_DOWNLOAD_MAX_CONCURRENT_PARTS_PER_FILE,
+                        inputs_cache_stats=inputs_cache_stats,
                     )
                 )
             else:
                 local_input_data_file[input_key] = input_params
         await asyncio.gather(*download_tasks)
         input_data_file.write_text(json.dumps(local_input_data_file))
+        if inputs_cache_stats.hits or inputs_cache_stats.misses:
+            await self._publish_sidecar_log(f"{inputs_cache_stats}")
 
         await self._publish_sidecar_log("All the input data were downloaded.")
 
@@ -204,7 +212,7 @@ class ComputationalSidecar:
                 labels=self.task_parameters.labels,
             )
             await self._write_input_data(
-                task_volumes, image_labels.get_integration_version()
+                task_volumes, image_labels.get_integration_version(), settings
             )
             await progress_bar.update()  # NOTE:  (1 step weighting 5%)
             # PROCESSING (1 step weighted 90%)
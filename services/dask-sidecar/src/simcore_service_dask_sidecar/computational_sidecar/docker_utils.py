@@ -1,9 +1,14 @@
 import asyncio
 import contextlib
+import datetime
+import itertools
 import logging
+import operator
 import re
 import socket
+import time
 from collections.abc import AsyncGenerator, AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass, field
 from pathlib import Path
 from pprint import pformat
 from typing import Any, Final, cast
@@ -27,6 +32,7 @@ from models_library.services_resources import BootMode
 from models_library.utils.labels_annotations import OSPARC_LABEL_PREFIXES, from_labels
 from packaging import version
 from pydantic import ByteSize, parse_obj_as
+from servicelib.background_task import periodic_task
 from servicelib.logging_utils import (
     LogLevelInt,
     LogMessageStr,
@@ -174,24 +180,129 @@ async def _try_parse_progress(
     return None
 
 
-async def _parse_and_publish_logs(
-    log_line: str,
+_LOGS_BATCH_INTERVAL: Final[datetime.timedelta] = datetime.timedelta(seconds=0.5)
+_LOGS_BATCH_MAX_SIZE: Final[int] = 64 * 1024
+_LOGS_MAX_LINES_PER_S: Final[int] = 5000
+_LOGS_MAX_BURST_LINES: Final[int] = 50000
+
+
+@dataclass(kw_only=True)
+class _LogsBatcher:
+    """Publishes the logs of the container in batches (bounded in time and size)
+    and its progress at most once per batch
+
+    NOTE: to protect the dask pub/sub and the message broker from very chatty services,
+    the lines exceeding the rate limit are not published (they are still in the logs file)
+    """
+
+    task_publishers: TaskPublisher
+    progress_regexp: re.Pattern[str]
+    progress_bar: ProgressBarData
+    published_lines: int = 0
+    dropped_lines: int = 0
+    _pending: list[tuple[LogLevelInt, LogMessageStr]] = field(default_factory=list)
+    _pending_size: int = 0
+    _pending_dropped_lines: int = 0
+    _progress_value: float | None = None
+    _allowed_lines: float = _LOGS_MAX_BURST_LINES
+    _allowed_lines_updated_at: float = field(default_factory=time.monotonic)
+
+    def _consume_allowed_line(self) -> bool:
+        now = time.monotonic()
+        self._allowed_lines = min(
+            _LOGS_MAX_BURST_LINES,
+            self._allowed_lines
+            + (now - self._allowed_lines_updated_at) * _LOGS_MAX_LINES_PER_S,
+        )
+        self._allowed_lines_updated_at = now
+        if self._allowed_lines < 1:
+            return False
+        self._allowed_lines -= 1
+        return True
+
+    async def add(self, log_line: str) -> None:
+        progress_value = await _try_parse_progress(
+            log_line, progress_regexp=self.progress_regexp
+        )
+        if progress_value is not None:
+            self._progress_value = progress_value
+
+        if not self._consume_allowed_line():
+            self._pending_dropped_lines += 1
+            return
+        message = log_line.rstrip("\n")
+        self._pending.append((guess_message_log_level(message), message))
+        self._pending_size += len(message)
+        if self._pending_size >= _LOGS_BATCH_MAX_SIZE:
+            await self.flush()
+
+    async def flush(self) -> None:
+        pending, self._pending, self._pending_size = self._pending, [], 0
+        # NOTE: consecutive lines of the same level are published together
+        for log_level, level_pending in itertools.groupby(
+            pending, key=operator.itemgetter(0)
+        ):
+            messages = [message for _, message in level_pending]
+            self.task_publishers.publish_logs(
+                message="\n".join(messages), log_level=log_level
+            )
+            self.published_lines += len(messages)
+
+        if self._pending_dropped_lines:
+            self.task_publishers.publish_logs(
+                message=f"[sidecar] {self._pending_dropped_lines} log lines were skipped (too many logs), "
+                "the complete logs are available in the service log file",
+                log_level=logging.WARNING,
+            )
+            self.dropped_lines += self._pending_dropped_lines
+            self._pending_dropped_lines = 0
+
+        if self._progress_value is not None:
+            progress_value, self._progress_value = self._progress_value, None
+            await self.progress_bar.set_(round(progress_value * 100.0))
+
+
+@contextlib.asynccontextmanager
+async def _managed_logs_batcher(
     *,
     task_publishers: TaskPublisher,
     progress_regexp: re.Pattern[str],
     progress_bar: ProgressBarData,
-) -> None:
-    progress_value = await _try_parse_progress(
-        log_line, progress_regexp=progress_regexp
+    container_name: str,
+) -> AsyncIterator[_LogsBatcher]:
+    logs_batcher = _LogsBatcher(
+        task_publishers=task_publishers,
+        progress_regexp=progress_regexp,
+        progress_bar=progress_bar,
     )
-    if progress_value is not None:
-        await progress_bar.set_(round(progress_value * 100.0))
-
-    task_publishers.publish_logs(
-        message=log_line, log_level=guess_message_log_level(log_line)
+    async with periodic_task(
+        logs_batcher.flush,
+        interval=_LOGS_BATCH_INTERVAL,
+        task_name=f"{container_name}_logs_batcher",
+    ):
+        yield logs_batcher
+    await logs_batcher.flush()
+    logger.log(
+        logging.WARNING if logs_batcher.dropped_lines else logging.DEBUG,
+        "%s: published %s log lines, skipped %s",
+        container_name,
+        logs_batcher.published_lines,
+        logs_batcher.dropped_lines,
     )
 
 
+_CONTAINER_START_CHECK_INTERVAL_S: Final[float] = 1
+_LOG_FILE_READ_INTERVAL_S: Final[float] = 0.5
+
+
+async def _wait_for_container_exit(container: DockerContainer) -> None:
+    # NOTE: the monitoring starts before the container, and waiting
+    # on a container that is not yet started returns immediately
+    while (await container.show())["State"]["Status"] == "created":
+        await asyncio.sleep(_CONTAINER_START_CHECK_INTERVAL_S)
+    await container.wait()
+
+
 async def _parse_container_log_file(  # noqa: PLR0913 # pylint: disable=too-many-arguments
     *,
     container: DockerContainer,
@@ -212,39 +323,49 @@ async def _parse_container_log_file(  # noqa: PLR0913 # pylint: disable=too-many
         logging.DEBUG,
         "started monitoring of pre-1.0 service - using log file in /logs folder",
     ):
-        async with aiofiles.open(log_file, mode="rt") as file_pointer:
-            while (await container.show())["State"]["Running"]:
-                if line := await file_pointer.readline():
+        container_exit_task = asyncio.create_task(
+            _wait_for_container_exit(container),
+            name=f"{container_name}_wait_for_container_exit",
+        )
+        try:
+            async with aiofiles.open(
+                log_file, mode="rt"
+            ) as file_pointer, _managed_logs_batcher(
+                task_publishers=task_publishers,
+                progress_regexp=progress_regexp,
+                progress_bar=progress_bar,
+                container_name=container_name,
+            ) as logs_batcher:
+                while not container_exit_task.done():
+                    if line := await file_pointer.readline():
+                        logger.info(
+                            "[%s]: %s",
+                            f"{service_key}:{service_version} - {container.id}{container_name}",
+                            line,
+                        )
+                        await logs_batcher.add(line)
+                    else:
+                        await asyncio.wait(
+                            {container_exit_task}, timeout=_LOG_FILE_READ_INTERVAL_S
+                        )
+
+                # finish reading the logs if possible
+                async for line in file_pointer:
                     logger.info(
                         "[%s]: %s",
                         f"{service_key}:{service_version} - {container.id}{container_name}",
                         line,
                     )
-                    await _parse_and_publish_logs(
-                        line,
-                        task_publishers=task_publishers,
-                        progress_regexp=progress_regexp,
-                        progress_bar=progress_bar,
-                    )
-
-            # finish reading the logs if possible
-            async for line in file_pointer:
-                logger.info(
-                    "[%s]: %s",
-                    f"{service_key}:{service_version} - {container.id}{container_name}",
-                    line,
-                )
-                await _parse_and_publish_logs(
-                    line,
-                    task_publishers=task_publishers,
-                    progress_regexp=progress_regexp,
-                    progress_bar=progress_bar,
-                )
-
-            # copy the log file to the log_file_url
-            await push_file_to_remote(
-                log_file, log_file_url, log_publishing_cb, s3_settings
-            )
+                    await logs_batcher.add(line)
+        finally:
+            container_exit_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await container_exit_task
+
+        # copy the log file to the log_file_url
+        await push_file_to_remote(
+            log_file, log_file_url, log_publishing_cb, s3_settings
+        )
 
 
 async def _parse_container_docker_logs(
@@ -269,7 +390,14 @@ async def _parse_container_docker_logs(
                 / f"{service_key.split(sep='/')[-1]}_{service_version}.logs"
             )
             log_file_path.parent.mkdir(parents=True, exist_ok=True)
-            async with aiofiles.open(log_file_path, mode="wb+") as log_fp:
+            async with aiofiles.open(
+                log_file_path, mode="wb+"
+            ) as log_fp, _managed_logs_batcher(
+                task_publishers=task_publishers,
+                progress_regexp=progress_regexp,
+                progress_bar=progress_bar,
+                container_name=container_name,
+            ) as logs_batcher:
                 async for log_line in cast(
                     AsyncGenerator[str, None],
                     container.log(
@@ -284,12 +412,7 @@ async def _parse_container_docker_logs(
                     )
                     await log_fp.write(log_line.encode("utf-8"))
                     # NOTE: here we remove the timestamp, only needed for the file
-                    await _parse_and_publish_logs(
-                        log_msg_without_timestamp,
-                        task_publishers=task_publishers,
-                        progress_regexp=progress_regexp,
-                        progress_bar=progress_bar,
-                    )
+                    await logs_batcher.add(log_msg_without_timestamp)
 
             # copy the log file to the log_file_url
             await push_file_to_remote(
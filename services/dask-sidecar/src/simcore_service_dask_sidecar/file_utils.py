@@ -1,22 +1,53 @@
 import asyncio
+import contextlib
 import functools
+import hashlib
+import json
 import logging
+import math
 import mimetypes
+import shutil
+import tempfile
+import threading
 import time
 import zipfile
+from collections.abc import AsyncIterator, Iterator
 from io import BytesIO
 from pathlib import Path
 from typing import Any, Awaitable, Callable, Final, TypedDict, cast
 
 import aiofiles
 import aiofiles.tempfile
+import aiohttp
 import fsspec
-from pydantic import ByteSize, FileUrl, parse_obj_as
+from fsspec.spec import AbstractFileSystem
+from pydantic import (
+    BaseModel,
+    ByteSize,
+    FileUrl,
+    NonNegativeInt,
+    PositiveInt,
+    ValidationError,
+    parse_obj_as,
+)
 from pydantic.networks import AnyUrl
 from servicelib.logging_utils import LogLevelInt, LogMessageStr
+from servicelib.utils import logged_gather
 from settings_library.s3 import S3Settings
+from tenacity import AsyncRetrying
+from tenacity.before_sleep import before_sleep_log
+from tenacity.retry import retry_if_exception_type, retry_if_not_exception_type
+from tenacity.stop import stop_after_attempt
+from tenacity.wait import wait_exponential
 from yarl import URL
 
+from .inputs_cache import (
+    InputsCache,
+    InputsCacheStats,
+    get_cache_key,
+    get_worker_inputs_cache,
+)
+
 logger = logging.getLogger(__name__)
 
 HTTP_FILE_SYSTEM_SCHEMES: Final = ["http", "https"]
@@ -109,16 +140,379 @@ async def _copy_file(
             )
 
 
+DEFAULT_DOWNLOAD_PART_SIZE: Final[ByteSize] = parse_obj_as(ByteSize, "16MiB")
+DEFAULT_DOWNLOAD_MAX_CONCURRENT_PARTS_PER_FILE: Final[PositiveInt] = 4
+_DEFAULT_DOWNLOAD_MAX_CONCURRENT_PARTS: Final[PositiveInt] = 8
+_DOWNLOAD_BUDGET_POLL_INTERVAL_S: Final[float] = 0.05
+_DOWNLOAD_PART_MAX_ATTEMPTS: Final[int] = 5
+# NOTE: long enough for the retries of a task, partial downloads are then abandoned
+_PARTIAL_DOWNLOAD_MAX_AGE_S: Final[float] = 60 * 60
+_RANGED_DOWNLOAD_SCHEMES: Final = [*HTTP_FILE_SYSTEM_SCHEMES, *S3_FILE_SYSTEM_SCHEMES]
+
+
+class _WorkerDownloadBudget:
+    """Download concurrency and bandwidth shared by all the tasks of the dask worker
+
+    NOTE: each task runs its own event loop in its own thread, therefore
+    the budget relies on a thread lock and polling instead of asyncio primitives
+    """
+
+    def __init__(
+        self, *, max_concurrent_parts: PositiveInt, max_bandwidth: ByteSize | None
+    ) -> None:
+        self._lock = threading.Lock()
+        self._available_parts = max_concurrent_parts
+        self._max_bandwidth = max_bandwidth
+        self._next_transfer_at = time.monotonic()
+
+    def _try_acquire_part(self) -> bool:
+        with self._lock:
+            if self._available_parts == 0:
+                return False
+            self._available_parts -= 1
+            return True
+
+    def _release_part(self) -> None:
+        with self._lock:
+            self._available_parts += 1
+
+    async def _throttle(self, num_bytes: int) -> None:
+        if not self._max_bandwidth:
+            return
+        with self._lock:
+            now = time.monotonic()
+            transfer_at = max(now, self._next_transfer_at)
+            self._next_transfer_at = transfer_at + num_bytes / self._max_bandwidth
+        await asyncio.sleep(transfer_at - now)
+
+    @contextlib.asynccontextmanager
+    async def reserve(self, num_bytes: int) -> AsyncIterator[None]:
+        await self._throttle(num_bytes)
+        while not self._try_acquire_part():
+            await asyncio.sleep(_DOWNLOAD_BUDGET_POLL_INTERVAL_S)
+        try:
+            yield
+        finally:
+            self._release_part()
+
+
+_worker_download_budget = _WorkerDownloadBudget(
+    max_concurrent_parts=_DEFAULT_DOWNLOAD_MAX_CONCURRENT_PARTS, max_bandwidth=None
+)
+
+
+def setup_worker_download_budget(
+    *, max_concurrent_parts: PositiveInt, max_bandwidth: ByteSize | None
+) -> None:
+    global _worker_download_budget  # pylint: disable=global-statement
+    _worker_download_budget = _WorkerDownloadBudget(
+        max_concurrent_parts=max_concurrent_parts, max_bandwidth=max_bandwidth
+    )
+
+
+class _RangedDownloadNotSupportedError(RuntimeError):
+    ...
+
+
+class _DownloadCheckpoint(BaseModel):
+    source: str
+    etag: str | None
+    file_size: NonNegativeInt
+    part_size: PositiveInt
+    completed_parts: set[NonNegativeInt] = set()
+
+    def is_resumable_by(self, other: "_DownloadCheckpoint") -> bool:
+        return self.dict(exclude={"completed_parts"}) == other.dict(
+            exclude={"completed_parts"}
+        )
+
+
+class _WorkerPartialDownloads:
+    """Directory of the dask worker keeping the partially downloaded files
+
+    The inputs folder of a task is wiped when it (re)starts, the parts downloaded by
+    a failed task are therefore kept here so that its retry resumes the download.
+    Partial downloads older than _PARTIAL_DOWNLOAD_MAX_AGE_S are removed.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._in_use: set[str] = set()
+
+    def _remove_abandoned(self) -> None:
+        with self._lock:
+            abandoned_before = time.time() - _PARTIAL_DOWNLOAD_MAX_AGE_S
+            for path in self.path.iterdir():
+                if path.name.split(".")[0] in self._in_use:
+                    continue
+                with contextlib.suppress(FileNotFoundError):
+                    if path.stat().st_mtime < abandoned_before:
+                        path.unlink()
+
+    @contextlib.contextmanager
+    def reserve(self, key: str) -> Iterator[tuple[Path, Path] | None]:
+        """paths of the partial download and of its checkpoint,
+        None if another task is currently downloading the same file"""
+        with self._lock:
+            is_in_use = key in self._in_use
+            self._in_use.add(key)
+        if is_in_use:
+            yield None
+            return
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            self._remove_abandoned()
+            partial_path = self.path / f"{key}.partial"
+            yield partial_path, partial_path.with_name(f"{partial_path.name}.json")
+        finally:
+            with self._lock:
+                self._in_use.discard(key)
+
+
+_worker_partial_downloads = _WorkerPartialDownloads(
+    Path(tempfile.gettempdir()) / "dask-sidecar-partial-downloads"
+)
+
+
+def setup_worker_partial_downloads(path: Path) -> None:
+    global _worker_partial_downloads  # pylint: disable=global-statement
+    # NOTE: leftovers of a previous run of the worker
+    shutil.rmtree(path, ignore_errors=True)
+    _worker_partial_downloads = _WorkerPartialDownloads(path)
+
+
+def _load_download_checkpoint(checkpoint_path: Path) -> _DownloadCheckpoint | None:
+    try:
+        return _DownloadCheckpoint.parse_file(checkpoint_path)
+    except (OSError, ValidationError, json.JSONDecodeError):
+        return None
+
+
+def _write_part(file_path: Path, offset: int, data: bytes) -> None:
+    with file_path.open("r+b") as fp:
+        fp.seek(offset)
+        fp.write(data)
+
+
+async def _download_part(
+    fs: AbstractFileSystem, path: str, *, offset: int, length: int
+) -> bytes:
+    async for attempt in AsyncRetrying(
+        stop=stop_after_attempt(_DOWNLOAD_PART_MAX_ATTEMPTS),
+        wait=wait_exponential(max=10),
+        retry=retry_if_exception_type(
+            (OSError, asyncio.TimeoutError, aiohttp.ClientError)
+        )
+        & retry_if_not_exception_type(FileNotFoundError),
+        before_sleep=before_sleep_log(logger, logging.WARNING),
+        reraise=True,
+    ):
+        with attempt:
+            async with _worker_download_budget.reserve(length):
+                data: bytes = await asyncio.get_event_loop().run_in_executor(
+                    None,
+                    functools.partial(
+                        fs.cat_file, path, start=offset, end=offset + length
+                    ),
+                )
+    if len(data) != length:
+        # NOTE: the server ignored the range request
+        raise _RangedDownloadNotSupportedError
+    return data
+
+
+async def _pull_file_in_parts(
+    src_url: AnyUrl,
+    dst_path: Path,
+    *,
+    fs: AbstractFileSystem,
+    path: str,
+    file_info: dict[str, Any],
+    part_size: ByteSize,
+    max_concurrent_parts: PositiveInt,
+    log_publishing_cb: LogPublishingCB,
+    text_prefix: str,
+) -> bool:
+    """downloads the file with concurrent ranged requests, resuming from the parts
+    already downloaded by a previous attempt (e.g. a retry of the task on this worker)
+
+    Returns False if the file cannot (or does not need to) be downloaded in parts
+    """
+    file_size = file_info.get("size")
+    if not file_size or file_size <= part_size:
+        return False
+
+    checkpoint = _DownloadCheckpoint(
+        # NOTE: the query of presigned links changes at every attempt
+        source=f"{URL(src_url).with_query(None)}",
+        etag=file_info.get("ETag") or file_info.get("etag"),
+        file_size=file_size,
+        part_size=part_size,
+    )
+    partial_download_key = hashlib.sha256(
+        checkpoint.json(exclude={"completed_parts"}).encode()
+    ).hexdigest()
+    with _worker_partial_downloads.reserve(partial_download_key) as paths:
+        if paths is None:
+            return False
+        partial_path, checkpoint_path = paths
+        return await _pull_file_parts(
+            checkpoint,
+            partial_path,
+            checkpoint_path,
+            dst_path,
+            fs=fs,
+            path=path,
+            max_concurrent_parts=max_concurrent_parts,
+            log_publishing_cb=log_publishing_cb,
+            text_prefix=text_prefix,
+        )
+
+
+async def _pull_file_parts(
+    checkpoint: _DownloadCheckpoint,
+    partial_path: Path,
+    checkpoint_path: Path,
+    dst_path: Path,
+    *,
+    fs: AbstractFileSystem,
+    path: str,
+    max_concurrent_parts: PositiveInt,
+    log_publishing_cb: LogPublishingCB,
+    text_prefix: str,
+) -> bool:
+    file_size = checkpoint.file_size
+    part_size = checkpoint.part_size
+    previous_checkpoint = _load_download_checkpoint(checkpoint_path)
+    if (
+        previous_checkpoint
+        and previous_checkpoint.is_resumable_by(checkpoint)
+        and partial_path.exists()
+    ):
+        checkpoint = previous_checkpoint
+    else:
+        with partial_path.open("wb") as fp:
+            fp.truncate(file_size)
+        checkpoint_path.write_text(checkpoint.json())
+
+    num_parts = math.ceil(file_size / part_size)
+    missing_parts = [i for i in range(num_parts) if i not in checkpoint.completed_parts]
+    if len(missing_parts) < num_parts:
+        await log_publishing_cb(
+            f"{text_prefix} resuming, {num_parts - len(missing_parts)}/{num_parts} parts already downloaded",
+            logging.INFO,
+        )
+    total_data_written = sum(
+        min(part_size, file_size - i * part_size) for i in checkpoint.completed_parts
+    )
+    start_time = time.monotonic()
+
+    async def _download_and_write_part(part_index: int) -> None:
+        nonlocal total_data_written
+        offset = part_index * part_size
+        length = min(part_size, file_size - offset)
+        data = await _download_part(fs, path, offset=offset, length=length)
+        await asyncio.get_event_loop().run_in_executor(
+            None, _write_part, partial_path, offset, data
+        )
+        checkpoint.completed_parts.add(part_index)
+        checkpoint_path.write_text(checkpoint.json())
+
+        total_data_written += length
+        elapsed_time = time.monotonic() - start_time
+        await log_publishing_cb(
+            f"{text_prefix}"
+            f" {100.0 * float(total_data_written)/float(file_size):.1f}%"
+            f" ({ByteSize(total_data_written).human_readable()} / {ByteSize(file_size).human_readable()})"
+            f" [{ByteSize(total_data_written).to('MB')/elapsed_time:.2f} MBytes/s (avg)]",
+            logging.DEBUG,
+        )
+
+    try:
+        await logged_gather(
+            *(_download_and_write_part(i) for i in missing_parts),
+            log=logger,
+            max_concurrency=max_concurrent_parts,
+        )
+    except _RangedDownloadNotSupportedError:
+        partial_path.unlink(missing_ok=True)
+        checkpoint_path.unlink(missing_ok=True)
+        return False
+
+    # NOTE: the worker directory might be on another filesystem
+    await asyncio.get_event_loop().run_in_executor(
+        None, shutil.move, partial_path, dst_path
+    )
+    checkpoint_path.unlink()
+    return True
+
+
 _ZIP_MIME_TYPE: Final[str] = "application/zip"
 
 
+def _get_zip_files_names(zip_path: Path) -> list[str] | None:
+    """names of the files in the archive, None if some would not be extracted as named"""
+    with zipfile.ZipFile(zip_path, "r") as zip_obj:
+        names = [info.filename for info in zip_obj.infolist() if not info.is_dir()]
+    if any(
+        Path(name).is_absolute() or ".." in Path(name).parts or "\\" in name
+        for name in names
+    ):
+        return None
+    return names
+
+
+async def _try_pull_file_from_inputs_cache(
+    cache_key: str,
+    dst_path: Path,
+    *,
+    extract: bool,
+    inputs_cache: InputsCache,
+    inputs_cache_stats: InputsCacheStats | None,
+    log_publishing_cb: LogPublishingCB,
+) -> bool:
+    loop = asyncio.get_event_loop()
+    if extract:
+        bytes_saved = await loop.run_in_executor(
+            None, inputs_cache.copy_extracted, cache_key, dst_path.parent
+        )
+    else:
+        bytes_saved = await loop.run_in_executor(
+            None, inputs_cache.copy_file, cache_key, dst_path
+        )
+    if inputs_cache_stats:
+        if bytes_saved is None:
+            inputs_cache_stats.misses += 1
+        else:
+            inputs_cache_stats.hits += 1
+            inputs_cache_stats.bytes_saved += bytes_saved
+    if bytes_saved is None:
+        return False
+    await log_publishing_cb(
+        f"'{dst_path.name}' {'(uncompressed) ' if extract else ''}retrieved from the worker inputs cache.",
+        logging.INFO,
+    )
+    return True
+
+
 async def pull_file_from_remote(
     src_url: AnyUrl,
     target_mime_type: str | None,
     dst_path: Path,
     log_publishing_cb: LogPublishingCB,
     s3_settings: S3Settings | None,
+    *,
+    part_size: ByteSize = DEFAULT_DOWNLOAD_PART_SIZE,
+    max_concurrent_parts: PositiveInt = DEFAULT_DOWNLOAD_MAX_CONCURRENT_PARTS_PER_FILE,
+    inputs_cache_stats: InputsCacheStats | None = None,
 ) -> None:
+    """downloads the file, S3/HTTP sources bigger than `part_size` are downloaded
+    in parts concurrently. If interrupted, calling it again resumes the download.
+
+    If the worker inputs cache is set up, S3/HTTP sources with an ETag are taken from
+    (or added to) the cache, zip archives are then cached uncompressed.
+    """
     assert src_url.path  # nosec
     await log_publishing_cb(
         f"Downloading '{src_url}' into local file '{dst_path}'...",
@@ -131,35 +525,92 @@ async def pull_file_from_remote(
     src_mime_type, _ = mimetypes.guess_type(f"{src_url.path}")
     if not target_mime_type:
         target_mime_type, _ = mimetypes.guess_type(dst_path)
+    must_extract = (
+        src_mime_type == _ZIP_MIME_TYPE and target_mime_type != _ZIP_MIME_TYPE
+    )
 
     storage_kwargs: S3FsSettingsDict | dict[str, Any] = {}
     if s3_settings and src_url.scheme in S3_FILE_SYSTEM_SCHEMES:
         storage_kwargs = _s3fs_settings_from_s3_settings(s3_settings)
-    await _copy_file(
-        src_url,
-        parse_obj_as(FileUrl, dst_path.as_uri()),
-        src_storage_cfg=cast(dict[str, Any], storage_kwargs),
-        log_publishing_cb=log_publishing_cb,
-        text_prefix=f"Downloading '{src_url.path.strip('/')}':",
-    )
+    text_prefix = f"Downloading '{src_url.path.strip('/')}':"
+
+    downloaded = False
+    cache_key = None
+    inputs_cache = get_worker_inputs_cache()
+    if src_url.scheme in _RANGED_DOWNLOAD_SCHEMES:
+        fs, path = fsspec.core.url_to_fs(f"{src_url}", **storage_kwargs)
+        file_info = await asyncio.get_event_loop().run_in_executor(None, fs.info, path)
+        if inputs_cache and (cache_key := get_cache_key(src_url, file_info)):
+            if await _try_pull_file_from_inputs_cache(
+                cache_key,
+                dst_path,
+                extract=must_extract,
+                inputs_cache=inputs_cache,
+                inputs_cache_stats=inputs_cache_stats,
+                log_publishing_cb=log_publishing_cb,
+            ):
+                return
+        downloaded = await _pull_file_in_parts(
+            src_url,
+            dst_path,
+            fs=fs,
+            path=path,
+            file_info=file_info,
+            part_size=part_size,
+            max_concurrent_parts=max_concurrent_parts,
+            log_publishing_cb=log_publishing_cb,
+            text_prefix=text_prefix,
+        )
+    if not downloaded:
+        await _copy_file(
+            src_url,
+            parse_obj_as(FileUrl, dst_path.as_uri()),
+            src_storage_cfg=cast(dict[str, Any], storage_kwargs),
+            log_publishing_cb=log_publishing_cb,
+            text_prefix=text_prefix,
+        )
 
     await log_publishing_cb(
         f"Download of '{src_url}' into local file '{dst_path}' complete.",
         logging.INFO,
     )
 
-    if src_mime_type == _ZIP_MIME_TYPE and target_mime_type != _ZIP_MIME_TYPE:
+    if must_extract:
         await log_publishing_cb(f"Uncompressing '{dst_path.name}'...", logging.INFO)
         logger.debug("%s is a zip file and will be now uncompressed", dst_path)
         with zipfile.ZipFile(dst_path, "r") as zip_obj:
             await asyncio.get_event_loop().run_in_executor(
                 None, zip_obj.extractall, dst_path.parents[0]
             )
+        if inputs_cache and cache_key:
+            if files_names := await asyncio.get_event_loop().run_in_executor(
+                None, _get_zip_files_names, dst_path
+            ):
+                await asyncio.get_event_loop().run_in_executor(
+                    None,
+                    functools.partial(
+                        inputs_cache.add_extracted,
+                        cache_key,
+                        dst_path.parents[0],
+                        files_names,
+                        remote_size=dst_path.stat().st_size,
+                    ),
+                )
         # finally remove the zip archive
         await log_publishing_cb(
             f"Uncompressing '{dst_path.name}' complete.", logging.INFO
         )
         dst_path.unlink()
+    elif inputs_cache and cache_key:
+        await asyncio.get_event_loop().run_in_executor(
+            None,
+            functools.partial(
+                inputs_cache.add_file,
+                cache_key,
+                dst_path,
+                remote_size=dst_path.stat().st_size,
+            ),
+        )
 
 
 async def _push_file_to_http_link(
@@ -0,0 +1,274 @@
+""" Content-addressed cache of the input files of the computational tasks
+
+The cache lives on the shared volume of the worker, next to the folders of the tasks,
+so that its entries are cloned (copy-on-write where the filesystem supports it, copied
+otherwise) into the inputs folder of the tasks.
+Entries are keyed by the location (without query), ETag and size of the remote file,
+the cache being shared by the tasks of all the users. Zip inputs are cached once extracted.
+When the cache grows over its maximum size, the least recently used entries are evicted.
+
+NOTE: the files of an entry are never shared with a task (i.e. no hard-links) and are
+read-only, as the entries are shared by all the users. Their stat (size, times, inode,
+links count) is nevertheless checked before the entry is used.
+"""
+
+import fcntl
+import hashlib
+import logging
+import os
+import shutil
+import threading
+from collections.abc import Callable
+from contextlib import suppress
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Final
+from uuid import uuid4
+
+from pydantic import AnyUrl, BaseModel, ByteSize, NonNegativeInt, ValidationError
+from yarl import URL
+
+_logger = logging.getLogger(__name__)
+
+_STAGING_DIR_NAME: Final[str] = ".staging"
+_ENTRY_METADATA_FILE_NAME: Final[str] = "entry.json"
+_ENTRY_CONTENT_DIR_NAME: Final[str] = "content"
+_ENTRY_FILE_NAME: Final[str] = "file"
+_EXTRACTED_ENTRY_SUFFIX: Final[str] = ".extracted"
+_ENTRY_FILE_MODE: Final[int] = 0o444
+# ioctl cloning a file (copy-on-write), see linux/fs.h
+_FICLONE: Final[int] = 0x40049409
+
+
+@dataclass(slots=True)
+class InputsCacheStats:
+    hits: int = 0
+    misses: int = 0
+    bytes_saved: NonNegativeInt = 0
+
+    def __str__(self) -> str:
+        return (
+            f"inputs cache: {self.hits} hit(s), {self.misses} miss(es),"
+            f" {ByteSize(self.bytes_saved).human_readable()} not downloaded"
+        )
+
+
+class _CachedFile(BaseModel):
+    size: NonNegativeInt
+    mtime_ns: NonNegativeInt
+    ctime_ns: NonNegativeInt
+    inode: NonNegativeInt
+
+    @classmethod
+    def from_stat(cls, stat: os.stat_result) -> "_CachedFile":
+        return cls(
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            ctime_ns=stat.st_ctime_ns,
+            inode=stat.st_ino,
+        )
+
+
+class _CacheEntry(BaseModel):
+    files: dict[str, _CachedFile]
+    # size of the remote file, i.e. what is not downloaded on a hit
+    remote_size: NonNegativeInt
+
+    @property
+    def size(self) -> NonNegativeInt:
+        return sum(f.size for f in self.files.values())
+
+
+def get_cache_key(src_url: AnyUrl, file_info: dict[str, Any]) -> str | None:
+    """key of a remote file from its url and fsspec info, None if it cannot be identified
+
+    NOTE: ETags are only unique for a given resource (e.g. servers derive them from
+    the modification time and size), and weak ETags (W/) do not identify the content
+    """
+    etag = file_info.get("ETag") or file_info.get("etag")
+    file_size = file_info.get("size")
+    if not etag or file_size is None or etag.startswith("W/"):
+        return None
+    etag = etag.strip('"')
+    # NOTE: the query of presigned links changes at every request
+    source = URL(f"{src_url}").with_user(None).with_query(None).with_fragment(None)
+    return hashlib.sha256(f"{source}:{etag}:{file_size}".encode()).hexdigest()
+
+
+def _clone_or_copy(src: Path, dst: Path) -> None:
+    # NOTE: dst is removed first, it might be a hard-link to another file
+    dst.unlink(missing_ok=True)
+    with src.open("rb") as fsrc, dst.open("wb") as fdst, suppress(OSError):
+        fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+        return
+    # e.g. the filesystem does not support cloning, or not on the same filesystem
+    shutil.copyfile(src, dst)
+
+
+class InputsCache:
+    def __init__(self, path: Path, max_size: ByteSize) -> None:
+        self.path = path
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        # NOTE: leftovers of a previous run of the worker
+        shutil.rmtree(self._staging_path, ignore_errors=True)
+        self._staging_path.mkdir(parents=True)
+
+    @property
+    def _staging_path(self) -> Path:
+        return self.path / _STAGING_DIR_NAME
+
+    def _get_entry_path(self, key: str, *, extracted: bool) -> Path:
+        return self.path / f"{key}{_EXTRACTED_ENTRY_SUFFIX if extracted else ''}"
+
+    def _load_valid_entry(self, entry_path: Path) -> _CacheEntry | None:
+        try:
+            entry = _CacheEntry.parse_file(entry_path / _ENTRY_METADATA_FILE_NAME)
+            for relative_path, cached_file in entry.files.items():
+                stat = (entry_path / _ENTRY_CONTENT_DIR_NAME / relative_path).stat()
+                if stat.st_nlink != 1 or _CachedFile.from_stat(stat) != cached_file:
+                    _logger.warning(
+                        "%s was modified, removing it from the inputs cache",
+                        entry_path / _ENTRY_CONTENT_DIR_NAME / relative_path,
+                    )
+                    shutil.rmtree(entry_path, ignore_errors=True)
+                    return None
+            return entry
+        except FileNotFoundError:
+            return None
+        except (OSError, ValidationError) as err:
+            _logger.warning(
+                "Removing invalid inputs cache entry %s: %s", entry_path, err
+            )
+            shutil.rmtree(entry_path, ignore_errors=True)
+            return None
+
+    def _copy_entry(
+        self, entry_path: Path, get_dst_path: Callable[[str], Path]
+    ) -> NonNegativeInt | None:
+        with self._lock:
+            entry = self._load_valid_entry(entry_path)
+            if entry is None:
+                return None
+            for relative_path in entry.files:
+                dst_path = get_dst_path(relative_path)
+                dst_path.parent.mkdir(parents=True, exist_ok=True)
+                _clone_or_copy(
+                    entry_path / _ENTRY_CONTENT_DIR_NAME / relative_path, dst_path
+                )
+            # NOTE: the modification time of the entry orders the LRU eviction
+            os.utime(entry_path)
+        return entry.remote_size
+
+    def copy_file(self, key: str, dst_path: Path) -> NonNegativeInt | None:
+        """copies the cached file to `dst_path`
+
+        Returns the size of the remote file if cached, None otherwise
+
+        NOTE: blocking
+        """
+        return self._copy_entry(
+            self._get_entry_path(key, extracted=False), lambda _: dst_path
+        )
+
+    def copy_extracted(self, key: str, dst_dir: Path) -> NonNegativeInt | None:
+        """copies the files of the cached extracted archive into `dst_dir`
+
+        Returns the size of the remote archive if cached, None otherwise
+
+        NOTE: blocking
+        """
+        return self._copy_entry(
+            self._get_entry_path(key, extracted=True),
+            lambda relative_path: dst_dir / relative_path,
+        )
+
+    def _add_entry(
+        self, entry_path: Path, files: dict[str, Path], *, remote_size: int
+    ) -> None:
+        staging_entry_path = self._staging_path / f"{uuid4()}"
+        try:
+            entry_files: dict[str, _CachedFile] = {}
+            for relative_path, file_path in files.items():
+                cached_file_path = (
+                    staging_entry_path / _ENTRY_CONTENT_DIR_NAME / relative_path
+                )
+                cached_file_path.parent.mkdir(parents=True, exist_ok=True)
+                _clone_or_copy(file_path, cached_file_path)
+                cached_file_path.chmod(_ENTRY_FILE_MODE)
+                entry_files[relative_path] = _CachedFile.from_stat(
+                    cached_file_path.stat()
+                )
+            entry = _CacheEntry(files=entry_files, remote_size=remote_size)
+            if entry.size > self.max_size:
+                _logger.debug("%s is too big for the inputs cache", entry_path.name)
+                return
+            (staging_entry_path / _ENTRY_METADATA_FILE_NAME).write_text(entry.json())
+
+            with self._lock:
+                if entry_path.exists():
+                    # added in the meantime by another task
+                    return
+                staging_entry_path.rename(entry_path)
+                self._evict(keep=entry_path)
+        finally:
+            shutil.rmtree(staging_entry_path, ignore_errors=True)
+
+    def add_file(self, key: str, file_path: Path, *, remote_size: int) -> None:
+        """NOTE: blocking"""
+        self._add_entry(
+            self._get_entry_path(key, extracted=False),
+            {_ENTRY_FILE_NAME: file_path},
+            remote_size=remote_size,
+        )
+
+    def add_extracted(
+        self,
+        key: str,
+        extraction_dir: Path,
+        relative_paths: list[str],
+        *,
+        remote_size: int,
+    ) -> None:
+        """NOTE: blocking"""
+        self._add_entry(
+            self._get_entry_path(key, extracted=True),
+            {
+                relative_path: extraction_dir / relative_path
+                for relative_path in relative_paths
+            },
+            remote_size=remote_size,
+        )
+
+    def _evict(self, *, keep: Path) -> None:
+        entries: list[tuple[int, Path, int]] = []
+        for entry_path in self.path.iterdir():
+            if entry_path.name == _STAGING_DIR_NAME:
+                continue
+            try:
+                entry = _CacheEntry.parse_file(entry_path / _ENTRY_METADATA_FILE_NAME)
+                entries.append((entry_path.stat().st_mtime_ns, entry_path, entry.size))
+            except (OSError, ValidationError):
+                shutil.rmtree(entry_path, ignore_errors=True)
+
+        total_size = sum(size for *_, size in entries)
+        for _, entry_path, size in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            if entry_path == keep:
+                continue
+            _logger.debug("evicting %s from the inputs cache", entry_path.name)
+            shutil.rmtree(entry_path, ignore_errors=True)
+            total_size -= size
+
+
+_worker_inputs_cache: InputsCache | None = None
+
+
+def setup_worker_inputs_cache(path: Path, max_size: ByteSize) -> None:
+    global _worker_inputs_cache  # pylint: disable=global-statement
+    _worker_inputs_cache = InputsCache(path, max_size)
+
+
+def get_worker_inputs_cache() -> InputsCache | None:
+    return _worker_inputs_cache
@@ -2,7 +2,7 @@ from pathlib import Path
 from typing import Any, cast
 
 from models_library.basic_types import LogLevel
-from pydantic import Field, validator
+from pydantic import ByteSize, Field, PositiveInt, parse_obj_as, validator
 from settings_library.base import BaseCustomSettings
 from settings_library.utils_logging import MixinLoggingSettings
 
@@ -24,6 +24,27 @@ class Settings(BaseCustomSettings, MixinLoggingSettings):
 
     SIDECAR_INTERVAL_TO_CHECK_TASK_ABORTED_S: int | None = 5
 
+    SIDECAR_DOWNLOAD_PART_SIZE: ByteSize = Field(
+        default=parse_obj_as(ByteSize, "16MiB"),
+        description="size of the parts of the input files downloaded in parallel (only for S3/HTTP sources)",
+    )
+    SIDECAR_DOWNLOAD_MAX_CONCURRENT_PARTS_PER_FILE: PositiveInt = Field(
+        default=4,
+        description="maximum number of parts of one input file downloaded concurrently",
+    )
+    SIDECAR_DOWNLOAD_MAX_CONCURRENT_PARTS: PositiveInt = Field(
+        default=8,
+        description="maximum number of parts downloaded concurrently by all the tasks of the worker",
+    )
+    SIDECAR_DOWNLOAD_MAX_BANDWIDTH: ByteSize | None = Field(
+        default=None,
+        description="maximum download bandwidth in bytes/s shared by all the tasks of the worker (None means unlimited)",
+    )
+    SIDECAR_INPUTS_CACHE_MAX_SIZE: ByteSize | None = Field(
+        default=None,
+        description="maximum size of the cache of input files kept in the shared folder (None disables the cache)",
+    )
+
     # dask config ----
 
     DASK_START_AS_SCHEDULER: bool | None = Field(
@@ -3,6 +3,7 @@ import logging
 import signal
 import threading
 from pprint import pformat
+from typing import Final
 
 import distributed
 from dask_task_models_library.container_tasks.docker import DockerBasicAuth
@@ -18,10 +19,15 @@ from settings_library.s3 import S3Settings
 from ._meta import print_dask_sidecar_banner
 from .computational_sidecar.core import ComputationalSidecar
 from .dask_utils import TaskPublisher, get_current_task_resources, monitor_task_abortion
+from .file_utils import setup_worker_download_budget, setup_worker_partial_downloads
+from .inputs_cache import setup_worker_inputs_cache
 from .settings import Settings
 
 _logger = logging.getLogger(__name__)
 
+_INPUTS_CACHE_DIR_NAME: Final[str] = ".inputs_cache"
+_PARTIAL_DOWNLOADS_DIR_NAME: Final[str] = ".partial_downloads"
+
 
 class GracefulKiller:
     """this ensure the dask-worker is gracefully stopped.
@@ -69,6 +75,19 @@ async def dask_setup(worker: distributed.Worker) -> None:
 
     print_dask_sidecar_banner()
 
+    setup_worker_download_budget(
+        max_concurrent_parts=settings.SIDECAR_DOWNLOAD_MAX_CONCURRENT_PARTS,
+        max_bandwidth=settings.SIDECAR_DOWNLOAD_MAX_BANDWIDTH,
+    )
+    setup_worker_partial_downloads(
+        settings.SIDECAR_COMP_SERVICES_SHARED_FOLDER / _PARTIAL_DOWNLOADS_DIR_NAME
+    )
+    if settings.SIDECAR_INPUTS_CACHE_MAX_SIZE:
+        setup_worker_inputs_cache(
+            settings.SIDECAR_COMP_SERVICES_SHARED_FOLDER / _INPUTS_CACHE_DIR_NAME,
+            settings.SIDECAR_INPUTS_CACHE_MAX_SIZE,
+        )
+
     if threading.current_thread() is threading.main_thread():
         loop = asyncio.get_event_loop()
         logger.info("We do have a running loop in the main thread: %s", f"{loop=}")
@@ -4,8 +4,10 @@
 # pylint: disable=no-member
 
 import asyncio
+import logging
 import re
 from typing import Any
+from unittest import mock
 from unittest.mock import call
 
 import aiodocker
@@ -20,7 +22,9 @@ from dask_task_models_library.container_tasks.protocol import (
 )
 from models_library.services_resources import BootMode
 from pytest_mock.plugin import MockerFixture
+from simcore_service_dask_sidecar.computational_sidecar import docker_utils
 from simcore_service_dask_sidecar.computational_sidecar.docker_utils import (
+    _LogsBatcher,
     _try_parse_progress,
     create_container_config,
     managed_container,
@@ -269,3 +273,89 @@ async def test_managed_container_with_broken_container_raises_docker_exception(
                 docker_client=docker_client, config=container_config
             ) as container:
                 assert container is not None
+
+
+@pytest.fixture
+def mocked_task_publishers(mocker: MockerFixture) -> mock.Mock:
+    return mocker.Mock()
+
+
+@pytest.fixture
+def mocked_progress_bar(mocker: MockerFixture) -> mock.Mock:
+    return mocker.AsyncMock()
+
+
+async def test_logs_batcher_publishes_batches(
+    mocked_task_publishers: mock.Mock, mocked_progress_bar: mock.AsyncMock
+):
+    logs_batcher = _LogsBatcher(
+        task_publishers=mocked_task_publishers,
+        progress_regexp=PROGRESS_REGEXP,
+        progress_bar=mocked_progress_bar,
+    )
+    for i in range(10):
+        await logs_batcher.add(f"line {i}\n")
+        await logs_batcher.add(f"[PROGRESS] {i + 1}/10\n")
+    await logs_batcher.add("error: something bad\n")
+    mocked_task_publishers.publish_logs.assert_not_called()
+    mocked_progress_bar.set_.assert_not_called()
+
+    await logs_batcher.flush()
+    assert mocked_task_publishers.publish_logs.call_args_list == [
+        call(
+            message="\n".join(f"line {i}\n[PROGRESS] {i + 1}/10" for i in range(10)),
+            log_level=logging.INFO,
+        ),
+        call(message="error: something bad", log_level=logging.ERROR),
+    ]
+    # only the last progress is set
+    mocked_progress_bar.set_.assert_called_once_with(100)
+    assert logs_batcher.published_lines == 21
+
+    # nothing pending
+    mocked_task_publishers.reset_mock()
+    await logs_batcher.flush()
+    mocked_task_publishers.publish_logs.assert_not_called()
+
+
+async def test_logs_batcher_flushes_big_batches(
+    mocked_task_publishers: mock.Mock,
+    mocked_progress_bar: mock.AsyncMock,
+    mocker: MockerFixture,
+):
+    mocker.patch.object(docker_utils, "_LOGS_BATCH_MAX_SIZE", 100)
+    logs_batcher = _LogsBatcher(
+        task_publishers=mocked_task_publishers,
+        progress_regexp=PROGRESS_REGEXP,
+        progress_bar=mocked_progress_bar,
+    )
+    for _ in range(10):
+        await logs_batcher.add(f"{'a' * 10}\n")
+    mocked_task_publishers.publish_logs.assert_called_once()
+    assert logs_batcher.published_lines == 10
+
+
+async def test_logs_batcher_skips_lines_over_the_rate_limit(
+    mocked_task_publishers: mock.Mock,
+    mocked_progress_bar: mock.AsyncMock,
+    mocker: MockerFixture,
+):
+    mocker.patch.object(docker_utils, "_LOGS_MAX_BURST_LINES", 5)
+    mocker.patch.object(docker_utils, "_LOGS_MAX_LINES_PER_S", 1)
+    logs_batcher = _LogsBatcher(
+        task_publishers=mocked_task_publishers,
+        progress_regexp=PROGRESS_REGEXP,
+        progress_bar=mocked_progress_bar,
+    )
+    for i in range(10):
+        await logs_batcher.add(f"[PROGRESS] {i + 1}/10\n")
+    await logs_batcher.flush()
+
+    assert logs_batcher.published_lines == 5
+    assert logs_batcher.dropped_lines == 5
+    assert (
+        mocked_task_publishers.publish_logs.call_args_list[-1].kwargs["log_level"]
+        == logging.WARNING
+    )
+    # the progress is still followed
+    mocked_progress_bar.set_.assert_called_once_with(100)
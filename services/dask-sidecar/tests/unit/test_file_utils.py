@@ -14,15 +14,18 @@ from unittest import mock
 import fsspec
 import pytest
 from faker import Faker
-from pydantic import AnyUrl, parse_obj_as
+from pydantic import AnyUrl, ByteSize, parse_obj_as
 from pytest_localftpserver.servers import ProcessFTPServer
 from pytest_mock.plugin import MockerFixture
 from settings_library.s3 import S3Settings
+from simcore_service_dask_sidecar import file_utils
 from simcore_service_dask_sidecar.file_utils import (
     _s3fs_settings_from_s3_settings,
+    _WorkerPartialDownloads,
     pull_file_from_remote,
     push_file_to_remote,
 )
+from simcore_service_dask_sidecar.inputs_cache import InputsCache, InputsCacheStats
 
 
 @pytest.fixture()
@@ -375,3 +378,158 @@ async def test_pull_compressed_zip_file_from_remote(
         assert file.exists()
         assert file.name in file_names_within_zip_file
     mocked_log_publishing_cb.assert_called()
+
+
+_PART_SIZE = parse_obj_as(ByteSize, "1KiB")
+
+
+@pytest.fixture
+def s3_remote_file_content(
+    s3_settings: S3Settings, s3_remote_file_url: AnyUrl, faker: Faker
+) -> bytes:
+    content = faker.binary(length=10 * _PART_SIZE + 123)
+    with cast(
+        fsspec.core.OpenFile,
+        fsspec.open(
+            s3_remote_file_url,
+            mode="wb",
+            **_s3fs_settings_from_s3_settings(s3_settings),
+        ),
+    ) as fp:
+        fp.write(content)
+    return content
+
+
+@pytest.fixture
+def worker_partial_downloads(tmp_path: Path, mocker: MockerFixture) -> Path:
+    partial_downloads_path = tmp_path / ".partial_downloads"
+    mocker.patch(
+        "simcore_service_dask_sidecar.file_utils._worker_partial_downloads",
+        _WorkerPartialDownloads(partial_downloads_path),
+    )
+    return partial_downloads_path
+
+
+async def test_pull_file_from_remote_in_parts(
+    worker_partial_downloads: Path,
+    s3_settings: S3Settings,
+    s3_remote_file_url: AnyUrl,
+    s3_remote_file_content: bytes,
+    tmp_path: Path,
+    faker: Faker,
+    mocked_log_publishing_cb: mock.AsyncMock,
+    mocker: MockerFixture,
+):
+    spy_download_part = mocker.spy(file_utils, "_download_part")
+    dst_path = tmp_path / faker.file_name()
+    await pull_file_from_remote(
+        src_url=s3_remote_file_url,
+        target_mime_type=None,
+        dst_path=dst_path,
+        log_publishing_cb=mocked_log_publishing_cb,
+        s3_settings=s3_settings,
+        part_size=_PART_SIZE,
+        max_concurrent_parts=3,
+    )
+    assert dst_path.read_bytes() == s3_remote_file_content
+    assert spy_download_part.call_count == 11
+    assert list(dst_path.parent.iterdir()) == [dst_path]
+    assert not list(worker_partial_downloads.iterdir())
+    mocked_log_publishing_cb.assert_called()
+
+
+async def test_pull_file_from_remote_in_parts_resumes(
+    worker_partial_downloads: Path,
+    s3_settings: S3Settings,
+    s3_remote_file_url: AnyUrl,
+    s3_remote_file_content: bytes,
+    tmp_path: Path,
+    faker: Faker,
+    mocked_log_publishing_cb: mock.AsyncMock,
+    mocker: MockerFixture,
+):
+    download_part = file_utils._download_part  # noqa: SLF001
+    connection_drops = True
+
+    async def _failing_download_part(*args, offset: int, **kwargs) -> bytes:
+        if connection_drops and offset == 5 * _PART_SIZE:
+            msg = "connection dropped"
+            raise RuntimeError(msg)
+        return await download_part(*args, offset=offset, **kwargs)
+
+    mocked_download_part = mocker.patch.object(
+        file_utils, "_download_part", side_effect=_failing_download_part
+    )
+    # NOTE: every (re)try of a task downloads to its own new inputs folder
+    dst_paths = [tmp_path / f"run_{i}" / "inputs" / "input.bin" for i in range(2)]
+    for dst_path in dst_paths:
+        dst_path.parent.mkdir(parents=True)
+    dst_path = dst_paths[0]
+    with pytest.raises(RuntimeError, match="connection dropped"):
+        await pull_file_from_remote(
+            src_url=s3_remote_file_url,
+            target_mime_type=None,
+            dst_path=dst_path,
+            log_publishing_cb=mocked_log_publishing_cb,
+            s3_settings=s3_settings,
+            part_size=_PART_SIZE,
+        )
+    assert not list(dst_path.parent.iterdir())
+    assert len(list(worker_partial_downloads.iterdir())) == 2
+
+    # the retry only downloads the missing part
+    connection_drops = False
+    mocked_download_part.reset_mock()
+    dst_path = dst_paths[1]
+    await pull_file_from_remote(
+        src_url=s3_remote_file_url,
+        target_mime_type=None,
+        dst_path=dst_path,
+        log_publishing_cb=mocked_log_publishing_cb,
+        s3_settings=s3_settings,
+        part_size=_PART_SIZE,
+    )
+    assert dst_path.read_bytes() == s3_remote_file_content
+    assert mocked_download_part.call_count == 1
+    assert not list(worker_partial_downloads.iterdir())
+
+
+@pytest.fixture
+def worker_inputs_cache(tmp_path: Path, mocker: MockerFixture) -> None:
+    mocker.patch(
+        "simcore_service_dask_sidecar.inputs_cache._worker_inputs_cache",
+        InputsCache(tmp_path / ".inputs_cache", parse_obj_as(ByteSize, "1MiB")),
+    )
+
+
+async def test_pull_file_from_remote_uses_inputs_cache(
+    worker_inputs_cache: None,
+    s3_settings: S3Settings,
+    s3_remote_file_url: AnyUrl,
+    s3_remote_file_content: bytes,
+    tmp_path: Path,
+    mocked_log_publishing_cb: mock.AsyncMock,
+    mocker: MockerFixture,
+):
+    spy_download_part = mocker.spy(file_utils, "_download_part")
+    inputs_cache_stats = InputsCacheStats()
+    dst_paths = [tmp_path / f"task_{i}" / "inputs" / "input.bin" for i in range(2)]
+    for dst_path in dst_paths:
+        dst_path.parent.mkdir(parents=True)
+        await pull_file_from_remote(
+            src_url=s3_remote_file_url,
+            target_mime_type=None,
+            dst_path=dst_path,
+            log_publishing_cb=mocked_log_publishing_cb,
+            s3_settings=s3_settings,
+            part_size=_PART_SIZE,
+            inputs_cache_stats=inputs_cache_stats,
+        )
+        assert dst_path.read_bytes() == s3_remote_file_content
+
+    # the second task got the file from the cache
+    assert spy_download_part.call_count == 11
+    assert dst_paths[0].samefile(dst_paths[1])
+    assert inputs_cache_stats == InputsCacheStats(
+        hits=1, misses=1, bytes_saved=len(s3_remote_file_content)
+    )
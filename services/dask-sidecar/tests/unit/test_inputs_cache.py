@@ -0,0 +1,134 @@
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-argument
+# pylint: disable=unused-variable
+
+import os
+from pathlib import Path
+
+import pytest
+from faker import Faker
+from pydantic import AnyUrl, ByteSize, parse_obj_as
+from simcore_service_dask_sidecar.inputs_cache import InputsCache, get_cache_key
+
+
+@pytest.fixture
+def inputs_cache(tmp_path: Path) -> InputsCache:
+    return InputsCache(tmp_path / "cache", parse_obj_as(ByteSize, "10KiB"))
+
+
+@pytest.fixture
+def task_inputs_folder(tmp_path: Path) -> Path:
+    inputs_folder = tmp_path / "task" / "inputs"
+    inputs_folder.mkdir(parents=True)
+    return inputs_folder
+
+
+def _create_file(path: Path, size: int, faker: Faker) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(faker.binary(length=size))
+    return path
+
+
+def test_get_cache_key():
+    src_url = parse_obj_as(AnyUrl, "https://s3.example.com/bucket/file.bin?sig=1")
+    assert get_cache_key(src_url, {"size": 12}) is None
+    assert get_cache_key(src_url, {"ETag": 'W/"abc"', "size": 12}) is None
+    assert get_cache_key(src_url, {"ETag": '"abc"', "size": 12}) == get_cache_key(
+        parse_obj_as(AnyUrl, "https://s3.example.com/bucket/file.bin?sig=2"),
+        {"etag": "abc", "size": 12},
+    )
+    assert get_cache_key(src_url, {"ETag": "abc", "size": 12}) != get_cache_key(
+        src_url, {"ETag": "abc", "size": 13}
+    )
+    # the same ETag from another file or server is another file
+    for other_src_url in (
+        "https://s3.example.com/bucket/other_file.bin?sig=1",
+        "https://other.example.com/bucket/file.bin?sig=1",
+        "s3://bucket/file.bin",
+    ):
+        assert get_cache_key(src_url, {"ETag": "abc", "size": 12}) != get_cache_key(
+            parse_obj_as(AnyUrl, other_src_url), {"ETag": "abc", "size": 12}
+        )
+
+
+def test_inputs_cache_copy_file(
+    inputs_cache: InputsCache, task_inputs_folder: Path, tmp_path: Path, faker: Faker
+):
+    downloaded_file = _create_file(tmp_path / "downloaded.bin", 1024, faker)
+    content = downloaded_file.read_bytes()
+    assert inputs_cache.copy_file("key", task_inputs_folder / "input.bin") is None
+
+    inputs_cache.add_file("key", downloaded_file, remote_size=1024)
+    # the task modifying its inputs does not modify the cache
+    downloaded_file.write_bytes(faker.binary(length=1024))
+    assert inputs_cache.copy_file("key", task_inputs_folder / "input.bin") == 1024
+    assert not (task_inputs_folder / "input.bin").samefile(downloaded_file)
+    assert (task_inputs_folder / "input.bin").read_bytes() == content
+
+    (task_inputs_folder / "input.bin").write_bytes(faker.binary(length=1024))
+    assert inputs_cache.copy_file("key", task_inputs_folder / "other.bin") == 1024
+    assert (task_inputs_folder / "other.bin").read_bytes() == content
+
+
+def test_inputs_cache_drops_modified_entries(
+    inputs_cache: InputsCache, task_inputs_folder: Path, tmp_path: Path, faker: Faker
+):
+    for key in ("modified", "linked"):
+        downloaded_file = _create_file(tmp_path / key, 1024, faker)
+        inputs_cache.add_file(key, downloaded_file, remote_size=1024)
+
+    # modified in place, even with the same size and modification time
+    cached_file = inputs_cache.path / "modified" / "content" / "file"
+    stat = cached_file.stat()
+    assert not stat.st_mode & 0o222
+    cached_file.chmod(0o644)
+    cached_file.write_bytes(faker.binary(length=1024))
+    os.utime(cached_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert inputs_cache.copy_file("modified", task_inputs_folder / "a.bin") is None
+    assert not (task_inputs_folder / "a.bin").exists()
+
+    # hard-linked somewhere else, i.e. modifiable from there
+    os.link(inputs_cache.path / "linked" / "content" / "file", tmp_path / "linked.bin")
+    assert inputs_cache.copy_file("linked", task_inputs_folder / "b.bin") is None
+    assert not (task_inputs_folder / "b.bin").exists()
+
+
+def test_inputs_cache_copy_extracted(
+    inputs_cache: InputsCache, task_inputs_folder: Path, tmp_path: Path, faker: Faker
+):
+    extraction_dir = tmp_path / "extracted"
+    relative_paths = ["a.txt", "sub/b.txt", "sub/sub/c.txt"]
+    for relative_path in relative_paths:
+        _create_file(extraction_dir / relative_path, 100, faker)
+
+    inputs_cache.add_extracted("key", extraction_dir, relative_paths, remote_size=250)
+    # the same key is cached independently for the archive itself
+    assert inputs_cache.copy_file("key", task_inputs_folder / "archive.zip") is None
+
+    assert inputs_cache.copy_extracted("key", task_inputs_folder) == 250
+    for relative_path in relative_paths:
+        assert (task_inputs_folder / relative_path).read_bytes() == (
+            extraction_dir / relative_path
+        ).read_bytes()
+
+
+def test_inputs_cache_evicts_least_recently_used(
+    inputs_cache: InputsCache, task_inputs_folder: Path, tmp_path: Path, faker: Faker
+):
+    for key in ("first", "second", "third"):
+        file = _create_file(tmp_path / key, 4 * 1024, faker)
+        inputs_cache.add_file(key, file, remote_size=4 * 1024)
+        if key == "first":
+            os.utime(inputs_cache.path / key, ns=(0, 0))
+        if key == "second":
+            # using the first entry makes it the most recently used one
+            assert inputs_cache.copy_file("first", task_inputs_folder / key)
+
+    assert inputs_cache.copy_file("first", task_inputs_folder / "first")
+    assert inputs_cache.copy_file("second", task_inputs_folder / "second") is None
+    assert inputs_cache.copy_file("third", task_inputs_folder / "third")
+
+    # too big to be cached
+    file = _create_file(tmp_path / "big", 11 * 1024, faker)
+    inputs_cache.add_file("big", file, remote_size=11 * 1024)
+    assert inputs_cache.copy_file("big", task_inputs_folder / "big") is None
@@ -588,7 +588,12 @@ async def test_run_computational_sidecar_dask(
     ), "ordering of progress values incorrectly sorted!"
     assert worker_progresses[0] == 0, "missing/incorrect initial progress value"
     assert worker_progresses[-1] == 1, "missing/incorrect final progress value"
-    worker_logs = [TaskLogEvent.parse_raw(msg).log for msg in log_sub.buffer]
+    # NOTE: the logs are published in batches
+    worker_logs = [
+        line
+        for msg in log_sub.buffer
+        for line in TaskLogEvent.parse_raw(msg).log.split("\n")
+    ]
     print(f"<-- we got {len(worker_logs)} lines of logs")
 
     for log in sleeper_task.expected_logs:
@@ -660,8 +665,11 @@ async def test_run_computational_sidecar_dask_does_not_lose_messages_with_pubsub
     assert worker_progresses[-1] == 1, "missing/incorrect final progress value"
 
     worker_logs = [TaskLogEvent.parse_raw(msg).log for msg in log_sub.buffer]
-    # check all the awaited logs are in there
-    filtered_worker_logs = filter(lambda log: "This is iteration" in log, worker_logs)
+    # check all the awaited logs are in there (NOTE: the logs are published in batches)
+    worker_log_lines = [line for log in worker_logs for line in log.split("\n")]
+    filtered_worker_logs = filter(
+        lambda log: "This is iteration" in log, worker_log_lines
+    )
     assert len(list(filtered_worker_logs)) == NUMBER_OF_LOGS
     mocked_get_image_labels.assert_called()
 
@@ -93,6 +93,11 @@ class ComputationalBackendSettings(BaseCustomSettings):
         FileLinkType.PRESIGNED,
         description=f"Default file link type to use with computational backend on-demand clusters '{list(FileLinkType)}'",
     )
+    COMPUTATIONAL_BACKEND_SCHEDULER_FULL_SWEEP_INTERVAL: datetime.timedelta = Field(
+        default=datetime.timedelta(seconds=30),
+        description="interval at which all the pipelines are scheduled, also the ones without known changes"
+        " (default to seconds, or see https://pydantic-docs.helpmanual.io/usage/types/#datetime-types for string formating)",
+    )
 
     @cached_property
     def default_cluster(self) -> Cluster:
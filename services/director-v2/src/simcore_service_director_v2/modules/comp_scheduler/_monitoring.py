@@ -0,0 +1,65 @@
+from dataclasses import dataclass
+
+from fastapi import FastAPI
+from prometheus_client import REGISTRY, Gauge, Histogram
+
+from ...core.settings import AppSettings
+
+_LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, float("inf"))
+
+
+@dataclass(frozen=True)
+class SchedulerMetrics:
+    scheduled_pipelines: Gauge | None
+    dirty_pipelines: Gauge | None
+    scheduling_latency: Histogram | None
+    scheduling_duration: Histogram | None
+
+    @classmethod
+    def create(cls, app: FastAPI) -> "SchedulerMetrics":
+        app_settings: AppSettings = app.state.settings
+        if not app_settings.DIRECTOR_V2_PROMETHEUS_INSTRUMENTATION_ENABLED:
+            return cls(
+                scheduled_pipelines=None,
+                dirty_pipelines=None,
+                scheduling_latency=None,
+                scheduling_duration=None,
+            )
+        # NOTE: the collectors of the default registry are unregistered
+        # on shutdown by the prometheus instrumentation
+        return cls(
+            scheduled_pipelines=Gauge(
+                name="comp_scheduler_scheduled_pipelines",
+                documentation="Number of pipelines currently scheduled",
+                registry=REGISTRY,
+            ),
+            dirty_pipelines=Gauge(
+                name="comp_scheduler_dirty_pipelines",
+                documentation="Number of pipelines with changes waiting to be scheduled",
+                registry=REGISTRY,
+            ),
+            scheduling_latency=Histogram(
+                name="comp_scheduler_pipeline_scheduling_latency_seconds",
+                documentation="Time between a change in a pipeline and its scheduling",
+                buckets=_LATENCY_BUCKETS,
+                registry=REGISTRY,
+            ),
+            scheduling_duration=Histogram(
+                name="comp_scheduler_pipeline_scheduling_duration_seconds",
+                documentation="Time needed to schedule a pipeline",
+                buckets=_LATENCY_BUCKETS,
+                registry=REGISTRY,
+            ),
+        )
+
+    def pipelines_count(self, *, scheduled: int, dirty: int) -> None:
+        if self.scheduled_pipelines:
+            self.scheduled_pipelines.set(scheduled)
+        if self.dirty_pipelines:
+            self.dirty_pipelines.set(dirty)
+
+    def observe_scheduling(self, *, latency: float | None, duration: float) -> None:
+        if self.scheduling_latency and latency is not None:
+            self.scheduling_latency.observe(latency)
+        if self.scheduling_duration:
+            self.scheduling_duration.observe(duration)
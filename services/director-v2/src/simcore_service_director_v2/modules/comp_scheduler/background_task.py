@@ -1,11 +1,13 @@
 import asyncio
 import logging
+import time
 from asyncio import CancelledError
 from contextlib import suppress
 from typing import Any, Callable, Coroutine
 
 from fastapi import FastAPI
 
+from ...core.settings import AppSettings
 from . import factory
 
 logger = logging.getLogger(__name__)
@@ -15,10 +17,22 @@ _DEFAULT_TIMEOUT_S: int = 5
 
 async def scheduler_task(app: FastAPI) -> None:
     scheduler = app.state.scheduler
+    app_settings: AppSettings = app.state.settings
+    full_sweep_interval_s = (
+        app_settings.DIRECTOR_V2_COMPUTATIONAL_BACKEND.COMPUTATIONAL_BACKEND_SCHEDULER_FULL_SWEEP_INTERVAL.total_seconds()
+    )
+    last_full_sweep: float | None = None
     while app.state.comp_scheduler_running:
         try:
             logger.debug("Computational scheduler task running...")
-            await scheduler.schedule_all_pipelines()
+            if (
+                last_full_sweep is None
+                or (time.monotonic() - last_full_sweep) > full_sweep_interval_s
+            ):
+                last_full_sweep = time.monotonic()
+                await scheduler.schedule_all_pipelines()
+            else:
+                await scheduler.schedule_dirty_pipelines()
             with suppress(asyncio.TimeoutError):
                 await asyncio.wait_for(
                     scheduler.wake_up_event.wait(), timeout=_DEFAULT_TIMEOUT_S
@@ -9,10 +9,14 @@ When a pipeline is scheduled first all the tasks contained in the DAG are set to
 Once the scheduler determines a task shall run, its state is set to PENDING, so that the sidecar can pick up the task.
 The sidecar will then change the state to STARTED, then to SUCCESS or FAILED.
 
+Pipelines are only scheduled when marked as dirty (e.g. new run, stop request, task started/done in the backend),
+all the pipelines are regularly scheduled as a safety net for changes that do not trigger any event.
+
 """
 import asyncio
 import datetime
 import logging
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from typing import Final
@@ -67,6 +71,7 @@ from ...utils.rabbitmq import (
 from ..db.repositories.comp_pipelines import CompPipelinesRepository
 from ..db.repositories.comp_runs import CompRunsRepository
 from ..db.repositories.comp_tasks import CompTasksRepository
+from ._monitoring import SchedulerMetrics
 
 _logger = logging.getLogger(__name__)
 
@@ -74,6 +79,9 @@ _logger = logging.getLogger(__name__)
 _Previous = CompTaskAtDB
 _Current = CompTaskAtDB
 _MAX_WAITING_FOR_CLUSTER_TIMEOUT_IN_MIN: Final[int] = 10
+_MAX_CONCURRENT_PIPELINE_SCHEDULING: Final[int] = 40
+# NOTE: covers the writes that started before the last listing but committed after it
+_TASKS_REFRESH_OVERLAP: Final[datetime.timedelta] = datetime.timedelta(seconds=5)
 
 
 @dataclass(frozen=True, slots=True)
@@ -125,6 +133,15 @@ async def _triage_changed_tasks(
     )
 
 
+@dataclass(slots=True)
+class _PipelineCache:
+    """in-memory snapshot of a scheduled pipeline"""
+
+    dag: nx.DiGraph
+    tasks: dict[NodeIDStr, CompTaskAtDB] = field(default_factory=dict)
+    tasks_listed_at: datetime.datetime | None = None
+
+
 @dataclass(kw_only=True)
 class ScheduledPipelineParams:
     cluster_id: ClusterID
@@ -144,6 +161,14 @@ class BaseCompScheduler(ABC):
     rabbitmq_rpc_client: RabbitMQRPCClient
     settings: ComputationalBackendSettings
     service_runtime_heartbeat_interval: datetime.timedelta
+    metrics: SchedulerMetrics
+    # pipelines with changes to schedule, and since when (monotonic time)
+    _dirty_pipelines: dict[tuple[UserID, ProjectID], float] = field(
+        default_factory=dict, init=False
+    )
+    _pipelines_cache: dict[ProjectID, _PipelineCache] = field(
+        default_factory=dict, init=False
+    )
 
     async def run_new_pipeline(
         self,
@@ -158,8 +183,10 @@ class BaseCompScheduler(ABC):
         Passing cluster_id=0 will use the default cluster. Passing an existing ID will instruct
         the scheduler to run the tasks on the defined cluster"""
         # ensure the pipeline exists and is populated with something
+        self._pipelines_cache.pop(project_id, None)
         dag = await self._get_pipeline_dag(project_id)
         if not dag:
+            self._pipelines_cache.pop(project_id, None)
             _logger.warning(
                 "project %s has no computational dag defined. not scheduled for a run.",
                 f"{project_id=}",
@@ -189,7 +216,7 @@ class BaseCompScheduler(ABC):
             log_level=logging.INFO,
         )
         # ensure the scheduler starts right away
-        self._wake_up_scheduler_now()
+        self._mark_pipeline_dirty(user_id, project_id)
 
     async def stop_pipeline(
         self, user_id: UserID, project_id: ProjectID, iteration: int | None = None
@@ -214,46 +241,118 @@ class BaseCompScheduler(ABC):
             (user_id, project_id, selected_iteration)
         ].mark_for_cancellation = True
         # ensure the scheduler starts right away
-        self._wake_up_scheduler_now()
+        self._mark_pipeline_dirty(user_id, project_id)
 
     async def schedule_all_pipelines(self) -> None:
+        """schedules every pipeline, also the ones without any known change"""
         self.wake_up_event.clear()
+        dirty_pipelines, self._dirty_pipelines = self._dirty_pipelines, {}
+        await self._schedule_pipelines(list(self.scheduled_pipelines), dirty_pipelines)
+
+    async def schedule_dirty_pipelines(self) -> None:
+        """schedules only the pipelines that were marked as dirty since the last call"""
+        self.wake_up_event.clear()
+        dirty_pipelines, self._dirty_pipelines = self._dirty_pipelines, {}
+        await self._schedule_pipelines(
+            [
+                key
+                for key in self.scheduled_pipelines
+                if (key[0], key[1]) in dirty_pipelines
+            ],
+            dirty_pipelines,
+        )
+
+    async def _schedule_pipelines(
+        self,
+        pipelines: list[tuple[UserID, ProjectID, Iteration]],
+        dirty_pipelines: dict[tuple[UserID, ProjectID], float],
+    ) -> None:
+        self.metrics.pipelines_count(
+            scheduled=len(self.scheduled_pipelines), dirty=len(dirty_pipelines)
+        )
+
+        async def _schedule_and_measure(
+            user_id: UserID, project_id: ProjectID, iteration: Iteration
+        ) -> None:
+            pipeline_params = self.scheduled_pipelines.get(
+                (user_id, project_id, iteration)
+            )
+            if pipeline_params is None:
+                # the pipeline was removed in the meantime
+                return
+            start = time.monotonic()
+            await self._schedule_pipeline(
+                user_id=user_id,
+                project_id=project_id,
+                iteration=iteration,
+                pipeline_params=pipeline_params,
+            )
+            dirty_since = dirty_pipelines.get((user_id, project_id))
+            self.metrics.observe_scheduling(
+                latency=None if dirty_since is None else start - dirty_since,
+                duration=time.monotonic() - start,
+            )
+
         # if one of the task throws, the other are NOT cancelled which is what we want
         await logged_gather(
             *(
-                self._schedule_pipeline(
-                    user_id=user_id,
-                    project_id=project_id,
-                    iteration=iteration,
-                    pipeline_params=pipeline_params,
-                )
-                for (
-                    user_id,
-                    project_id,
-                    iteration,
-                ), pipeline_params in self.scheduled_pipelines.items()
+                _schedule_and_measure(user_id, project_id, iteration)
+                for user_id, project_id, iteration in pipelines
             ),
             log=_logger,
-            max_concurrency=40,
+            max_concurrency=_MAX_CONCURRENT_PIPELINE_SCHEDULING,
         )
 
+    def _unschedule_pipeline(
+        self, user_id: UserID, project_id: ProjectID, iteration: Iteration
+    ) -> None:
+        self.scheduled_pipelines.pop((user_id, project_id, iteration), None)
+        self._pipelines_cache.pop(project_id, None)
+
     async def _get_pipeline_dag(self, project_id: ProjectID) -> nx.DiGraph:
-        comp_pipeline_repo = CompPipelinesRepository.instance(self.db_engine)
-        pipeline_at_db: CompPipelineAtDB = await comp_pipeline_repo.get_pipeline(
-            project_id
-        )
-        dag = pipeline_at_db.get_graph()
+        # NOTE: the pipeline cannot change while it runs, so it is read once per run
+        if (pipeline_cache := self._pipelines_cache.get(project_id)) is None:
+            comp_pipeline_repo = CompPipelinesRepository.instance(self.db_engine)
+            pipeline_at_db: CompPipelineAtDB = await comp_pipeline_repo.get_pipeline(
+                project_id
+            )
+            pipeline_cache = self._pipelines_cache[project_id] = _PipelineCache(
+                dag=pipeline_at_db.get_graph()
+            )
+        # the callers modify the graph
+        dag: nx.DiGraph = pipeline_cache.dag.copy()
         _logger.debug("%s: current %s", f"{project_id=}", f"{dag=}")
         return dag
 
+    async def _list_pipeline_tasks(self, project_id: ProjectID) -> list[CompTaskAtDB]:
+        comp_tasks_repo = CompTasksRepository.instance(self.db_engine)
+        if (pipeline_cache := self._pipelines_cache.get(project_id)) is None:
+            return await comp_tasks_repo.list_computational_tasks(project_id)
+
+        # only the tasks modified since last time are listed (by the scheduler or anyone else)
+        (
+            modified_tasks,
+            pipeline_cache.tasks_listed_at,
+        ) = await comp_tasks_repo.list_computational_tasks_modified_since(
+            project_id,
+            since=pipeline_cache.tasks_listed_at - _TASKS_REFRESH_OVERLAP
+            if pipeline_cache.tasks_listed_at
+            else None,
+        )
+        pipeline_cache.tasks.update(
+            {NodeIDStr(f"{t.node_id}"): t for t in modified_tasks}
+        )
+        # the callers modify the tasks
+        return [t.copy() for t in pipeline_cache.tasks.values()]
+
     async def _get_pipeline_tasks(
         self, project_id: ProjectID, pipeline_dag: nx.DiGraph
     ) -> dict[NodeIDStr, CompTaskAtDB]:
-        comp_tasks_repo = CompTasksRepository.instance(self.db_engine)
+        pipeline_nodes = set(pipeline_dag.nodes())
         pipeline_comp_tasks: dict[NodeIDStr, CompTaskAtDB] = {
             NodeIDStr(f"{t.node_id}"): t
-            for t in await comp_tasks_repo.list_computational_tasks(project_id)
-            if (f"{t.node_id}" in list(pipeline_dag.nodes()))
+            for t in await self._list_pipeline_tasks(project_id)
+            if f"{t.node_id}" in pipeline_nodes
         }
         if len(pipeline_comp_tasks) != len(pipeline_dag.nodes()):
             msg = (
@@ -635,9 +734,12 @@ class BaseCompScheduler(ABC):
             )
 
             # 7. Are we done scheduling that pipeline?
+            if pipeline_result is RunningState.WAITING_FOR_CLUSTER:
+                # NOTE: the cluster does not notify when it is ready, so let's check it on next round
+                self._mark_pipeline_dirty(user_id, project_id, wake_up=False)
             if not dag.nodes() or pipeline_result in COMPLETED_STATES:
                 # there is nothing left, the run is completed, we're done here
-                self.scheduled_pipelines.pop((user_id, project_id, iteration), None)
+                self._unschedule_pipeline(user_id, project_id, iteration)
                 _logger.info(
                     "pipeline %s scheduling completed with result %s",
                     f"{project_id=}",
@@ -651,7 +753,7 @@ class BaseCompScheduler(ABC):
             await self._set_run_result(
                 user_id, project_id, iteration, RunningState.ABORTED
             )
-            self.scheduled_pipelines.pop((user_id, project_id, iteration), None)
+            self._unschedule_pipeline(user_id, project_id, iteration)
         except InvalidPipelineError as exc:
             _logger.warning(
                 "pipeline %s appears to be misconfigured, it will be removed from scheduler. Please check pipeline:\n%s",
@@ -661,7 +763,7 @@ class BaseCompScheduler(ABC):
             await self._set_run_result(
                 user_id, project_id, iteration, RunningState.ABORTED
             )
-            self.scheduled_pipelines.pop((user_id, project_id, iteration), None)
+            self._unschedule_pipeline(user_id, project_id, iteration)
         except (DaskClientAcquisisitonError, ClustersKeeperNotAvailableError):
             _logger.exception(
                 "Unexpected error while connecting with computational backend, aborting pipeline"
@@ -678,7 +780,7 @@ class BaseCompScheduler(ABC):
             await self._set_run_result(
                 user_id, project_id, iteration, RunningState.FAILED
             )
-            self.scheduled_pipelines.pop((user_id, project_id, iteration), None)
+            self._unschedule_pipeline(user_id, project_id, iteration)
         except ComputationalBackendNotConnectedError:
             _logger.exception("Computational backend is not connected!")
 
@@ -880,5 +982,15 @@ class BaseCompScheduler(ABC):
                 )
         return comp_tasks
 
+    def _mark_pipeline_dirty(
+        self, user_id: UserID, project_id: ProjectID, *, wake_up: bool = True
+    ) -> None:
+        self._dirty_pipelines.setdefault((user_id, project_id), time.monotonic())
+        if wake_up:
+            self.wake_up_event.set()
+
     def _wake_up_scheduler_now(self) -> None:
+        """all the scheduled pipelines are scheduled right away"""
+        for user_id, project_id, _ in self.scheduled_pipelines:
+            self._mark_pipeline_dirty(user_id, project_id, wake_up=False)
         self.wake_up_event.set()
@@ -106,6 +106,15 @@ class DaskScheduler(BaseCompScheduler):
         scheduled_tasks: dict[NodeID, CompTaskAtDB],
         pipeline_params: ScheduledPipelineParams,
     ) -> None:
+        loop = asyncio.get_running_loop()
+
+        def _on_task_done() -> None:
+            # NOTE: this runs in a separate thread
+            with contextlib.suppress(RuntimeError):  # loop is already closed
+                loop.call_soon_threadsafe(
+                    self._mark_pipeline_dirty, user_id, project_id
+                )
+
         # now transfer the pipeline to the dask scheduler
         async with _cluster_dask_client(user_id, pipeline_params, self) as client:
             # Change the tasks state to PENDING
@@ -124,7 +133,7 @@ class DaskScheduler(BaseCompScheduler):
                         cluster_id=pipeline_params.cluster_id,
                         tasks={node_id: task.image},
                         hardware_info=task.hardware_info,
-                        callback=self._wake_up_scheduler_now,
+                        callback=_on_task_done,
                         metadata=pipeline_params.run_metadata,
                     )
                     for node_id, task in scheduled_tasks.items()
@@ -339,6 +348,7 @@ class DaskScheduler(BaseCompScheduler):
                     iteration=run.iteration,
                     run_metadata=run.metadata,
                 )
+                self._mark_pipeline_dirty(user_id, project_id)
             else:
                 await comp_tasks_repo.update_project_task_progress(
                     project_id, node_id, task_progress_event.progress
@@ -10,6 +10,7 @@ from ...modules.dask_clients_pool import DaskClientsPool
 from ...modules.rabbitmq import get_rabbitmq_client, get_rabbitmq_rpc_client
 from ...utils.comp_scheduler import SCHEDULED_STATES
 from ..db.repositories.comp_runs import CompRunsRepository
+from ._monitoring import SchedulerMetrics
 from .base_scheduler import BaseCompScheduler, ScheduledPipelineParams
 from .dask_scheduler import DaskScheduler
 
@@ -53,4 +54,5 @@ async def create_from_db(app: FastAPI) -> BaseCompScheduler:
             for r in runs
         },
         service_runtime_heartbeat_interval=app_settings.SERVICE_TRACKING_HEARTBEAT,
+        metrics=SchedulerMetrics.create(app),
     )
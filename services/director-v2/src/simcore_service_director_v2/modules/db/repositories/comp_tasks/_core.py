@@ -72,6 +72,24 @@ class CompTasksRepository(BaseRepository):
                 tasks.append(task_db)
         return tasks
 
+    async def list_computational_tasks_modified_since(
+        self, project_id: ProjectID, since: datetime | None
+    ) -> tuple[list[CompTaskAtDB], datetime]:
+        """returns the computational tasks modified since `since` (all of them if None)
+        and the database time before listing them (to be used as next `since`)"""
+        tasks: list[CompTaskAtDB] = []
+        async with self.db_engine.acquire() as conn:
+            listed_at = await conn.scalar(sa.select(sa.func.now()))
+            query = sa.select(comp_tasks).where(
+                (comp_tasks.c.project_id == f"{project_id}")
+                & (comp_tasks.c.node_class == NodeClass.COMPUTATIONAL)
+            )
+            if since is not None:
+                query = query.where(comp_tasks.c.modified >= since)
+            async for row in conn.execute(query):
+                tasks.append(CompTaskAtDB.from_orm(row))
+        return tasks, listed_at
+
     async def task_exists(self, project_id: ProjectID, node_id: NodeID) -> bool:
         async with self.db_engine.acquire() as conn:
             nid: str | None = await conn.scalar(
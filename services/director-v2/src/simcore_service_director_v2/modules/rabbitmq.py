@@ -7,6 +7,7 @@ from models_library.rabbitmq_messages import (
     CreditsLimit,
     WalletCreditsLimitReachedMessage,
 )
+from prometheus_client import REGISTRY
 from servicelib.rabbitmq import (
     RabbitMQClient,
     RabbitMQRPCClient,
@@ -52,10 +53,15 @@ async def handler_out_of_credits(app: FastAPI, data: bytes) -> bool:
 
 def setup(app: FastAPI) -> None:
     async def on_startup() -> None:
-        settings: RabbitSettings = app.state.settings.DIRECTOR_V2_RABBITMQ
+        app_settings: AppSettings = app.state.settings
+        settings: RabbitSettings = app_settings.DIRECTOR_V2_RABBITMQ
         await wait_till_rabbitmq_responsive(settings.dsn)
         app.state.rabbitmq_client = RabbitMQClient(
-            client_name="director-v2", settings=settings
+            client_name="director-v2",
+            settings=settings,
+            metrics_registry=REGISTRY
+            if app_settings.DIRECTOR_V2_PROMETHEUS_INSTRUMENTATION_ENABLED
+            else None,
         )
         app.state.rabbitmq_rpc_client = await RabbitMQRPCClient.create(
             client_name="director-v2", settings=settings
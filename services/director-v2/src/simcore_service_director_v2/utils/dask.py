@@ -33,6 +33,7 @@ from pydantic import AnyUrl, ByteSize, ValidationError, parse_obj_as
 from servicelib.json_serialization import json_dumps
 from servicelib.logging_utils import log_catch, log_context
 from simcore_sdk import node_ports_v2
+from simcore_sdk.node_ports_common.constants import SIMCORE_LOCATION
 from simcore_sdk.node_ports_common.exceptions import (
     S3InvalidPathError,
     StorageInvalidCall,
@@ -206,10 +207,27 @@ async def compute_input_data(
     input_data = {}
 
     ports_errors = []
+    input_ports = await node_ports.inputs
+    # NOTE: the download links of the files in simcore are created in a single call to storage
+    download_links = await port_utils.get_download_links_from_storage_batch(
+        user_id=node_ports.user_id,
+        values=[
+            port.value
+            for port in input_ports.values()
+            if isinstance(port.value, links.FileLink)
+            and port.value.store == SIMCORE_LOCATION
+        ],
+        link_type=file_link_type,
+    )
     port: Port
-    for port in (await node_ports.inputs).values():
+    for port in input_ports.values():
         try:
-            value: _PVType = await port.get_value(file_link_type=file_link_type)
+            value: _PVType = (
+                download_links[port.value.path]
+                if isinstance(port.value, links.FileLink)
+                and port.value.path in download_links
+                else await port.get_value(file_link_type=file_link_type)
+            )
 
             # Mapping _PVType -> PortValue
             if isinstance(value, AnyUrl):
@@ -249,28 +267,37 @@ async def compute_output_data_schema(
     """
 
     output_data_schema: dict[str, Any] = {}
+    file_ports_mappings: dict[str, str | None] = {}
     for port in (await node_ports.outputs).values():
         output_data_schema[port.key] = {"required": port.default_value is None}
 
         if port_utils.is_file_type(port.property_type):
-            value_links = await port_utils.get_upload_links_from_storage(
-                user_id=user_id,
-                project_id=f"{project_id}",
-                node_id=f"{node_id}",
-                file_name=next(iter(port.file_to_key_map))
-                if port.file_to_key_map
-                else port.key,
-                link_type=file_link_type,
-                file_size=ByteSize(0),  # will create a single presigned link
-                sha256_checksum=None,
+            file_ports_mappings[port.key] = (
+                next(iter(port.file_to_key_map)) if port.file_to_key_map else None
             )
+
+    if file_ports_mappings:
+        # NOTE: the links of all the file ports are created in one call to storage
+        files_links = await port_utils.get_upload_links_from_storage_batch(
+            user_id=user_id,
+            project_id=f"{project_id}",
+            node_id=f"{node_id}",
+            file_names=list(
+                {
+                    mapping or port_key
+                    for port_key, mapping in file_ports_mappings.items()
+                }
+            ),
+            link_type=file_link_type,
+            file_size=ByteSize(0),  # will create a single presigned link
+        )
+        for port_key, mapping in file_ports_mappings.items():
+            value_links = files_links[mapping or port_key]
             assert value_links.urls  # nosec
             assert len(value_links.urls) == 1  # nosec
-            output_data_schema[port.key].update(
+            output_data_schema[port_key].update(
                 {
-                    "mapping": next(iter(port.file_to_key_map))
-                    if port.file_to_key_map
-                    else None,
+                    "mapping": mapping,
                     "url": f"{value_links.urls[0]}",
                 }
             )
@@ -142,11 +142,12 @@ async def publish_service_log(
     log: str,
     log_level: LogLevelInt,
 ) -> None:
+    # NOTE: the sidecars publish the log lines in batches, each line is a message
     message = LoggerRabbitMessage.construct(
         user_id=user_id,
         project_id=project_id,
         node_id=node_id,
-        messages=[log],
+        messages=log.split("\n"),
         log_level=log_level,
     )
 
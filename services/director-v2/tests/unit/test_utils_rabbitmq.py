@@ -0,0 +1,38 @@
+# pylint:disable=unused-variable
+# pylint:disable=unused-argument
+# pylint:disable=redefined-outer-name
+
+import logging
+from unittest import mock
+
+from faker import Faker
+from models_library.projects import ProjectID
+from models_library.projects_nodes_io import NodeID
+from models_library.rabbitmq_messages import LoggerRabbitMessage
+from models_library.users import UserID
+from pytest_mock import MockerFixture
+from servicelib.rabbitmq import RabbitMQClient
+from simcore_service_director_v2.utils.rabbitmq import publish_service_log
+
+
+async def test_publish_service_log_publishes_each_line_as_a_message(
+    mocker: MockerFixture, faker: Faker
+):
+    rabbitmq_client = mocker.AsyncMock(spec=RabbitMQClient)
+    log_lines = [faker.sentence() for _ in range(3)]
+
+    await publish_service_log(
+        rabbitmq_client,
+        user_id=UserID(faker.pyint(min_value=1)),
+        project_id=ProjectID(faker.uuid4()),
+        node_id=NodeID(faker.uuid4()),
+        log="\n".join(log_lines),
+        log_level=logging.INFO,
+    )
+
+    rabbitmq_client.publish.assert_called_once_with(
+        LoggerRabbitMessage.get_channel_name(), mock.ANY
+    )
+    published_message = rabbitmq_client.publish.call_args.args[1]
+    assert isinstance(published_message, LoggerRabbitMessage)
+    assert published_message.messages == log_lines
@@ -76,6 +76,12 @@ from simcore_service_director_v2.modules.dask_client import (
     DaskJobID,
     PublishedComputationTask,
 )
+from simcore_service_director_v2.modules.db.repositories.comp_pipelines import (
+    CompPipelinesRepository,
+)
+from simcore_service_director_v2.modules.db.repositories.comp_tasks import (
+    CompTasksRepository,
+)
 from simcore_service_director_v2.utils.comp_scheduler import COMPLETED_STATES
 from simcore_service_director_v2.utils.dask_client_utils import TaskHandlers
 from starlette.testclient import TestClient
@@ -470,7 +476,7 @@ async def _assert_schedule_pipeline_PENDING(
                 project_id=published_project.project.uuid,
                 cluster_id=DEFAULT_CLUSTER_ID,
                 tasks={f"{p.node_id}": p.image},
-                callback=scheduler._wake_up_scheduler_now,  # noqa: SLF001
+                callback=mock.ANY,
                 metadata=mock.ANY,
                 hardware_info=mock.ANY,
             )
@@ -806,7 +812,7 @@ async def test_proper_pipeline_is_scheduled(  # noqa: PLR0915
         tasks={
             f"{next_pending_task.node_id}": next_pending_task.image,
         },
-        callback=scheduler._wake_up_scheduler_now,  # noqa: SLF001
+        callback=mock.ANY,
         metadata=mock.ANY,
         hardware_info=mock.ANY,
     )
@@ -1424,6 +1430,103 @@ async def test_pipeline_with_on_demand_cluster_with_not_ready_backend_waits(
     )
 
 
+async def test_only_dirty_pipelines_are_scheduled(
+    with_disabled_scheduler_task: None,
+    mocked_dask_client: mock.MagicMock,
+    scheduler: BaseCompScheduler,
+    aiopg_engine: aiopg.sa.engine.Engine,
+    published_project: PublishedProject,
+    mocker: MockerFixture,
+):
+    _mock_send_computation_tasks(published_project.tasks, mocked_dask_client)
+
+    async def _return_tasks_pending(job_ids: list[str]) -> list[DaskClientTaskState]:
+        return [DaskClientTaskState.PENDING for job_id in job_ids]
+
+    mocked_dask_client.get_tasks_status.side_effect = _return_tasks_pending
+    spied_schedule_pipeline = mocker.spy(scheduler, "_schedule_pipeline")
+    await _assert_start_pipeline(aiopg_engine, published_project, scheduler)
+
+    # a new pipeline is scheduled right away
+    await scheduler.schedule_dirty_pipelines()
+    spied_schedule_pipeline.assert_called_once()
+    spied_schedule_pipeline.reset_mock()
+
+    # nothing changed, nothing to schedule
+    await scheduler.schedule_dirty_pipelines()
+    spied_schedule_pipeline.assert_not_called()
+
+    # the full sweep schedules every pipeline
+    await scheduler.schedule_all_pipelines()
+    spied_schedule_pipeline.assert_called_once()
+    spied_schedule_pipeline.reset_mock()
+
+    # a started task marks its pipeline
+    assert published_project.tasks[1].job_id
+    assert published_project.project.prj_owner
+    await _trigger_progress_event(
+        scheduler,
+        job_id=published_project.tasks[1].job_id,
+        user_id=published_project.project.prj_owner,
+        project_id=published_project.project.uuid,
+        node_id=published_project.tasks[1].node_id,
+    )
+    await scheduler.schedule_dirty_pipelines()
+    spied_schedule_pipeline.assert_called_once()
+    spied_schedule_pipeline.reset_mock()
+
+    # stopping the pipeline marks it as well
+    await scheduler.stop_pipeline(
+        published_project.project.prj_owner, published_project.project.uuid
+    )
+    await scheduler.schedule_dirty_pipelines()
+    spied_schedule_pipeline.assert_called_once()
+
+
+async def test_pipeline_dag_and_tasks_are_cached_while_scheduled(
+    with_disabled_scheduler_task: None,
+    mocked_dask_client: mock.MagicMock,
+    scheduler: BaseCompScheduler,
+    aiopg_engine: aiopg.sa.engine.Engine,
+    published_project: PublishedProject,
+    run_metadata: RunMetadataDict,
+    mocker: MockerFixture,
+):
+    _mock_send_computation_tasks(published_project.tasks, mocked_dask_client)
+
+    async def _return_tasks_pending(job_ids: list[str]) -> list[DaskClientTaskState]:
+        return [DaskClientTaskState.PENDING for job_id in job_ids]
+
+    mocked_dask_client.get_tasks_status.side_effect = _return_tasks_pending
+    spied_get_pipeline = mocker.spy(CompPipelinesRepository, "get_pipeline")
+    spied_list_tasks = mocker.spy(
+        CompTasksRepository, "list_computational_tasks_modified_since"
+    )
+    await _assert_start_pipeline(aiopg_engine, published_project, scheduler)
+    spied_get_pipeline.assert_called_once()
+
+    for _ in range(3):
+        await run_comp_scheduler(scheduler)
+    # the pipeline is read once per run
+    spied_get_pipeline.assert_called_once()
+    # the tasks are fully listed once, then only the modified ones
+    assert spied_list_tasks.call_args_list[0].kwargs["since"] is None
+    assert all(
+        c.kwargs["since"] is not None for c in spied_list_tasks.call_args_list[1:]
+    )
+
+    # a new run reads the pipeline again
+    assert published_project.project.prj_owner
+    await scheduler.run_new_pipeline(
+        user_id=published_project.project.prj_owner,
+        project_id=published_project.project.uuid,
+        cluster_id=DEFAULT_CLUSTER_ID,
+        run_metadata=run_metadata,
+        use_on_demand_clusters=False,
+    )
+    assert spied_get_pipeline.call_count == 2
+
+
 @pytest.mark.parametrize(
     "get_or_create_exception",
     [ClustersKeeperNotAvailableError],
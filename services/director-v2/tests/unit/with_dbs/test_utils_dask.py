@@ -77,6 +77,21 @@ async def mocked_node_ports_filemanager_fcts(
     faker: Faker,
     tasks_file_link_scheme: tuple,
 ) -> dict[str, mock.MagicMock]:
+    def _fake_upload_links() -> FileUploadSchema:
+        return FileUploadSchema(
+            urls=[
+                parse_obj_as(
+                    AnyUrl,
+                    f"{URL(faker.uri()).with_scheme(choice(tasks_file_link_scheme))}",  # noqa: S311
+                )
+            ],
+            chunk_size=parse_obj_as(ByteSize, "5GiB"),
+            links=FileUploadLinks(
+                abort_upload=parse_obj_as(AnyUrl, "https://www.fakeabort.com"),
+                complete_upload=parse_obj_as(AnyUrl, "https://www.fakecomplete.com"),
+            ),
+        )
+
     return {
         "entry_exists": mocker.patch(
             "simcore_service_director_v2.utils.dask.port_utils.filemanager.entry_exists",
@@ -91,24 +106,14 @@ async def mocked_node_ports_filemanager_fcts(
         "get_upload_links_from_s3": mocker.patch(
             "simcore_service_director_v2.utils.dask.port_utils.filemanager.get_upload_links_from_s3",
             autospec=True,
-            side_effect=lambda **kwargs: (
-                0,
-                FileUploadSchema(
-                    urls=[
-                        parse_obj_as(
-                            AnyUrl,
-                            f"{URL(faker.uri()).with_scheme(choice(tasks_file_link_scheme))}",  # noqa: S311
-                        )
-                    ],
-                    chunk_size=parse_obj_as(ByteSize, "5GiB"),
-                    links=FileUploadLinks(
-                        abort_upload=parse_obj_as(AnyUrl, "https://www.fakeabort.com"),
-                        complete_upload=parse_obj_as(
-                            AnyUrl, "https://www.fakecomplete.com"
-                        ),
-                    ),
-                ),
-            ),
+            side_effect=lambda **kwargs: (0, _fake_upload_links()),
+        ),
+        "get_upload_links_from_s3_batch": mocker.patch(
+            "simcore_service_director_v2.utils.dask.port_utils.filemanager.get_upload_links_from_s3_batch",
+            autospec=True,
+            side_effect=lambda **kwargs: {
+                f.file_id: _fake_upload_links() for f in kwargs["files"]
+            },
         ),
     }
 
@@ -329,9 +334,8 @@ async def test_compute_input_data(
         for value, value_type in zip(
             fake_inputs.values(), fake_io_schema.values(), strict=True
         ):
-            if value_type["type"] == "data:*/*":
-                yield parse_obj_as(AnyUrl, faker.url())
-            else:
+            # the download links of the files are created in a batch
+            if value_type["type"] != "data:*/*":
                 yield value
 
     mocked_node_ports_get_value_fct = mocker.patch(
@@ -339,6 +343,13 @@ async def test_compute_input_data(
         autospec=True,
         side_effect=return_fake_input_value(),
     )
+    mocked_get_download_links = mocker.patch(
+        "simcore_service_director_v2.utils.dask.port_utils.get_download_links_from_storage_batch",
+        autospec=True,
+        side_effect=lambda *, user_id, values, link_type: {
+            value.path: parse_obj_as(AnyUrl, faker.url()) for value in values
+        },
+    )
     node_ports = await create_node_ports(
         db_engine=initialized_app.state.engine,
         user_id=user_id,
@@ -352,7 +363,14 @@ async def test_compute_input_data(
         node_ports=node_ports,
     )
     mocked_node_ports_get_value_fct.assert_has_calls(
-        [mock.call(mock.ANY, file_link_type=tasks_file_link_type) for n in fake_io_data]
+        [
+            mock.call(mock.ANY, file_link_type=tasks_file_link_type)
+            for value_type in fake_io_schema.values()
+            if value_type["type"] != "data:*/*"
+        ]
+    )
+    mocked_get_download_links.assert_called_once_with(
+        user_id=user_id, values=mock.ANY, link_type=tasks_file_link_type
     )
     assert computed_input_data.keys() == fake_io_data.keys()
 
@@ -14,7 +14,7 @@ from models_library.rabbitmq_messages import (
 )
 from pydantic import NonNegativeFloat
 from servicelib.logging_utils import LogLevelInt, LogMessageStr, log_catch, log_context
-from servicelib.rabbitmq import RabbitMQClient, is_rabbitmq_responsive
+from servicelib.rabbitmq import RabbitMQClient, RabbitMQOutbox, is_rabbitmq_responsive
 from settings_library.rabbit import RabbitSettings
 
 from ..core.settings import ApplicationSettings
@@ -23,9 +23,15 @@ from ..modules.service_liveness import wait_for_service_liveness
 _logger = logging.getLogger(__file__)
 
 
-async def _post_rabbit_message(app: FastAPI, message: RabbitMessageBase) -> None:
+async def _post_rabbit_message(
+    app: FastAPI, message: RabbitMessageBase, *, batched: bool = False
+) -> None:
     with log_catch(_logger, reraise=False):
-        await get_rabbitmq_client(app).publish(message.channel_name, message)
+        if batched:
+            # NOTE: frequent messages (logs, progress) are published in batches
+            await get_rabbitmq_outbox(app).put(message.channel_name, message)
+        else:
+            await get_rabbitmq_client(app).publish(message.channel_name, message)
 
 
 async def post_resource_tracking_message(
@@ -46,7 +52,7 @@ async def post_log_message(
         log_level=log_level,
     )
 
-    await _post_rabbit_message(app, message)
+    await _post_rabbit_message(app, message, batched=True)
 
 
 async def post_progress_message(
@@ -60,7 +66,7 @@ async def post_progress_message(
         progress_type=progress_type,
         progress=progress_value,
     )
-    await _post_rabbit_message(app, message)
+    await _post_rabbit_message(app, message, batched=True)
 
 
 async def post_sidecar_log_message(
@@ -102,8 +108,13 @@ def setup_rabbitmq(app: FastAPI) -> None:
                 client_name=f"dynamic-sidecar_{app_settings.DY_SIDECAR_NODE_ID}",
                 settings=settings,
             )
+            app.state.rabbitmq_outbox = app.state.rabbitmq_client.create_outbox()
+            await app.state.rabbitmq_outbox.start()
 
     async def on_shutdown() -> None:
+        if app.state.rabbitmq_outbox:
+            # publishes the messages still waiting
+            await app.state.rabbitmq_outbox.stop()
         if app.state.rabbitmq_client:
             await app.state.rabbitmq_client.close()
 
@@ -121,3 +132,10 @@ def get_rabbitmq_client(app: FastAPI) -> RabbitMQClient:
         msg = "RabbitMQ client is not available. Please check the configuration."
         raise RuntimeError(msg)
     return cast(RabbitMQClient, app.state.rabbitmq_client)
+
+
+def get_rabbitmq_outbox(app: FastAPI) -> RabbitMQOutbox:
+    if not _is_rabbitmq_initialized(app):
+        msg = "RabbitMQ client is not available. Please check the configuration."
+        raise RuntimeError(msg)
+    return cast(RabbitMQOutbox, app.state.rabbitmq_outbox)
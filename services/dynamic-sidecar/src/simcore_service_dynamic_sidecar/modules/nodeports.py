@@ -1,35 +1,50 @@
+import asyncio
+import functools
 import json
 import logging
 import os
 import shutil
 import sys
 import time
-from collections import deque
 from contextlib import AsyncExitStack
 from enum import Enum
 from pathlib import Path
-from typing import Coroutine, Optional, cast
+from typing import Any, Optional, cast
 
 import aiofiles.os
 import magic
-from aiofiles.tempfile import TemporaryDirectory as AioTemporaryDirectory
 from models_library.projects import ProjectIDStr
 from models_library.projects_nodes_io import NodeIDStr
-from pydantic import ByteSize
-from servicelib.archiving_utils import PrunableFolder, archive_dir, unarchive_dir
+from pydantic import BaseModel, ByteSize
+from servicelib.archiving_utils import (
+    ArchiveStream,
+    PrunableFolder,
+    cpu_based_max_workers,
+    unarchive_dir,
+)
 from servicelib.async_utils import run_sequentially_in_context
 from servicelib.file_utils import remove_directory
 from servicelib.logging_utils import log_context
 from servicelib.progress_bar import ProgressBarData
 from servicelib.utils import logged_gather
 from simcore_sdk import node_ports_v2
-from simcore_sdk.node_ports_common.file_io_utils import LogRedirectCB
+from simcore_sdk.node_ports_common.file_io_utils import (
+    LogRedirectCB,
+    UploadableFileObject,
+)
 from simcore_sdk.node_ports_v2 import Nodeports, Port
 from simcore_sdk.node_ports_v2.links import ItemConcreteValue
 from simcore_sdk.node_ports_v2.port import SetKWargs
 from simcore_sdk.node_ports_v2.port_utils import is_file_type
 
 from ..core.settings import ApplicationSettings, get_settings
+from .nodeports_manifest import (
+    PortManifest,
+    compute_manifest,
+    get_manifest_path,
+    load_manifest,
+    save_manifest,
+)
 
 
 class PortTypeName(str, Enum):
@@ -39,15 +54,18 @@ class PortTypeName(str, Enum):
 
 _FILE_TYPE_PREFIX = "data:"
 _KEY_VALUE_FILE_NAME = "key_values.json"
+_OUTPUTS_MANIFESTS_DIR_NAME = "outputs_manifests"
 
 logger = logging.getLogger(__name__)
 
 # OUTPUTS section
 
 
-def _get_size_of_value(value: ItemConcreteValue | None) -> int:
+def _get_size_of_value(value: ItemConcreteValue | UploadableFileObject | None) -> int:
     if value is None:
         return 0
+    if isinstance(value, UploadableFileObject):
+        return value.file_size
     if isinstance(value, Path):
         # if symlink we need to fetch the pointer to the file
         # relative symlink need to know which their parent is
@@ -61,6 +79,13 @@ def _get_size_of_value(value: ItemConcreteValue | None) -> int:
     return sys.getsizeof(value)
 
 
+def _get_port_value(port: Port) -> dict[str, Any] | None:
+    if isinstance(port.value, BaseModel):
+        port_value: dict[str, Any] = json.loads(port.value.json(by_alias=True))
+        return port_value
+    return None
+
+
 _CONTROL_TESTMARK_DY_SIDECAR_NODEPORT_UPLOADED_MESSAGE = (
     "TEST: test_nodeports_integration DO NOT REMOVE"
 )
@@ -86,10 +111,18 @@ async def upload_outputs(
         r_clone_settings=None,
         io_log_redirect_cb=io_log_redirect_cb,
     )
+    # NOTE: persisted with the shared store, across restarts of the sidecar
+    manifests_dir = (
+        settings.DYNAMIC_SIDECAR_SHARED_STORE_DIR / _OUTPUTS_MANIFESTS_DIR_NAME
+    )
+    manifests_dir.mkdir(parents=True, exist_ok=True)
 
     # let's gather the tasks
-    ports_values: dict[str, tuple[ItemConcreteValue | None, SetKWargs | None]] = {}
-    archiving_tasks: deque[Coroutine[None, None, None]] = deque()
+    ports_values: dict[
+        str, tuple[ItemConcreteValue | UploadableFileObject | None, SetKWargs | None]
+    ] = {}
+    ports_manifests: dict[str, PortManifest] = {}
+    skipped_bytes = 0
     ports_to_set = [
         port_value
         for port_value in (await PORTS.outputs).values()
@@ -108,6 +141,27 @@ async def upload_outputs(
         for port in ports_to_set:
             if is_file_type(port.property_type):
                 src_folder = outputs_path / port.key
+
+                # NOTE: ports with the same content as their last upload are skipped
+                manifest_path = get_manifest_path(manifests_dir, port.key)
+                previous_manifest = load_manifest(manifest_path)
+                manifest = await asyncio.get_event_loop().run_in_executor(
+                    None, compute_manifest, src_folder, previous_manifest
+                )
+                if (
+                    previous_manifest
+                    and previous_manifest.has_same_files(manifest)
+                    and previous_manifest.port_value == _get_port_value(port)
+                ):
+                    logger.info("Port %s is unchanged, skipping upload", port.key)
+                    skipped_bytes += manifest.total_size
+                    # keeps track of touched files, their hash is not recomputed
+                    manifest.port_value = previous_manifest.port_value
+                    save_manifest(manifest_path, manifest)
+                    await sub_progress.update(2)
+                    continue
+                ports_manifests[port.key] = manifest
+
                 files_and_folders_list = list(src_folder.rglob("*"))
                 logger.debug("Discovered files to upload %s", files_and_folders_list)
 
@@ -131,25 +185,23 @@ async def upload_outputs(
                     continue
 
                 # generic case let's create an archive
-                # only the filtered out files will be zipped
-                tmp_folder = Path(
-                    await stack.enter_async_context(AioTemporaryDirectory())
-                )
-                tmp_file = tmp_folder / f"{src_folder.stem}.zip"
-
-                # when having multiple directories it is important to
-                # run the compression in parallel to guarantee better performance
-                archiving_tasks.append(
-                    archive_dir(
-                        dir_to_compress=src_folder,
-                        destination=tmp_file,
-                        compress=False,
-                        store_relative_path=True,
-                        progress_bar=sub_progress,
+                # NOTE: the archive is streamed while being uploaded, no temporary
+                # copy is written to disk and archiving overlaps with the upload
+                archive_stream = stack.enter_context(
+                    await asyncio.get_event_loop().run_in_executor(
+                        None,
+                        functools.partial(
+                            ArchiveStream, src_folder, store_relative_path=True
+                        ),
                     )
                 )
+                await sub_progress.update()
                 ports_values[port.key] = (
-                    tmp_file,
+                    UploadableFileObject(
+                        file_object=archive_stream,
+                        file_name=f"{src_folder.stem}.zip",
+                        file_size=archive_stream.archive_size,
+                    ),
                     SetKWargs(
                         file_base_path=(
                             src_folder.parent.relative_to(outputs_path.parent)
@@ -167,14 +219,23 @@ async def upload_outputs(
                 else:
                     logger.debug("No file %s to fetch port values from", data_file)
 
-        if archiving_tasks:
-            await logged_gather(*archiving_tasks)
+        if ports_values:
+            await PORTS.set_multiple(ports_values, progress_bar=sub_progress)
 
-        await PORTS.set_multiple(ports_values, progress_bar=sub_progress)
+        for port_key, manifest in ports_manifests.items():
+            manifest.port_value = _get_port_value(PORTS.internal_outputs[port_key])
+            save_manifest(get_manifest_path(manifests_dir, port_key), manifest)
 
         elapsed_time = time.perf_counter() - start_time
-        total_bytes = sum(_get_size_of_value(x) for x in ports_values.values())
-        logger.info("Uploaded %s bytes in %s seconds", total_bytes, elapsed_time)
+        total_bytes = sum(
+            _get_size_of_value(value) for value, _ in ports_values.values()
+        )
+        logger.info(
+            "Uploaded %s bytes in %s seconds, skipped %s bytes of unchanged ports",
+            total_bytes,
+            elapsed_time,
+            skipped_bytes,
+        )
         logger.debug(_CONTROL_TESTMARK_DY_SIDECAR_NODEPORT_UPLOADED_MESSAGE)
 
 
@@ -226,6 +287,7 @@ async def _get_data_from_port(
                 unarchived: set[Path] = await unarchive_dir(
                     archive_to_extract=downloaded_file,
                     destination_folder=final_path,
+                    max_workers=cpu_based_max_workers(),
                     progress_bar=sub_progress,
                 )
 
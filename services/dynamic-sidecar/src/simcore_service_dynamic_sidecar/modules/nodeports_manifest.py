@@ -0,0 +1,98 @@
+""" Manifest of the content of an output port, as it was last uploaded
+
+Used to avoid re-uploading output ports whose content did not change.
+The hash of a file is only recomputed when its size or modification time changed.
+"""
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any, Final
+
+from models_library.basic_types import SHA256Str
+from pydantic import BaseModel, NonNegativeInt, ValidationError
+
+_logger = logging.getLogger(__name__)
+
+_HASH_CHUNK_SIZE: Final[int] = 1024 * 1024
+
+
+class FileManifestEntry(BaseModel):
+    size: NonNegativeInt
+    mtime_ns: NonNegativeInt
+    sha256_checksum: SHA256Str
+
+
+class PortManifest(BaseModel):
+    files: dict[str, FileManifestEntry]
+    # value of the port after the upload of these files
+    port_value: dict[str, Any] | None = None
+
+    @property
+    def total_size(self) -> NonNegativeInt:
+        return sum(entry.size for entry in self.files.values())
+
+    def has_same_files(self, other: "PortManifest") -> bool:
+        return {k: v.sha256_checksum for k, v in self.files.items()} == {
+            k: v.sha256_checksum for k, v in other.files.items()
+        }
+
+
+def get_manifest_path(manifests_dir: Path, port_key: str) -> Path:
+    # NOTE: kept outside of the outputs directory, which the user service sees
+    return manifests_dir / f"{port_key}.manifest.json"
+
+
+def _compute_sha256_checksum(file_path: Path) -> SHA256Str:
+    sha256_hash = hashlib.sha256()  # nosec
+    with file_path.open("rb") as f:
+        while chunk := f.read(_HASH_CHUNK_SIZE):
+            sha256_hash.update(chunk)
+    return SHA256Str(sha256_hash.hexdigest())
+
+
+def load_manifest(manifest_path: Path) -> PortManifest | None:
+    try:
+        return PortManifest.parse_file(manifest_path)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValidationError, json.JSONDecodeError) as err:
+        _logger.warning("Ignoring invalid manifest %s: %s", manifest_path, err)
+        return None
+
+
+def save_manifest(manifest_path: Path, manifest: PortManifest) -> None:
+    manifest_path.write_text(manifest.json())
+
+
+def compute_manifest(
+    port_path: Path, previous_manifest: PortManifest | None
+) -> PortManifest:
+    """
+    hashes the files of the port, reusing the hashes of the previous manifest
+    for files with unchanged size and modification time
+
+    NOTE: blocking, walks and reads the directory
+    """
+    previous_files = previous_manifest.files if previous_manifest else {}
+    files: dict[str, FileManifestEntry] = {}
+    for path in sorted(port_path.rglob("*")) if port_path.exists() else []:
+        if not path.is_file():
+            continue
+        stat = path.stat()
+        relative_path = f"{path.relative_to(port_path)}"
+        previous_entry = previous_files.get(relative_path)
+        if (
+            previous_entry
+            and previous_entry.size == stat.st_size
+            and previous_entry.mtime_ns == stat.st_mtime_ns
+        ):
+            files[relative_path] = previous_entry
+            continue
+        files[relative_path] = FileManifestEntry(
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            sha256_checksum=_compute_sha256_checksum(path),
+        )
+    return PortManifest(files=files)
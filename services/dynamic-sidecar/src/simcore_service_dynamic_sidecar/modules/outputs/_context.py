@@ -15,6 +15,10 @@ class OutputsContext:
     # _PortKeysEventHandler (generates) -> EventFilter (receives)
     port_key_events_queue: AioQueue = field(default_factory=aioprocessing.AioQueue)
 
+    # _PortKeysEventHandler (generates) -> EventFilter (receives)
+    # contains the incrementally tracked size of the `port_key` directories
+    port_key_sizes_queue: AioQueue = field(default_factory=aioprocessing.AioQueue)
+
     # OutputsContext (generates) -> _EventHandlerProcess(receives)
     file_system_event_handler_queue: AioQueue = field(
         default_factory=aioprocessing.AioQueue
@@ -1,7 +1,21 @@
 import os
 from pathlib import Path
+from threading import RLock
 
-from pydantic import ByteSize, parse_obj_as
+from pydantic import ByteSize, NonNegativeInt, parse_obj_as
+
+
+def _scan_files_sizes(path: Path) -> dict[str, NonNegativeInt]:
+    files_sizes: dict[str, NonNegativeInt] = {}
+    if not path.is_dir():
+        return files_sizes
+
+    for entry in os.scandir(path):
+        if entry.is_file():
+            files_sizes[entry.path] = entry.stat().st_size
+        elif entry.is_dir():
+            files_sizes.update(_scan_files_sizes(Path(entry.path)))
+    return files_sizes
 
 
 def get_directory_total_size(path: Path) -> ByteSize:
@@ -19,3 +33,87 @@ def get_directory_total_size(path: Path) -> ByteSize:
         elif entry.is_dir():
             total += get_directory_total_size(Path(entry.path))
     return parse_obj_as(ByteSize, total)
+
+
+class DirectorySizeTracker:
+    """
+    Keeps the size of a directory up to date from the file system events
+    happening inside it, without having to walk the whole directory each time.
+
+    The size of every file is indexed, which makes updates idempotent:
+    receiving the same event twice or out of order does not cause drift.
+    Events which were missed (e.g. when event propagation was disabled)
+    are corrected by calling `rescan`.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = RLock()
+        self._files_sizes: dict[str, NonNegativeInt] = {}
+        self._total_size: NonNegativeInt = 0
+        self._changed_since_rescan: bool = False
+
+        self.rescan()
+
+    @property
+    def total_size(self) -> ByteSize:
+        return parse_obj_as(ByteSize, self._total_size)
+
+    @property
+    def file_count(self) -> NonNegativeInt:
+        return len(self._files_sizes)
+
+    @property
+    def changed_since_rescan(self) -> bool:
+        return self._changed_since_rescan
+
+    def _set_file_size(self, file_path: str, size: NonNegativeInt | None) -> None:
+        previous_size = (
+            self._files_sizes.pop(file_path, 0)
+            if size is None
+            else self._files_sizes.get(file_path, 0)
+        )
+        if size is not None:
+            self._files_sizes[file_path] = size
+        self._total_size += (size or 0) - previous_size
+
+    def update(self, path: Path, *, is_directory: bool) -> None:
+        """
+        refreshes the indexed size of a file or of a directory which
+        was created, modified, moved or removed
+        """
+        with self._lock:
+            self._changed_since_rescan = True
+            if not is_directory:
+                try:
+                    size: NonNegativeInt | None = (
+                        path.stat().st_size if path.is_file() else None
+                    )
+                except OSError:
+                    # removed in the meantime
+                    size = None
+                self._set_file_size(f"{path}", size)
+                return
+
+            if path.is_dir():
+                # NOTE: only the newly created or moved in directory is scanned
+                for file_path, size in _scan_files_sizes(path).items():
+                    self._set_file_size(file_path, size)
+                return
+
+            # directory was removed or moved away
+            prefix = f"{path}{os.sep}"
+            for file_path in [p for p in self._files_sizes if p.startswith(prefix)]:
+                self._set_file_size(file_path, None)
+
+    def rescan(self) -> ByteSize:
+        """
+        walks the whole directory to correct any drift,
+        returns the difference with the previously tracked size
+        """
+        with self._lock:
+            previous_total_size = self._total_size
+            self._files_sizes = _scan_files_sizes(self.path)
+            self._total_size = sum(self._files_sizes.values())
+            self._changed_since_rescan = False
+            return parse_obj_as(ByteSize, abs(self._total_size - previous_total_size))
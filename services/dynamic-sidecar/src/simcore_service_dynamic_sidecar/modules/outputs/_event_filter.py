@@ -85,6 +85,19 @@ class EventFilter:
         self._task_upload_events: Task | None = None
 
         self._port_key_tracked_event: dict[str, TrackedEvent] = {}
+        self._port_key_directory_size: dict[str, NonNegativeInt] = {}
+
+    def set_directory_size(self, port_key: str, size: NonNegativeInt) -> None:
+        """provides the size of the `port_key` directory, which is otherwise computed"""
+        self._port_key_directory_size[port_key] = size
+
+    def _get_directory_size(self, port_key: str) -> NonNegativeInt:
+        directory_size = self._port_key_directory_size.get(port_key)
+        if directory_size is None:
+            directory_size = get_directory_total_size(
+                self.outputs_manager.outputs_context.outputs_path / port_key
+            )
+        return directory_size
 
     async def _worker_incoming_event_ingestion(self) -> None:
         """processes incoming events generated by the watchdog"""
@@ -123,18 +136,17 @@ class EventFilter:
                 # Set the wait_interval for future events.
                 # NOTE: Computing the size of a directory is a relatively difficult task,
                 # example: on SSD with 1 million files ~ 2 seconds
-                # Size of directory will only be computed if:
+                # It is normally tracked incrementally by the event handler and
+                # only computed here as a fallback.
+                # Size of directory will only be looked up if:
                 # - event was just added
                 # - already waited more than the wait_interval
                 if (
                     tracked_event.wait_interval is None
                     or elapsed_since_detection > tracked_event.wait_interval
                 ):
-                    port_key_dir_path = (
-                        self.outputs_manager.outputs_context.outputs_path / port_key
-                    )
                     total_wait_for = self.delay_policy.get_wait_interval(
-                        get_directory_total_size(port_key_dir_path)
+                        self._get_directory_size(port_key)
                     )
                     tracked_event.wait_interval = total_wait_for
 
@@ -8,6 +8,7 @@ from contextlib import suppress
 from pathlib import Path
 from queue import Empty
 from threading import Thread
+from time import monotonic
 from time import sleep as blocking_sleep
 from typing import Any, Final
 
@@ -16,13 +17,21 @@ from aioprocessing.process import AioProcess
 from aioprocessing.queues import AioQueue
 from pydantic import PositiveFloat
 from servicelib.logging_utils import log_context
-from watchdog.events import FileSystemEvent
+from watchdog.events import (
+    EVENT_TYPE_CLOSED,
+    EVENT_TYPE_MODIFIED,
+    EVENT_TYPE_MOVED,
+    EVENT_TYPE_OPENED,
+    FileSystemEvent,
+)
 
 from ._context import OutputsContext
+from ._directory_utils import DirectorySizeTracker
 from ._manager import OutputsManager
 from ._watchdog_extensions import ExtendedInotifyObserver, SafeFileSystemEventHandler
 
 _HEART_BEAT_MARK: Final = 1
+_DIRECTORY_SIZE_VERIFICATION_INTERVAL_S: Final[PositiveFloat] = 60
 
 _logger = logging.getLogger(__name__)
 
@@ -30,42 +39,108 @@ _logger = logging.getLogger(__name__)
 class _PortKeysEventHandler(SafeFileSystemEventHandler):
     # NOTE: runs in the created process
 
-    def __init__(self, outputs_path: Path, port_key_events_queue: AioQueue):
+    def __init__(
+        self,
+        outputs_path: Path,
+        port_key_events_queue: AioQueue,
+        port_key_sizes_queue: AioQueue,
+    ):
         super().__init__()
 
         self._is_event_propagation_enabled: bool = False
         self.outputs_path: Path = outputs_path
         self.port_key_events_queue: AioQueue = port_key_events_queue
+        self.port_key_sizes_queue: AioQueue = port_key_sizes_queue
         self._outputs_port_keys: set[str] = set()
+        self._directory_size_trackers: dict[str, DirectorySizeTracker] = {}
+        self._published_sizes: dict[str, int] = {}
 
     def handle_set_outputs_port_keys(self, *, outputs_port_keys: set[str]) -> None:
         self._outputs_port_keys = outputs_port_keys
+        for port_key in set(self._directory_size_trackers) - set(outputs_port_keys):
+            self._directory_size_trackers.pop(port_key, None)
+            self._published_sizes.pop(port_key, None)
 
     def handle_toggle_event_propagation(self, *, is_enabled: bool) -> None:
         self._is_event_propagation_enabled = is_enabled
+        if not is_enabled:
+            # NOTE: events are ignored while disabled, sizes will be
+            # recomputed once the next event is received
+            self._directory_size_trackers.clear()
 
-    def event_handler(self, event: FileSystemEvent) -> None:
-        if not self._is_event_propagation_enabled:
-            return
-
-        # NOTE: ignoring all events which are not relative to modifying
-        # the contents of the `port_key` folders from the outputs directory
-
-        path_relative_to_outputs = Path(event.src_path).relative_to(self.outputs_path)
+    def _get_port_key(self, path: str) -> str | None:
+        try:
+            path_relative_to_outputs = Path(path).relative_to(self.outputs_path)
+        except ValueError:
+            return None
 
         # discard event if not part of a subfolder
         relative_path_parents = path_relative_to_outputs.parents
         event_in_subdirs = len(relative_path_parents) > 0
         if not event_in_subdirs:
-            return
+            return None
 
         # only accept events generated inside `port_key` subfolder
         port_key_candidate = f"{relative_path_parents[0]}"
+        if port_key_candidate not in self._outputs_port_keys:
+            return None
+        return port_key_candidate
+
+    def _publish_size(self, port_key: str) -> None:
+        tracker = self._directory_size_trackers.get(port_key)
+        if tracker is None:
+            return
+        total_size = tracker.total_size
+        if self._published_sizes.get(port_key) != total_size:
+            self._published_sizes[port_key] = total_size
+            self.port_key_sizes_queue.put((port_key, total_size))
 
-        if port_key_candidate in self._outputs_port_keys:
+    def _update_directory_size(
+        self, port_key: str, path: str, event: FileSystemEvent
+    ) -> None:
+        tracker = self._directory_size_trackers.get(port_key)
+        if tracker is None:
+            # NOTE: the first event walks the directory, the next ones are O(1)
+            tracker = self._directory_size_trackers[port_key] = DirectorySizeTracker(
+                self.outputs_path / port_key
+            )
+        else:
+            tracker.update(Path(path), is_directory=event.is_directory)
+        self._publish_size(port_key)
+
+    def verify_directory_sizes(self) -> None:
+        """corrects the drift of the directories which changed since last verification"""
+        for port_key, tracker in list(self._directory_size_trackers.items()):
+            if not tracker.changed_since_rescan:
+                continue
+            if drift := tracker.rescan():
+                _logger.debug("corrected %s size drift of %s", port_key, drift)
+            self._publish_size(port_key)
+
+    def event_handler(self, event: FileSystemEvent) -> None:
+        if not self._is_event_propagation_enabled:
+            return
+
+        # NOTE: ignoring all events which are not relative to modifying
+        # the contents of the `port_key` folders from the outputs directory
+        port_key = self._get_port_key(event.src_path)
+
+        # keep track of the size of the directories, ignoring the events
+        # which do not change it (or that of a directory when its content changes)
+        if event.event_type not in (EVENT_TYPE_OPENED, EVENT_TYPE_CLOSED) and not (
+            event.is_directory and event.event_type == EVENT_TYPE_MODIFIED
+        ):
+            if port_key is not None:
+                self._update_directory_size(port_key, event.src_path, event)
+            if event.event_type == EVENT_TYPE_MOVED:
+                dest_port_key = self._get_port_key(event.dest_path)
+                if dest_port_key is not None:
+                    self._update_directory_size(dest_port_key, event.dest_path, event)
+
+        if port_key is not None:
             # messages in this queue (part of the process),
             # will be consumed by the asyncio thread
-            self.port_key_events_queue.put(port_key_candidate)
+            self.port_key_events_queue.put(port_key)
 
 
 class _EventHandlerProcess:
@@ -126,6 +201,7 @@ class _EventHandlerProcess:
 
             # signal queue observers to finish
             self.outputs_context.port_key_events_queue.put(None)
+            self.outputs_context.port_key_sizes_queue.put(None)
             self.health_check_queue.put(None)
 
     def _thread_worker_update_outputs_port_keys(self) -> None:
@@ -159,6 +235,7 @@ class _EventHandlerProcess:
         self._file_system_event_handler = _PortKeysEventHandler(
             outputs_path=self.outputs_context.outputs_path,
             port_key_events_queue=self.outputs_context.port_key_events_queue,
+            port_key_sizes_queue=self.outputs_context.port_key_sizes_queue,
         )
         watch = None
 
@@ -175,6 +252,7 @@ class _EventHandlerProcess:
             )
             observer.start()
 
+            last_verification = monotonic()
             while self._stop_queue.qsize() == 0:
                 # watchdog internally uses 1 sec interval to detect events
                 # sleeping for less is useless.
@@ -188,6 +266,14 @@ class _EventHandlerProcess:
                 self.health_check_queue.put(_HEART_BEAT_MARK)
                 blocking_sleep(self.heart_beat_interval_s)
 
+                if (
+                    monotonic() - last_verification
+                    > _DIRECTORY_SIZE_VERIFICATION_INTERVAL_S
+                ):
+                    assert self._file_system_event_handler  # nosec
+                    self._file_system_event_handler.verify_directory_sizes()
+                    last_verification = monotonic()
+
         except Exception:  # pylint: disable=broad-except
             _logger.exception("Unexpected error")
         finally:
@@ -23,6 +23,7 @@ class OutputsWatcher:
         self.outputs_context = outputs_context
 
         self._task_events_worker: Task | None = None
+        self._task_sizes_worker: Task | None = None
         self._event_filter = EventFilter(outputs_manager=outputs_manager)
         self._observer_monitor: EventHandlerObserver = EventHandlerObserver(
             outputs_context=self.outputs_context,
@@ -40,6 +41,17 @@ class OutputsWatcher:
 
             await self._event_filter.enqueue(event)
 
+    async def _worker_sizes(self) -> None:
+        while True:
+            message: tuple[
+                str, int
+            ] | None = await self.outputs_context.port_key_sizes_queue.coro_get()
+            if message is None:
+                break
+
+            port_key, size = message
+            self._event_filter.set_directory_size(port_key, size)
+
     async def enable_event_propagation(self) -> None:
         await self.outputs_context.toggle_event_propagation(is_enabled=True)
 
@@ -51,6 +63,9 @@ class OutputsWatcher:
             self._task_events_worker = create_task(
                 self._worker_events(), name="outputs_watcher_events_worker"
             )
+            self._task_sizes_worker = create_task(
+                self._worker_sizes(), name="outputs_watcher_sizes_worker"
+            )
 
             await self._event_filter.start()
             await self._observer_monitor.start()
@@ -61,10 +76,11 @@ class OutputsWatcher:
             await self._event_filter.shutdown()
             await self._observer_monitor.stop()
 
-            if self._task_events_worker is not None:
-                self._task_events_worker.cancel()
-                with suppress(CancelledError):
-                    await self._task_events_worker
+            for task in (self._task_events_worker, self._task_sizes_worker):
+                if task is not None:
+                    task.cancel()
+                    with suppress(CancelledError):
+                        await task
 
 
 def setup_outputs_watcher(app: FastAPI) -> None:
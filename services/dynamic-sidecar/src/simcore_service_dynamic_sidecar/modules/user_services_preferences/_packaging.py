@@ -3,7 +3,7 @@ from typing import Final
 
 import aiofiles
 from pydantic import ByteSize, parse_obj_as
-from servicelib.archiving_utils import archive_dir, unarchive_dir
+from servicelib.archiving_utils import archive_dir, cpu_based_max_workers, unarchive_dir
 from servicelib.file_utils import remove_directory
 
 from ._errors import DestinationIsNotADirectoryError, PreferencesAreTooBigError
@@ -18,7 +18,13 @@ async def dir_to_bytes(source: Path) -> bytes:
     async with aiofiles.tempfile.TemporaryDirectory() as tmp_dir:
         archive_path = Path(tmp_dir) / "archive"
 
-        await archive_dir(source, archive_path, compress=True, store_relative_path=True)
+        await archive_dir(
+            source,
+            archive_path,
+            compress=True,
+            store_relative_path=True,
+            max_workers=cpu_based_max_workers(),
+        )
 
         archive_size = archive_path.stat().st_size
         if archive_size > _MAX_PREFERENCES_TOTAL_SIZE:
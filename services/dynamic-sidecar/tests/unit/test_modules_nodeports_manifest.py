@@ -0,0 +1,75 @@
+# pylint:disable=redefined-outer-name
+
+import os
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+from simcore_service_dynamic_sidecar.modules import nodeports_manifest
+from simcore_service_dynamic_sidecar.modules.nodeports_manifest import (
+    compute_manifest,
+    get_manifest_path,
+    load_manifest,
+    save_manifest,
+)
+
+
+@pytest.fixture
+def port_path(tmp_path: Path) -> Path:
+    port_path = tmp_path / "outputs" / "output_1"
+    (port_path / "subdir").mkdir(parents=True)
+    for i in range(5):
+        (port_path / f"file_{i}.txt").write_text(f"content {i}")
+        (port_path / "subdir" / f"file_{i}.txt").write_text(f"content {i}")
+    return port_path
+
+
+def test_manifest_detects_changes(port_path: Path):
+    manifest = compute_manifest(port_path, None)
+    assert len(manifest.files) == 10
+    assert manifest.total_size == sum(
+        p.stat().st_size for p in port_path.rglob("*") if p.is_file()
+    )
+
+    # touching a file does not change the content
+    touched_file = port_path / "file_0.txt"
+    stat = touched_file.stat()
+    os.utime(touched_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert compute_manifest(port_path, manifest).has_same_files(manifest)
+
+    # changing, adding or removing a file does
+    touched_file.write_text("changed")
+    assert not compute_manifest(port_path, manifest).has_same_files(manifest)
+    touched_file.write_text("content 0")
+    assert compute_manifest(port_path, manifest).has_same_files(manifest)
+
+    (port_path / "new_file.txt").write_text("new")
+    assert not compute_manifest(port_path, manifest).has_same_files(manifest)
+    (port_path / "new_file.txt").unlink()
+
+    (port_path / "subdir" / "file_1.txt").unlink()
+    assert not compute_manifest(port_path, manifest).has_same_files(manifest)
+
+
+def test_manifest_hashes_only_modified_files(port_path: Path, mocker: MockerFixture):
+    spy_hash = mocker.spy(nodeports_manifest, "_compute_sha256_checksum")
+    manifest = compute_manifest(port_path, None)
+    assert spy_hash.call_count == 10
+
+    (port_path / "file_0.txt").write_text("a change of size")
+    compute_manifest(port_path, manifest)
+    assert spy_hash.call_count == 11
+
+
+def test_save_and_load_manifest(port_path: Path, tmp_path: Path):
+    manifest_path = get_manifest_path(tmp_path / "manifests", port_path.name)
+    manifest_path.parent.mkdir()
+    assert load_manifest(manifest_path) is None
+
+    manifest = compute_manifest(port_path, None)
+    manifest.port_value = {"store": 0, "path": "some/file.zip"}
+    save_manifest(manifest_path, manifest)
+    assert load_manifest(manifest_path) == manifest
+
+    manifest_path.write_text("not a manifest")
+    assert load_manifest(manifest_path) is None
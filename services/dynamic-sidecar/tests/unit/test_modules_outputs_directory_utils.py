@@ -1,5 +1,6 @@
 # pylint:disable=redefined-outer-name
 
+import shutil
 import time
 from pathlib import Path
 from random import randbytes
@@ -8,6 +9,7 @@ from uuid import uuid4
 import pytest
 from pydantic import NonNegativeInt, PositiveInt
 from simcore_service_dynamic_sidecar.modules.outputs._directory_utils import (
+    DirectorySizeTracker,
     get_directory_total_size,
 )
 
@@ -57,3 +59,42 @@ def test_get_directory_total_size(dir_with_files: tuple[Path, PositiveInt]):
     print(f"runtime {runtime:04}")
 
     assert expected_size == dir_size
+
+
+def test_directory_size_tracker(dir_with_files: tuple[Path, PositiveInt]):
+    path, expected_size = dir_with_files
+    tracker = DirectorySizeTracker(path)
+    assert tracker.total_size == expected_size
+    assert tracker.changed_since_rescan is False
+
+    # file created, then modified
+    new_file = path / "d0" / "new_file"
+    new_file.write_bytes(randbytes(10))
+    tracker.update(new_file, is_directory=False)
+    assert tracker.total_size == expected_size + 10
+    new_file.write_bytes(randbytes(20))
+    tracker.update(new_file, is_directory=False)
+    tracker.update(new_file, is_directory=False)
+    assert tracker.total_size == expected_size + 20
+
+    # directory moved in
+    new_dir_size = _create_files(tmp_dir := path.parent / f"{uuid4()}", 3)
+    moved_dir = tmp_dir.rename(path / "moved_in")
+    tracker.update(moved_dir, is_directory=True)
+    assert tracker.total_size == expected_size + 20 + new_dir_size
+
+    # file and directory removed
+    new_file.unlink()
+    tracker.update(new_file, is_directory=False)
+    shutil.rmtree(moved_dir)
+    tracker.update(moved_dir, is_directory=True)
+    assert tracker.total_size == expected_size
+    assert tracker.total_size == get_directory_total_size(path)
+    assert tracker.changed_since_rescan is True
+
+    # missed events are corrected by a rescan
+    _create_files(path / "missed", 2)
+    assert tracker.total_size == expected_size
+    assert tracker.rescan() == 2
+    assert tracker.total_size == get_directory_total_size(path)
+    assert tracker.changed_since_rescan is False
@@ -115,5 +115,13 @@ class ApplicationSettings(MinimalApplicationSettings):
         default=6,
         description="Heartbeat couter limit when RUT considers service as unhealthy.",
     )
+    RESOURCE_USAGE_TRACKER_HEARTBEATS_BATCH_WINDOW: datetime.timedelta = Field(
+        default=datetime.timedelta(milliseconds=500),
+        description="Heartbeats received within this window are written to the DB together. (default to seconds, or see https://pydantic-docs.helpmanual.io/usage/types/#datetime-types for string formating)",
+    )
+    RESOURCE_USAGE_TRACKER_HEARTBEATS_BATCH_MAX_SIZE: PositiveInt = Field(
+        default=100,
+        description="Maximum number of heartbeats written to the DB together (also the number of RabbitMQ messages handled concurrently)",
+    )
     RESOURCE_USAGE_TRACKER_PROMETHEUS_INSTRUMENTATION_ENABLED: bool = True
     RESOURCE_USAGE_TRACKER_S3: S3Settings | None = Field(auto_default_from_env=True)
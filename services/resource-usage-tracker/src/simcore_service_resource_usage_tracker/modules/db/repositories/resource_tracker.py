@@ -48,6 +48,7 @@ from simcore_service_resource_usage_tracker.models.resource_tracker_pricing_unit
     PricingUnitCostsDB,
 )
 from sqlalchemy.dialects.postgresql import ARRAY, INTEGER
+from sqlalchemy.ext.asyncio import AsyncConnection
 
 from ....models.resource_tracker_credit_transactions import (
     CreditTransactionCreate,
@@ -150,6 +151,46 @@ class ResourceTrackerRepository(BaseRepository):
             return None
         return ServiceRunDB.from_orm(row)
 
+    async def update_service_runs_last_heartbeat(
+        self, conn: AsyncConnection, data: list[ServiceRunLastHeartbeatUpdate]
+    ) -> list[ServiceRunDB]:
+        """updates all the service runs in a single statement, returns the updated ones
+
+        NOTE: runs in the transaction of conn, a service run shall appear only once in data
+        """
+        if not data:
+            return []
+        heartbeats = sa.values(
+            sa.column("service_run_id", sa.String),
+            sa.column("last_heartbeat_at", sa.DateTime(timezone=True)),
+            name="heartbeats",
+        ).data([(d.service_run_id, d.last_heartbeat_at) for d in data])
+        update_stmt = (
+            resource_tracker_service_runs.update()
+            .values(
+                modified=sa.func.now(),
+                last_heartbeat_at=heartbeats.c.last_heartbeat_at,
+                missed_heartbeat_counter=0,
+            )
+            .where(
+                (
+                    resource_tracker_service_runs.c.service_run_id
+                    == heartbeats.c.service_run_id
+                )
+                & (
+                    resource_tracker_service_runs.c.service_run_status
+                    == ServiceRunStatus.RUNNING
+                )
+                & (
+                    resource_tracker_service_runs.c.last_heartbeat_at
+                    <= heartbeats.c.last_heartbeat_at
+                )
+            )
+            .returning(*resource_tracker_service_runs.columns)
+        )
+        result = await conn.execute(update_stmt)
+        return [ServiceRunDB.from_orm(row) for row in result.fetchall()]
+
     async def update_service_run_stopped_at(
         self, data: ServiceRunStoppedAtUpdate
     ) -> ServiceRunDB | None:
@@ -569,6 +610,63 @@ class ResourceTrackerRepository(BaseRepository):
             return None
         return row[0]
 
+    async def update_credit_transactions_credits(
+        self, conn: AsyncConnection, data: list[CreditTransactionCreditsUpdate]
+    ) -> list[ServiceRunId]:
+        """updates all the credit transactions in a single statement, returns the service runs of the updated ones
+
+        NOTE: runs in the transaction of conn, a service run shall appear only once in data
+        """
+        if not data:
+            return []
+        credits_updates = sa.values(
+            sa.column("service_run_id", sa.String),
+            sa.column("osparc_credits", sa.Numeric),
+            sa.column("last_heartbeat_at", sa.DateTime(timezone=True)),
+            name="credits_updates",
+        ).data(
+            [(d.service_run_id, d.osparc_credits, d.last_heartbeat_at) for d in data]
+        )
+        update_stmt = (
+            resource_tracker_credit_transactions.update()
+            .values(
+                modified=sa.func.now(),
+                osparc_credits=credits_updates.c.osparc_credits,
+                last_heartbeat_at=credits_updates.c.last_heartbeat_at,
+            )
+            .where(
+                (
+                    resource_tracker_credit_transactions.c.service_run_id
+                    == credits_updates.c.service_run_id
+                )
+                & (
+                    resource_tracker_credit_transactions.c.transaction_status
+                    == CreditTransactionStatus.PENDING
+                )
+                & (
+                    resource_tracker_credit_transactions.c.last_heartbeat_at
+                    <= credits_updates.c.last_heartbeat_at
+                )
+            )
+            .returning(resource_tracker_credit_transactions.c.service_run_id)
+        )
+        result = await conn.execute(update_stmt)
+        return [row[0] for row in result.fetchall()]
+
+    async def list_service_runs_status(
+        self, service_run_ids: list[ServiceRunId]
+    ) -> dict[ServiceRunId, ServiceRunStatus]:
+        async with self.db_engine.begin() as conn:
+            result = await conn.execute(
+                sa.select(
+                    resource_tracker_service_runs.c.service_run_id,
+                    resource_tracker_service_runs.c.service_run_status,
+                ).where(
+                    resource_tracker_service_runs.c.service_run_id.in_(service_run_ids)
+                )
+            )
+        return {row[0]: row[1] for row in result.fetchall()}
+
     async def update_credit_transaction_credits_and_status(
         self, data: CreditTransactionCreditsAndStatusUpdate
     ) -> CreditTransactionId | None:
@@ -1,3 +1,4 @@
+import asyncio
 import functools
 import logging
 from collections.abc import Awaitable, Callable
@@ -14,6 +15,7 @@ from .core.settings import ApplicationSettings
 from .modules.rabbitmq import get_rabbitmq_client
 from .modules.redis import get_redis_client
 from .resource_tracker_background_task import periodic_check_of_running_services_task
+from .resource_tracker_heartbeats_batcher import HeartbeatsBatcher
 from .resource_tracker_process_messages import process_message
 
 _logger = logging.getLogger(__name__)
@@ -25,12 +27,15 @@ _RUT_MESSAGE_TTL_IN_MS = 2 * 60 * 60 * 1000  # 2 hours
 
 async def _subscribe_to_rabbitmq(app) -> str:
     with log_context(_logger, logging.INFO, msg="Subscribing to rabbitmq channel"):
+        app_settings: ApplicationSettings = app.state.settings
         rabbit_client: RabbitMQClient = get_rabbitmq_client(app)
         subscribed_queue: str = await rabbit_client.subscribe(
             RabbitResourceTrackingBaseMessage.get_channel_name(),
             message_handler=functools.partial(process_message, app),
             exclusive_queue=False,
             message_ttl=_RUT_MESSAGE_TTL_IN_MS,
+            # NOTE: a batch of heartbeats can only be as large as the messages handled concurrently
+            prefetch_count=app_settings.RESOURCE_USAGE_TRACKER_HEARTBEATS_BATCH_MAX_SIZE,
         )
         return subscribed_queue
 
@@ -43,12 +48,17 @@ def on_app_startup(app: FastAPI) -> Callable[[], Awaitable[None]]:
             app_settings: ApplicationSettings = app.state.settings
             app.state.resource_tracker_rabbitmq_consumer = None
             app.state.resource_tracker_background_task = None
+            app.state.resource_tracker_heartbeats_batcher = None
             settings: RabbitSettings | None = (
                 app_settings.RESOURCE_USAGE_TRACKER_RABBITMQ
             )
             if not settings:
                 _logger.warning("RabbitMQ client is de-activated in the settings")
                 return
+            app.state.resource_tracker_events_lock = asyncio.Lock()
+            app.state.resource_tracker_heartbeats_batcher = HeartbeatsBatcher.create(
+                app
+            )
             app.state.resource_tracker_rabbitmq_consumer = await _subscribe_to_rabbitmq(
                 app
             )
@@ -74,6 +84,8 @@ def on_app_shutdown(
         assert _app  # nosec
         if _app.state.resource_tracker_background_task:
             await stop_periodic_task(_app.state.resource_tracker_background_task)
+        if _app.state.resource_tracker_heartbeats_batcher:
+            await _app.state.resource_tracker_heartbeats_batcher.close()
 
     return _stop
 
@@ -0,0 +1,158 @@
+""" Micro-batching of the heartbeats messages
+
+Heartbeats are the most frequent resource tracking messages. Instead of being written to the DB one by one,
+the ones received within a short window are written together, and each message handler only returns
+(i.e. the message is only acknowledged) once its batch is committed.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+
+from fastapi import FastAPI
+from models_library.rabbitmq_messages import RabbitResourceTrackingHeartbeatMessage
+from prometheus_client import REGISTRY, Counter, Histogram
+
+from .core.settings import ApplicationSettings
+from .modules.db.repositories.resource_tracker import ResourceTrackerRepository
+from .modules.rabbitmq import get_rabbitmq_client
+from .resource_tracker_process_messages import process_heartbeat_events
+
+_logger = logging.getLogger(__name__)
+
+_LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, float("inf"))
+_BATCH_SIZE_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, float("inf"))
+
+
+@dataclass(frozen=True)
+class _BatcherMetrics:
+    processed_heartbeats: Counter | None
+    batch_size: Histogram | None
+    heartbeat_latency: Histogram | None
+
+    @classmethod
+    def create(cls, app: FastAPI) -> "_BatcherMetrics":
+        app_settings: ApplicationSettings = app.state.settings
+        if not app_settings.RESOURCE_USAGE_TRACKER_PROMETHEUS_INSTRUMENTATION_ENABLED:
+            return cls(
+                processed_heartbeats=None, batch_size=None, heartbeat_latency=None
+            )
+        # NOTE: the collectors of the default registry are unregistered
+        # on shutdown by the prometheus instrumentation
+        return cls(
+            processed_heartbeats=Counter(
+                name="resource_tracker_heartbeats_processed_total",
+                documentation="Number of heartbeats written to the DB",
+                registry=REGISTRY,
+            ),
+            batch_size=Histogram(
+                name="resource_tracker_heartbeats_batch_size",
+                documentation="Number of heartbeats written to the DB together",
+                buckets=_BATCH_SIZE_BUCKETS,
+                registry=REGISTRY,
+            ),
+            heartbeat_latency=Histogram(
+                name="resource_tracker_heartbeats_latency_seconds",
+                documentation="Time between the reception of a heartbeat and its commit to the DB",
+                buckets=_LATENCY_BUCKETS,
+                registry=REGISTRY,
+            ),
+        )
+
+    def observe_batch(self, received_at: list[float]) -> None:
+        if self.processed_heartbeats:
+            self.processed_heartbeats.inc(len(received_at))
+        if self.batch_size:
+            self.batch_size.observe(len(received_at))
+        if self.heartbeat_latency:
+            now = time.monotonic()
+            for received in received_at:
+                self.heartbeat_latency.observe(now - received)
+
+
+@dataclass(frozen=True)
+class _PendingHeartbeat:
+    msg: RabbitResourceTrackingHeartbeatMessage
+    received_at: float
+    committed: asyncio.Future[None]
+
+
+@dataclass
+class HeartbeatsBatcher:
+    app: FastAPI
+    window_s: float
+    max_size: int
+    metrics: _BatcherMetrics
+    _pending: list[_PendingHeartbeat] = field(default_factory=list, init=False)
+    _flush_handle: asyncio.TimerHandle | None = field(default=None, init=False)
+    _batch_tasks: set[asyncio.Task] = field(default_factory=set, init=False)
+
+    @classmethod
+    def create(cls, app: FastAPI) -> "HeartbeatsBatcher":
+        app_settings: ApplicationSettings = app.state.settings
+        return cls(
+            app=app,
+            window_s=app_settings.RESOURCE_USAGE_TRACKER_HEARTBEATS_BATCH_WINDOW.total_seconds(),
+            max_size=app_settings.RESOURCE_USAGE_TRACKER_HEARTBEATS_BATCH_MAX_SIZE,
+            metrics=_BatcherMetrics.create(app),
+        )
+
+    async def process(self, msg: RabbitResourceTrackingHeartbeatMessage) -> None:
+        """returns once the heartbeat is committed to the DB
+
+        Raises:
+            the error that made the batch fail
+        """
+        loop = asyncio.get_running_loop()
+        committed: asyncio.Future[None] = loop.create_future()
+        self._pending.append(_PendingHeartbeat(msg, time.monotonic(), committed))
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window_s, self._flush)
+        await committed
+
+    async def close(self) -> None:
+        self._flush()
+        if self._batch_tasks:
+            await asyncio.gather(*self._batch_tasks, return_exceptions=True)
+
+    def _flush(self) -> None:
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.create_task(
+            self._process_batch(batch), name="resource tracker heartbeats batch"
+        )
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+
+    async def _process_batch(self, batch: list[_PendingHeartbeat]) -> None:
+        try:
+            await process_heartbeat_events(
+                ResourceTrackerRepository(db_engine=self.app.state.engine),
+                [pending.msg for pending in batch],
+                get_rabbitmq_client(self.app),
+            )
+        except asyncio.CancelledError:
+            for pending in batch:
+                pending.committed.cancel()
+            raise
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            # NOTE: the messages handlers will raise, so the messages are retried
+            _logger.warning(
+                "Processing a batch of %s heartbeats failed: %s", len(batch), exc
+            )
+            for pending in batch:
+                if not pending.committed.done():
+                    pending.committed.set_exception(exc)
+            return
+
+        for pending in batch:
+            if not pending.committed.done():
+                pending.committed.set_result(None)
+        self.metrics.observe_batch([pending.received_at for pending in batch])
@@ -1,5 +1,6 @@
 import logging
 from collections.abc import Awaitable, Callable
+from datetime import datetime
 from decimal import Decimal
 
 from fastapi import FastAPI
@@ -17,6 +18,7 @@ from models_library.resource_tracker import (
     CreditClassification,
     CreditTransactionStatus,
     ResourceTrackerServiceType,
+    ServiceRunId,
     ServiceRunStatus,
 )
 from models_library.services import ServiceType
@@ -29,6 +31,7 @@ from .models.resource_tracker_credit_transactions import (
 )
 from .models.resource_tracker_service_runs import (
     ServiceRunCreate,
+    ServiceRunDB,
     ServiceRunLastHeartbeatUpdate,
     ServiceRunStoppedAtUpdate,
 )
@@ -51,14 +54,21 @@ async def process_message(app: FastAPI, data: bytes) -> bool:
         rabbit_message.message_type,
         rabbit_message.service_run_id,
     )
+    if isinstance(rabbit_message, RabbitResourceTrackingHeartbeatMessage):
+        # NOTE: heartbeats are written to the DB in batches
+        await app.state.resource_tracker_heartbeats_batcher.process(rabbit_message)
+        return True
+
     resource_tracker_repo: ResourceTrackerRepository = ResourceTrackerRepository(
         db_engine=app.state.engine
     )
     rabbitmq_client = get_rabbitmq_client(app)
 
-    await RABBIT_MSG_TYPE_TO_PROCESS_HANDLER[rabbit_message.message_type](
-        resource_tracker_repo, rabbit_message, rabbitmq_client
-    )
+    # NOTE: start/stop events are handled one at a time in the order they are received
+    async with app.state.resource_tracker_events_lock:
+        await RABBIT_MSG_TYPE_TO_PROCESS_HANDLER[rabbit_message.message_type](
+            resource_tracker_repo, rabbit_message, rabbitmq_client
+        )
     return True
 
 
@@ -151,70 +161,133 @@ async def _process_heartbeat_event(
     msg: RabbitResourceTrackingHeartbeatMessage,
     rabbitmq_client: RabbitMQClient,
 ):
-    service_run_db = await resource_tracker_repo.get_service_run_by_id(
-        service_run_id=msg.service_run_id
-    )
-    if not service_run_db:
-        _logger.error(
-            "Recieved process heartbeat event for service_run_id: %s, but we do not have the started record in the DB, INVESTIGATE!",
-            msg.service_run_id,
-        )
-        return
-    if service_run_db.service_run_status in {
-        ServiceRunStatus.SUCCESS,
-        ServiceRunStatus.ERROR,
-    }:
-        _logger.error(
-            "Recieved process heartbeat event for service_run_id: %s, but it was already closed, INVESTIGATE!",
-            msg.service_run_id,
-        )
-        return
+    await process_heartbeat_events(resource_tracker_repo, [msg], rabbitmq_client)
 
-    # Update `service run` record (if billable `credit transaction`) in the DB
-    update_service_run_last_heartbeat = ServiceRunLastHeartbeatUpdate(
-        service_run_id=msg.service_run_id, last_heartbeat_at=msg.created_at
-    )
-    running_service = await resource_tracker_repo.update_service_run_last_heartbeat(
-        update_service_run_last_heartbeat
-    )
-    if running_service is None:
-        _logger.info("Nothing to update: %s", msg)
-        return
 
-    if running_service.wallet_id and running_service.pricing_unit_cost:
-        # Compute currently used credits
-        computed_credits = await compute_service_run_credit_costs(
-            running_service.started_at,
-            msg.created_at,
-            running_service.pricing_unit_cost,
+async def process_heartbeat_events(
+    resource_tracker_repo: ResourceTrackerRepository,
+    msgs: list[RabbitResourceTrackingHeartbeatMessage],
+    rabbitmq_client: RabbitMQClient,
+) -> None:
+    # only the latest heartbeat of each service run matters
+    latest_heartbeats: dict[ServiceRunId, datetime] = {}
+    for msg in msgs:
+        if (
+            msg.service_run_id not in latest_heartbeats
+            or msg.created_at > latest_heartbeats[msg.service_run_id]
+        ):
+            latest_heartbeats[msg.service_run_id] = msg.created_at
+
+    # Update `service run` records and the credits of the billed ones in a single transaction
+    async with resource_tracker_repo.db_engine.begin() as conn:
+        running_services = (
+            await resource_tracker_repo.update_service_runs_last_heartbeat(
+                conn,
+                [
+                    ServiceRunLastHeartbeatUpdate(
+                        service_run_id=service_run_id,
+                        last_heartbeat_at=last_heartbeat_at,
+                    )
+                    for service_run_id, last_heartbeat_at in latest_heartbeats.items()
+                ],
+            )
         )
-        # Update credits in the transaction table
-        update_credit_transaction = CreditTransactionCreditsUpdate(
-            service_run_id=msg.service_run_id,
-            osparc_credits=make_negative(computed_credits),
-            last_heartbeat_at=msg.created_at,
+        billed_services, credits_updates = await _compute_credits_updates(
+            running_services, latest_heartbeats
         )
-        await resource_tracker_repo.update_credit_transaction_credits(
-            update_credit_transaction
+        await resource_tracker_repo.update_credit_transactions_credits(
+            conn, credits_updates
         )
-        # Publish wallet total credits to RabbitMQ
+
+    if not_updated_service_run_ids := set(latest_heartbeats).difference(
+        s.service_run_id for s in running_services
+    ):
+        await _log_not_updated_heartbeats(
+            resource_tracker_repo, not_updated_service_run_ids
+        )
+
+    # Publish wallets total credits to RabbitMQ (once per wallet)
+    for product_name, wallet_id in {
+        (s.product_name, s.wallet_id) for s in billed_services if s.wallet_id
+    }:
         wallet_total_credits = await sum_credit_transactions_and_publish_to_rabbitmq(
             resource_tracker_repo,
             rabbitmq_client,
-            running_service.product_name,
-            running_service.wallet_id,
+            product_name,
+            wallet_id,
         )
         if wallet_total_credits.available_osparc_credits < CreditsLimit.OUT_OF_CREDITS:
             await publish_to_rabbitmq_wallet_credits_limit_reached(
                 resource_tracker_repo,
                 rabbitmq_client,
-                product_name=running_service.product_name,
-                wallet_id=running_service.wallet_id,
+                product_name=product_name,
+                wallet_id=wallet_id,
                 credits_=wallet_total_credits.available_osparc_credits,
                 credits_limit=CreditsLimit.OUT_OF_CREDITS,
             )
 
 
+async def _compute_credits_updates(
+    running_services: list[ServiceRunDB],
+    latest_heartbeats: dict[ServiceRunId, datetime],
+) -> tuple[list[ServiceRunDB], list[CreditTransactionCreditsUpdate]]:
+    """Computes currently used credits of all the billed services"""
+    billed_services: list[ServiceRunDB] = []
+    credits_updates: list[CreditTransactionCreditsUpdate] = []
+    for running_service in running_services:
+        if not (running_service.wallet_id and running_service.pricing_unit_cost):
+            continue
+        last_heartbeat_at = latest_heartbeats[running_service.service_run_id]
+        try:
+            computed_credits = await compute_service_run_credit_costs(
+                running_service.started_at,
+                last_heartbeat_at,
+                running_service.pricing_unit_cost,
+            )
+        except ValueError:
+            # NOTE: the other services of the batch shall still be billed
+            _logger.exception(
+                "Unexpected error while computing the credits of service_run_id: %s",
+                running_service.service_run_id,
+            )
+            continue
+        billed_services.append(running_service)
+        credits_updates.append(
+            CreditTransactionCreditsUpdate(
+                service_run_id=running_service.service_run_id,
+                osparc_credits=make_negative(computed_credits),
+                last_heartbeat_at=last_heartbeat_at,
+            )
+        )
+    return billed_services, credits_updates
+
+
+async def _log_not_updated_heartbeats(
+    resource_tracker_repo: ResourceTrackerRepository,
+    service_run_ids: set[ServiceRunId],
+) -> None:
+    services_status = await resource_tracker_repo.list_service_runs_status(
+        list(service_run_ids)
+    )
+    for service_run_id in service_run_ids:
+        service_run_status = services_status.get(service_run_id)
+        if service_run_status is None:
+            _logger.error(
+                "Recieved process heartbeat event for service_run_id: %s, but we do not have the started record in the DB, INVESTIGATE!",
+                service_run_id,
+            )
+        elif service_run_status in {
+            ServiceRunStatus.SUCCESS,
+            ServiceRunStatus.ERROR,
+        }:
+            _logger.error(
+                "Recieved process heartbeat event for service_run_id: %s, but it was already closed, INVESTIGATE!",
+                service_run_id,
+            )
+        else:
+            _logger.info("Nothing to update for service_run_id: %s", service_run_id)
+
+
 async def _process_stop_event(
     resource_tracker_repo: ResourceTrackerRepository,
     msg: RabbitResourceTrackingStoppedMessage,
@@ -1,5 +1,5 @@
 from collections.abc import Callable
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 import sqlalchemy as sa
 from models_library.rabbitmq_messages import (
@@ -15,6 +15,7 @@ from simcore_service_resource_usage_tracker.resource_tracker_process_messages im
     _process_heartbeat_event,
     _process_start_event,
     _process_stop_event,
+    process_heartbeat_events,
 )
 
 from .conftest import assert_service_runs_db_row
@@ -70,3 +71,47 @@ async def test_process_event_functions(
     output = await assert_service_runs_db_row(postgres_db, msg.service_run_id)
     assert output.stopped_at is not None
     assert output.service_run_status == "SUCCESS"
+
+
+async def test_process_heartbeat_events_in_batch(
+    create_rabbitmq_client: Callable[[str], RabbitMQClient],
+    random_rabbit_message_start,
+    mocked_redis_server: None,
+    postgres_db: sa.engine.Engine,
+    resource_tracker_service_run_db,
+    initialized_app,
+):
+    engine = initialized_app.state.engine
+    publisher = create_rabbitmq_client("publisher")
+    resource_tracker_repo: ResourceTrackerRepository = ResourceTrackerRepository(
+        db_engine=engine
+    )
+
+    start_msgs = [
+        random_rabbit_message_start(
+            wallet_id=None,
+            wallet_name=None,
+            pricing_plan_id=None,
+            pricing_unit_id=None,
+            pricing_unit_cost_id=None,
+        )
+        for _ in range(3)
+    ]
+    for msg in start_msgs:
+        await _process_start_event(resource_tracker_repo, msg, publisher)
+
+    # several heartbeats of the same service run, in any order
+    now = datetime.now(tz=timezone.utc)
+    heartbeat_msgs = [
+        RabbitResourceTrackingHeartbeatMessage(
+            service_run_id=msg.service_run_id, created_at=now - timedelta(seconds=s)
+        )
+        for msg in start_msgs
+        for s in (10, 0, 5)
+    ]
+    await process_heartbeat_events(resource_tracker_repo, heartbeat_msgs, publisher)
+
+    for msg in start_msgs:
+        output = await assert_service_runs_db_row(postgres_db, msg.service_run_id)
+        assert output.service_run_status == "RUNNING"
+        assert output.last_heartbeat_at == now
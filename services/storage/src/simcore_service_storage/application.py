@@ -16,6 +16,7 @@ from ._meta import WELCOME_MSG, app_name, version_info
 from .db import setup_db
 from .dsm import setup_dsm
 from .dsm_cleaner import setup_dsm_cleaner
+from .dsm_repair import setup_dsm_repair
 from .long_running_tasks import setup_long_running_tasks
 from .rest import setup_rest
 from .s3 import setup_s3
@@ -68,6 +69,8 @@ def create(settings: Settings) -> web.Application:
         setup_dsm(app)  # core subsystem. Needs s3 and db setups done
         if settings.STORAGE_CLEANER_INTERVAL_S:
             setup_dsm_cleaner(app)
+        if settings.STORAGE_SYNC_FULL_SCAN_INTERVAL_S:
+            setup_dsm_repair(app)
 
         app.middlewares.append(dsm_exception_handler)
 
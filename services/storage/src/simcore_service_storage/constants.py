@@ -1,3 +1,4 @@
+import datetime
 from typing import Final
 
 from models_library.api_schemas_storage import LinkType
@@ -31,8 +32,13 @@ S3_MAX_FILE_SIZE: Final[ByteSize] = parse_obj_as(ByteSize, "5TiB")
 # AWS S3 upload limits https://docs.aws.amazon.com/AmazonS3/latest/userguide/qfacts.html
 MULTIPART_UPLOADS_MIN_TOTAL_SIZE: Final[ByteSize] = parse_obj_as(ByteSize, "100MiB")
 MULTIPART_UPLOADS_MIN_PART_SIZE: Final[ByteSize] = parse_obj_as(ByteSize, "10MiB")
+# server-side copies above this size are split in parallel UploadPartCopy ranges
+MULTIPART_COPY_PART_SIZE: Final[ByteSize] = parse_obj_as(ByteSize, "100MiB")
 
 
+# NOTE: younger journal events might belong to operations still in progress
+JOURNAL_REPLAY_MIN_EVENT_AGE: Final[datetime.timedelta] = datetime.timedelta(minutes=1)
+
 MAX_LINK_CHUNK_BYTE_SIZE: Final[dict[LinkType, ByteSize]] = {
     LinkType.PRESIGNED: PRESIGNED_LINK_MAX_SIZE,
     LinkType.S3: S3_MAX_FILE_SIZE,
@@ -54,3 +60,4 @@ APP_S3_KEY = f"{__name__}.S3_CLIENT"
 
 
 EXPAND_DIR_MAX_ITEM_COUNT: Final[int] = 1000
+LIST_FILES_PAGE_SIZE: Final[int] = 1000
@@ -272,6 +272,61 @@ async def get_file_access_rights(
     return access_rights
 
 
+async def get_files_access_rights(
+    conn: SAConnection, user_id: UserID, file_ids: list[StorageFileID]
+) -> dict[StorageFileID, AccessRights]:
+    """
+    Returns access-rights of user (user_id) over several data file resources (file_ids)
+    NOTE: same rules as get_file_access_rights, but the registered files are read in a
+    single query and the access-rights of each project are resolved only once
+
+    raises InvalidFileIdentifier
+    """
+    stmt = sa.select(
+        file_meta_data.c.file_id, file_meta_data.c.project_id, file_meta_data.c.user_id
+    ).where(file_meta_data.c.file_id.in_([f"{file_id}" for file_id in file_ids]))
+    registered_files: dict[str, RowProxy] = {
+        row.file_id: row async for row in await conn.execute(stmt)
+    }
+
+    projects_access_rights: dict[ProjectID, AccessRights] = {}
+
+    async def _get_project_access_rights(project_id: ProjectID) -> AccessRights:
+        if project_id not in projects_access_rights:
+            projects_access_rights[project_id] = await get_project_access_rights(
+                conn, user_id, project_id=project_id
+            )
+        return projects_access_rights[project_id]
+
+    files_access_rights: dict[StorageFileID, AccessRights] = {}
+    for file_id in file_ids:
+        if row := registered_files.get(f"{file_id}"):
+            if int(row.user_id) == user_id:
+                files_access_rights[file_id] = AccessRights.all()
+            elif not row.project_id:
+                files_access_rights[file_id] = AccessRights.none()
+            else:
+                files_access_rights[file_id] = await _get_project_access_rights(
+                    ProjectID(row.project_id)
+                )
+            continue
+
+        try:
+            parent, _, _ = file_id.split("/", maxsplit=2)
+            files_access_rights[file_id] = (
+                AccessRights.all()
+                if parent == "api"
+                else await _get_project_access_rights(ProjectID(parent))
+            )
+        except (ValueError, AttributeError) as err:
+            raise InvalidFileIdentifierError(
+                identifier=file_id,
+                details=str(err),
+            ) from err
+
+    return files_access_rights
+
+
 # HELPERS -----------------------------------------------
 
 
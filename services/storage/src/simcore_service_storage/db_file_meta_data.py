@@ -1,5 +1,4 @@
 import datetime
-from typing import AsyncGenerator
 
 import sqlalchemy as sa
 from aiopg.sa.connection import SAConnection
@@ -44,6 +43,29 @@ async def upsert(
     return FileMetaDataAtDB.from_orm(row)
 
 
+async def upsert_many(
+    conn: SAConnection, fmds: list[FileMetaData] | list[FileMetaDataAtDB]
+) -> list[FileMetaDataAtDB]:
+    """same as upsert but with a single statement for all the entries"""
+    if not fmds:
+        return []
+    insert_statement = pg_insert(file_meta_data).values(
+        [jsonable_encoder(FileMetaDataAtDB.from_orm(fmd)) for fmd in fmds]
+    )
+    on_update_statement = insert_statement.on_conflict_do_update(
+        index_elements=[file_meta_data.c.file_id],
+        set_={
+            c.name: insert_statement.excluded[c.name]
+            for c in file_meta_data.columns
+            if c.name != "file_id"
+        },
+    ).returning(literal_column("*"))
+    return [
+        FileMetaDataAtDB.from_orm(row)
+        async for row in await conn.execute(on_update_statement)
+    ]
+
+
 async def insert(conn: SAConnection, fmd: FileMetaData) -> FileMetaDataAtDB:
     fmd_db = FileMetaDataAtDB.from_orm(fmd)
     result = await conn.execute(
@@ -65,8 +87,7 @@ async def get(conn: SAConnection, file_id: SimcoreS3FileID) -> FileMetaDataAtDB:
     raise FileMetaDataNotFoundError(file_id=file_id)
 
 
-async def list_filter_with_partial_file_id(
-    conn: SAConnection,
+def _partial_file_id_filter(
     *,
     user_id: UserID,
     project_ids: list[ProjectID],
@@ -74,8 +95,8 @@ async def list_filter_with_partial_file_id(
     partial_file_id: str | None,
     sha256_checksum: SHA256Str | None,
     only_files: bool,
-) -> list[FileMetaDataAtDB]:
-    stmt = sa.select(file_meta_data).where(
+):
+    return (
         (
             (file_meta_data.c.user_id == f"{user_id}")
             | file_meta_data.c.project_id.in_(f"{pid}" for pid in project_ids)
@@ -101,6 +122,66 @@ async def list_filter_with_partial_file_id(
             else True
         )
     )
+
+
+async def list_filter_with_partial_file_id(
+    conn: SAConnection,
+    *,
+    user_id: UserID,
+    project_ids: list[ProjectID],
+    file_id_prefix: str | None,
+    partial_file_id: str | None,
+    sha256_checksum: SHA256Str | None,
+    only_files: bool,
+) -> list[FileMetaDataAtDB]:
+    stmt = sa.select(file_meta_data).where(
+        _partial_file_id_filter(
+            user_id=user_id,
+            project_ids=project_ids,
+            file_id_prefix=file_id_prefix,
+            partial_file_id=partial_file_id,
+            sha256_checksum=sha256_checksum,
+            only_files=only_files,
+        )
+    )
+    return [FileMetaDataAtDB.from_orm(row) async for row in await conn.execute(stmt)]
+
+
+async def list_filter_with_partial_file_id_page(
+    conn: SAConnection,
+    *,
+    user_id: UserID,
+    project_ids: list[ProjectID],
+    partial_file_id: str | None,
+    only_files: bool,
+    after_file_id: SimcoreS3FileID | None,
+    limit: int,
+) -> list[FileMetaDataAtDB]:
+    """returns at most `limit` entries ordered by file_id and strictly after `after_file_id`
+
+    NOTE: keyset pagination on the primary key, so each page is an index range scan
+    regardless of how deep into the listing the cursor is
+    """
+    stmt = (
+        sa.select(file_meta_data)
+        .where(
+            _partial_file_id_filter(
+                user_id=user_id,
+                project_ids=project_ids,
+                file_id_prefix=None,
+                partial_file_id=partial_file_id,
+                sha256_checksum=None,
+                only_files=only_files,
+            )
+            & (
+                file_meta_data.c.file_id > after_file_id
+                if after_file_id is not None
+                else True
+            )
+        )
+        .order_by(file_meta_data.c.file_id.asc())
+        .limit(limit)
+    )
     return [FileMetaDataAtDB.from_orm(row) async for row in await conn.execute(stmt)]
 
 
@@ -136,16 +217,25 @@ async def total(conn: SAConnection) -> int:
 
 
 async def list_valid_uploads(
-    conn: SAConnection,
-) -> AsyncGenerator[FileMetaDataAtDB, None]:
-    """returns all the theoretically valid fmds (e.g. upload_expires_at column is null)"""
-    async for row in conn.execute(
-        sa.select(file_meta_data).where(
-            file_meta_data.c.upload_expires_at == None  # lgtm [py/test-equals-none]
+    conn: SAConnection, *, after_file_id: SimcoreS3FileID | None, limit: int
+) -> list[FileMetaDataAtDB]:
+    """returns a page of the theoretically valid fmds (e.g. upload_expires_at column is null)
+    ordered by file_id and strictly after `after_file_id`
+    """
+    stmt = (
+        sa.select(file_meta_data)
+        .where(
+            (file_meta_data.c.upload_expires_at == None)  # lgtm [py/test-equals-none]
+            & (
+                file_meta_data.c.file_id > after_file_id
+                if after_file_id is not None
+                else True
+            )
         )
-    ):
-        fmd_at_db = FileMetaDataAtDB.from_orm(row)
-        yield fmd_at_db
+        .order_by(file_meta_data.c.file_id.asc())
+        .limit(limit)
+    )
+    return [FileMetaDataAtDB.from_orm(row) async for row in await conn.execute(stmt)]
 
 
 async def delete(conn: SAConnection, file_ids: list[SimcoreS3FileID]) -> None:
@@ -164,3 +254,76 @@ async def delete_all_from_node(conn: SAConnection, node_id: NodeID) -> None:
     await conn.execute(
         file_meta_data.delete().where(file_meta_data.c.node_id == f"{node_id}")
     )
+
+
+def _is_in_path(column: sa.Column, path: str) -> sa.sql.ColumnElement:
+    # NOTE: the trailing / prevents matching siblings sharing a prefix (e.g. file and file2)
+    path = path.rstrip("/")
+    return (column == path) | column.startswith(f"{path}/", autoescape=True)
+
+
+async def lock_external_references(
+    conn: SAConnection, *, path: str
+) -> list[FileMetaDataAtDB]:
+    """returns the entries outside of `path` (a file, a directory or a project/node)
+    which are backed by an S3 object under `path` (e.g. deduplicated copies of these files)
+
+    NOTE: entries sharing an object are its references, deleting an entry decrements
+    the reference count of the object. Soft links are not references.
+    NOTE: the entries under `path` and their references are locked until the end of the
+    transaction, i.e. no reference can be added meanwhile (SEE lock_object_owner)
+    """
+    is_external = ~_is_in_path(file_meta_data.c.file_id, path)
+    stmt = (
+        sa.select(file_meta_data, is_external.label("is_external"))
+        .where(
+            ~is_external
+            | (
+                _is_in_path(file_meta_data.c.object_name, path)
+                & file_meta_data.c.is_soft_link.is_(False)
+            )
+        )
+        # NOTE: always locking in the same order prevents deadlocks
+        .order_by(file_meta_data.c.file_id)
+        .with_for_update()
+    )
+    return [
+        FileMetaDataAtDB.from_orm(row)
+        async for row in await conn.execute(stmt)
+        if row.is_external
+    ]
+
+
+async def lock_object_owner(conn: SAConnection, object_name: SimcoreS3FileID) -> bool:
+    """locks (shared) the entry owning the S3 object until the end of the transaction,
+    i.e. the object cannot be moved or deleted meanwhile (SEE lock_external_references)
+
+    Returns False if the object has no owner (e.g. it was moved in the meantime)
+    """
+    return (
+        await conn.scalar(
+            sa.select(file_meta_data.c.file_id)
+            .where(
+                (file_meta_data.c.file_id == object_name)
+                & (file_meta_data.c.object_name == object_name)
+            )
+            .with_for_update(read=True)
+        )
+        is not None
+    )
+
+
+async def update_object_name(
+    conn: SAConnection,
+    *,
+    current_object_name: SimcoreS3FileID,
+    new_object_name: SimcoreS3FileID,
+) -> None:
+    await conn.execute(
+        file_meta_data.update()
+        .where(
+            (file_meta_data.c.object_name == current_object_name)
+            & file_meta_data.c.is_soft_link.is_(False)
+        )
+        .values(object_name=new_object_name)
+    )
@@ -0,0 +1,79 @@
+import datetime
+
+import sqlalchemy as sa
+from aiopg.sa.connection import SAConnection
+from models_library.projects_nodes_io import SimcoreS3FileID
+from simcore_postgres_database.storage_models import (
+    FileMetaDataJournalEvent,
+    file_meta_data_journal,
+)
+
+from .models import FileMetaDataJournalEntry, UploadID
+
+
+async def record(
+    conn: SAConnection,
+    file_id: SimcoreS3FileID,
+    event: FileMetaDataJournalEvent,
+    *,
+    upload_id: UploadID | None = None,
+) -> None:
+    await conn.execute(
+        file_meta_data_journal.insert().values(
+            file_id=file_id, event=event, upload_id=upload_id
+        )
+    )
+
+
+async def record_many(
+    conn: SAConnection,
+    entries: list[tuple[SimcoreS3FileID, UploadID | None]],
+    event: FileMetaDataJournalEvent,
+) -> None:
+    if not entries:
+        return
+    await conn.execute(
+        file_meta_data_journal.insert().values(
+            [
+                {"file_id": file_id, "event": event, "upload_id": upload_id}
+                for file_id, upload_id in entries
+            ]
+        )
+    )
+
+
+async def list_events(
+    conn: SAConnection,
+    *,
+    after_event_id: int | None,
+    limit: int,
+    created_before: datetime.datetime | None = None,
+) -> list[FileMetaDataJournalEntry]:
+    """returns at most `limit` events in the order they were recorded"""
+    stmt = (
+        sa.select(file_meta_data_journal)
+        .where(
+            file_meta_data_journal.c.event_id > after_event_id
+            if after_event_id is not None
+            else True
+        )
+        .where(
+            file_meta_data_journal.c.created < created_before
+            if created_before is not None
+            else True
+        )
+        .order_by(file_meta_data_journal.c.event_id.asc())
+        .limit(limit)
+    )
+    return [
+        FileMetaDataJournalEntry.from_orm(row) async for row in await conn.execute(stmt)
+    ]
+
+
+async def checkpoint(conn: SAConnection, *, up_to_event_id: int) -> None:
+    """the events up to `up_to_event_id` are processed and will not be replayed"""
+    await conn.execute(
+        file_meta_data_journal.delete().where(
+            file_meta_data_journal.c.event_id <= up_to_event_id
+        )
+    )
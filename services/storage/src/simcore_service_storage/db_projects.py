@@ -1,9 +1,10 @@
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Iterable
 from contextlib import suppress
 
 import sqlalchemy as sa
 from aiopg.sa.connection import SAConnection
 from models_library.projects import ProjectAtDB, ProjectID
+from models_library.projects_nodes_io import NodeID
 from pydantic import ValidationError
 from simcore_postgres_database.storage_models import projects
 
@@ -37,3 +38,28 @@ async def project_exists(
         )
         == 1
     )
+
+
+async def get_project_id_and_node_id_to_names_map(
+    conn: SAConnection,
+    project_uuids: Iterable[ProjectID],
+) -> dict[ProjectID | NodeID, str]:
+    """returns a mapping of project and node ids to their names in a single query
+
+    NOTE: only the columns needed to resolve names are loaded (not the whole project)
+    """
+    mapping: dict[ProjectID | NodeID, str] = {}
+    uuids = [f"{pid}" for pid in project_uuids]
+    if not uuids:
+        return mapping
+    async for row in conn.execute(
+        sa.select(projects.c.uuid, projects.c.name, projects.c.workbench).where(
+            projects.c.uuid.in_(uuids)
+        )
+    ):
+        mapping[ProjectID(row.uuid)] = row.name
+        for node_id, node_data in (row.workbench or {}).items():
+            with suppress(AttributeError, TypeError, ValueError):
+                if label := node_data.get("label"):
+                    mapping[NodeID(node_id)] = label
+    return mapping
@@ -16,6 +16,7 @@
    - removes the entries in the database that are expired:
       - removes the entry
       - aborts the multipart upload if any
+ - drains the journal of the file_meta_data operations (SEE dsm_repair)
 """
 
 import asyncio
@@ -27,7 +28,7 @@ from typing import cast
 
 from aiohttp import web
 
-from .constants import APP_CONFIG_KEY, APP_DSM_KEY
+from .constants import APP_CONFIG_KEY, APP_DSM_KEY, JOURNAL_REPLAY_MIN_EVENT_AGE
 from .dsm_factory import DataManagerProvider
 from .settings import Settings
 from .simcore_s3_dsm import SimcoreS3DataManager
@@ -46,6 +47,9 @@ async def dsm_cleaner_task(app: web.Application) -> None:
     while await asyncio.sleep(cfg.STORAGE_CLEANER_INTERVAL_S, result=True):
         try:
             await simcore_s3_dsm.clean_expired_uploads()
+            await simcore_s3_dsm.replay_journal(
+                min_event_age=JOURNAL_REPLAY_MIN_EVENT_AGE
+            )
 
         except asyncio.CancelledError:  # noqa: PERF203
             logger.info("cancelled dsm cleaner task")
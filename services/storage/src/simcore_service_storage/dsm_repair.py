@@ -0,0 +1,109 @@
+""" background task that repairs the file_meta_data table with a full S3 scan
+
+# Rationale:
+ - storage journals the upload/complete/abort/delete operations it performs
+ - synchronising the file_meta_data table replays only the journal since the last checkpoint
+ (the dsm cleaner drains it at every run)
+ - changes done to the S3 backend outside of storage are not journaled, therefore
+ a full scan of the table against S3 still runs at a (long) interval:
+   - the checks are rate-limited (STORAGE_SYNC_FULL_SCAN_MAX_CHECKS_PER_SECOND)
+   - the progress is exported as prometheus metrics (if monitoring is enabled)
+"""
+
+import asyncio
+import logging
+import os
+import socket
+from collections.abc import Callable
+from contextlib import suppress
+from typing import cast
+
+from aiohttp import web
+from prometheus_client import Gauge
+from servicelib.aiohttp.monitoring import get_collector_registry
+from servicelib.logging_utils import log_context
+
+from .constants import APP_CONFIG_KEY, APP_DSM_KEY
+from .dsm_factory import DataManagerProvider
+from .settings import Settings
+from .simcore_s3_dsm import SimcoreS3DataManager
+
+_logger = logging.getLogger(__name__)
+
+
+def _create_progress_metrics(
+    app: web.Application,
+) -> tuple[Callable[[int, int], None] | None, Gauge | None]:
+    try:
+        registry = get_collector_registry(app)
+    except KeyError:
+        # monitoring is disabled
+        return None, None
+
+    checked_entries = Gauge(
+        name="storage_sync_full_scan_checked_entries",
+        documentation="Number of file meta data entries checked by the current full scan",
+        registry=registry,
+    )
+    total_entries = Gauge(
+        name="storage_sync_full_scan_total_entries",
+        documentation="Number of file meta data entries to check by the current full scan",
+        registry=registry,
+    )
+    removed_entries = Gauge(
+        name="storage_sync_full_scan_removed_entries",
+        documentation="Number of file meta data entries removed by the last full scan",
+        registry=registry,
+    )
+
+    def _progress_cb(num_checked: int, num_total: int) -> None:
+        checked_entries.set(num_checked)
+        total_entries.set(num_total)
+
+    return _progress_cb, removed_entries
+
+
+async def dsm_repair_task(app: web.Application) -> None:
+    _logger.info("starting dsm repair task...")
+    cfg: Settings = app[APP_CONFIG_KEY]
+    dsm: DataManagerProvider = app[APP_DSM_KEY]
+    simcore_s3_dsm: SimcoreS3DataManager = cast(
+        SimcoreS3DataManager, dsm.get(SimcoreS3DataManager.get_location_id())
+    )
+    progress_cb, removed_entries = _create_progress_metrics(app)
+    assert cfg.STORAGE_SYNC_FULL_SCAN_INTERVAL_S  # nosec
+    while await asyncio.sleep(cfg.STORAGE_SYNC_FULL_SCAN_INTERVAL_S, result=True):
+        try:
+            with log_context(
+                _logger, logging.INFO, "full scan of file_meta_data", log_duration=True
+            ):
+                removed = await simcore_s3_dsm.synchronise_meta_data_table(
+                    dry_run=False, full_scan=True, full_scan_progress_cb=progress_cb
+                )
+            if removed_entries:
+                removed_entries.set(len(removed))
+
+        except asyncio.CancelledError:  # noqa: PERF203
+            _logger.info("cancelled dsm repair task")
+            raise
+        except Exception:  # pylint: disable=broad-except
+            _logger.exception("Unhandled error in dsm repair task, restarting task...")
+
+
+def setup_dsm_repair(app: web.Application):
+    async def _setup(app: web.Application):
+        task = asyncio.create_task(
+            dsm_repair_task(app),
+            name=f"dsm_repair_task_{socket.gethostname()}_{os.getpid()}",
+        )
+        _logger.info("%s created", f"{task=}")
+
+        yield
+
+        _logger.debug("stopping %s...", f"{task=}")
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+        _logger.info("%s stopped.", f"{task=}")
+
+    app.cleanup_ctx.append(_setup)
@@ -6,6 +6,8 @@ from typing import NoReturn, cast
 from aiohttp import web
 from aiohttp.web import RouteTableDef
 from models_library.api_schemas_storage import (
+    FileDownloadLinksBatch,
+    FileDownloadLinksBatchBody,
     FileMetaDataGet,
     FileUploadCompleteFutureResponse,
     FileUploadCompleteLinks,
@@ -13,9 +15,13 @@ from models_library.api_schemas_storage import (
     FileUploadCompleteState,
     FileUploadCompletionBody,
     FileUploadLinks,
+    FileUploadLinksBatch,
+    FileUploadLinksBatchBody,
     FileUploadSchema,
     SoftCopyBody,
 )
+from models_library.projects_nodes_io import LocationID, StorageFileID
+from models_library.users import UserID
 from models_library.utils.fastapi_encoders import jsonable_encoder
 from pydantic import AnyUrl, ByteSize, parse_obj_as
 from servicelib.aiohttp import status
@@ -37,6 +43,7 @@ from .models import (
     FilePathIsUploadCompletedParams,
     FilePathParams,
     FilesMetadataQueryParams,
+    FileUploadBatchQueryParams,
     FileUploadQueryParams,
     LocationPathParams,
     StorageQueryParamsBase,
@@ -201,23 +208,42 @@ async def upload_file(request: web.Request) -> web.Response:
         return web.json_response(response, dumps=json_dumps)
 
     # v2 response
+    response = _create_file_upload_schema(
+        request,
+        location_id=path_params.location_id,
+        user_id=query_params.user_id,
+        file_id=path_params.file_id,
+        links=links,
+    )
+    log.debug("returning v2 response: %s", response)
+    return jsonable_encoder(response, by_alias=True)
+
+
+def _create_file_upload_schema(
+    request: web.Request,
+    *,
+    location_id: LocationID,
+    user_id: UserID,
+    file_id: StorageFileID,
+    links: UploadLinks,
+) -> FileUploadSchema:
     abort_url = request.url.join(
         request.app.router["abort_upload_file"]
         .url_for(
-            location_id=f"{path_params.location_id}",
-            file_id=urllib.parse.quote(path_params.file_id, safe=""),
+            location_id=f"{location_id}",
+            file_id=urllib.parse.quote(file_id, safe=""),
         )
-        .with_query(user_id=query_params.user_id)
+        .with_query(user_id=user_id)
     )
     complete_url = request.url.join(
         request.app.router["complete_upload_file"]
         .url_for(
-            location_id=f"{path_params.location_id}",
-            file_id=urllib.parse.quote(path_params.file_id, safe=""),
+            location_id=f"{location_id}",
+            file_id=urllib.parse.quote(file_id, safe=""),
         )
-        .with_query(user_id=query_params.user_id)
+        .with_query(user_id=user_id)
     )
-    response = FileUploadSchema(
+    return FileUploadSchema(
         chunk_size=links.chunk_size,
         urls=links.urls,
         links=FileUploadLinks(
@@ -228,10 +254,74 @@ async def upload_file(request: web.Request) -> web.Response:
             ),
         ),
     )
-    log.debug("returning v2 response: %s", response)
+
+
+@routes.post(
+    f"/{api_vtag}/simcore-s3/files/links:batch-upload",
+    name="upload_files_batch",
+)
+async def upload_files_batch(request: web.Request) -> web.Response:
+    """creates the upload links of several files in one call
+
+    Same as upload_file v2.1, v2.2 and v2.3 use-cases (directories are not supported),
+    for the simcore S3 location only
+    """
+    query_params = parse_request_query_parameters_as(
+        FileUploadBatchQueryParams, request
+    )
+    body = await parse_request_body_as(FileUploadLinksBatchBody, request)
+    log.debug(
+        "received call to upload_files_batch with %s",
+        f"{query_params=}, {len(body.files)=}",
+    )
+
+    dsm = cast(
+        SimcoreS3DataManager,
+        get_dsm_provider(request.app).get(SimcoreS3DataManager.get_location_id()),
+    )
+    files_links = await dsm.create_file_upload_links_batch(
+        user_id=query_params.user_id,
+        files=body.files,
+        link_type=query_params.link_type,
+    )
+    response = FileUploadLinksBatch(
+        uploads={
+            file_id: _create_file_upload_schema(
+                request,
+                location_id=SimcoreS3DataManager.get_location_id(),
+                user_id=query_params.user_id,
+                file_id=file_id,
+                links=links,
+            )
+            for file_id, links in files_links.items()
+        }
+    )
     return jsonable_encoder(response, by_alias=True)
 
 
+@routes.post(
+    f"/{api_vtag}/simcore-s3/files/links:batch-download",
+    name="download_files_batch",
+)
+async def download_files_batch(request: web.Request) -> web.Response:
+    """creates the download links of several files in one call (simcore S3 location only)"""
+    query_params = parse_request_query_parameters_as(FileDownloadQueryParams, request)
+    body = await parse_request_body_as(FileDownloadLinksBatchBody, request)
+    log.debug(
+        "received call to download_files_batch with %s",
+        f"{query_params=}, {len(body.file_ids)=}",
+    )
+
+    dsm = cast(
+        SimcoreS3DataManager,
+        get_dsm_provider(request.app).get(SimcoreS3DataManager.get_location_id()),
+    )
+    links = await dsm.create_file_download_links_batch(
+        query_params.user_id, body.file_ids, query_params.link_type
+    )
+    return jsonable_encoder(FileDownloadLinksBatch(links=links), by_alias=True)
+
+
 @routes.post(
     f"/{api_vtag}/locations/{{location_id}}/files/{{file_id}}:abort",
     name="abort_upload_file",
@@ -64,7 +64,9 @@ async def synchronise_meta_data_table(request: web.Request) -> web.Response:
         get_dsm_provider(request.app).get(SimcoreS3DataManager.get_location_id()),
     )
     sync_results: list[StorageFileID] = []
-    sync_coro = dsm.synchronise_meta_data_table(dry_run=query_params.dry_run)
+    sync_coro = dsm.synchronise_meta_data_table(
+        dry_run=query_params.dry_run, full_scan=query_params.full_scan
+    )
 
     if query_params.fire_and_forget:
         settings: Settings = request.app[APP_CONFIG_KEY]
@@ -31,6 +31,7 @@ from pydantic import (
     validate_arguments,
     validator,
 )
+from simcore_postgres_database.storage_models import FileMetaDataJournalEvent
 
 UNDEFINED_SIZE: Final[ByteSize] = parse_obj_as(ByteSize, -1)
 
@@ -73,6 +74,18 @@ class FileMetaDataAtDB(BaseModel):
         extra = Extra.forbid
 
 
+class FileMetaDataJournalEntry(BaseModel):
+    event_id: int
+    file_id: SimcoreS3FileID
+    event: FileMetaDataJournalEvent
+    upload_id: UploadID | None = None
+    created: datetime.datetime
+
+    class Config:
+        orm_mode = True
+        extra = Extra.forbid
+
+
 class FileMetaData(FileMetaDataGet):
     upload_id: UploadID | None = None
     upload_expires_at: datetime.datetime | None = None
@@ -132,6 +145,13 @@ class UploadLinks:
     chunk_size: ByteSize
 
 
+@dataclass
+class FileMetaDataPage:
+    items: list[FileMetaData]
+    # NOTE: keyset cursor, i.e. the last file_id read from file_meta_data (None when exhausted)
+    next_cursor: SimcoreS3FileID | None
+
+
 class MultiPartUploadLinks(BaseModel):
     upload_id: UploadID
     chunk_size: ByteSize
@@ -158,6 +178,7 @@ class FilesMetadataQueryParams(StorageQueryParamsBase):
 class SyncMetadataQueryParams(BaseModel):
     dry_run: bool = False
     fire_and_forget: bool = False
+    full_scan: bool = False
 
 
 class FileDownloadQueryParams(StorageQueryParamsBase):
@@ -195,6 +216,18 @@ class FileUploadQueryParams(StorageQueryParamsBase):
         return values
 
 
+class FileUploadBatchQueryParams(StorageQueryParamsBase):
+    # NOTE: the size and checksum of each file are in the body, directories are not supported
+    link_type: LinkType = LinkType.PRESIGNED
+
+    @validator("link_type", pre=True)
+    @classmethod
+    def convert_from_lower_case(cls, v):
+        if v is not None:
+            return f"{v}".upper()
+        return v
+
+
 class DeleteFolderQueryParams(StorageQueryParamsBase):
     node_id: NodeID | None = None
 
@@ -1,3 +1,4 @@
+import asyncio
 import datetime
 import json
 import logging
@@ -6,7 +7,7 @@ from collections.abc import AsyncGenerator, Callable
 from contextlib import AsyncExitStack
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Final, TypeAlias, cast
+from typing import Any, Final, Literal, TypeAlias, cast
 
 import aioboto3
 from aiobotocore.session import ClientCreatorContext
@@ -18,7 +19,7 @@ from models_library.projects import ProjectID
 from models_library.projects_nodes_io import NodeID, SimcoreS3FileID
 from pydantic import AnyUrl, ByteSize, NonNegativeInt, parse_obj_as
 from servicelib.logging_utils import log_context
-from servicelib.utils import logged_gather
+from servicelib.utils import logged_gather, partition_gen
 from settings_library.s3 import S3Settings
 from simcore_service_storage.exceptions import S3KeyNotFoundError
 from types_aiobotocore_s3 import S3Client
@@ -28,14 +29,24 @@ from types_aiobotocore_s3.type_defs import (
     PaginatorConfigTypeDef,
 )
 
-from .constants import EXPAND_DIR_MAX_ITEM_COUNT, MULTIPART_UPLOADS_MIN_TOTAL_SIZE
+from .constants import (
+    EXPAND_DIR_MAX_ITEM_COUNT,
+    MULTIPART_COPY_PART_SIZE,
+    MULTIPART_UPLOADS_MIN_TOTAL_SIZE,
+)
 from .models import ETag, MultiPartUploadLinks, S3BucketName, UploadID
-from .s3_utils import compute_num_file_chunks, s3_exception_handler
+from .s3_utils import (
+    compute_num_copy_parts,
+    compute_num_file_chunks,
+    s3_exception_handler,
+)
 
 _logger = logging.getLogger(__name__)
 
 
 _MAX_ITEMS_PER_PAGE: Final[NonNegativeInt] = 500
+# NOTE: the maximum accepted by the S3 API
+_MAX_OBJECTS_PER_DELETE: Final[NonNegativeInt] = 1000
 
 
 NextContinuationToken: TypeAlias = str
@@ -164,6 +175,32 @@ class StorageS3Client:  # pylint: disable=too-many-public-methods
         url: AnyUrl = parse_obj_as(AnyUrl, generated_link)
         return url
 
+    @s3_exception_handler(_logger)
+    async def create_single_presigned_links(
+        self,
+        bucket: S3BucketName,
+        file_ids: list[SimcoreS3FileID],
+        *,
+        client_method: Literal["get_object", "put_object"],
+        expiration_secs: int,
+    ) -> list[AnyUrl]:
+        """same as create_single_presigned_download/upload_link for several files
+        NOTE: the bucket is checked once, the links are signed locally and
+        the objects existence is NOT checked
+        """
+        await self.client.head_bucket(Bucket=bucket)
+        return [
+            parse_obj_as(
+                AnyUrl,
+                await self.client.generate_presigned_url(
+                    client_method,
+                    Params={"Bucket": bucket, "Key": file_id},
+                    ExpiresIn=expiration_secs,
+                ),
+            )
+            for file_id in file_ids
+        ]
+
     @s3_exception_handler(_logger)
     async def create_multipart_upload_links(
         self,
@@ -266,6 +303,19 @@ class StorageS3Client:  # pylint: disable=too-many-public-methods
     async def delete_file(self, bucket: S3BucketName, file_id: SimcoreS3FileID) -> None:
         await self.client.delete_object(Bucket=bucket, Key=file_id)
 
+    @s3_exception_handler(_logger)
+    async def delete_files(
+        self, bucket: S3BucketName, file_ids: list[SimcoreS3FileID]
+    ) -> None:
+        for file_ids_batch in partition_gen(
+            file_ids, slice_size=_MAX_OBJECTS_PER_DELETE
+        ):
+            if file_ids_batch:
+                await self.client.delete_objects(
+                    Bucket=bucket,
+                    Delete={"Objects": [{"Key": key} for key in file_ids_batch]},
+                )
+
     @s3_exception_handler(_logger)
     async def undelete_file(
         self, bucket: S3BucketName, file_id: SimcoreS3FileID
@@ -370,6 +420,80 @@ class StorageS3Client:  # pylint: disable=too-many-public-methods
             copy_options |= {"Callback": bytes_transfered_cb}
         await self.client.copy(**copy_options)
 
+    @s3_exception_handler(_logger)
+    async def copy_file_multipart(
+        self,
+        bucket: S3BucketName,
+        src_file: SimcoreS3FileID,
+        dst_file: SimcoreS3FileID,
+        *,
+        file_size: ByteSize,
+        parts_limiter: asyncio.Semaphore,
+        bytes_transfered_cb: Callable[[int], None] | None,
+    ) -> None:
+        """server-side copy of a file in S3 (data does not transit through storage)
+
+        - files up to MULTIPART_COPY_PART_SIZE are copied with a single CopyObject
+        - larger files are split in byte ranges copied in parallel with UploadPartCopy
+
+        `parts_limiter` bounds the number of in-flight copy requests, sharing it between
+        concurrent calls creates a sliding window of parts across all the copied files
+        (as opposed to `copy_file` this can be called concurrently)
+        """
+        copy_source = {"Bucket": bucket, "Key": src_file}
+        if file_size <= MULTIPART_COPY_PART_SIZE:
+            async with parts_limiter:
+                await self.client.copy_object(
+                    CopySource=copy_source, Bucket=bucket, Key=dst_file  # type: ignore[arg-type]
+                )
+            if bytes_transfered_cb:
+                bytes_transfered_cb(file_size)
+            return
+
+        num_parts, part_size = compute_num_copy_parts(
+            file_size, MULTIPART_COPY_PART_SIZE
+        )
+        response = await self.client.create_multipart_upload(
+            Bucket=bucket, Key=dst_file
+        )
+        upload_id = response["UploadId"]
+
+        async def _copy_part(part_index: int) -> dict[str, Any]:
+            first_byte = part_index * part_size
+            last_byte = min(first_byte + part_size, file_size) - 1
+            async with parts_limiter:
+                part_response = await self.client.upload_part_copy(
+                    Bucket=bucket,
+                    Key=dst_file,
+                    UploadId=upload_id,
+                    PartNumber=part_index + 1,
+                    CopySource=copy_source,  # type: ignore[arg-type]
+                    CopySourceRange=f"bytes={first_byte}-{last_byte}",
+                )
+            if bytes_transfered_cb:
+                bytes_transfered_cb(last_byte - first_byte + 1)
+            return {
+                "ETag": part_response["CopyPartResult"]["ETag"],  # type: ignore[typeddict-item]
+                "PartNumber": part_index + 1,
+            }
+
+        try:
+            copied_parts = await logged_gather(
+                *(_copy_part(i) for i in range(num_parts)), log=_logger
+            )
+            await self.client.complete_multipart_upload(
+                Bucket=bucket,
+                Key=dst_file,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": copied_parts},
+            )
+        except BaseException:
+            # NOTE: an aborted copy must not leave parts behind (they are billed)
+            await self.client.abort_multipart_upload(
+                Bucket=bucket, Key=dst_file, UploadId=upload_id
+            )
+            raise
+
     @s3_exception_handler(_logger)
     async def list_files(
         self,
@@ -1,5 +1,6 @@
 import functools
 import logging
+import math
 from dataclasses import dataclass
 from typing import Final, Optional
 
@@ -47,6 +48,20 @@ def compute_num_file_chunks(file_size: ByteSize) -> tuple[int, ByteSize]:
     )
 
 
+def compute_num_copy_parts(
+    file_size: ByteSize, min_part_size: ByteSize
+) -> tuple[int, ByteSize]:
+    """returns the number of UploadPartCopy ranges and their size to copy `file_size` bytes
+
+    NOTE: the part size grows above `min_part_size` if the S3 maximum number of parts would be exceeded
+    """
+    part_size = parse_obj_as(
+        ByteSize,
+        max(min_part_size, math.ceil(file_size / _MULTIPART_MAX_NUMBER_OF_PARTS)),
+    )
+    return max(math.ceil(file_size / part_size), 1), part_size
+
+
 def s3_exception_handler(log: logging.Logger):
     """converts typical aiobotocore/boto exceptions to storage exceptions
     NOTE: this is a work in progress as more exceptions might arise in different
@@ -106,6 +121,12 @@ class S3TransferDataCB:
     def __post_init__(self):
         self.copy_transfer_cb(0)
 
+    def increase_bytes_to_transfer(self, additional_bytes: int) -> None:
+        # NOTE: used when the total is only discovered while transfering (e.g. listing directories)
+        self.total_bytes_to_transfer = parse_obj_as(
+            ByteSize, self.total_bytes_to_transfer + additional_bytes
+        )
+
     def finalize_transfer(self):
         self.copy_transfer_cb(self.total_bytes_to_transfer - self._total_bytes_copied)
 
@@ -117,5 +138,5 @@ class S3TransferDataCB:
                 f"{self.task_progress_message_prefix} - "
                 f"{parse_obj_as(ByteSize,self._total_bytes_copied).human_readable()}"
                 f"/{self.total_bytes_to_transfer.human_readable()}]",
-                self._total_bytes_copied / self.total_bytes_to_transfer,
+                min(self._total_bytes_copied / self.total_bytes_to_transfer, 1.0),
             )
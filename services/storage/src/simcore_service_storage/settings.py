@@ -52,11 +52,31 @@ class Settings(BaseCustomSettings, MixinLoggingSettings):
         description="Interval in seconds when task cleaning pending uploads runs. setting to NULL disables the cleaner.",
     )
 
+    STORAGE_SYNC_FULL_SCAN_INTERVAL_S: PositiveInt | None = Field(
+        None,
+        description="Interval in seconds when the background job repairing the file meta data table with a full S3 scan runs. setting to NULL disables the job.",
+    )
+
+    STORAGE_SYNC_FULL_SCAN_MAX_CHECKS_PER_SECOND: PositiveInt = Field(
+        20,
+        description="Maximal amount of S3 objects checked per second during a full scan of the file meta data table",
+    )
+
     STORAGE_S3_CLIENT_MAX_TRANSFER_CONCURRENCY: int = Field(
         4,
         description="Maximal amount of threads used by underlying S3 client to transfer data to S3 backend",
     )
 
+    STORAGE_S3_MAX_CONCURRENT_COPY_PARTS: PositiveInt = Field(
+        20,
+        description="Maximal amount of server-side copy requests (objects or parts) in flight while copying a project, also bounds the files copied concurrently",
+    )
+
+    STORAGE_DEDUPLICATE_PROJECT_COPIES: bool = Field(
+        False,
+        description="If True, files copied between projects share the same S3 object (copy-on-write) instead of being physically copied",
+    )
+
     STORAGE_LOG_FORMAT_LOCAL_DEV_ENABLED: bool = Field(
         False,
         env=["STORAGE_LOG_FORMAT_LOCAL_DEV_ENABLED", "LOG_FORMAT_LOCAL_DEV_ENABLED"],
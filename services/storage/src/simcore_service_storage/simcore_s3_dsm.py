@@ -1,9 +1,10 @@
+import asyncio
 import contextlib
 import datetime
 import logging
 import tempfile
 import urllib.parse
-from collections import deque
+from collections import defaultdict, deque
 from collections.abc import Awaitable, Callable, Coroutine
 from contextlib import suppress
 from dataclasses import dataclass
@@ -13,7 +14,12 @@ from typing import Any, Final, cast
 from aiohttp import web
 from aiopg.sa import Engine
 from aiopg.sa.connection import SAConnection
-from models_library.api_schemas_storage import LinkType, S3BucketName, UploadedPart
+from models_library.api_schemas_storage import (
+    FileUploadLinksBatchItem,
+    LinkType,
+    S3BucketName,
+    UploadedPart,
+)
 from models_library.basic_types import SHA256Str
 from models_library.projects import ProjectID
 from models_library.projects_nodes_io import (
@@ -23,19 +29,20 @@ from models_library.projects_nodes_io import (
     StorageFileID,
 )
 from models_library.users import UserID
-from pydantic import AnyUrl, ByteSize, NonNegativeInt, parse_obj_as
+from pydantic import AnyUrl, ByteSize, NonNegativeInt, PositiveInt, parse_obj_as
 from servicelib.aiohttp.client_session import get_client_session
 from servicelib.aiohttp.long_running_tasks.server import TaskProgress
-from servicelib.logging_utils import log_context
-from servicelib.sequences_utils import partition_gen
 from servicelib.utils import ensure_ends_with, logged_gather
+from simcore_postgres_database.storage_models import FileMetaDataJournalEvent
 
-from . import db_file_meta_data, db_projects, db_tokens
+from . import db_file_meta_data, db_file_meta_data_journal, db_projects, db_tokens
 from .constants import (
     APP_CONFIG_KEY,
     APP_DB_ENGINE_KEY,
     DATCORE_ID,
     EXPAND_DIR_MAX_ITEM_COUNT,
+    JOURNAL_REPLAY_MIN_EVENT_AGE,
+    LIST_FILES_PAGE_SIZE,
     MAX_CONCURRENT_DB_TASKS,
     MAX_CONCURRENT_S3_TASKS,
     MAX_LINK_CHUNK_BYTE_SIZE,
@@ -47,6 +54,7 @@ from .datcore_adapter import datcore_adapter
 from .db_access_layer import (
     AccessRights,
     get_file_access_rights,
+    get_files_access_rights,
     get_project_access_rights,
     get_readable_project_ids,
 )
@@ -57,12 +65,14 @@ from .exceptions import (
     LinkAlreadyExistsError,
     ProjectAccessRightError,
     ProjectNotFoundError,
+    S3AccessError,
     S3KeyNotFoundError,
 )
 from .models import (
     DatasetMetaData,
     FileMetaData,
     FileMetaDataAtDB,
+    FileMetaDataPage,
     UploadID,
     UploadLinks,
 )
@@ -83,6 +93,8 @@ from .utils import (
 )
 
 _MAX_PARALLEL_S3_CALLS: Final[NonNegativeInt] = 10
+_JOURNAL_REPLAY_BATCH_SIZE: Final[NonNegativeInt] = 1000
+_FULL_SCAN_PAGE_SIZE: Final[NonNegativeInt] = 1000
 
 _logger = logging.getLogger(__name__)
 
@@ -129,7 +141,7 @@ class SimcoreS3DataManager(BaseDataManager):
         )
         return data
 
-    async def list_files(  # noqa C901
+    async def list_files(
         self, user_id: UserID, *, expand_dirs: bool, uuid_filter: str = ""
     ) -> list[FileMetaData]:
         """
@@ -139,25 +151,85 @@ class SimcoreS3DataManager(BaseDataManager):
         NOTE: expand_dirs will be replaced by pagination in the future
         currently only {EXPAND_DIR_MAX_ITEM_COUNT} items will be returned
         The endpoint produces similar results to what it did previously
+        NOTE: this is a thin wrapper that consumes all the pages of `list_files_page`
         """
+        async with self.engine.acquire() as conn:
+            accessible_projects_ids = await get_readable_project_ids(conn, user_id)
 
         data: list[FileMetaData] = []
-        accessible_projects_ids = []
-        async with self.engine.acquire() as conn, conn.begin():
+        names_mapping: dict[ProjectID | NodeID, str] = {}
+        cursor: SimcoreS3FileID | None = None
+        while True:
+            page = await self._list_files_page(
+                user_id,
+                accessible_projects_ids,
+                expand_dirs=expand_dirs,
+                uuid_filter=uuid_filter,
+                cursor=cursor,
+                limit=LIST_FILES_PAGE_SIZE,
+                max_expanded_items=max(EXPAND_DIR_MAX_ITEM_COUNT - len(data), 0),
+                names_mapping=names_mapping,
+            )
+            data.extend(page.items)
+            if page.next_cursor is None:
+                return data
+            cursor = page.next_cursor
+
+    async def list_files_page(
+        self,
+        user_id: UserID,
+        *,
+        expand_dirs: bool,
+        uuid_filter: str = "",
+        cursor: SimcoreS3FileID | None = None,
+        limit: PositiveInt = LIST_FILES_PAGE_SIZE,
+        max_expanded_items: NonNegativeInt = EXPAND_DIR_MAX_ITEM_COUNT,
+    ) -> FileMetaDataPage:
+        """returns one page of the files a user has access to (keyset paginated on file_id)
+
+        - pass the returned `next_cursor` as `cursor` to get the following page
+        - `next_cursor` is None when there are no more entries
+        - directories of this page are expanded with at most `max_expanded_items` entries
+        """
+        async with self.engine.acquire() as conn:
             accessible_projects_ids = await get_readable_project_ids(conn, user_id)
+        return await self._list_files_page(
+            user_id,
+            accessible_projects_ids,
+            expand_dirs=expand_dirs,
+            uuid_filter=uuid_filter,
+            cursor=cursor,
+            limit=limit,
+            max_expanded_items=max_expanded_items,
+            names_mapping={},
+        )
+
+    async def _list_files_page(
+        self,
+        user_id: UserID,
+        accessible_projects_ids: list[ProjectID],
+        *,
+        expand_dirs: bool,
+        uuid_filter: str,
+        cursor: SimcoreS3FileID | None,
+        limit: PositiveInt,
+        max_expanded_items: NonNegativeInt,
+        names_mapping: dict[ProjectID | NodeID, str],
+    ) -> FileMetaDataPage:
+        data: list[FileMetaData] = []
+        async with self.engine.acquire() as conn, conn.begin():
             file_and_directory_meta_data: list[
                 FileMetaDataAtDB
-            ] = await db_file_meta_data.list_filter_with_partial_file_id(
+            ] = await db_file_meta_data.list_filter_with_partial_file_id_page(
                 conn,
                 user_id=user_id,
                 project_ids=accessible_projects_ids,
-                file_id_prefix=None,
                 partial_file_id=uuid_filter,
                 only_files=False,
-                sha256_checksum=None,
+                after_file_id=cursor,
+                limit=limit,
             )
 
-            # add all the entries from file_meta_data without
             for metadata in file_and_directory_meta_data:
                 # below checks ensures that directoris either appear as
                 if metadata.is_directory and expand_dirs:
@@ -173,53 +245,57 @@ class SimcoreS3DataManager(BaseDataManager):
                     )
                     data.append(convert_db_to_model(updated_fmd))
 
-            # now parse the project to search for node/project names
-            prj_names_mapping: dict[ProjectID | NodeID, str] = {}
-            async for proj_data in db_projects.list_valid_projects_in(
-                conn, accessible_projects_ids
-            ):
-                prj_names_mapping |= {proj_data.uuid: proj_data.name} | {
-                    NodeID(node_id): node_data.label
-                    for node_id, node_data in proj_data.workbench.items()
-                }
+            # only the projects of this page that were not yet resolved are looked up
+            # NOTE: names_mapping is shared between pages of the same listing
+            names_mapping |= await db_projects.get_project_id_and_node_id_to_names_map(
+                conn,
+                {
+                    fmd.project_id
+                    for fmd in file_and_directory_meta_data
+                    if fmd.project_id and fmd.project_id not in names_mapping
+                },
+            )
 
-        # expand directories until the max number of files to return is reached
-        directory_expands: list[Coroutine] = []
-        for metadata in file_and_directory_meta_data:
-            if (
-                expand_dirs
-                and metadata.is_directory
-                and len(data) < EXPAND_DIR_MAX_ITEM_COUNT
-            ):
-                max_items_to_include = EXPAND_DIR_MAX_ITEM_COUNT - len(data)
-                directory_expands.append(
-                    expand_directory(
-                        self.app,
-                        self.simcore_bucket_name,
-                        metadata,
-                        max_items_to_include,
-                    )
+        # lazily expand the directories of this page only
+        if expand_dirs and max_expanded_items > 0:
+            directory_expands: list[Coroutine] = [
+                expand_directory(
+                    self.app,
+                    self.simcore_bucket_name,
+                    metadata,
+                    max_expanded_items,
                 )
-        for files_in_directory in await logged_gather(
-            *directory_expands, max_concurrency=_MAX_PARALLEL_S3_CALLS
-        ):
-            data.extend(files_in_directory)
+                for metadata in file_and_directory_meta_data
+                if metadata.is_directory
+            ]
+            expanded_files: list[FileMetaData] = []
+            for files_in_directory in await logged_gather(
+                *directory_expands, max_concurrency=_MAX_PARALLEL_S3_CALLS
+            ):
+                expanded_files.extend(files_in_directory)
+            data.extend(expanded_files[:max_expanded_items])
 
         # artifically fills ['project_name', 'node_name', 'file_id', 'raw_file_path', 'display_file_path']
         #   with information from the projects table!
         # NOTE: This part with the projects, should be done in the client code not here!
         clean_data: list[FileMetaData] = []
         for d in data:
-            if d.project_id not in prj_names_mapping:
+            if d.project_id not in names_mapping:
                 continue
-            d.project_name = prj_names_mapping[d.project_id]
-            if d.node_id in prj_names_mapping:
-                d.node_name = prj_names_mapping[d.node_id]
+            d.project_name = names_mapping[d.project_id]
+            if d.node_id in names_mapping:
+                d.node_name = names_mapping[d.node_id]
             if d.node_name and d.project_name:
                 clean_data.append(d)
 
-            data = clean_data
-        return data
+        return FileMetaDataPage(
+            items=clean_data,
+            next_cursor=(
+                file_and_directory_meta_data[-1].file_id
+                if len(file_and_directory_meta_data) == limit
+                else None
+            ),
+        )
 
     async def get_file(self, user_id: UserID, file_id: StorageFileID) -> FileMetaData:
         async with self.engine.acquire() as conn, conn.begin():
@@ -252,6 +328,7 @@ class SimcoreS3DataManager(BaseDataManager):
             can: AccessRights = await get_file_access_rights(conn, user_id, file_id)
             if not can.write:
                 raise FileAccessRightError(access_right="write", file_id=file_id)
+            await self._journal(file_id, FileMetaDataJournalEvent.UPLOAD_STARTED)
 
             # NOTE: if this gets called successively with the same file_id, and
             # there was a multipart upload in progress beforehand, it MUST be
@@ -301,6 +378,11 @@ class SimcoreS3DataManager(BaseDataManager):
                     expiration_secs=self.settings.STORAGE_DEFAULT_PRESIGNED_LINK_EXPIRATION_SECONDS,
                     sha256_checksum=fmd.sha256_checksum,
                 )
+                await self._journal(
+                    fmd.file_id,
+                    FileMetaDataJournalEvent.UPLOAD_STARTED,
+                    upload_id=multipart_presigned_links.upload_id,
+                )
                 # update the database so we keep the upload id
                 fmd.upload_id = multipart_presigned_links.upload_id
                 await db_file_meta_data.upsert(conn, fmd)
@@ -330,6 +412,158 @@ class SimcoreS3DataManager(BaseDataManager):
             [s3_link], file_size_bytes or MAX_LINK_CHUNK_BYTE_SIZE[link_type]
         )
 
+    async def create_file_upload_links_batch(
+        self,
+        user_id: UserID,
+        files: list[FileUploadLinksBatchItem],
+        link_type: LinkType,
+    ) -> dict[SimcoreS3FileID, UploadLinks]:
+        """same as create_file_upload_links for several files (no directories):
+        - the access rights are resolved once per project
+        - the entries are upserted in bulk
+        - the single presigned links are signed locally
+        """
+        s3_client = get_s3_client(self.app)
+        file_ids = [f.file_id for f in files]
+        async with self.engine.acquire() as conn:
+            files_access_rights = await get_files_access_rights(conn, user_id, file_ids)
+            for file_id, can in files_access_rights.items():
+                if not can.write:
+                    raise FileAccessRightError(access_right="write", file_id=file_id)
+            await db_file_meta_data_journal.record_many(
+                conn,
+                [(file_id, None) for file_id in file_ids],
+                FileMetaDataJournalEvent.UPLOAD_STARTED,
+            )
+            existing_fmds = await db_file_meta_data.list_fmds(conn, file_ids=file_ids)
+
+        # NOTE: as for a single upload, pending uploads are cancelled
+        # and the already existing files are deleted first
+        await self._delete_files_for_upload(existing_fmds)
+
+        async with self.engine.acquire() as conn:
+            fmds = await db_file_meta_data.upsert_many(
+                conn,
+                [
+                    self._new_fmd_for_upload(
+                        user_id,
+                        f.file_id,
+                        upload_id=S3_UNDEFINED_OR_EXTERNAL_MULTIPART_ID
+                        if (
+                            s3_client.is_multipart(f.file_size)
+                            or link_type == LinkType.S3
+                        )
+                        else None,
+                        is_directory=False,
+                        sha256_checksum=f.sha256_checksum,
+                    )
+                    for f in files
+                ],
+            )
+        file_sizes = {f.file_id: f.file_size for f in files}
+
+        if link_type == LinkType.S3:
+            return {
+                fmd.file_id: UploadLinks(
+                    [s3_client.compute_s3_url(self.simcore_bucket_name, fmd.file_id)],
+                    file_sizes[fmd.file_id] or MAX_LINK_CHUNK_BYTE_SIZE[link_type],
+                )
+                for fmd in fmds
+            }
+
+        multipart_fmds = [
+            fmd for fmd in fmds if s3_client.is_multipart(file_sizes[fmd.file_id])
+        ]
+        single_fmds = [
+            fmd for fmd in fmds if not s3_client.is_multipart(file_sizes[fmd.file_id])
+        ]
+
+        # NOTE: initiating a multipart upload is a call to S3 for each file
+        multipart_presigned_links = await logged_gather(
+            *(
+                s3_client.create_multipart_upload_links(
+                    fmd.bucket_name,
+                    fmd.file_id,
+                    file_sizes[fmd.file_id],
+                    expiration_secs=self.settings.STORAGE_DEFAULT_PRESIGNED_LINK_EXPIRATION_SECONDS,
+                    sha256_checksum=fmd.sha256_checksum,
+                )
+                for fmd in multipart_fmds
+            ),
+            max_concurrency=MAX_CONCURRENT_S3_TASKS,
+        )
+        if multipart_fmds:
+            for fmd, links in zip(
+                multipart_fmds, multipart_presigned_links, strict=True
+            ):
+                fmd.upload_id = links.upload_id
+            async with self.engine.acquire() as conn, conn.begin():
+                await db_file_meta_data_journal.record_many(
+                    conn,
+                    [(fmd.file_id, fmd.upload_id) for fmd in multipart_fmds],
+                    FileMetaDataJournalEvent.UPLOAD_STARTED,
+                )
+                # update the database so we keep the upload ids
+                await db_file_meta_data.upsert_many(conn, multipart_fmds)
+
+        single_presigned_links = await s3_client.create_single_presigned_links(
+            self.simcore_bucket_name,
+            [fmd.file_id for fmd in single_fmds],
+            client_method="put_object",
+            expiration_secs=self.settings.STORAGE_DEFAULT_PRESIGNED_LINK_EXPIRATION_SECONDS,
+        )
+
+        upload_links = {
+            fmd.file_id: UploadLinks(links.urls, links.chunk_size)
+            for fmd, links in zip(
+                multipart_fmds, multipart_presigned_links, strict=True
+            )
+        } | {
+            fmd.file_id: UploadLinks(
+                [link], file_sizes[fmd.file_id] or MAX_LINK_CHUNK_BYTE_SIZE[link_type]
+            )
+            for fmd, link in zip(single_fmds, single_presigned_links, strict=True)
+        }
+        return {file_id: upload_links[file_id] for file_id in file_ids}
+
+    async def _delete_files_for_upload(self, fmds: list[FileMetaDataAtDB]) -> None:
+        """bulk version of the cleaning done by create_file_upload_links
+        (i.e. cancels the pending uploads and deletes the files)"""
+        if not fmds:
+            return
+        s3_client = get_s3_client(self.app)
+        await logged_gather(
+            *(
+                s3_client.abort_multipart_upload(
+                    bucket=fmd.bucket_name, file_id=fmd.file_id, upload_id=fmd.upload_id
+                )
+                for fmd in fmds
+                if fmd.upload_id and is_valid_managed_multipart_upload(fmd.upload_id)
+            ),
+            max_concurrency=MAX_CONCURRENT_S3_TASKS,
+        )
+        file_ids = [fmd.file_id for fmd in fmds]
+        async with self.engine.acquire() as conn:
+            await db_file_meta_data_journal.record_many(
+                conn,
+                [(file_id, None) for file_id in file_ids],
+                FileMetaDataJournalEvent.DELETED,
+            )
+        async with self.engine.acquire() as conn, conn.begin():
+            if self.settings.STORAGE_DEDUPLICATE_PROJECT_COPIES:
+                for file_id in file_ids:
+                    await self._move_shared_objects_to_references(conn, path=file_id)
+            for fmd in fmds:
+                if fmd.is_directory:
+                    await s3_client.delete_files_in_path(
+                        fmd.bucket_name, prefix=ensure_ends_with(fmd.file_id, "/")
+                    )
+            await s3_client.delete_files(
+                self.simcore_bucket_name,
+                [fmd.file_id for fmd in fmds if not fmd.is_directory],
+            )
+            await db_file_meta_data.delete(conn, file_ids)
+
     async def abort_file_upload(
         self,
         user_id: UserID,
@@ -341,6 +575,7 @@ class SimcoreS3DataManager(BaseDataManager):
             )
             if not can.delete or not can.write:
                 raise FileAccessRightError(access_right="write/delete", file_id=file_id)
+            await self._journal(file_id, FileMetaDataJournalEvent.UPLOAD_ABORTED)
 
             fmd: FileMetaDataAtDB = await db_file_meta_data.get(
                 conn, parse_obj_as(SimcoreS3FileID, file_id)
@@ -381,6 +616,11 @@ class SimcoreS3DataManager(BaseDataManager):
                 conn, parse_obj_as(SimcoreS3FileID, file_id)
             )
 
+        await self._journal(
+            fmd.file_id,
+            FileMetaDataJournalEvent.UPLOAD_COMPLETED,
+            upload_id=fmd.upload_id,
+        )
         if is_valid_managed_multipart_upload(fmd.upload_id):
             # NOTE: Processing of a Complete Multipart Upload request
             # could take several minutes to complete. After Amazon S3
@@ -428,6 +668,59 @@ class SimcoreS3DataManager(BaseDataManager):
                 )
             )
 
+    async def create_file_download_links_batch(
+        self,
+        user_id: UserID,
+        file_ids: list[SimcoreS3FileID],
+        link_type: LinkType,
+    ) -> dict[SimcoreS3FileID, AnyUrl]:
+        """same as create_file_download_link for several files:
+        - the access rights are resolved once per project
+        - the entries are read in bulk
+        - the presigned links are signed locally
+
+        NOTE: files inside a directory are resolved one by one
+        """
+        async with self.engine.acquire() as conn:
+            files_access_rights = await get_files_access_rights(
+                conn, user_id, list(file_ids)
+            )
+            for file_id, can in files_access_rights.items():
+                if not can.read:
+                    raise FileAccessRightError(access_right="read", file_id=file_id)
+
+            fmds = {
+                fmd.file_id: fmd
+                for fmd in await db_file_meta_data.list_fmds(conn, file_ids=file_ids)
+            }
+            for file_id, fmd in fmds.items():
+                if not is_file_entry_valid(fmd):
+                    # try lazy update
+                    fmds[file_id] = await self._update_database_from_storage(conn, fmd)
+
+        links: dict[SimcoreS3FileID, AnyUrl] = {
+            file_id: await self.create_file_download_link(user_id, file_id, link_type)
+            for file_id in file_ids
+            if file_id not in fmds
+        }
+        object_names = [fmds[file_id].object_name for file_id in fmds]
+        if link_type == LinkType.PRESIGNED:
+            object_links = await get_s3_client(self.app).create_single_presigned_links(
+                self.simcore_bucket_name,
+                object_names,
+                client_method="get_object",
+                expiration_secs=self.settings.STORAGE_DEFAULT_PRESIGNED_LINK_EXPIRATION_SECONDS,
+            )
+        else:
+            object_links = [
+                get_s3_client(self.app).compute_s3_url(
+                    self.simcore_bucket_name, object_name
+                )
+                for object_name in object_names
+            ]
+        links |= dict(zip(fmds, object_links, strict=True))
+        return {file_id: links[file_id] for file_id in file_ids}
+
     @staticmethod
     async def __ensure_read_access_rights(
         conn: SAConnection, user_id: UserID, storage_file_id: StorageFileID
@@ -507,33 +800,40 @@ class SimcoreS3DataManager(BaseDataManager):
         # Only use this in those circumstances where a collaborator requires to delete a file (the current
         # permissions model will not allow him to do so, even though this is a legitimate action)
         # SEE https://github.com/ITISFoundation/osparc-simcore/issues/5159
-        async with self.engine.acquire() as conn, conn.begin():
+        async with self.engine.acquire() as conn:
             if enforce_access_rights:
                 can: AccessRights = await get_file_access_rights(conn, user_id, file_id)
                 if not can.delete:
                     raise FileAccessRightError(access_right="delete", file_id=file_id)
-
-            with suppress(FileMetaDataNotFoundError):
+        await self._journal(file_id, FileMetaDataJournalEvent.DELETED)
+        async with self.engine.acquire() as conn:
+            try:
                 file: FileMetaDataAtDB = await db_file_meta_data.get(
                     conn, parse_obj_as(SimcoreS3FileID, file_id)
                 )
-                # NOTE: since this lists the files before deleting them
-                # it can be used to filter for just a single file and also
-                # to delete it
-                await get_s3_client(self.app).delete_files_in_path(
-                    file.bucket_name,
-                    prefix=(
-                        ensure_ends_with(file.file_id, "/")
-                        if file.is_directory
-                        else file.file_id
-                    ),
-                )
-                await db_file_meta_data.delete(conn, [file.file_id])
+            except FileMetaDataNotFoundError:
+                return
+
+        async with self.engine.acquire() as conn, conn.begin():
+            if self.settings.STORAGE_DEDUPLICATE_PROJECT_COPIES:
+                await self._move_shared_objects_to_references(conn, path=file.file_id)
+            # NOTE: since this lists the files before deleting them
+            # it can be used to filter for just a single file and also
+            # to delete it
+            await get_s3_client(self.app).delete_files_in_path(
+                file.bucket_name,
+                prefix=(
+                    ensure_ends_with(file.file_id, "/")
+                    if file.is_directory
+                    else file.file_id
+                ),
+            )
+            await db_file_meta_data.delete(conn, [file.file_id])
 
     async def delete_project_simcore_s3(
         self, user_id: UserID, project_id: ProjectID, node_id: NodeID | None = None
     ) -> None:
-        async with self.engine.acquire() as conn, conn.begin():
+        async with self.engine.acquire() as conn:
             can: AccessRights | None = await get_project_access_rights(
                 conn, user_id, project_id
             )
@@ -542,7 +842,12 @@ class SimcoreS3DataManager(BaseDataManager):
                     access_right="delete", project_id=project_id
                 )
 
+        async with self.engine.acquire() as conn, conn.begin():
             # we can do it this way, since we are in a transaction, it will rollback in case of error
+            if self.settings.STORAGE_DEDUPLICATE_PROJECT_COPIES:
+                await self._move_shared_objects_to_references(
+                    conn, path=f"{project_id}/{node_id}" if node_id else f"{project_id}"
+                )
             if not node_id:
                 await db_file_meta_data.delete_all_from_project(conn, project_id)
             else:
@@ -600,32 +905,23 @@ class SimcoreS3DataManager(BaseDataManager):
                 FileMetaDataAtDB
             ] = await db_file_meta_data.list_fmds(conn, project_ids=[src_project_uuid])
 
-        with log_context(
-            _logger,
-            logging.INFO,
-            (
-                f"{src_project_uuid} -> {dst_project_uuid}: getting total file size for "
-                f"{len(src_project_files)} files"
+        # NOTE: the size of files is known from the database, the size of directories
+        # is only discovered while they are listed for copying (sizing and copying overlap)
+        s3_transfered_data_cb = S3TransferDataCB(
+            task_progress,
+            parse_obj_as(
+                ByteSize,
+                sum(
+                    fmd.file_size
+                    for fmd in src_project_files
+                    if not fmd.is_directory and fmd.file_size > 0
+                ),
             ),
-            log_duration=True,
-        ):
-            sizes_and_num_files: list[tuple[ByteSize, int]] = []
-            for src_project_files_slice in partition_gen(
-                src_project_files, slice_size=_MAX_PARALLEL_S3_CALLS
-            ):
-                sizes_and_num_files.extend(
-                    await logged_gather(
-                        *[
-                            self._get_size_and_num_files(fmd)
-                            for fmd in src_project_files_slice
-                        ]
-                    )
-                )
-
-            total_bytes_to_copy = sum(n for n, _ in sizes_and_num_files)
-            total_num_of_files = sum(n for _, n in sizes_and_num_files)
-        src_project_total_data_size: ByteSize = parse_obj_as(
-            ByteSize, total_bytes_to_copy
+            task_progress_message_prefix=f"Copying {len(src_project_files)} files to '{dst_project['name']}'",
+        )
+        # NOTE: one sliding window of in-flight S3 copy requests shared by all the files
+        parts_limiter = asyncio.Semaphore(
+            self.settings.STORAGE_S3_MAX_CONCURRENT_COPY_PARTS
         )
         _logger.info(
             "%s -> %s: Step 3.1: copy: files referenced from file_metadata",
@@ -633,11 +929,6 @@ class SimcoreS3DataManager(BaseDataManager):
             dst_project_uuid,
         )
         copy_tasks: deque[Awaitable] = deque()
-        s3_transfered_data_cb = S3TransferDataCB(
-            task_progress,
-            src_project_total_data_size,
-            task_progress_message_prefix=f"Copying {total_num_of_files} files to '{dst_project['name']}'",
-        )
         for src_fmd in src_project_files:
             if not src_fmd.node_id or (src_fmd.location_id != self.location_id):
                 msg = (
@@ -647,14 +938,31 @@ class SimcoreS3DataManager(BaseDataManager):
                 raise NotImplementedError(msg)
 
             if new_node_id := node_mapping.get(src_fmd.node_id):
+                dst_file_id = SimcoreS3FileID(
+                    f"{dst_project_uuid}/{new_node_id}/{src_fmd.file_id.split('/', maxsplit=2)[-1]}"
+                )
+                if (
+                    self.settings.STORAGE_DEDUPLICATE_PROJECT_COPIES
+                    and not src_fmd.is_directory
+                    and is_file_entry_valid(src_fmd)
+                ):
+                    copy_tasks.append(
+                        self._copy_file_as_shared_object(
+                            user_id,
+                            src_fmd,
+                            dst_file_id,
+                            bytes_transfered_cb=s3_transfered_data_cb.copy_transfer_cb,
+                        )
+                    )
+                    continue
                 copy_tasks.append(
                     self._copy_path_s3_s3(
                         user_id,
                         src_fmd,
-                        SimcoreS3FileID(
-                            f"{dst_project_uuid}/{new_node_id}/{src_fmd.object_name.split('/', maxsplit=2)[-1]}"
-                        ),
+                        dst_file_id,
                         bytes_transfered_cb=s3_transfered_data_cb.copy_transfer_cb,
+                        parts_limiter=parts_limiter,
+                        bytes_discovered_cb=s3_transfered_data_cb.increase_bytes_to_transfer,
                     )
                 )
         _logger.info(
@@ -678,10 +986,14 @@ class SimcoreS3DataManager(BaseDataManager):
                     and (int(output.get("store", self.location_id)) == DATCORE_ID)
                 ]
             )
-        for copy_tasks_slice in partition_gen(
-            copy_tasks, slice_size=MAX_CONCURRENT_S3_TASKS
-        ):
-            await logged_gather(*copy_tasks_slice)
+        # NOTE: no slice barriers, a new file starts as soon as another one is done.
+        # Each file being copied holds at least one of the in-flight copy requests,
+        # so the files are bounded by the same setting and do not stack on it
+        await logged_gather(
+            *copy_tasks,
+            log=_logger,
+            max_concurrency=self.settings.STORAGE_S3_MAX_CONCURRENT_COPY_PARTS,
+        )
         # ensure the full size is reported
         s3_transfered_data_cb.finalize_transfer()
         _logger.info(
@@ -690,24 +1002,6 @@ class SimcoreS3DataManager(BaseDataManager):
             dst_project_uuid,
         )
 
-    async def _get_size_and_num_files(
-        self, fmd: FileMetaDataAtDB
-    ) -> tuple[ByteSize, int]:
-        if not fmd.is_directory:
-            return fmd.file_size, 1
-
-        # in case of directory list files and return size
-        total_size: int = 0
-        total_num_s3_objects = 0
-        async for s3_objects in get_s3_client(self.app).list_all_objects_gen(
-            self.simcore_bucket_name,
-            prefix=f"{fmd.object_name}",
-        ):
-            total_size += sum(x.get("Size", 0) for x in s3_objects)
-            total_num_s3_objects += len(s3_objects)
-
-        return parse_obj_as(ByteSize, total_size), total_num_s3_objects
-
     async def search_read_access_files(
         self, user_id: UserID, file_id_prefix: str, sha256_checksum: SHA256Str | None
     ):
@@ -783,30 +1077,185 @@ class SimcoreS3DataManager(BaseDataManager):
             return convert_db_to_model(await db_file_meta_data.insert(conn, target))
 
     async def synchronise_meta_data_table(
-        self, *, dry_run: bool
+        self,
+        *,
+        dry_run: bool,
+        full_scan: bool = False,
+        full_scan_progress_cb: Callable[[int, int], None] | None = None,
     ) -> list[StorageFileID]:
-        file_ids_to_remove = []
+        """removes the entries which S3 object does not exist anymore
+
+        - by default only the files touched by the journal events recorded since the
+        last checkpoint are checked (and dangling multipart uploads aborted)
+        - `full_scan` additionally checks every entry against S3 (slow, rate-limited)
+        - the journal events younger than JOURNAL_REPLAY_MIN_EVENT_AGE are left
+        for later, they might belong to operations still in progress
+        """
+        file_ids_to_remove = await self._replay_journal(
+            dry_run=dry_run, min_event_age=JOURNAL_REPLAY_MIN_EVENT_AGE
+        )
+        if full_scan:
+            file_ids_to_remove.extend(
+                file_id
+                for file_id in await self._full_scan(
+                    dry_run=dry_run, progress_cb=full_scan_progress_cb
+                )
+                if file_id not in file_ids_to_remove
+            )
+        _logger.info(
+            "%s %d entries ",
+            "Would delete" if dry_run else "Deleted",
+            len(file_ids_to_remove),
+        )
+        return file_ids_to_remove
+
+    async def _journal(
+        self,
+        file_id: StorageFileID,
+        event: FileMetaDataJournalEvent,
+        *,
+        upload_id: UploadID | None = None,
+    ) -> None:
+        # NOTE: recorded once the access rights are checked and BEFORE the operation is
+        # performed, on its own connection (i.e. outside of the transaction of the
+        # operation), so that the event survives a failure (or a rollback) of the operation
         async with self.engine.acquire() as conn:
-            _logger.warning(
-                "Total number of entries to check %d",
-                await db_file_meta_data.total(conn),
+            await db_file_meta_data_journal.record(
+                conn,
+                parse_obj_as(SimcoreS3FileID, file_id),
+                event,
+                upload_id=upload_id,
+            )
+
+    async def replay_journal(self, *, min_event_age: datetime.timedelta) -> None:
+        """drains the journal of the events older than `min_event_age`
+
+        NOTE: the younger events might belong to operations still in progress
+        (e.g. a multipart upload whose ID is not yet saved in its entry)
+        """
+        removed_file_ids = await self._replay_journal(
+            dry_run=False, min_event_age=min_event_age
+        )
+        if removed_file_ids:
+            _logger.info(
+                "Deleted %d entries which S3 object does not exist anymore",
+                len(removed_file_ids),
             )
+
+    async def _replay_journal(
+        self, *, dry_run: bool, min_event_age: datetime.timedelta
+    ) -> list[StorageFileID]:
+        s3_client = get_s3_client(self.app)
+        file_ids_to_remove: list[StorageFileID] = []
+        last_event_id: int | None = None
+        created_before = datetime.datetime.now(datetime.timezone.utc) - min_event_age
+        while True:
+            async with self.engine.acquire() as conn:
+                events = await db_file_meta_data_journal.list_events(
+                    conn,
+                    after_event_id=last_event_id,
+                    limit=_JOURNAL_REPLAY_BATCH_SIZE,
+                    created_before=created_before,
+                )
+                if not events:
+                    break
+                last_event_id = events[-1].event_id
+                # NOTE: only the current state matters, each file is checked once per batch
+                fmds: dict[SimcoreS3FileID, FileMetaDataAtDB] = {
+                    fmd.file_id: fmd
+                    for fmd in await db_file_meta_data.list_fmds(
+                        conn, file_ids=list({e.file_id for e in events})
+                    )
+                }
+
+            batch_file_ids_to_remove = [
+                fmd.file_id
+                for fmd in fmds.values()
+                if fmd.upload_expires_at is None
+                and not await s3_client.file_exists(
+                    self.simcore_bucket_name, s3_object=fmd.object_name
+                )
+            ]
+            file_ids_to_remove.extend(batch_file_ids_to_remove)
+
+            # multipart uploads started by storage that are neither finished nor
+            # referenced anymore by their entry are dangling
+            finished_uploads = {
+                (e.file_id, e.upload_id)
+                for e in events
+                if e.event
+                in (
+                    FileMetaDataJournalEvent.UPLOAD_COMPLETED,
+                    FileMetaDataJournalEvent.UPLOAD_ABORTED,
+                )
+            }
+            dangling_uploads = [
+                (e.file_id, e.upload_id)
+                for e in events
+                if e.event == FileMetaDataJournalEvent.UPLOAD_STARTED
+                and is_valid_managed_multipart_upload(e.upload_id)
+                and (e.file_id, e.upload_id) not in finished_uploads
+                and (e.file_id not in fmds or fmds[e.file_id].upload_id != e.upload_id)
+            ]
+            if dry_run:
+                continue
+
+            for file_id, upload_id in dangling_uploads:
+                assert upload_id  # nosec
+                # NOTE: the upload might have been finished in the meantime
+                with suppress(S3AccessError):
+                    await s3_client.abort_multipart_upload(
+                        self.simcore_bucket_name, file_id, upload_id
+                    )
+            async with self.engine.acquire() as conn, conn.begin():
+                await db_file_meta_data.delete(conn, batch_file_ids_to_remove)
+                await db_file_meta_data_journal.checkpoint(
+                    conn, up_to_event_id=last_event_id
+                )
+        return file_ids_to_remove
+
+    async def _full_scan(
+        self,
+        *,
+        dry_run: bool,
+        progress_cb: Callable[[int, int], None] | None,
+    ) -> list[StorageFileID]:
+        s3_client = get_s3_client(self.app)
+        check_period = 1.0 / self.settings.STORAGE_SYNC_FULL_SCAN_MAX_CHECKS_PER_SECOND
+        file_ids_to_remove: list[StorageFileID] = []
+        async with self.engine.acquire() as conn:
+            total_num_entries = await db_file_meta_data.total(conn)
+        _logger.warning("Total number of entries to check %d", total_num_entries)
+
+        num_checked_entries = 0
+        last_file_id: SimcoreS3FileID | None = None
+        while True:
+            # NOTE: the connection is not kept during the (slow) checks
+            async with self.engine.acquire() as conn:
+                fmds = await db_file_meta_data.list_valid_uploads(
+                    conn, after_file_id=last_file_id, limit=_FULL_SCAN_PAGE_SIZE
+                )
+            if not fmds:
+                break
+            last_file_id = fmds[-1].file_id
+
             # iterate over all entries to check if there is a file in the S3 backend
-            async for fmd in db_file_meta_data.list_valid_uploads(conn):
-                if not await get_s3_client(self.app).file_exists(
+            page_file_ids_to_remove = []
+            for fmd in fmds:
+                if not await s3_client.file_exists(
                     self.simcore_bucket_name, s3_object=fmd.object_name
                 ):
                     # this file does not exist in S3
-                    file_ids_to_remove.append(fmd.file_id)
+                    page_file_ids_to_remove.append(fmd.file_id)
+                num_checked_entries += 1
+                await asyncio.sleep(check_period)
+            if progress_cb:
+                progress_cb(num_checked_entries, total_num_entries)
 
             if not dry_run:
-                await db_file_meta_data.delete(conn, file_ids_to_remove)
-
-            _logger.info(
-                "%s %d entries ",
-                "Would delete" if dry_run else "Deleted",
-                len(file_ids_to_remove),
-            )
+                async with self.engine.acquire() as conn:
+                    await db_file_meta_data.delete(conn, page_file_ids_to_remove)
+            file_ids_to_remove.extend(page_file_ids_to_remove)
 
         return file_ids_to_remove
 
@@ -1065,6 +1514,7 @@ class SimcoreS3DataManager(BaseDataManager):
             await download_to_file_or_raise(session, dc_link, local_file_path)
 
             # copying will happen using aioboto3, therefore multipart might happen
+            await self._journal(dst_file_id, FileMetaDataJournalEvent.UPLOAD_STARTED)
             async with self.engine.acquire() as conn, conn.begin() as transaction:
                 new_fmd = await self._create_fmd_for_upload(
                     conn,
@@ -1097,6 +1547,9 @@ class SimcoreS3DataManager(BaseDataManager):
         src_fmd: FileMetaDataAtDB,
         dst_file_id: SimcoreS3FileID,
         bytes_transfered_cb: Callable[[int], None],
+        *,
+        parts_limiter: asyncio.Semaphore | None = None,
+        bytes_discovered_cb: Callable[[int], None] | None = None,
     ) -> FileMetaData:
         _logger.debug(
             "copying %s to %s, %s",
@@ -1104,8 +1557,13 @@ class SimcoreS3DataManager(BaseDataManager):
             f"{dst_file_id=}",
             f"{src_fmd.is_directory=}",
         )
-        # copying will happen using aioboto3, therefore multipart might happen
+        if parts_limiter is None:
+            parts_limiter = asyncio.Semaphore(
+                self.settings.STORAGE_S3_MAX_CONCURRENT_COPY_PARTS
+            )
+        await self._journal(dst_file_id, FileMetaDataJournalEvent.UPLOAD_STARTED)
         # NOTE: connection must be released to ensure database update
+        # and is not kept while copying (the copy can take a long time)
         async with self.engine.acquire() as conn, conn.begin() as transaction:
             new_fmd = await self._create_fmd_for_upload(
                 conn,
@@ -1118,56 +1576,165 @@ class SimcoreS3DataManager(BaseDataManager):
             # NOTE: ensure the database is updated so cleaner does not pickup newly created uploads
             await transaction.commit()
 
-            s3_client: StorageS3Client = get_s3_client(self.app)
+        s3_client: StorageS3Client = get_s3_client(self.app)
 
-            if src_fmd.is_directory:
-                async for s3_objects in s3_client.list_all_objects_gen(
-                    self.simcore_bucket_name,
-                    prefix=src_fmd.object_name,
-                ):
-                    s3_objects_src_to_new: dict[str, str] = {
-                        x["Key"]: x["Key"].replace(
-                            f"{src_fmd.object_name}", f"{new_fmd.object_name}"
-                        )
-                        for x in s3_objects
-                    }
-
-                    for src, new in s3_objects_src_to_new.items():
-                        # NOTE: copy_file cannot be called concurrently or it will hang.
-                        # test this with copying multiple 1GB files if you do not believe me
-                        await s3_client.copy_file(
+        if src_fmd.is_directory:
+            async for s3_objects in s3_client.list_all_objects_gen(
+                self.simcore_bucket_name,
+                prefix=src_fmd.object_name,
+            ):
+                if bytes_discovered_cb:
+                    bytes_discovered_cb(sum(x.get("Size", 0) for x in s3_objects))
+                # NOTE: objects are copied server-side in parallel, bounded by parts_limiter
+                await logged_gather(
+                    *(
+                        s3_client.copy_file_multipart(
                             self.simcore_bucket_name,
-                            cast(SimcoreS3FileID, src),
-                            cast(SimcoreS3FileID, new),
+                            cast(SimcoreS3FileID, x["Key"]),
+                            cast(
+                                SimcoreS3FileID,
+                                x["Key"].replace(
+                                    f"{src_fmd.object_name}", f"{new_fmd.object_name}"
+                                ),
+                            ),
+                            file_size=parse_obj_as(ByteSize, x.get("Size", 0)),
+                            parts_limiter=parts_limiter,
                             bytes_transfered_cb=bytes_transfered_cb,
                         )
-            else:
-                await s3_client.copy_file(
-                    self.simcore_bucket_name,
-                    src_fmd.object_name,
-                    new_fmd.object_name,
-                    bytes_transfered_cb=bytes_transfered_cb,
+                        for x in s3_objects
+                    ),
+                    log=_logger,
                 )
+        else:
+            await s3_client.copy_file_multipart(
+                self.simcore_bucket_name,
+                src_fmd.object_name,
+                new_fmd.object_name,
+                file_size=(
+                    src_fmd.file_size
+                    if src_fmd.file_size >= 0
+                    else parse_obj_as(
+                        ByteSize,
+                        (
+                            await s3_client.get_file_metadata(
+                                self.simcore_bucket_name, src_fmd.object_name
+                            )
+                        ).size,
+                    )
+                ),
+                parts_limiter=parts_limiter,
+                bytes_transfered_cb=bytes_transfered_cb,
+            )
 
+        async with self.engine.acquire() as conn:
             updated_fmd = await self._update_database_from_storage(conn, new_fmd)
         _logger.info("copied %s to %s", f"{src_fmd=}", f"{updated_fmd=}")
         return convert_db_to_model(updated_fmd)
 
-    async def _create_fmd_for_upload(
+    async def _copy_file_as_shared_object(
+        self,
+        user_id: UserID,
+        src_fmd: FileMetaDataAtDB,
+        dst_file_id: SimcoreS3FileID,
+        bytes_transfered_cb: Callable[[int], None],
+    ) -> FileMetaData:
+        """the copy is a new entry backed by the same S3 object as src_fmd (no data is copied)
+
+        NOTE: copy-on-write: uploading to the copy creates its own object and deleting
+        the owner of a shared object first moves it to one of its references
+        NOTE: the owner of the object is locked until the copy is saved, so that the object
+        is not moved or deleted meanwhile
+        """
+        async with self.engine.acquire() as conn, conn.begin():
+            src_fmd = await db_file_meta_data.get(conn, src_fmd.file_id)
+            if not await db_file_meta_data.lock_object_owner(conn, src_fmd.object_name):
+                # the object was moved (copy-on-delete) since the source was read
+                src_fmd = await db_file_meta_data.get(conn, src_fmd.file_id)
+                if not await db_file_meta_data.lock_object_owner(
+                    conn, src_fmd.object_name
+                ):
+                    raise FileMetaDataNotFoundError(file_id=src_fmd.object_name)
+            new_fmd = FileMetaData.from_simcore_node(
+                user_id=user_id,
+                file_id=dst_file_id,
+                bucket=self.simcore_bucket_name,
+                location_id=self.location_id,
+                location_name=self.location_name,
+                sha256_checksum=src_fmd.sha256_checksum,
+                object_name=src_fmd.object_name,
+                file_size=src_fmd.file_size,
+                last_modified=src_fmd.last_modified,
+                entity_tag=src_fmd.entity_tag,
+            )
+            copied_fmd = await db_file_meta_data.upsert(conn, new_fmd)
+        bytes_transfered_cb(src_fmd.file_size)
+        _logger.debug(
+            "copied %s to %s as shared object", f"{src_fmd=}", f"{copied_fmd=}"
+        )
+        return convert_db_to_model(copied_fmd)
+
+    async def _move_shared_objects_to_references(
+        self, conn: SAConnection, *, path: str
+    ) -> None:
+        """S3 objects under path that are still referenced by entries outside of it
+        are physically copied to their first reference, which becomes the new owner of
+        the object for all the references (i.e. copy-on-delete)
+
+        NOTE: to be called in the transaction deleting the entries under path, which are
+        locked with their references until it ends (i.e. no new reference meanwhile)
+        """
+        references_per_object: dict[
+            SimcoreS3FileID, list[FileMetaDataAtDB]
+        ] = defaultdict(list)
+        for fmd in await db_file_meta_data.lock_external_references(conn, path=path):
+            references_per_object[fmd.object_name].append(fmd)
+        if not references_per_object:
+            return
+
+        s3_client = get_s3_client(self.app)
+        parts_limiter = asyncio.Semaphore(
+            self.settings.STORAGE_S3_MAX_CONCURRENT_COPY_PARTS
+        )
+        await logged_gather(
+            *(
+                s3_client.copy_file_multipart(
+                    self.simcore_bucket_name,
+                    object_name,
+                    references[0].file_id,
+                    file_size=references[0].file_size,
+                    parts_limiter=parts_limiter,
+                    bytes_transfered_cb=None,
+                )
+                for object_name, references in references_per_object.items()
+            ),
+            log=_logger,
+        )
+        for object_name, references in references_per_object.items():
+            await db_file_meta_data.update_object_name(
+                conn,
+                current_object_name=object_name,
+                new_object_name=references[0].file_id,
+            )
+        _logger.info(
+            "moved %d shared objects out of '%s' before deleting it",
+            len(references_per_object),
+            path,
+        )
+
+    def _new_fmd_for_upload(
         self,
-        conn: SAConnection,
         user_id: UserID,
         file_id: StorageFileID,
         upload_id: UploadID | None,
         *,
         is_directory: bool,
         sha256_checksum: SHA256Str | None,
-    ) -> FileMetaDataAtDB:
+    ) -> FileMetaData:
         now = datetime.datetime.utcnow()
         upload_expiration_date = now + datetime.timedelta(
             seconds=self.settings.STORAGE_DEFAULT_PRESIGNED_LINK_EXPIRATION_SECONDS
         )
-        fmd = FileMetaData.from_simcore_node(
+        return FileMetaData.from_simcore_node(
             user_id=user_id,
             file_id=parse_obj_as(SimcoreS3FileID, file_id),
             bucket=self.simcore_bucket_name,
@@ -1178,6 +1745,24 @@ class SimcoreS3DataManager(BaseDataManager):
             is_directory=is_directory,
             sha256_checksum=sha256_checksum,
         )
+
+    async def _create_fmd_for_upload(
+        self,
+        conn: SAConnection,
+        user_id: UserID,
+        file_id: StorageFileID,
+        upload_id: UploadID | None,
+        *,
+        is_directory: bool,
+        sha256_checksum: SHA256Str | None,
+    ) -> FileMetaDataAtDB:
+        fmd = self._new_fmd_for_upload(
+            user_id,
+            file_id,
+            upload_id,
+            is_directory=is_directory,
+            sha256_checksum=sha256_checksum,
+        )
         return await db_file_meta_data.upsert(conn, fmd)
 
 
@@ -3,15 +3,19 @@
 # pylint: disable=redefined-outer-name
 
 import asyncio
+import datetime
 from pathlib import Path
 from typing import Awaitable, Callable, Optional
 
 import pytest
+from aiopg.sa.engine import Engine
 from faker import Faker
 from models_library.projects_nodes_io import SimcoreS3FileID
 from models_library.users import UserID
 from pydantic import ByteSize, parse_obj_as
 from servicelib.utils import logged_gather
+from simcore_service_storage import db_file_meta_data_journal
+from simcore_service_storage.exceptions import FileAccessRightError
 from simcore_service_storage.models import FileMetaData, S3BucketName
 from simcore_service_storage.s3_client import StorageS3Client
 from simcore_service_storage.simcore_s3_dsm import SimcoreS3DataManager
@@ -44,7 +48,17 @@ async def dsm_mockup_complete_db(
     return (fmds[0], fmds[1])
 
 
+@pytest.fixture
+def no_journal_replay_min_event_age(monkeypatch: pytest.MonkeyPatch) -> None:
+    # NOTE: the events of the files uploaded by the test are otherwise too young
+    monkeypatch.setattr(
+        "simcore_service_storage.simcore_s3_dsm.JOURNAL_REPLAY_MIN_EVENT_AGE",
+        datetime.timedelta(0),
+    )
+
+
 async def test_sync_table_meta_data(
+    no_journal_replay_min_event_age: None,
     simcore_s3_dsm: SimcoreS3DataManager,
     dsm_mockup_complete_db: tuple[FileMetaData, FileMetaData],
     storage_s3_client: StorageS3Client,
@@ -72,3 +86,92 @@ async def test_sync_table_meta_data(
     # listing again will show an empty list again
     list_changes = await simcore_s3_dsm.synchronise_meta_data_table(dry_run=True)
     assert list_changes == []
+
+
+async def test_sync_table_meta_data_full_scan_finds_unjournaled_changes(
+    no_journal_replay_min_event_age: None,
+    simcore_s3_dsm: SimcoreS3DataManager,
+    dsm_mockup_complete_db: tuple[FileMetaData, FileMetaData],
+    storage_s3_client: StorageS3Client,
+    storage_s3_bucket: S3BucketName,
+):
+    # replaying the journal checkpoints the uploads
+    list_changes = await simcore_s3_dsm.synchronise_meta_data_table(dry_run=False)
+    assert list_changes == []
+
+    # a change done outside of storage is not journaled...
+    file_entry = dsm_mockup_complete_db[0]
+    await storage_s3_client.client.delete_object(
+        Bucket=storage_s3_bucket, Key=file_entry.object_name
+    )
+    list_changes = await simcore_s3_dsm.synchronise_meta_data_table(dry_run=True)
+    assert list_changes == []
+
+    # ...but is found by the full scan
+    progress = []
+    list_changes = await simcore_s3_dsm.synchronise_meta_data_table(
+        dry_run=False,
+        full_scan=True,
+        full_scan_progress_cb=lambda checked, total: progress.append((checked, total)),
+    )
+    assert list_changes == [file_entry.file_id]
+    assert progress
+    assert progress[-1] == (2, 2)
+
+    list_changes = await simcore_s3_dsm.synchronise_meta_data_table(
+        dry_run=True, full_scan=True
+    )
+    assert list_changes == []
+
+
+async def test_replay_journal_drains_the_events_old_enough(
+    simcore_s3_dsm: SimcoreS3DataManager,
+    dsm_mockup_complete_db: tuple[FileMetaData, FileMetaData],
+    aiopg_engine: Engine,
+):
+    async with aiopg_engine.acquire() as conn:
+        events = await db_file_meta_data_journal.list_events(
+            conn, after_event_id=None, limit=100
+        )
+    assert events
+
+    # the events of operations that might still be in progress are kept
+    await simcore_s3_dsm.replay_journal(min_event_age=datetime.timedelta(hours=1))
+    async with aiopg_engine.acquire() as conn:
+        assert (
+            await db_file_meta_data_journal.list_events(
+                conn, after_event_id=None, limit=100
+            )
+            == events
+        )
+
+    await simcore_s3_dsm.replay_journal(min_event_age=datetime.timedelta(0))
+    async with aiopg_engine.acquire() as conn:
+        assert (
+            await db_file_meta_data_journal.list_events(
+                conn, after_event_id=None, limit=100
+            )
+            == []
+        )
+
+
+async def test_rejected_operations_are_not_journaled(
+    simcore_s3_dsm: SimcoreS3DataManager,
+    dsm_mockup_complete_db: tuple[FileMetaData, FileMetaData],
+    aiopg_engine: Engine,
+    faker: Faker,
+):
+    await simcore_s3_dsm.replay_journal(min_event_age=datetime.timedelta(0))
+
+    other_user_id = parse_obj_as(UserID, faker.pyint(min_value=10000))
+    with pytest.raises(FileAccessRightError):
+        await simcore_s3_dsm.delete_file(
+            other_user_id, dsm_mockup_complete_db[0].file_id
+        )
+    async with aiopg_engine.acquire() as conn:
+        assert (
+            await db_file_meta_data_journal.list_events(
+                conn, after_event_id=None, limit=100
+            )
+            == []
+        )
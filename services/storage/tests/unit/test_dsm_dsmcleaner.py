@@ -20,6 +20,7 @@ from models_library.basic_types import SHA256Str
 from models_library.projects_nodes_io import SimcoreS3DirectoryID, SimcoreS3FileID
 from models_library.users import UserID
 from pydantic import ByteSize, parse_obj_as
+from pytest_mock import MockerFixture
 from pytest_simcore.helpers.utils_parametrizations import byte_size_ids
 from simcore_postgres_database.storage_models import file_meta_data
 from simcore_service_storage import db_file_meta_data
@@ -491,3 +492,43 @@ async def test_clean_expired_uploads_cleans_dangling_multipart_uploads_if_no_cor
     )
     assert len(all_ongoing_uploads_after_clean) == 1
     assert all_ongoing_uploads == all_ongoing_uploads_after_clean
+
+
+async def test_synchronise_meta_data_table_does_not_abort_multipart_upload_on_creation(
+    disabled_dsm_cleaner_task,
+    aiopg_engine: Engine,
+    simcore_s3_dsm: SimcoreS3DataManager,
+    simcore_file_id: SimcoreS3FileID,
+    user_id: UserID,
+    storage_s3_client: StorageS3Client,
+    storage_s3_bucket: S3BucketName,
+    mocker: MockerFixture,
+):
+    """the upload is journaled before its upload id is saved in its entry, a sync
+    running in between shall not take it for a dangling upload"""
+    original_upsert = db_file_meta_data.upsert
+
+    async def _sync_then_upsert(*args, **kwargs):
+        await simcore_s3_dsm.synchronise_meta_data_table(dry_run=False, full_scan=True)
+        return await original_upsert(*args, **kwargs)
+
+    mocker.patch.object(db_file_meta_data, "upsert", side_effect=_sync_then_upsert)
+
+    await simcore_s3_dsm.create_file_upload_links(
+        user_id,
+        simcore_file_id,
+        LinkType.PRESIGNED,
+        parse_obj_as(ByteSize, "100Mib"),
+        sha256_checksum=None,
+        is_directory=False,
+    )
+
+    async with aiopg_engine.acquire() as conn:
+        fmd = await db_file_meta_data.get(conn, simcore_file_id)
+    assert fmd.upload_id
+    all_ongoing_uploads = await storage_s3_client.list_ongoing_multipart_uploads(
+        storage_s3_bucket
+    )
+    assert len(all_ongoing_uploads) == 1
+    ongoing_upload_id, _ = all_ongoing_uploads[0]
+    assert ongoing_upload_id == fmd.upload_id
@@ -23,11 +23,16 @@ from aiohttp.test_utils import TestClient
 from aiopg.sa import Engine
 from faker import Faker
 from models_library.api_schemas_storage import (
+    FileDownloadLinksBatch,
+    FileDownloadLinksBatchBody,
     FileMetaDataGet,
     FileUploadCompleteFutureResponse,
     FileUploadCompleteResponse,
     FileUploadCompleteState,
     FileUploadCompletionBody,
+    FileUploadLinksBatch,
+    FileUploadLinksBatchBody,
+    FileUploadLinksBatchItem,
     FileUploadSchema,
     LinkType,
     PresignedLink,
@@ -936,6 +941,136 @@ async def test_download_file_1_to_1_with_file_meta_data(
     )
 
 
+async def test_batch_upload_and_download_links(
+    client: TestClient,
+    user_id: UserID,
+    project_id: ProjectID,
+    node_id: NodeID,
+    create_simcore_file_id: Callable[[ProjectID, NodeID, str], SimcoreS3FileID],
+    create_file_of_size: Callable[[ByteSize, str | None], Path],
+    aiopg_engine: Engine,
+    faker: Faker,
+    tmp_path: Path,
+    cleanup_user_projects_file_metadata: None,
+    storage_s3_client: StorageS3Client,
+    storage_s3_bucket: S3BucketName,
+):
+    assert client.app
+    file_size = parse_obj_as(ByteSize, "1Mib")
+    files = {
+        create_simcore_file_id(
+            project_id, node_id, faker.file_name()
+        ): create_file_of_size(file_size, None)
+        for _ in range(3)
+    }
+
+    # 1. get all the upload links in one call
+    url = client.app.router["upload_files_batch"].url_for().with_query(user_id=user_id)
+    response = await client.post(
+        f"{url}",
+        json=jsonable_encoder(
+            FileUploadLinksBatchBody(
+                files=[
+                    FileUploadLinksBatchItem(file_id=file_id, file_size=file_size)
+                    for file_id in files
+                ]
+            )
+        ),
+    )
+    data, error = await assert_status(response, web.HTTPOk)
+    assert not error
+    uploads = FileUploadLinksBatch.parse_obj(data).uploads
+    assert list(uploads) == list(files)
+    for file_id, file_upload in uploads.items():
+        assert len(file_upload.urls) == 1
+        await assert_file_meta_data_in_db(
+            aiopg_engine,
+            file_id=file_id,
+            expected_entry_exists=True,
+            expected_file_size=-1,
+            expected_upload_id=False,
+            expected_upload_expiration_date=True,
+            expected_sha256_checksum=None,
+        )
+
+        # upload and complete the files as usual
+        parts = await upload_file_to_presigned_link(files[file_id], file_upload)
+        response = await client.post(
+            f"{file_upload.links.complete_upload}",
+            json=jsonable_encoder(FileUploadCompletionBody(parts=parts)),
+        )
+        await assert_status(response, web.HTTPAccepted)
+
+    # 2. get all the download links in one call
+    url = (
+        client.app.router["download_files_batch"].url_for().with_query(user_id=user_id)
+    )
+    response = await client.post(
+        f"{url}",
+        json=jsonable_encoder(FileDownloadLinksBatchBody(file_ids=list(files))),
+    )
+    data, error = await assert_status(response, web.HTTPOk)
+    assert not error
+    links = FileDownloadLinksBatch.parse_obj(data).links
+    assert list(links) == list(files)
+    for file_id, link in links.items():
+        await _assert_file_downloaded(
+            faker, tmp_path, link=link, uploaded_file=files[file_id]
+        )
+
+    # 3. uploading again deletes the existing files
+    url = client.app.router["upload_files_batch"].url_for().with_query(user_id=user_id)
+    response = await client.post(
+        f"{url}",
+        json=jsonable_encoder(
+            FileUploadLinksBatchBody(
+                files=[
+                    FileUploadLinksBatchItem(file_id=file_id, file_size=file_size)
+                    for file_id in files
+                ]
+            )
+        ),
+    )
+    await assert_status(response, web.HTTPOk)
+    for file_id in files:
+        await assert_file_meta_data_in_db(
+            aiopg_engine,
+            file_id=file_id,
+            expected_entry_exists=True,
+            expected_file_size=-1,
+            expected_upload_id=False,
+            expected_upload_expiration_date=True,
+            expected_sha256_checksum=None,
+        )
+        assert not await storage_s3_client.file_exists(
+            storage_s3_bucket, s3_object=file_id
+        )
+
+    # 4. a file can only be once in a batch
+    file_id = next(iter(files))
+    response = await client.post(
+        f"{url}",
+        json={
+            "files": [
+                {"file_id": file_id, "file_size": file_size},
+                {"file_id": file_id, "file_size": file_size},
+            ]
+        },
+    )
+    await assert_status(response, web.HTTPUnprocessableEntity)
+
+    # 5. directories cannot be uploaded in a batch
+    response = await client.post(
+        f"{url.update_query(is_directory='true')}",
+        json=jsonable_encoder(
+            FileUploadLinksBatchBody(
+                files=[FileUploadLinksBatchItem(file_id=file_id, file_size=file_size)]
+            )
+        ),
+    )
+    await assert_status(response, web.HTTPUnprocessableEntity)
+
+
 async def test_download_file_from_inside_a_directory(
     client: TestClient,
     file_size: ByteSize,
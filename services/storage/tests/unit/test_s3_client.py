@@ -811,6 +811,46 @@ async def test_copy_file(
         assert s3_obj["Size"] == src_file.stat().st_size
 
 
+@pytest.mark.parametrize(
+    "file_size",
+    [parametrized_file_size("10Mib"), parametrized_file_size("500Mib")],
+    ids=byte_size_ids,
+)
+async def test_copy_file_multipart(
+    file_size: ByteSize,
+    upload_file_with_aioboto3_managed_transfer: Callable[
+        [ByteSize], Awaitable[tuple[Path, SimcoreS3FileID]]
+    ],
+    storage_s3_client: StorageS3Client,
+    storage_s3_bucket: S3BucketName,
+    create_simcore_file_id: Callable[[ProjectID, NodeID, str], SimcoreS3FileID],
+    faker: Faker,
+):
+    src_file, src_file_uuid = await upload_file_with_aioboto3_managed_transfer(
+        file_size
+    )
+    dst_file_uuid = create_simcore_file_id(uuid4(), uuid4(), faker.file_name())
+    copied_bytes: list[int] = []
+    await storage_s3_client.copy_file_multipart(
+        storage_s3_bucket,
+        src_file_uuid,
+        dst_file_uuid,
+        file_size=file_size,
+        parts_limiter=asyncio.Semaphore(2),
+        bytes_transfered_cb=copied_bytes.append,
+    )
+    assert sum(copied_bytes) == file_size
+
+    dst_metadata = await storage_s3_client.get_file_metadata(
+        storage_s3_bucket, dst_file_uuid
+    )
+    assert dst_metadata.size == src_file.stat().st_size
+    # no dangling multipart upload is left
+    assert (
+        await storage_s3_client.list_ongoing_multipart_uploads(storage_s3_bucket) == []
+    )
+
+
 async def test_copy_file_invalid_raises(
     upload_file_with_aioboto3_managed_transfer: Callable[
         [ByteSize], Awaitable[tuple[Path, SimcoreS3FileID]]
@@ -10,6 +10,7 @@ from pytest_simcore.helpers.utils_parametrizations import byte_size_ids
 from simcore_service_storage.s3_utils import (
     _MULTIPART_MAX_NUMBER_OF_PARTS,
     _MULTIPART_UPLOADS_TARGET_MAX_PART_SIZE,
+    compute_num_copy_parts,
     compute_num_file_chunks,
 )
 
@@ -49,3 +50,29 @@ def test_enormous_file_size_raises_value_error():
     )
     with pytest.raises(ValueError):
         compute_num_file_chunks(enormous_file_size)
+
+
+@pytest.mark.parametrize(
+    "file_size, expected_num_parts, expected_part_size",
+    [
+        (parse_obj_as(ByteSize, "1"), 1, parse_obj_as(ByteSize, "100Mib")),
+        (parse_obj_as(ByteSize, "100Mib"), 1, parse_obj_as(ByteSize, "100Mib")),
+        (parse_obj_as(ByteSize, "150Mib"), 2, parse_obj_as(ByteSize, "100Mib")),
+        (parse_obj_as(ByteSize, "200Gib"), 2048, parse_obj_as(ByteSize, "100Mib")),
+        (
+            parse_obj_as(ByteSize, "5Tib"),
+            _MULTIPART_MAX_NUMBER_OF_PARTS,
+            parse_obj_as(ByteSize, 549755814),
+        ),
+    ],
+    ids=byte_size_ids,
+)
+def test_compute_num_copy_parts(
+    file_size: ByteSize, expected_num_parts: int, expected_part_size: ByteSize
+):
+    num_parts, part_size = compute_num_copy_parts(
+        file_size, parse_obj_as(ByteSize, "100Mib")
+    )
+    assert num_parts == expected_num_parts
+    assert part_size == expected_part_size
+    assert num_parts <= _MULTIPART_MAX_NUMBER_OF_PARTS
@@ -1,18 +1,23 @@
 # pylint:disable=protected-access
 # pylint:disable=redefined-outer-name
 
+import asyncio
 from collections.abc import Awaitable, Callable
 from pathlib import Path
-from typing import AsyncContextManager
+from typing import Any, AsyncContextManager
 
 import pytest
+import sqlalchemy as sa
 from aiopg.sa.engine import Engine
 from faker import Faker
 from models_library.api_schemas_storage import FileUploadSchema
 from models_library.basic_types import SHA256Str
-from models_library.projects_nodes_io import SimcoreS3FileID
+from models_library.projects import ProjectID
+from models_library.projects_nodes_io import NodeID, SimcoreS3FileID
 from models_library.users import UserID
 from pydantic import ByteSize, parse_obj_as
+from pytest_mock import MockerFixture
+from simcore_postgres_database.storage_models import projects
 from simcore_service_storage import db_file_meta_data
 from simcore_service_storage.models import FileMetaData
 from simcore_service_storage.s3 import get_s3_client
@@ -109,3 +114,210 @@ async def test_upload_and_search(
     for file in files:
         assert file.sha256_checksum == checksum
         assert file.file_name in {"file1", "file2"}
+
+
+async def test_list_files_page_follows_cursor(
+    simcore_s3_dsm: SimcoreS3DataManager,
+    upload_file: Callable[..., Awaitable[tuple[Path, SimcoreS3FileID]]],
+    file_size: ByteSize,
+    user_id: UserID,
+):
+    NUM_FILES = 5
+    uploaded_file_ids = {
+        file_id
+        for _, file_id in [
+            await upload_file(file_size, f"file{n}") for n in range(NUM_FILES)
+        ]
+    }
+
+    listed_file_ids: list[SimcoreS3FileID] = []
+    cursor: SimcoreS3FileID | None = None
+    num_pages = 0
+    while True:
+        page = await simcore_s3_dsm.list_files_page(
+            user_id, expand_dirs=True, cursor=cursor, limit=2
+        )
+        num_pages += 1
+        assert len(page.items) <= 2
+        listed_file_ids.extend(f.file_id for f in page.items)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+
+    assert num_pages == 3
+    assert listed_file_ids == sorted(listed_file_ids)
+    assert set(listed_file_ids) == uploaded_file_ids
+
+    # the legacy call is a wrapper on the paginated one
+    files = await simcore_s3_dsm.list_files(user_id, expand_dirs=True)
+    assert {f.file_id for f in files} == uploaded_file_ids
+
+
+@pytest.fixture
+def deduplicate_project_copies(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("STORAGE_DEDUPLICATE_PROJECT_COPIES", "1")
+
+
+@pytest.fixture
+def copy_project(
+    simcore_s3_dsm: SimcoreS3DataManager,
+    create_project: Callable[..., Awaitable[dict[str, Any]]],
+    user_id: UserID,
+    aiopg_engine: Engine,
+    faker: Faker,
+) -> Callable[[ProjectID], Awaitable[tuple[ProjectID, dict[NodeID, NodeID]]]]:
+    async def _copier(
+        src_project_id: ProjectID,
+    ) -> tuple[ProjectID, dict[NodeID, NodeID]]:
+        async with aiopg_engine.acquire() as conn:
+            result = await conn.execute(
+                sa.select(projects).where(projects.c.uuid == f"{src_project_id}")
+            )
+            row = await result.first()
+        assert row
+        src_project = dict(row)
+        node_mapping = {
+            NodeID(node_id): NodeID(faker.uuid4())
+            for node_id in src_project["workbench"]
+        }
+        dst_project = await create_project(
+            workbench={
+                f"{dst_node_id}": src_project["workbench"][f"{src_node_id}"]
+                for src_node_id, dst_node_id in node_mapping.items()
+            }
+        )
+        await simcore_s3_dsm.deep_copy_project_simcore_s3(
+            user_id, src_project, dst_project, node_mapping
+        )
+        return ProjectID(dst_project["uuid"]), node_mapping
+
+    return _copier
+
+
+def _copied_file_id(
+    file_id: SimcoreS3FileID,
+    project_copy: tuple[ProjectID, dict[NodeID, NodeID]],
+) -> SimcoreS3FileID:
+    dst_project_id, node_mapping = project_copy
+    _, src_node_id, file_name = file_id.split("/", maxsplit=2)
+    return SimcoreS3FileID(
+        f"{dst_project_id}/{node_mapping[NodeID(src_node_id)]}/{file_name}"
+    )
+
+
+async def test_deduplicated_copy_survives_source_deletion(
+    deduplicate_project_copies: None,
+    simcore_s3_dsm: SimcoreS3DataManager,
+    upload_file: Callable[..., Awaitable[tuple[Path, SimcoreS3FileID]]],
+    copy_project: Callable[
+        [ProjectID], Awaitable[tuple[ProjectID, dict[NodeID, NodeID]]]
+    ],
+    file_size: ByteSize,
+    user_id: UserID,
+    project_id: ProjectID,
+    aiopg_engine: Engine,
+):
+    _, src_file_id = await upload_file(file_size, "shared_file")
+    dst_file_id = _copied_file_id(src_file_id, await copy_project(project_id))
+
+    # no data was copied
+    async with aiopg_engine.acquire() as conn:
+        dst_fmd = await db_file_meta_data.get(conn, dst_file_id)
+    assert dst_fmd.object_name == src_file_id
+    assert not await get_s3_client(simcore_s3_dsm.app).file_exists(
+        simcore_s3_dsm.simcore_bucket_name, s3_object=dst_file_id
+    )
+
+    # deleting the owner moves the object to the copy
+    await simcore_s3_dsm.delete_file(user_id, src_file_id)
+    async with aiopg_engine.acquire() as conn:
+        assert not await db_file_meta_data.exists(conn, src_file_id)
+        dst_fmd = await db_file_meta_data.get(conn, dst_file_id)
+    assert dst_fmd.object_name == dst_file_id
+    s3_metadata = await get_s3_client(simcore_s3_dsm.app).get_file_metadata(
+        simcore_s3_dsm.simcore_bucket_name, dst_file_id
+    )
+    assert s3_metadata.size == file_size
+
+
+async def test_deduplicated_copy_while_deleting_the_shared_object_owner(
+    deduplicate_project_copies: None,
+    simcore_s3_dsm: SimcoreS3DataManager,
+    upload_file: Callable[..., Awaitable[tuple[Path, SimcoreS3FileID]]],
+    copy_project: Callable[
+        [ProjectID], Awaitable[tuple[ProjectID, dict[NodeID, NodeID]]]
+    ],
+    file_size: ByteSize,
+    user_id: UserID,
+    project_id: ProjectID,
+    aiopg_engine: Engine,
+    mocker: MockerFixture,
+):
+    _, src_file_id = await upload_file(file_size, "shared_file")
+    project_copy = await copy_project(project_id)
+    copied_file_id = _copied_file_id(src_file_id, project_copy)
+
+    # the copy of the copy lists its files before the owner is deleted...
+    files_listed = asyncio.Event()
+    owner_deleted = asyncio.Event()
+    original_list_fmds = db_file_meta_data.list_fmds
+
+    async def _list_fmds_then_wait(*args, **kwargs):
+        fmds = await original_list_fmds(*args, **kwargs)
+        files_listed.set()
+        await owner_deleted.wait()
+        return fmds
+
+    mocker.patch.object(
+        db_file_meta_data, "list_fmds", side_effect=_list_fmds_then_wait
+    )
+    copy_of_the_copy = asyncio.create_task(copy_project(project_copy[0]))
+    await files_listed.wait()
+    await simcore_s3_dsm.delete_file(user_id, src_file_id)
+    owner_deleted.set()
+    # ...and references the object where it was moved to
+    copied_copy_file_id = _copied_file_id(copied_file_id, await copy_of_the_copy)
+    async with aiopg_engine.acquire() as conn:
+        copied_copy_fmd = await db_file_meta_data.get(conn, copied_copy_file_id)
+    assert copied_copy_fmd.object_name == copied_file_id
+    assert await get_s3_client(simcore_s3_dsm.app).file_exists(
+        simcore_s3_dsm.simcore_bucket_name, s3_object=copied_copy_fmd.object_name
+    )
+
+
+async def test_deleting_the_owner_ignores_soft_links_and_siblings(
+    deduplicate_project_copies: None,
+    simcore_s3_dsm: SimcoreS3DataManager,
+    upload_file: Callable[..., Awaitable[tuple[Path, SimcoreS3FileID]]],
+    copy_project: Callable[
+        [ProjectID], Awaitable[tuple[ProjectID, dict[NodeID, NodeID]]]
+    ],
+    file_size: ByteSize,
+    user_id: UserID,
+    project_id: ProjectID,
+    aiopg_engine: Engine,
+):
+    _, src_file_id = await upload_file(file_size, "file")
+    _, sibling_file_id = await upload_file(file_size, "file2")
+    project_copy = await copy_project(project_id)
+    copy_id = _copied_file_id(src_file_id, project_copy)
+    # a copy of file2 must not be moved when deleting file
+    sibling_copy_id = _copied_file_id(sibling_file_id, project_copy)
+    link_file_id = parse_obj_as(SimcoreS3FileID, f"{Path(src_file_id).parent}/the-link")
+    await simcore_s3_dsm.create_soft_link(user_id, src_file_id, link_file_id)
+
+    await simcore_s3_dsm.delete_file(user_id, src_file_id)
+    async with aiopg_engine.acquire() as conn:
+        # the soft link is not a reference: it was not turned into the owner
+        link_fmd = await db_file_meta_data.get(conn, link_file_id)
+        assert link_fmd.object_name == src_file_id
+        copy_fmd = await db_file_meta_data.get(conn, copy_id)
+        assert copy_fmd.object_name == copy_id
+        sibling_copy_fmd = await db_file_meta_data.get(conn, sibling_copy_id)
+        assert sibling_copy_fmd.object_name == sibling_file_id
+    assert not await get_s3_client(simcore_s3_dsm.app).file_exists(
+        simcore_s3_dsm.simcore_bucket_name, s3_object=link_file_id
+    )
+    assert not await get_s3_client(simcore_s3_dsm.app).file_exists(
+        simcore_s3_dsm.simcore_bucket_name, s3_object=sibling_copy_id
+    )
@@ -5,6 +5,8 @@ of a record in comp_task table is changed.
 import asyncio
 import json
 import logging
+import time
+from collections import defaultdict
 from collections.abc import AsyncIterator
 from contextlib import suppress
 from dataclasses import dataclass
@@ -24,34 +26,60 @@ from sqlalchemy.sql import select
 
 from ..projects import exceptions, projects_api
 from ..projects.nodes_utils import update_node_outputs
+from ._monitoring import ListenerMetrics
 from ._utils import convert_state_from_db
 
-_LISTENING_TASK_BASE_SLEEPING_TIME_S: Final[int] = 1
+# NOTE: the connection is checked for closure at least every such period
+_LISTENING_TASK_CONNECTION_CHECK_PERIOD_S: Final[float] = 1
+# NOTE: notifications received within this window are handled together
+_NOTIFICATIONS_BATCH_WINDOW_S: Final[float] = 0.2
+_NOTIFICATIONS_MAX_BATCH_SIZE: Final[int] = 1000
 _logger = logging.getLogger(__name__)
 
 
-async def _get_project_owner(conn: SAConnection, project_uuid: str) -> PositiveInt:
-    the_project_owner: PositiveInt | None = await conn.scalar(
-        select(projects.c.prj_owner).where(projects.c.uuid == project_uuid)
-    )
-    if not the_project_owner:
-        raise exceptions.ProjectOwnerNotFoundError(project_uuid=project_uuid)
-    return the_project_owner
+async def _get_projects_owners(
+    conn: SAConnection, project_uuids: list[str]
+) -> dict[str, PositiveInt]:
+    return {
+        row.uuid: row.prj_owner
+        async for row in await conn.execute(
+            select(projects.c.uuid, projects.c.prj_owner).where(
+                projects.c.uuid.in_(project_uuids)
+            )
+        )
+        if row.prj_owner
+    }
 
 
-async def _update_project_state(
+async def _update_project_nodes_state(
     app: web.Application,
     user_id: PositiveInt,
     project_uuid: ProjectID,
-    node_uuid: NodeID,
-    new_state: RunningState,
-    node_errors: list[ErrorDict] | None,
+    nodes_states: dict[NodeID, RunningState],
+    nodes_errors: dict[NodeID, list[ErrorDict] | None],
 ) -> None:
-    project = await projects_api.update_project_node_state(
-        app, user_id, project_uuid, node_uuid, new_state
-    )
+    while nodes_states:
+        try:
+            project = await projects_api.update_project_nodes_state(
+                app, user_id, project_uuid, nodes_states
+            )
+            break
+        except exceptions.NodeNotFoundError as exc:
+            _logger.warning(
+                "Node %s of project %s not found and cannot be updated. Maybe was it deleted?",
+                exc.node_uuid,
+                exc.project_uuid,
+            )
+            # the other nodes are still updated
+            nodes_states.pop(NodeID(exc.node_uuid))
+    else:
+        return
 
-    await projects_api.notify_project_node_update(app, project, node_uuid, node_errors)
+    for node_uuid in nodes_states:
+        await projects_api.notify_project_node_update(
+            app, project, node_uuid, nodes_errors[node_uuid]
+        )
+    # NOTE: the project state is notified once for all the nodes
     await projects_api.notify_project_state_update(app, project)
 
 
@@ -63,74 +91,163 @@ class _CompTaskNotificationPayload:
     table: str
 
 
-async def _handle_db_notification(
-    app: web.Application, payload: _CompTaskNotificationPayload, conn: SAConnection
+@dataclass
+class _NodeUpdate:
+    """the notifications of a comp_task coalesced over a batching window"""
+
+    data: dict
+    changes: set[str]
+
+
+def _coalesce_notifications(
+    notifications: list[_CompTaskNotificationPayload],
+) -> dict[ProjectID, dict[NodeID, _NodeUpdate]]:
+    projects_updates: dict[ProjectID, dict[NodeID, _NodeUpdate]] = defaultdict(dict)
+    for payload in notifications:
+        project_uuid = payload.data.get("project_id", None)
+        node_uuid = payload.data.get("node_id", None)
+        if any(x is None for x in [project_uuid, node_uuid]):
+            _logger.warning(
+                "comp_tasks row is corrupted. TIP: please check DB entry containing '%s'",
+                f"{payload.data=}",
+            )
+            continue
+
+        nodes_updates = projects_updates[ProjectID(project_uuid)]
+        if node_update := nodes_updates.get(NodeID(node_uuid)):
+            # the latest row contains all the changes
+            node_update.data = payload.data
+            node_update.changes.update(payload.changes)
+        else:
+            nodes_updates[NodeID(node_uuid)] = _NodeUpdate(
+                data=payload.data,
+                changes=set(payload.changes),
+            )
+    return projects_updates
+
+
+async def _handle_project_db_notifications(
+    app: web.Application,
+    project_owner: PositiveInt,
+    project_uuid: ProjectID,
+    nodes_updates: dict[NodeID, _NodeUpdate],
+) -> None:
+    for node_uuid, node_update in nodes_updates.items():
+        if any(f in node_update.changes for f in ["outputs", "run_hash"]):
+            try:
+                await update_node_outputs(
+                    app,
+                    project_owner,
+                    project_uuid,
+                    node_uuid,
+                    node_update.data.get("outputs", {}),
+                    node_update.data.get("run_hash", None),
+                    node_errors=node_update.data.get("errors", None),
+                    ui_changed_keys=None,
+                )
+            except exceptions.NodeNotFoundError as exc:
+                _logger.warning(
+                    "Node %s of project %s not found and cannot be updated. Maybe was it deleted?",
+                    exc.node_uuid,
+                    exc.project_uuid,
+                )
+
+    nodes_with_new_state = {
+        node_uuid: node_update
+        for node_uuid, node_update in nodes_updates.items()
+        if "state" in node_update.changes
+    }
+    if not nodes_with_new_state:
+        return
+    await _update_project_nodes_state(
+        app,
+        project_owner,
+        project_uuid,
+        {
+            node_uuid: convert_state_from_db(node_update.data["state"])
+            for node_uuid, node_update in nodes_with_new_state.items()
+        },
+        {
+            node_uuid: node_update.data.get("errors", None)
+            for node_uuid, node_update in nodes_with_new_state.items()
+        },
+    )
+
+
+async def _handle_db_notifications(
+    app: web.Application,
+    notifications: list[_CompTaskNotificationPayload],
+    conn: SAConnection,
 ) -> None:
-    task_data = payload.data
-    task_changes = payload.changes
-
-    project_uuid = task_data.get("project_id", None)
-    node_uuid = task_data.get("node_id", None)
-    if any(x is None for x in [project_uuid, node_uuid]):
-        _logger.warning(
-            "comp_tasks row is corrupted. TIP: please check DB entry containing '%s'",
-            f"{task_data=}",
-        )
+    projects_updates = _coalesce_notifications(notifications)
+    if not projects_updates:
         return
 
-    assert project_uuid  # nosec
-    assert node_uuid  # nosec
-
-    try:
-        # NOTE: we need someone with the rights to modify that project. the owner is one.
-        # find the user(s) linked to that project
-        the_project_owner = await _get_project_owner(conn, project_uuid)
-
-        if any(f in task_changes for f in ["outputs", "run_hash"]):
-            new_outputs = task_data.get("outputs", {})
-            new_run_hash = task_data.get("run_hash", None)
-
-            await update_node_outputs(
-                app,
-                the_project_owner,
-                ProjectID(project_uuid),
-                NodeID(node_uuid),
-                new_outputs,
-                new_run_hash,
-                node_errors=task_data.get("errors", None),
-                ui_changed_keys=None,
+    # NOTE: we need someone with the rights to modify that project. the owner is one.
+    # find the user(s) linked to that project
+    projects_owners = await _get_projects_owners(
+        conn, [f"{project_uuid}" for project_uuid in projects_updates]
+    )
+    for project_uuid, nodes_updates in projects_updates.items():
+        try:
+            if f"{project_uuid}" not in projects_owners:
+                raise exceptions.ProjectOwnerNotFoundError(project_uuid=project_uuid)
+            await _handle_project_db_notifications(
+                app, projects_owners[f"{project_uuid}"], project_uuid, nodes_updates
+            )
+
+        except exceptions.ProjectNotFoundError as exc:
+            _logger.warning(
+                "Project %s was not found and cannot be updated. Maybe was it deleted?",
+                exc.project_uuid,
+            )
+        except exceptions.ProjectOwnerNotFoundError as exc:
+            _logger.warning(
+                "Project owner of project %s could not be found, is the project valid?",
+                exc.project_uuid,
             )
 
-        if "state" in task_changes:
-            new_state = convert_state_from_db(task_data["state"])
-            await _update_project_state(
-                app,
-                the_project_owner,
-                ProjectID(project_uuid),
-                NodeID(node_uuid),
-                new_state,
-                node_errors=task_data.get("errors", None),
+
+async def _wait_for_notifications(
+    conn: SAConnection,
+) -> tuple[float, list[_CompTaskNotificationPayload]]:
+    """returns as soon as notifications are received, including the ones received
+    during the batching window, with the time the oldest one was received
+
+    NOTE: the other ones are only read from the queue after the window, so
+    the time each of them was received is not known
+    """
+    assert conn.connection  # nosec
+    notifies: asyncio.Queue = conn.connection.notifies
+    while True:
+        # NOTE: instead of using only await get() we check regularly if the connection was closed
+        # since aiopg does not reset the await in such a case (if DB was restarted or so)
+        # see aiopg issue: https://github.com/aio-libs/aiopg/pull/559#issuecomment-826813082
+        if conn.closed:
+            msg = "connection with database is closed!"
+            raise ConnectionError(msg)
+        with suppress(asyncio.TimeoutError):
+            # NOTE: aiopg fills the queue as soon as the connection socket is readable
+            first_notification = await asyncio.wait_for(
+                notifies.get(), timeout=_LISTENING_TASK_CONNECTION_CHECK_PERIOD_S
             )
+            oldest_received_at = time.monotonic()
+            break
 
-    except exceptions.ProjectNotFoundError as exc:
-        _logger.warning(
-            "Project %s was not found and cannot be updated. Maybe was it deleted?",
-            exc.project_uuid,
-        )
-    except exceptions.ProjectOwnerNotFoundError as exc:
-        _logger.warning(
-            "Project owner of project %s could not be found, is the project valid?",
-            exc.project_uuid,
-        )
-    except exceptions.NodeNotFoundError as exc:
-        _logger.warning(
-            "Node %s of project %s not found and cannot be updated. Maybe was it deleted?",
-            exc.node_uuid,
-            exc.project_uuid,
-        )
+    await asyncio.sleep(_NOTIFICATIONS_BATCH_WINDOW_S)
+    notifications = [first_notification]
+    while not notifies.empty() and len(notifications) < _NOTIFICATIONS_MAX_BATCH_SIZE:
+        notifications.append(notifies.get_nowait())
+
+    return oldest_received_at, [
+        _CompTaskNotificationPayload(**json.loads(notification.payload))
+        for notification in notifications
+    ]
 
 
-async def _listen(app: web.Application, db_engine: Engine) -> NoReturn:
+async def _listen(
+    app: web.Application, db_engine: Engine, metrics: ListenerMetrics
+) -> NoReturn:
     listen_query = f"LISTEN {DB_CHANNEL_NAME};"
 
     async with db_engine.acquire() as conn:
@@ -138,30 +255,25 @@ async def _listen(app: web.Application, db_engine: Engine) -> NoReturn:
         await conn.execute(listen_query)
 
         while True:
-            # NOTE: instead of using await get() we check first if the connection was closed
-            # since aiopg does not reset the await in such a case (if DB was restarted or so)
-            # see aiopg issue: https://github.com/aio-libs/aiopg/pull/559#issuecomment-826813082
-            if conn.closed:
-                msg = "connection with database is closed!"
-                raise ConnectionError(msg)
-            if conn.connection.notifies.empty():
-                await asyncio.sleep(_LISTENING_TASK_BASE_SLEEPING_TIME_S)
-                continue
-            notification = conn.connection.notifies.get_nowait()
-            # get the data and the info on what changed
-            payload = _CompTaskNotificationPayload(**json.loads(notification.payload))
-            _logger.debug("received update from database: %s", f"{payload=}")
-            await _handle_db_notification(app, payload, conn)
+            oldest_received_at, notifications = await _wait_for_notifications(conn)
+            metrics.queue_depth(conn.connection.notifies.qsize())
+            _logger.debug("received %d updates from database", len(notifications))
+            try:
+                # get the data and the info on what changed
+                await _handle_db_notifications(app, notifications, conn)
+            finally:
+                metrics.observe_handled(oldest_received_at=oldest_received_at)
 
 
 async def _comp_tasks_listening_task(app: web.Application) -> None:
     _logger.info("starting comp_task db listening task...")
+    metrics = ListenerMetrics.create(app)
     while True:
         try:
             # create a special connection here
             db_engine = app[APP_DB_ENGINE_KEY]
             _logger.info("listening to comp_task events...")
-            await _listen(app, db_engine)
+            await _listen(app, db_engine, metrics)
         except asyncio.CancelledError:  # noqa: PERF203
             # we are closing the app..
             _logger.info("cancelled comp_tasks events")
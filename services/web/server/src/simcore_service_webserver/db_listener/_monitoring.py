@@ -0,0 +1,44 @@
+import time
+from dataclasses import dataclass
+
+from aiohttp import web
+from prometheus_client import Gauge, Histogram
+from servicelib.aiohttp.monitoring import get_collector_registry
+
+_LAG_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, float("inf"))
+
+
+@dataclass(frozen=True)
+class ListenerMetrics:
+    notifications_queue_depth: Gauge | None
+    oldest_notification_lag: Histogram | None
+
+    @classmethod
+    def create(cls, app: web.Application) -> "ListenerMetrics":
+        try:
+            registry = get_collector_registry(app)
+        except KeyError:
+            # monitoring is disabled
+            return cls(notifications_queue_depth=None, oldest_notification_lag=None)
+
+        return cls(
+            notifications_queue_depth=Gauge(
+                name="db_listener_notifications_queue_depth",
+                documentation="Number of comp_tasks notifications waiting to be handled",
+                registry=registry,
+            ),
+            oldest_notification_lag=Histogram(
+                name="db_listener_oldest_notification_lag_seconds",
+                documentation="Time between the reception of the oldest comp_tasks notification of a batch and the end of the batch handling",
+                buckets=_LAG_BUCKETS,
+                registry=registry,
+            ),
+        )
+
+    def queue_depth(self, depth: int) -> None:
+        if self.notifications_queue_depth:
+            self.notifications_queue_depth.set(depth)
+
+    def observe_handled(self, *, oldest_received_at: float) -> None:
+        if self.oldest_notification_lag:
+            self.oldest_notification_lag.observe(time.monotonic() - oldest_received_at)
@@ -1,7 +1,7 @@
 from pathlib import Path
 
 from aiohttp import web
-from servicelib.archiving_utils import archive_dir
+from servicelib.archiving_utils import archive_dir, cpu_based_max_workers
 
 from ..exceptions import SDSException
 from ._sds import create_sds_directory
@@ -25,6 +25,7 @@ async def _compress_dir(
         destination=archive_name,
         compress=True,
         store_relative_path=True,
+        max_workers=cpu_based_max_workers(),
     )
 
     return archive_name
@@ -1,3 +1,4 @@
+import json
 import logging
 from collections.abc import AsyncIterator, Generator
 from typing import Final
@@ -93,6 +94,14 @@ def _convert_to_node_progress_event(
     )
 
 
+def _get_project_id(data: bytes) -> str:
+    return f"{json.loads(data)['project_id']}"
+
+
+def _get_wallet_id(data: bytes) -> str:
+    return f"{json.loads(data)['wallet_id']}"
+
+
 async def _progress_message_parser(app: web.Application, data: bytes) -> bool:
     rabbit_message: ProgressRabbitMessageNode | ProgressRabbitMessageProject = (
         parse_raw_as(ProgressRabbitMessageNode | ProgressRabbitMessageProject, data)
@@ -173,25 +182,26 @@ async def _osparc_credits_message_parser(app: web.Application, data: bytes) -> b
 
 
 _EXCHANGE_TO_PARSER_CONFIG: Final[tuple[SubcribeArgumentsTuple, ...]] = (
+    # NOTE: messages are handled concurrently, only the ones of the same project/wallet keep their order
     SubcribeArgumentsTuple(
         LoggerRabbitMessage.get_channel_name(),
         _log_message_parser,
-        {"topics": []},
+        {"topics": [], "ordering_key": _get_project_id},
     ),
     SubcribeArgumentsTuple(
         ProgressRabbitMessageNode.get_channel_name(),
         _progress_message_parser,
-        {"topics": []},
+        {"topics": [], "ordering_key": _get_project_id},
     ),
     SubcribeArgumentsTuple(
         EventRabbitMessage.get_channel_name(),
         _events_message_parser,
-        {},
+        {"ordering_key": _get_project_id},
     ),
     SubcribeArgumentsTuple(
         WalletCreditsMessage.get_channel_name(),
         _osparc_credits_message_parser,
-        {"topics": []},
+        {"topics": [], "ordering_key": _get_wallet_id},
     ),
 )
 
@@ -753,6 +753,37 @@ async def update_project_node_state(
     )
 
 
+async def update_project_nodes_state(
+    app: web.Application,
+    user_id: UserID,
+    project_id: ProjectID,
+    nodes_states: dict[NodeID, str],
+) -> dict:
+    """same as update_project_node_state for several nodes of the same project
+    in a single database update
+    """
+    log.debug(
+        "updating nodes %s current state in project %s for user %s",
+        list(nodes_states),
+        project_id,
+        user_id,
+    )
+
+    db: ProjectDBAPI = app[APP_PROJECT_DBAPI]
+    updated_project, _ = await db.update_project_multiple_node_data(
+        user_id=user_id,
+        project_uuid=project_id,
+        product_name=None,
+        partial_workbench_data={
+            NodeIDStr(f"{node_id}"): {"state": {"currentStatus": new_state}}
+            for node_id, new_state in nodes_states.items()
+        },
+    )
+    return await add_project_states_for_user(
+        user_id=user_id, project=updated_project, is_template=False, app=app
+    )
+
+
 async def is_project_hidden(app: web.Application, project_id: ProjectID) -> bool:
     db: ProjectDBAPI = app[APP_PROJECT_DBAPI]
     return await db.is_hidden(project_id)
@@ -10,15 +10,25 @@
     A key can be set as "alive". This creates a secondary key (e.g. "user_id=a_user_id:some_other_id=123:alive").
     This key can have a timeout value. When the key times out then the key disappears from Redis automatically.
 
+    The keys are also indexed, so that no scan of the whole keyspace is needed:
+    - a sorted set of the keys having resources
+    - a sorted set of the alive keys scored with their expiration time (redis server time)
+    - a set of keys per resource (field, value)
+    The indices are regularly reconciled with the keys, since replicas of a previous
+    version (e.g. during a rolling upgrade) write the keys without their indices.
+
 
 """
 
 import logging
-from typing import TypedDict
+import time
+from typing import Final, TypedDict
 
 import redis.asyncio as aioredis
 from aiohttp import web
 from models_library.basic_types import UUIDStr
+from redis.asyncio.client import Pipeline
+from servicelib.logging_utils import log_context
 
 from ..redis import get_redis_resources_client
 from ._constants import APP_CLIENT_SOCKET_REGISTRY_KEY
@@ -33,6 +43,14 @@ _logger = logging.getLogger(__name__)
 _ALIVE_SUFFIX = "alive"  # points to a string type
 _RESOURCE_SUFFIX = "resources"  # points to a hash (like a dict) type
 
+# indices of the keys above, formatted as '${user_id=}:${client_session_id=}'
+_ALIVE_INDEX_KEY: Final[str] = "index-alive"  # sorted set scored by expiration time
+_RESOURCES_INDEX_KEY: Final[str] = "index-resources"  # sorted set (score is unused)
+_RESOURCE_INDEX_PREFIX: Final[str] = "index-resource"  # sets per resource field=value
+# NOTE: bump the version when the indices change, so that they are rebuilt
+_INDICES_BUILT_KEY: Final[str] = "index-built:v1"
+_INDICES_RECONCILIATION_INTERVAL_S: Final[int] = 60 * 60
+
 
 class _UserRequired(TypedDict, total=True):
     user_id: str | int
@@ -64,6 +82,7 @@ class RedisResourceRegistry:
 
     def __init__(self, app: web.Application):
         self._app = app
+        self._indices_ensured_at: float | None = None
 
     @property
     def app(self) -> web.Application:
@@ -89,12 +108,103 @@ class RedisResourceRegistry:
         client: aioredis.Redis = get_redis_resources_client(self.app)
         return client
 
+    @classmethod
+    def _resource_index_key(cls, field: str, value: str) -> str:
+        return f"{_RESOURCE_INDEX_PREFIX}:{field}={value}"
+
+    async def _server_time(self) -> float:
+        # NOTE: the expiration times are compared between replicas, their clocks might differ
+        seconds, microseconds = await self.client.time()
+        return seconds + microseconds / 1e6
+
+    async def _discard_stale_index_entry(
+        self, index_key: str, key: str, *, resource: tuple[str, str] | None = None
+    ) -> None:
+        """removes the entry of a key removed (or changed) without updating its indices"""
+        is_alive_index = index_key == _ALIVE_INDEX_KEY
+        watched_key = f"{key}:{_ALIVE_SUFFIX if is_alive_index else _RESOURCE_SUFFIX}"
+
+        async def _discard(pipe: Pipeline) -> None:
+            if resource is None:
+                is_stale = not await pipe.exists(watched_key)
+            else:
+                field, value = resource
+                is_stale = await pipe.hget(watched_key, field) != value
+            if is_stale:
+                pipe.multi()
+                if resource is None:
+                    pipe.zrem(index_key, key)
+                else:
+                    pipe.srem(index_key, key)
+
+        # NOTE: the key is watched, i.e. nothing is removed if it was written meanwhile
+        await self.client.transaction(_discard, watched_key)
+
+    async def _reconcile_indices(self) -> None:
+        now = await self._server_time()
+        async for hash_key in self.client.scan_iter(match=f"*:{_RESOURCE_SUFFIX}"):
+            key = hash_key[: -len(f":{_RESOURCE_SUFFIX}")]
+            fields = await self.client.hgetall(hash_key)
+            async with self.client.pipeline(transaction=True) as pipe:
+                pipe.zadd(_RESOURCES_INDEX_KEY, {key: 0})
+                for field, value in fields.items():
+                    pipe.sadd(self._resource_index_key(field, value), key)
+                await pipe.execute()
+        async for hash_key in self.client.scan_iter(match=f"*:{_ALIVE_SUFFIX}"):
+            if (ttl := await self.client.ttl(hash_key)) > 0:
+                key = hash_key[: -len(f":{_ALIVE_SUFFIX}")]
+                await self.client.zadd(_ALIVE_INDEX_KEY, {key: now + ttl})
+
+        for index_key in (_RESOURCES_INDEX_KEY, _ALIVE_INDEX_KEY):
+            async for key, _ in self.client.zscan_iter(index_key):
+                await self._discard_stale_index_entry(index_key, key)
+        async for index_key in self.client.scan_iter(
+            match=f"{_RESOURCE_INDEX_PREFIX}:*"
+        ):
+            field, value = index_key[len(f"{_RESOURCE_INDEX_PREFIX}:") :].split("=", 1)
+            async for key in self.client.sscan_iter(index_key):
+                await self._discard_stale_index_entry(
+                    index_key, key, resource=(field, value)
+                )
+
+    async def _ensure_indices(self) -> None:
+        """the indices are reconciled with the keys by one of the replicas at start
+        (e.g. after an upgrade) and then regularly"""
+        if (
+            self._indices_ensured_at is not None
+            and time.monotonic() - self._indices_ensured_at
+            < _INDICES_RECONCILIATION_INTERVAL_S
+        ):
+            return
+        if await self.client.set(
+            _INDICES_BUILT_KEY, 1, nx=True, ex=_INDICES_RECONCILIATION_INTERVAL_S
+        ):
+            with log_context(_logger, logging.INFO, msg="reconciling registry indices"):
+                await self._reconcile_indices()
+        self._indices_ensured_at = time.monotonic()
+
     async def set_resource(
         self, key: UserSessionDict, resource: tuple[str, str]
     ) -> None:
+        await self._ensure_indices()
         hash_key = f"{self._hash_key(key)}:{_RESOURCE_SUFFIX}"
         field, value = resource
-        await self.client.hset(hash_key, mapping={field: value})
+
+        async def _set(pipe: Pipeline) -> None:
+            previous_value = await pipe.hget(hash_key, field)
+            pipe.multi()
+            pipe.hset(hash_key, mapping={field: value})
+            pipe.zadd(_RESOURCES_INDEX_KEY, {self._hash_key(key): 0})
+            if previous_value is not None and previous_value != value:
+                pipe.srem(
+                    self._resource_index_key(field, previous_value),
+                    self._hash_key(key),
+                )
+            pipe.sadd(self._resource_index_key(field, value), self._hash_key(key))
+
+        # NOTE: the previous value is watched, i.e. the transaction is retried if
+        # it was changed meanwhile
+        await self.client.transaction(_set, hash_key)
 
     async def get_resources(self, key: UserSessionDict) -> ResourcesDict:
         hash_key = f"{self._hash_key(key)}:{_RESOURCE_SUFFIX}"
@@ -103,61 +213,107 @@ class RedisResourceRegistry:
 
     async def remove_resource(self, key: UserSessionDict, resource_name: str) -> None:
         hash_key = f"{self._hash_key(key)}:{_RESOURCE_SUFFIX}"
-        await self.client.hdel(hash_key, resource_name)
+
+        async def _remove(pipe: Pipeline) -> None:
+            previous_value = await pipe.hget(hash_key, resource_name)
+            if previous_value is None:
+                return
+            is_last_field = await pipe.hlen(hash_key) == 1
+            pipe.multi()
+            pipe.hdel(hash_key, resource_name)
+            pipe.srem(
+                self._resource_index_key(resource_name, previous_value),
+                self._hash_key(key),
+            )
+            if is_last_field:
+                # NOTE: redis removes a hash once its last field is removed
+                pipe.zrem(_RESOURCES_INDEX_KEY, self._hash_key(key))
+
+        await self.client.transaction(_remove, hash_key)
 
     async def find_resources(
         self, key: UserSessionDict, resource_name: str
     ) -> list[str]:
+        if "*" not in self._hash_key(key):
+            resource = await self.client.hget(
+                f"{self._hash_key(key)}:{_RESOURCE_SUFFIX}", resource_name
+            )
+            return [] if resource is None else [resource]
+
+        await self._ensure_indices()
         resources: list[str] = []
-        # the key might only be partialy complete
-        partial_hash_key = f"{self._hash_key(key)}:{_RESOURCE_SUFFIX}"
-        async for scanned_key in self.client.scan_iter(match=partial_hash_key):
-            if await self.client.hexists(scanned_key, resource_name):
-                resources.append(await self.client.hget(scanned_key, resource_name))
+        # the key might only be partialy complete, only the index is scanned
+        async for indexed_key, _ in self.client.zscan_iter(
+            _RESOURCES_INDEX_KEY, match=self._hash_key(key)
+        ):
+            resource = await self.client.hget(
+                f"{indexed_key}:{_RESOURCE_SUFFIX}", resource_name
+            )
+            if resource is not None:
+                resources.append(resource)
         return resources
 
     async def find_keys(self, resource: tuple[str, str]) -> list[UserSessionDict]:
-        keys: list[UserSessionDict] = []
         if not resource:
-            return keys
+            return []
 
+        await self._ensure_indices()
         field, value = resource
-
-        async for hash_key in self.client.scan_iter(match=f"*:{_RESOURCE_SUFFIX}"):
-            if value == await self.client.hget(hash_key, field):
-                keys.append(self._decode_hash_key(hash_key))
-        return keys
+        return [
+            self._decode_hash_key(f"{indexed_key}:{_RESOURCE_SUFFIX}")
+            for indexed_key in await self.client.smembers(
+                self._resource_index_key(field, value)
+            )
+        ]
 
     async def set_key_alive(self, key: UserSessionDict, timeout: int) -> None:
         # setting the timeout to always expire, timeout > 0
         timeout = int(max(1, timeout))
         hash_key = f"{self._hash_key(key)}:{_ALIVE_SUFFIX}"
-        await self.client.set(hash_key, 1, ex=timeout)
+        expires_at = await self._server_time() + timeout
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.set(hash_key, 1, ex=timeout)
+            pipe.zadd(_ALIVE_INDEX_KEY, {self._hash_key(key): expires_at})
+            await pipe.execute()
 
     async def is_key_alive(self, key: UserSessionDict) -> bool:
         hash_key = f"{self._hash_key(key)}:{_ALIVE_SUFFIX}"
         return await self.client.exists(hash_key) > 0
 
     async def remove_key(self, key: UserSessionDict) -> None:
-        await self.client.delete(
-            f"{self._hash_key(key)}:{_RESOURCE_SUFFIX}",
-            f"{self._hash_key(key)}:{_ALIVE_SUFFIX}",
-        )
+        hash_key = f"{self._hash_key(key)}:{_RESOURCE_SUFFIX}"
+
+        async def _remove(pipe: Pipeline) -> None:
+            fields = await pipe.hgetall(hash_key)
+            pipe.multi()
+            pipe.delete(
+                hash_key,
+                f"{self._hash_key(key)}:{_ALIVE_SUFFIX}",
+            )
+            pipe.zrem(_RESOURCES_INDEX_KEY, self._hash_key(key))
+            pipe.zrem(_ALIVE_INDEX_KEY, self._hash_key(key))
+            for field, value in fields.items():
+                pipe.srem(self._resource_index_key(field, value), self._hash_key(key))
+
+        await self.client.transaction(_remove, hash_key)
 
     async def get_all_resource_keys(
         self,
     ) -> tuple[list[UserSessionDict], list[UserSessionDict]]:
-        alive_keys = [
-            self._decode_hash_key(hash_key)
-            async for hash_key in self.client.scan_iter(match=f"*:{_ALIVE_SUFFIX}")
-        ]
-        dead_keys = [
-            self._decode_hash_key(hash_key)
-            async for hash_key in self.client.scan_iter(match=f"*:{_RESOURCE_SUFFIX}")
-            if self._decode_hash_key(hash_key) not in alive_keys
-        ]
-
-        return (alive_keys, dead_keys)
+        await self._ensure_indices()
+        # NOTE: the alive keys expire by themselves, their index entries are
+        # removed here once their expiration time is passed
+        now = await self._server_time()
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.zremrangebyscore(_ALIVE_INDEX_KEY, "-inf", now)
+            pipe.zrange(_ALIVE_INDEX_KEY, 0, -1)
+            pipe.zdiff([_RESOURCES_INDEX_KEY, _ALIVE_INDEX_KEY])
+            _, alive_keys, dead_keys = await pipe.execute()
+
+        return (
+            [self._decode_hash_key(f"{key}:{_ALIVE_SUFFIX}") for key in alive_keys],
+            [self._decode_hash_key(f"{key}:{_RESOURCE_SUFFIX}") for key in dead_keys],
+        )
 
 
 def get_registry(app: web.Application) -> RedisResourceRegistry:
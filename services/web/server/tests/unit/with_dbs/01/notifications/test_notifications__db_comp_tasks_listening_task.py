@@ -22,6 +22,8 @@ from simcore_postgres_database.models.comp_pipeline import StateType
 from simcore_postgres_database.models.comp_tasks import NodeClass, comp_tasks
 from simcore_postgres_database.models.users import UserRole
 from simcore_service_webserver.db_listener._db_comp_tasks_listening_task import (
+    _coalesce_notifications,
+    _CompTaskNotificationPayload,
     create_comp_tasks_listening_task,
 )
 from tenacity._asyncio import AsyncRetrying
@@ -44,12 +46,14 @@ async def mock_project_subsystem(
         return_value="",
     )
 
-    mocked_project_calls["_get_project_owner"] = mocker.patch(
-        "simcore_service_webserver.db_listener._db_comp_tasks_listening_task._get_project_owner",
-        return_value="",
+    mocked_project_calls["_get_projects_owners"] = mocker.patch(
+        "simcore_service_webserver.db_listener._db_comp_tasks_listening_task._get_projects_owners",
+        side_effect=lambda _conn, project_uuids: {
+            project_uuid: 1 for project_uuid in project_uuids
+        },
     )
-    mocked_project_calls["_update_project_state"] = mocker.patch(
-        "simcore_service_webserver.db_listener._db_comp_tasks_listening_task._update_project_state",
+    mocked_project_calls["_update_project_nodes_state"] = mocker.patch(
+        "simcore_service_webserver.db_listener._db_comp_tasks_listening_task._update_project_nodes_state",
         return_value="",
     )
 
@@ -105,17 +109,21 @@ def comp_task(
             {
                 "outputs": {"some new stuff": "it is new"},
             },
-            ["_get_project_owner", "update_node_outputs"],
+            ["_get_projects_owners", "update_node_outputs"],
             id="new output shall trigger",
         ),
         pytest.param(
             {"state": StateType.ABORTED},
-            ["_get_project_owner", "_update_project_state"],
+            ["_get_projects_owners", "_update_project_nodes_state"],
             id="new state shall trigger",
         ),
         pytest.param(
             {"outputs": {"some new stuff": "it is new"}, "state": StateType.ABORTED},
-            ["_get_project_owner", "update_node_outputs", "_update_project_state"],
+            [
+                "_get_projects_owners",
+                "update_node_outputs",
+                "_update_project_nodes_state",
+            ],
             id="new output and state shall double trigger",
         ),
         pytest.param(
@@ -171,3 +179,31 @@ async def test_listen_comp_tasks_task(
 
             else:
                 mocked_call.assert_not_called()
+
+
+def test_coalesce_notifications(faker: Faker):
+    project_id = faker.uuid4()
+    node_id = faker.uuid4()
+
+    def _payload(changes: dict, **data) -> _CompTaskNotificationPayload:
+        return _CompTaskNotificationPayload(
+            action="UPDATE",
+            data={"project_id": project_id, "node_id": node_id} | data,
+            changes=changes,
+            table="comp_tasks",
+        )
+
+    projects_updates = _coalesce_notifications(
+        [
+            _payload({"outputs": {}}, outputs={"out_1": 1}, state="PENDING"),
+            _payload({"state": "PENDING"}, outputs={"out_1": 1}, state="SUCCESS"),
+            _payload({}, project_id=None),
+        ]
+    )
+    assert list(projects_updates) == [ProjectID(project_id)]
+    nodes_updates = projects_updates[ProjectID(project_id)]
+    assert len(nodes_updates) == 1
+    node_update = next(iter(nodes_updates.values()))
+    # the latest data is kept with all the changes
+    assert node_update.data["state"] == "SUCCESS"
+    assert node_update.changes == {"outputs", "state"}
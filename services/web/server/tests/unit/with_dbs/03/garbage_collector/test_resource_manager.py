@@ -49,6 +49,7 @@ from simcore_service_webserver.projects.projects_api import (
 from simcore_service_webserver.rabbitmq import setup_rabbitmq
 from simcore_service_webserver.resource_manager.plugin import setup_resource_manager
 from simcore_service_webserver.resource_manager.registry import (
+    _INDICES_BUILT_KEY,
     RedisResourceRegistry,
     UserSessionDict,
     get_registry,
@@ -312,6 +313,67 @@ async def test_websocket_resource_management(
             assert not await socket_registry.find_resources(resource_key, "socket_id")
 
 
+async def test_registry_indices(socket_registry: RedisResourceRegistry):
+    alive_key = UserSessionDict(user_id="1", client_session_id="alive-session")
+    dead_key = UserSessionDict(user_id="1", client_session_id="dead-session")
+    other_user_key = UserSessionDict(user_id="2", client_session_id="some-session")
+
+    for key in (alive_key, dead_key, other_user_key):
+        await socket_registry.set_resource(key, ("socket_id", f"sid-{key['user_id']}"))
+    await socket_registry.set_resource(dead_key, ("socket_id", "new-sid"))
+    await socket_registry.set_key_alive(alive_key, timeout=60)
+
+    alive_keys, dead_keys = await socket_registry.get_all_resource_keys()
+    assert alive_keys == [alive_key]
+    assert sorted(dead_keys, key=lambda k: k["user_id"]) == [dead_key, other_user_key]
+
+    assert await socket_registry.find_keys(("socket_id", "sid-1")) == [alive_key]
+    assert await socket_registry.find_keys(("socket_id", "new-sid")) == [dead_key]
+    assert sorted(
+        await socket_registry.find_resources(
+            UserSessionDict(user_id="1", client_session_id="*"), "socket_id"
+        )
+    ) == ["new-sid", "sid-1"]
+
+    # indices are rebuilt from the existing keys (e.g. after an upgrade)
+    await socket_registry.client.delete(
+        "index-alive",
+        "index-resources",
+        _INDICES_BUILT_KEY,
+        "index-resource:socket_id=sid-2",
+    )
+    socket_registry._indices_ensured_at = None  # noqa: SLF001
+    assert await socket_registry.find_keys(("socket_id", "sid-2")) == [other_user_key]
+    assert await socket_registry.get_all_resource_keys() == (alive_keys, dead_keys)
+
+    # ...and reconciled with the keys written without their indices (e.g. by the
+    # replicas of a previous version during a rolling upgrade)
+    unindexed_key = UserSessionDict(user_id="3", client_session_id="some-session")
+    await socket_registry.client.hset(
+        "user_id=3:client_session_id=some-session:resources",
+        mapping={"socket_id": "sid-3"},
+    )
+    await socket_registry.client.delete(
+        "user_id=2:client_session_id=some-session:resources"
+    )
+    assert await socket_registry.find_keys(("socket_id", "sid-3")) == []
+    await socket_registry.client.delete(_INDICES_BUILT_KEY)
+    socket_registry._indices_ensured_at = None  # noqa: SLF001
+    assert await socket_registry.find_keys(("socket_id", "sid-3")) == [unindexed_key]
+    assert await socket_registry.find_keys(("socket_id", "sid-2")) == []
+    assert await socket_registry.get_all_resource_keys() == (
+        alive_keys,
+        [dead_key, unindexed_key],
+    )
+    await socket_registry.remove_key(unindexed_key)
+
+    await socket_registry.remove_resource(dead_key, "socket_id")
+    await socket_registry.remove_key(alive_key)
+    assert not await socket_registry.find_keys(("socket_id", "new-sid"))
+    assert not await socket_registry.find_keys(("socket_id", "sid-1"))
+    assert await socket_registry.get_all_resource_keys() == ([], [])
+
+
 @pytest.mark.parametrize(
     "user_role",
     [